@@ -0,0 +1,171 @@
+/**
+ * Unit Tests for the API request pipeline
+ *
+ * Tests method/size/field validation order, rate limit responses,
+ * error mapping and per-route timings.
+ */
+
+import { EventEmitter } from 'events';
+import {
+  getBase64ByteLength,
+  getRouteTimings,
+  resetRouteTimings,
+  withApiPipeline,
+} from '@/api/_utils/pipeline';
+import { MemoryRateLimitStore, setRateLimitStore } from '@/api/_utils/rateLimit';
+
+function createRequest(overrides: Record<string, any> = {}): any {
+  return {
+    method: 'POST',
+    headers: { 'x-forwarded-for': '10.0.0.1' },
+    body: {},
+    ...overrides,
+  };
+}
+
+function createResponse(): any {
+  const res: any = new EventEmitter();
+  res.statusCode = 200;
+  res.headersSent = false;
+  res.headers = {} as Record<string, string>;
+  res.setHeader = jest.fn((name: string, value: string) => {
+    res.headers[name] = value;
+  });
+  res.status = jest.fn((code: number) => {
+    res.statusCode = code;
+    return res;
+  });
+  res.json = jest.fn((body: unknown) => {
+    res.body = body;
+    res.headersSent = true;
+    res.emit('finish');
+    return res;
+  });
+  res.end = jest.fn(() => {
+    res.headersSent = true;
+    res.emit('finish');
+    return res;
+  });
+  return res;
+}
+
+describe('pipeline', () => {
+  beforeEach(() => {
+    setRateLimitStore(new MemoryRateLimitStore());
+    resetRouteTimings();
+    jest.spyOn(console, 'log').mockImplementation(() => {});
+    jest.spyOn(console, 'error').mockImplementation(() => {});
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  it('should run the handler for valid requests', async () => {
+    const handler = jest.fn((_req, res) => res.status(200).json({ ok: true }));
+    const res = createResponse();
+
+    await withApiPipeline({ route: 'test' }, handler)(createRequest(), res);
+
+    expect(handler).toHaveBeenCalled();
+    expect(res.body).toEqual({ ok: true });
+    expect(res.headers['X-RateLimit-Remaining']).toBe('29');
+  });
+
+  it('should reject disallowed methods', async () => {
+    const handler = jest.fn();
+    const res = createResponse();
+
+    await withApiPipeline({ route: 'test' }, handler)(createRequest({ method: 'GET' }), res);
+
+    expect(res.statusCode).toBe(405);
+    expect(handler).not.toHaveBeenCalled();
+  });
+
+  it('should reject oversized payloads from Content-Length', async () => {
+    const handler = jest.fn();
+    const res = createResponse();
+    const req = createRequest({ headers: { 'content-length': '2048' } });
+
+    await withApiPipeline({ route: 'test', maxBodyBytes: 1024 }, handler)(req, res);
+
+    expect(res.statusCode).toBe(413);
+    expect(handler).not.toHaveBeenCalled();
+  });
+
+  it('should reject oversized base64 images without decoding them', async () => {
+    const handler = jest.fn();
+    const res = createResponse();
+    const decode = jest.spyOn(Buffer, 'from');
+    const req = createRequest({ body: { imageData: 'A'.repeat(4000) } });
+
+    await withApiPipeline({ route: 'test', imageFields: ['imageData'], maxImageBytes: 2000 }, handler)(req, res);
+
+    expect(res.statusCode).toBe(413);
+    expect(decode).not.toHaveBeenCalled();
+    expect(handler).not.toHaveBeenCalled();
+  });
+
+  it('should require fields', async () => {
+    const res = createResponse();
+
+    await withApiPipeline({ route: 'test', requiredFields: ['labelName'] }, jest.fn())(createRequest(), res);
+
+    expect(res.statusCode).toBe(400);
+    expect(res.body.error).toContain('labelName');
+  });
+
+  it('should rate limit with Retry-After', async () => {
+    const handler = jest.fn((_req, res) => res.status(200).json({}));
+    const route = withApiPipeline({ route: 'test', rateLimit: { limit: 1, windowMs: 60_000 } }, handler);
+
+    await route(createRequest(), createResponse());
+    const res = createResponse();
+    await route(createRequest(), res);
+
+    expect(res.statusCode).toBe(429);
+    expect(Number(res.headers['Retry-After'])).toBeGreaterThan(0);
+    expect(handler).toHaveBeenCalledTimes(1);
+  });
+
+  it('should map upstream quota errors to 429 and others to 500', async () => {
+    const quota = createResponse();
+    await withApiPipeline({ route: 'test' }, () => {
+      throw new Error('429 Resource has been exhausted (e.g. check quota)');
+    })(createRequest(), quota);
+
+    const failure = createResponse();
+    await withApiPipeline({ route: 'test' }, () => {
+      throw new Error('boom');
+    })(createRequest(), failure);
+
+    expect(quota.statusCode).toBe(429);
+    expect(failure.statusCode).toBe(500);
+    expect(failure.body.error).toBe('boom');
+  });
+
+  it('should record timings per route', async () => {
+    const ok = withApiPipeline({ route: 'a' }, (_req, res) => res.status(200).json({}));
+    const invalid = withApiPipeline({ route: 'b', requiredFields: ['x'] }, jest.fn());
+
+    await ok(createRequest(), createResponse());
+    await ok(createRequest(), createResponse());
+    await invalid(createRequest(), createResponse());
+
+    const timings = getRouteTimings();
+    expect(timings.a.requests).toBe(2);
+    expect(timings.a.errors).toBe(0);
+    expect(timings.b.rejected).toBe(1);
+    expect(timings.a.requestsPerMinute).toBeGreaterThan(0);
+  });
+
+  describe('getBase64ByteLength', () => {
+    it('should match the decoded size', () => {
+      for (const size of [0, 1, 2, 3, 100]) {
+        const data = Buffer.alloc(size).toString('base64');
+        expect(getBase64ByteLength(data)).toBe(size);
+        expect(getBase64ByteLength(`data:image/png;base64,${data}`)).toBe(size);
+      }
+    });
+  });
+});
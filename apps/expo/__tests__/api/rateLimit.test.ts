@@ -0,0 +1,240 @@
+/**
+ * Unit Tests for API rate limiting
+ *
+ * Tests the in-memory token bucket, the Redis sliding-window store against a
+ * local RESP stand-in server, and the fallback when the store is unavailable.
+ */
+
+import * as net from 'net';
+import { AddressInfo } from 'net';
+import { RedisClient } from '@/api/_utils/redisClient';
+import {
+  checkRateLimit,
+  MemoryRateLimitStore,
+  RateLimitStore,
+  RedisRateLimitStore,
+  setRateLimitStore,
+} from '@/api/_utils/rateLimit';
+
+const rule = { limit: 3, windowMs: 1000 };
+
+/**
+ * Just enough of a Redis server for the rate limiter: AUTH, PING, INCR, PEXPIRE, GET
+ */
+function startRedisStandIn(password?: string) {
+  const data = new Map<string, number>();
+  const commands: string[][] = [];
+
+  const server = net.createServer((socket) => {
+    let buffer = '';
+    let authed = !password;
+
+    socket.on('data', (chunk) => {
+      buffer += chunk.toString();
+      // Commands arrive as arrays of bulk strings: *N\r\n($len\r\narg\r\n)*N
+      while (buffer.startsWith('*')) {
+        const lines = buffer.split('\r\n');
+        const count = Number(lines[0].slice(1));
+        if (lines.length < 1 + count * 2 + 1) return;
+
+        const args = Array.from({ length: count }, (_, i) => lines[2 + i * 2]);
+        buffer = lines.slice(1 + count * 2).join('\r\n');
+        commands.push(args);
+
+        const [name, key] = args;
+        if (name === 'AUTH') {
+          authed = args[args.length - 1] === password;
+          socket.write(authed ? '+OK\r\n' : '-WRONGPASS invalid password\r\n');
+        } else if (!authed) {
+          socket.write('-NOAUTH Authentication required\r\n');
+        } else if (name === 'PING') {
+          socket.write('+PONG\r\n');
+        } else if (name === 'INCR') {
+          data.set(key, (data.get(key) ?? 0) + 1);
+          socket.write(`:${data.get(key)}\r\n`);
+        } else if (name === 'PEXPIRE') {
+          socket.write(':1\r\n');
+        } else if (name === 'GET') {
+          const value = data.get(key);
+          socket.write(value === undefined ? '$-1\r\n' : `$${String(value).length}\r\n${value}\r\n`);
+        } else {
+          socket.write(`-ERR unknown command '${name}'\r\n`);
+        }
+      }
+    });
+  });
+
+  return new Promise<{ url: string; data: Map<string, number>; commands: string[][]; close: () => Promise<void> }>(
+    (resolve) => {
+      server.listen(0, '127.0.0.1', () => {
+        const { port } = server.address() as AddressInfo;
+        resolve({
+          url: password ? `redis://:${password}@127.0.0.1:${port}` : `redis://127.0.0.1:${port}`,
+          data,
+          commands,
+          close: () => new Promise((done) => server.close(() => done())),
+        });
+      });
+    }
+  );
+}
+
+describe('rateLimit', () => {
+  describe('MemoryRateLimitStore', () => {
+    it('should allow a burst up to the limit, then reject', async () => {
+      const store = new MemoryRateLimitStore();
+
+      const decisions = [];
+      for (let i = 0; i < 4; i++) {
+        decisions.push(await store.hit('client', rule, 0));
+      }
+
+      expect(decisions.map((d) => d.allowed)).toEqual([true, true, true, false]);
+      expect(decisions[2].remaining).toBe(0);
+      expect(decisions[3].retryAfterMs).toBeGreaterThan(0);
+    });
+
+    it('should refill tokens gradually instead of resetting the window', async () => {
+      const store = new MemoryRateLimitStore();
+      for (let i = 0; i < 3; i++) {
+        await store.hit('client', rule, 0);
+      }
+
+      // One token refills every windowMs / limit
+      expect((await store.hit('client', rule, 200)).allowed).toBe(false);
+      expect((await store.hit('client', rule, 340)).allowed).toBe(true);
+      expect((await store.hit('client', rule, 340)).allowed).toBe(false);
+    });
+
+    it('should track clients separately', async () => {
+      const store = new MemoryRateLimitStore();
+      for (let i = 0; i < 3; i++) {
+        await store.hit('a', rule, 0);
+      }
+
+      expect((await store.hit('b', rule, 0)).allowed).toBe(true);
+    });
+  });
+
+  describe('RedisRateLimitStore', () => {
+    let server: Awaited<ReturnType<typeof startRedisStandIn>>;
+    let clients: RedisClient[];
+
+    const connect = (url: string) => {
+      const client = new RedisClient(url);
+      clients.push(client);
+      return client;
+    };
+
+    beforeEach(() => {
+      clients = [];
+    });
+
+    afterEach(async () => {
+      clients.forEach((client) => client.disconnect());
+      await server.close();
+    });
+
+    it('should share counts between instances through Redis', async () => {
+      server = await startRedisStandIn();
+      const instanceA = new RedisRateLimitStore(connect(server.url));
+      const instanceB = new RedisRateLimitStore(connect(server.url));
+
+      const decisions = [
+        await instanceA.hit('client', rule, 0),
+        await instanceB.hit('client', rule, 10),
+        await instanceA.hit('client', rule, 20),
+        await instanceB.hit('client', rule, 30),
+      ];
+
+      expect(decisions.map((d) => d.allowed)).toEqual([true, true, true, false]);
+      expect(server.data.get('ratelimit:client:0')).toBe(4);
+    });
+
+    it('should weight the previous window by its overlap', async () => {
+      server = await startRedisStandIn();
+      const store = new RedisRateLimitStore(connect(server.url));
+      for (let i = 0; i < 3; i++) {
+        await store.hit('client', rule, 900);
+      }
+
+      // 25% into the next window, 75% of the previous 3 requests still count
+      const early = await store.hit('client', rule, 1250);
+      expect(early.allowed).toBe(false);
+      expect(early.retryAfterMs).toBeGreaterThan(0);
+
+      // 90% in, only 0.3 of them count
+      expect((await store.hit('client', rule, 1900)).allowed).toBe(true);
+    });
+
+    it('should pipeline commands and authenticate from the URL', async () => {
+      server = await startRedisStandIn('secret');
+      await new RedisRateLimitStore(connect(server.url)).hit('client', rule, 0);
+
+      expect(server.commands.map(([name]) => name)).toEqual(['AUTH', 'INCR', 'PEXPIRE', 'GET']);
+    });
+
+    it('should throw on error replies', async () => {
+      server = await startRedisStandIn('secret');
+      const client = connect(server.url.replace('secret', 'wrong'));
+
+      await expect(new RedisRateLimitStore(client).hit('client', rule, 0)).rejects.toThrow('WRONGPASS');
+    });
+  });
+
+  describe('checkRateLimit', () => {
+    afterEach(() => {
+      setRateLimitStore(new MemoryRateLimitStore());
+    });
+
+    it('should fall back to in-memory limits when the store fails', async () => {
+      const warn = jest.spyOn(console, 'warn').mockImplementation(() => {});
+      const failing: RateLimitStore = {
+        hit: jest.fn().mockRejectedValue(new Error('ECONNREFUSED')),
+      };
+      setRateLimitStore(failing);
+
+      const decision = await checkRateLimit('fallback-client', rule);
+
+      expect(decision.allowed).toBe(true);
+      expect(decision.remaining).toBe(2);
+      expect(warn).toHaveBeenCalled();
+      warn.mockRestore();
+    });
+
+    it('should skip a failed store for a while before retrying it', async () => {
+      const warn = jest.spyOn(console, 'warn').mockImplementation(() => {});
+      const now = jest.spyOn(Date, 'now').mockReturnValue(100000);
+      const failing: RateLimitStore = {
+        hit: jest.fn().mockRejectedValue(new Error('ETIMEDOUT')),
+      };
+      setRateLimitStore(failing);
+
+      await checkRateLimit('breaker-client', rule);
+      now.mockReturnValue(110000);
+      await checkRateLimit('breaker-client', rule);
+      expect(failing.hit).toHaveBeenCalledTimes(1);
+
+      now.mockReturnValue(130001);
+      await checkRateLimit('breaker-client', rule);
+      expect(failing.hit).toHaveBeenCalledTimes(2);
+      expect(warn).toHaveBeenCalledTimes(2);
+
+      now.mockRestore();
+      warn.mockRestore();
+    });
+
+    it('should fail over when Redis is unreachable', async () => {
+      const warn = jest.spyOn(console, 'warn').mockImplementation(() => {});
+      const unreachable = await startRedisStandIn();
+      await unreachable.close();
+      setRateLimitStore(new RedisRateLimitStore(new RedisClient(unreachable.url, 200)));
+
+      const decision = await checkRateLimit('unreachable-client', rule);
+
+      expect(decision.allowed).toBe(true);
+      expect(warn).toHaveBeenCalled();
+      warn.mockRestore();
+    });
+  });
+});
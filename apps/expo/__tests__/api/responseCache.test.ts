@@ -0,0 +1,186 @@
+/**
+ * Unit Tests for the API response cache
+ *
+ * Tests content-addressed keys, TTL/LRU eviction, in-flight coalescing,
+ * the file backend and metrics.
+ */
+
+import * as os from 'os';
+import * as path from 'path';
+import { promises as fs } from 'fs';
+import {
+  createCacheKey,
+  FileCacheBackend,
+  getCacheMetrics,
+  hashImageData,
+  MemoryCacheBackend,
+  resetCacheMetrics,
+  setResponseCacheBackend,
+  withResponseCache,
+} from '@/api/_utils/responseCache';
+
+const options = (key: string, ttlMs = 60_000) => ({ route: 'test-route', key, ttlMs });
+
+describe('responseCache', () => {
+  beforeEach(() => {
+    setResponseCacheBackend(new MemoryCacheBackend());
+    resetCacheMetrics();
+  });
+
+  describe('createCacheKey', () => {
+    it('should ignore key order, surrounding whitespace and line endings', () => {
+      expect(createCacheKey('r', { title: ' Trip ', content: 'a\r\nb' })).toBe(
+        createCacheKey('r', { content: 'a\nb', title: 'Trip' })
+      );
+    });
+
+    it('should differ by route and input', () => {
+      const key = createCacheKey('r', { title: 'Trip' });
+      expect(createCacheKey('other', { title: 'Trip' })).not.toBe(key);
+      expect(createCacheKey('r', { title: 'Trips' })).not.toBe(key);
+    });
+
+    it('should hash image content regardless of data URL prefix', () => {
+      const data = Buffer.from('image bytes').toString('base64');
+      expect(hashImageData(`data:image/png;base64,${data}`)).toBe(hashImageData(data));
+      expect(hashImageData(Buffer.from('other').toString('base64'))).not.toBe(hashImageData(data));
+    });
+  });
+
+  describe('withResponseCache', () => {
+    it('should serve repeated requests from the cache', async () => {
+      const upstream = jest.fn().mockResolvedValue({ name: 'Sunset' });
+
+      const first = await withResponseCache(options('k'), upstream);
+      const second = await withResponseCache(options('k'), upstream);
+
+      expect(first).toEqual({ value: { name: 'Sunset' }, cacheStatus: 'MISS' });
+      expect(second).toEqual({ value: { name: 'Sunset' }, cacheStatus: 'HIT' });
+      expect(upstream).toHaveBeenCalledTimes(1);
+    });
+
+    it('should coalesce identical requests in flight', async () => {
+      let resolve!: (value: string) => void;
+      const upstream = jest.fn(() => new Promise<string>((r) => (resolve = r)));
+
+      const requests = [1, 2, 3].map(() => withResponseCache(options('k'), upstream));
+      // Let the first request get past the cache lookup
+      await new Promise((r) => setImmediate(r));
+      resolve('result');
+      const results = await Promise.all(requests);
+
+      expect(upstream).toHaveBeenCalledTimes(1);
+      expect(results.map((r) => r.cacheStatus)).toEqual(['MISS', 'COALESCED', 'COALESCED']);
+      expect(results.every((r) => r.value === 'result')).toBe(true);
+    });
+
+    it('should share upstream errors and not cache them', async () => {
+      const upstream = jest.fn().mockRejectedValueOnce(new Error('quota')).mockResolvedValue('ok');
+
+      await expect(
+        Promise.all([withResponseCache(options('k'), upstream), withResponseCache(options('k'), upstream)])
+      ).rejects.toThrow('quota');
+      expect((await withResponseCache(options('k'), upstream)).value).toBe('ok');
+      expect(upstream).toHaveBeenCalledTimes(2);
+    });
+
+    it('should not cache null results', async () => {
+      const upstream = jest.fn().mockResolvedValue(null);
+
+      await withResponseCache(options('k'), upstream);
+      await withResponseCache(options('k'), upstream);
+
+      expect(upstream).toHaveBeenCalledTimes(2);
+    });
+
+    it('should expire entries after the TTL', async () => {
+      const now = jest.spyOn(Date, 'now').mockReturnValue(1000);
+      const upstream = jest.fn().mockResolvedValue('v');
+
+      await withResponseCache(options('k', 500), upstream);
+      now.mockReturnValue(1600);
+      const result = await withResponseCache(options('k', 500), upstream);
+
+      expect(result.cacheStatus).toBe('MISS');
+      expect(upstream).toHaveBeenCalledTimes(2);
+      now.mockRestore();
+    });
+
+    it('should go upstream when bypassed', async () => {
+      const upstream = jest.fn().mockResolvedValue('v');
+
+      await withResponseCache(options('k'), upstream);
+      const result = await withResponseCache({ ...options('k'), bypass: true }, upstream);
+
+      expect(result.cacheStatus).toBe('BYPASS');
+      expect(upstream).toHaveBeenCalledTimes(2);
+    });
+
+    it('should work without a backend', async () => {
+      setResponseCacheBackend(null);
+      const upstream = jest.fn().mockResolvedValue('v');
+
+      await withResponseCache(options('k'), upstream);
+      await withResponseCache(options('k'), upstream);
+
+      expect(upstream).toHaveBeenCalledTimes(2);
+    });
+
+    it('should record metrics per route', async () => {
+      const upstream = jest.fn().mockResolvedValue('v');
+
+      await withResponseCache(options('a'), upstream);
+      await withResponseCache(options('a'), upstream);
+      await withResponseCache(options('b'), upstream);
+
+      const metrics = getCacheMetrics()['test-route'];
+      expect(metrics.hits).toBe(1);
+      expect(metrics.misses).toBe(2);
+      expect(metrics.upstreamCalls).toBe(2);
+      expect(metrics.hitRate).toBeCloseTo(1 / 3);
+    });
+  });
+
+  describe('MemoryCacheBackend', () => {
+    it('should evict the least recently used entry', async () => {
+      const backend = new MemoryCacheBackend(2);
+      const entry = { value: 1, expiresAt: Infinity };
+
+      await backend.set('a', entry);
+      await backend.set('b', entry);
+      await backend.get('a');
+      await backend.set('c', entry);
+
+      expect(await backend.get('a')).toBeDefined();
+      expect(await backend.get('b')).toBeUndefined();
+      expect(backend.size).toBe(2);
+    });
+  });
+
+  describe('FileCacheBackend', () => {
+    let dir: string;
+
+    beforeEach(async () => {
+      dir = await fs.mkdtemp(path.join(os.tmpdir(), 'response-cache-'));
+    });
+
+    afterEach(async () => {
+      await fs.rm(dir, { recursive: true, force: true });
+    });
+
+    it('should persist entries across instances', async () => {
+      await new FileCacheBackend(dir).set('k', { value: { a: 1 }, expiresAt: 123 });
+
+      expect(await new FileCacheBackend(dir).get('k')).toEqual({ value: { a: 1 }, expiresAt: 123 });
+    });
+
+    it('should keep at most maxEntries files', async () => {
+      const backend = new FileCacheBackend(dir, 2);
+      for (const key of ['a', 'b', 'c']) {
+        await backend.set(key, { value: key, expiresAt: Infinity });
+      }
+
+      expect(await fs.readdir(dir)).toHaveLength(2);
+    });
+  });
+});
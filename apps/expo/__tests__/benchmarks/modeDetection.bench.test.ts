@@ -0,0 +1,119 @@
+/**
+ * Benchmark: mode detection
+ *
+ * Compares the per-note cost of the previous detection (one lowercase +
+ * `includes` pass per keyword) against the compiled keyword matcher, and
+ * against cached results, on 2k synthetic notes. Not part of the default
+ * run - use `npm run test:bench`. Result consistency is covered by
+ * modeDetectionService.test.ts.
+ */
+
+import {
+  clearModeDetectionCache,
+  detectModeForNote,
+  detectModesBatch,
+  detectModeFromPatterns,
+  detectModeFromStructure,
+  MANAGE_PATTERNS,
+  DEVELOP_PATTERNS,
+  ORGANIZE_PATTERNS,
+  EXPERIENCE_PATTERNS,
+} from '@/services/modeDetectionService';
+import { Mode, Note, NoteColor } from '@/types';
+
+jest.unmock('@/services/modeDetectionService');
+
+const NOTE_COUNT = 2000;
+const RUNS = 5;
+
+const WORDS = [
+  'meeting', 'buy', 'deadline', 'idea', 'draft', 'character', 'recipe', 'tutorial',
+  'today', 'felt', 'grateful', 'trip', 'the', 'and', 'with', 'for', 'about', 'later',
+  'customer', 'design', 'wireframe', 'study', 'quiz', 'remember', 'weekend', 'coffee',
+];
+
+// Deterministic pseudo-random generator so runs are comparable
+const createRandom = (seed: number) => () => {
+  seed = (seed * 1664525 + 1013904223) % 4294967296;
+  return seed / 4294967296;
+};
+
+const createSyntheticNotes = (count: number): Note[] => {
+  const random = createRandom(7);
+  const pick = () => WORDS[Math.floor(random() * WORDS.length)];
+  const line = (length: number) => Array.from({ length }, pick).join(' ');
+
+  return Array.from({ length: count }, (_, i) => ({
+    id: `note-${i}`,
+    title: line(3),
+    content: Array.from({ length: 3 + Math.floor(random() * 12) }, () =>
+      random() < 0.3 ? `- [ ] ${line(4)}` : line(12)
+    ).join('\n'),
+    color: NoteColor.White,
+    labels: [],
+    isPinned: false,
+    isArchived: false,
+    isDeleted: false,
+    createdAt: i,
+    updatedAt: i,
+  }));
+};
+
+// The pre-matcher keyword pass: lowercase, then one `includes` per keyword
+const legacyKeywordScores = (content: string): Record<Mode, number> => {
+  const lowerContent = content.toLowerCase();
+  const scores: Record<Mode, number> = { manage: 0, develop: 0, organize: 0, experience: 0 };
+  const tables: [string[], Mode][] = [
+    [MANAGE_PATTERNS.keywords, 'manage'],
+    [DEVELOP_PATTERNS.keywords, 'develop'],
+    [ORGANIZE_PATTERNS.keywords, 'organize'],
+    [EXPERIENCE_PATTERNS.keywords, 'experience'],
+  ];
+  for (const [keywords, mode] of tables) {
+    for (const keyword of keywords) {
+      if (lowerContent.includes(keyword)) scores[mode] += 0.3;
+    }
+  }
+  return scores;
+};
+
+const legacyDetect = (note: Note) => {
+  const content = `${note.title}\n${note.content}`;
+  return [
+    detectModeFromPatterns(content),
+    legacyKeywordScores(content),
+    detectModeFromStructure(content),
+  ];
+};
+
+const median = (values: number[]) => {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.floor(sorted.length / 2)];
+};
+
+const time = (fn: () => unknown, before?: () => void): number => {
+  const samples: number[] = [];
+  for (let i = 0; i < RUNS; i++) {
+    before?.();
+    const start = performance.now();
+    fn();
+    samples.push(performance.now() - start);
+  }
+  return median(samples);
+};
+
+describe('mode detection benchmark', () => {
+  const notes = createSyntheticNotes(NOTE_COUNT);
+
+  it('should beat the includes scan and make repeat detection cheap', () => {
+    const legacyMs = time(() => notes.forEach(legacyDetect));
+    const compiledMs = time(() => detectModesBatch(notes), clearModeDetectionCache);
+
+    clearModeDetectionCache();
+    notes.slice(0, 1000).forEach(detectModeForNote);
+    const cachedMs = time(() => notes.slice(0, 1000).forEach(detectModeForNote));
+
+    expect(compiledMs).toBeLessThan(legacyMs);
+    expect(cachedMs).toBeLessThan(compiledMs);
+  });
+});
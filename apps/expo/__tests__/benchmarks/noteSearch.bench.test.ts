@@ -0,0 +1,103 @@
+/**
+ * Benchmark: note search
+ *
+ * Compares query latency of the inverted search index against the previous
+ * linear scan (lowercase + includes over every note) on 10k synthetic notes.
+ * Median timings per query are logged as a table; each query must beat the
+ * scan. Not part of the default run - use `npm run test:bench`. Result consistency
+ * is covered by noteSearchIndex.test.ts.
+ */
+
+import { buildSearchIndex, parseSearchQuery, searchIndex } from '@/stores/noteSearchIndex';
+import { Note, NoteColor } from '@/types';
+
+const NOTE_COUNT = 10000;
+const RUNS_PER_QUERY = 20;
+
+const WORDS = [
+  'meeting', 'agenda', 'budget', 'travel', 'recipe', 'garden', 'project', 'deadline',
+  'invoice', 'workout', 'journal', 'grocery', 'birthday', 'reading', 'podcast', 'weekend',
+  'deploy', 'review', 'sketch', 'anime', 'manga', 'episode', 'chapter', 'character',
+  'coffee', 'market', 'ticket', 'flight', 'hotel', 'museum', 'concert', 'lecture',
+];
+
+// Deterministic pseudo-random generator so runs are comparable
+const createRandom = (seed: number) => () => {
+  seed = (seed * 1664525 + 1013904223) % 4294967296;
+  return seed / 4294967296;
+};
+
+const createSyntheticNotes = (count: number): Note[] => {
+  const random = createRandom(42);
+  const pick = () => WORDS[Math.floor(random() * WORDS.length)];
+  const sentence = (length: number) => Array.from({ length }, pick).join(' ');
+
+  return Array.from({ length: count }, (_, i) => ({
+    id: `note-${i}`,
+    title: `${sentence(3)} ${i}`,
+    content: sentence(40 + Math.floor(random() * 80)),
+    color: NoteColor.White,
+    labels: [],
+    isPinned: false,
+    isArchived: false,
+    isDeleted: false,
+    createdAt: i,
+    updatedAt: i,
+  }));
+};
+
+// The pre-index implementation of searchNotes
+const linearSearch = (notes: Note[], query: string): Note[] => {
+  const q = query.toLowerCase().trim();
+  return notes.filter(
+    (note) =>
+      !note.isArchived &&
+      !note.isDeleted &&
+      (note.title.toLowerCase().includes(q) || note.content.toLowerCase().includes(q))
+  );
+};
+
+const median = (values: number[]) => {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.floor(sorted.length / 2)];
+};
+
+const time = (fn: () => unknown): number => {
+  const samples: number[] = [];
+  for (let i = 0; i < RUNS_PER_QUERY; i++) {
+    const start = performance.now();
+    fn();
+    samples.push(performance.now() - start);
+  }
+  return median(samples);
+};
+
+describe('note search benchmark', () => {
+  const notes = createSyntheticNotes(NOTE_COUNT);
+  const index = buildSearchIndex(notes);
+
+  const queries = ['meeting', 'proj', 'anime chapter', 'flight hotel museum', 'zzz'];
+
+  it('should be faster than a linear scan', () => {
+    const rows = queries.map((query) => {
+      const tokens = parseSearchQuery(query).tokens;
+      const linearMs = time(() => linearSearch(notes, query));
+      const indexMs = time(() => searchIndex(index, tokens));
+      return { query, linearMs, indexMs, speedup: linearMs / Math.max(indexMs, 0.001) };
+    });
+
+    console.log(`[Benchmark] note search, ${NOTE_COUNT} notes, median of ${RUNS_PER_QUERY} runs (ms)`);
+    console.table(
+      rows.map((r) => ({
+        query: r.query,
+        linearMs: r.linearMs.toFixed(3),
+        indexMs: r.indexMs.toFixed(3),
+        speedup: `${r.speedup.toFixed(1)}x`,
+      }))
+    );
+
+    for (const row of rows) {
+      expect(row.indexMs).toBeLessThan(row.linearMs);
+    }
+  });
+});
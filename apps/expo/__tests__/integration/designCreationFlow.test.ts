@@ -65,7 +65,8 @@ const createMockDesign = (): NoteDesign => ({
 describe('Design Creation Flow - Integration Tests', () => {
   beforeEach(() => {
     // Reset all stores
-    useNoteStore.setState({ notes: [], labels: [] });
+    useNoteStore.getState().replaceNotes([]);
+    useNoteStore.setState({ labels: [] });
     useDesignStore.setState({ designs: [] });
     useUserStore.setState({
       user: {
@@ -216,7 +217,7 @@ describe('Design Creation Flow - Integration Tests', () => {
       });
 
       // Verify new note was created with design
-      expect(useNoteStore.getState().notes).toHaveLength(1);
+      expect(useNoteStore.getState().getAllNotes()).toHaveLength(1);
       expect(newNote.designId).toBe('design-123');
       expect(newNote.title).toBe('');
       expect(newNote.content).toBe('');
@@ -242,7 +243,7 @@ describe('Design Creation Flow - Integration Tests', () => {
         designId: mockDesign.id,
       });
 
-      const newNote = useNoteStore.getState().notes[0];
+      const newNote = useNoteStore.getState().getAllNotes()[0];
       expect(newNote.title).toBe('');
       expect(newNote.content).toBe('');
       expect(newNote.designId).toBe('design-123');
@@ -289,8 +290,8 @@ describe('Design Creation Flow - Integration Tests', () => {
         designId: mockDesign.id,
       });
 
-      expect(useNoteStore.getState().notes).toHaveLength(3);
-      expect(useNoteStore.getState().notes.every((n) => n.designId === 'design-123')).toBe(true);
+      expect(useNoteStore.getState().getAllNotes()).toHaveLength(3);
+      expect(useNoteStore.getState().getAllNotes().every((n) => n.designId === 'design-123')).toBe(true);
       expect(useDesignStore.getState().designs).toHaveLength(1);
     });
   });
@@ -421,7 +422,7 @@ describe('Design Creation Flow - Integration Tests', () => {
       useNoteStore.getState().updateNote('non-existent-id', { designId: mockDesign.id });
 
       // No notes should exist
-      expect(useNoteStore.getState().notes).toHaveLength(0);
+      expect(useNoteStore.getState().getAllNotes()).toHaveLength(0);
     });
 
     it('should handle creating note with non-existent design', () => {
@@ -436,7 +437,7 @@ describe('Design Creation Flow - Integration Tests', () => {
         designId: 'non-existent-design',
       });
 
-      const note = useNoteStore.getState().notes[0];
+      const note = useNoteStore.getState().getAllNotes()[0];
       expect(note.designId).toBe('non-existent-design');
 
       // Design doesn't exist
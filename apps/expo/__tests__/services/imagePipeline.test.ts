@@ -0,0 +1,148 @@
+/**
+ * Image Pipeline Tests
+ *
+ * Tests downscaling to target sizes, format handling, fallbacks and
+ * thumbnail caching.
+ */
+
+jest.mock('expo-file-system/legacy', () => ({
+  cacheDirectory: '/mock/cache/',
+  readAsStringAsync: jest.fn(),
+  getInfoAsync: jest.fn().mockResolvedValue({ exists: false }),
+  makeDirectoryAsync: jest.fn().mockResolvedValue(undefined),
+  moveAsync: jest.fn().mockResolvedValue(undefined),
+  EncodingType: { Base64: 'base64' },
+}));
+
+import * as LegacyFileSystem from 'expo-file-system/legacy';
+import { ImageManipulator } from 'expo-image-manipulator';
+import {
+  getCachedThumbnailUri,
+  getThumbnailUri,
+  prepareImage,
+  resetImagePipelineCache,
+} from '@/services/imagePipeline';
+
+const mockManipulate = ImageManipulator.manipulate as jest.Mock;
+
+/**
+ * Manipulator stand-in for an image of the given size
+ */
+function mockImageSize(width: number, height: number) {
+  const resize = jest.fn();
+  const saveAsync = jest.fn((options: { format: string }) =>
+    Promise.resolve({ uri: `file:///cache/out.${options.format}`, width: 0, height: 0 })
+  );
+  mockManipulate.mockImplementation(() => ({
+    resize,
+    renderAsync: () => Promise.resolve({ width, height, saveAsync, release: jest.fn() }),
+    release: jest.fn(),
+  }));
+  return { resize, saveAsync };
+}
+
+describe('imagePipeline', () => {
+  beforeEach(() => {
+    resetImagePipelineCache();
+    jest.spyOn(console, 'warn').mockImplementation(() => {});
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  describe('prepareImage', () => {
+    it('should downscale the longest side to the target', async () => {
+      const { resize, saveAsync } = mockImageSize(4000, 3000);
+
+      const prepared = await prepareImage('file:///photo.jpg', 'ai');
+
+      expect(resize).toHaveBeenCalledWith({ width: 1024, height: 768 });
+      expect(saveAsync).toHaveBeenCalledWith(expect.objectContaining({ format: 'jpeg', compress: 0.8 }));
+      expect(prepared).toEqual(expect.objectContaining({ uri: 'file:///cache/out.jpeg', mimeType: 'image/jpeg' }));
+    });
+
+    it('should keep PNGs as PNG', async () => {
+      const { saveAsync } = mockImageSize(3000, 3000);
+
+      const prepared = await prepareImage('file:///sticker.png', 'upload');
+
+      expect(saveAsync).toHaveBeenCalledWith(expect.objectContaining({ format: 'png' }));
+      expect(prepared.mimeType).toBe('image/png');
+    });
+
+    it('should pass small JPEGs through unchanged', async () => {
+      const { saveAsync } = mockImageSize(800, 600);
+
+      const prepared = await prepareImage('file:///small.jpg', 'upload');
+
+      expect(prepared.uri).toBe('file:///small.jpg');
+      expect(saveAsync).not.toHaveBeenCalled();
+    });
+
+    it('should re-encode other formats even when small', async () => {
+      mockImageSize(800, 600);
+
+      const prepared = await prepareImage('file:///photo.heic', 'upload');
+
+      expect(prepared).toEqual(expect.objectContaining({ uri: 'file:///cache/out.jpeg', mimeType: 'image/jpeg' }));
+    });
+
+    it('should keep GIF and WebP transparency by re-encoding as PNG', async () => {
+      const { saveAsync } = mockImageSize(200, 200);
+
+      const gif = await prepareImage('file:///sticker.gif', 'upload');
+      const webp = await prepareImage('file:///sticker.webp', 'upload');
+
+      expect(saveAsync).toHaveBeenCalledTimes(2);
+      expect(saveAsync).toHaveBeenCalledWith(expect.objectContaining({ format: 'png' }));
+      expect(gif).toEqual(expect.objectContaining({ uri: 'file:///cache/out.png', mimeType: 'image/png' }));
+      expect(webp.mimeType).toBe('image/png');
+    });
+
+    it('should reuse prepared images per source and target', async () => {
+      mockImageSize(4000, 3000);
+
+      await Promise.all([prepareImage('file:///photo.jpg', 'ai'), prepareImage('file:///photo.jpg', 'ai')]);
+      await prepareImage('file:///photo.jpg', 'ai');
+
+      // One render of the original plus one of the resized copy
+      expect(mockManipulate).toHaveBeenCalledTimes(2);
+    });
+
+    it('should fall back to the original when manipulation fails', async () => {
+      mockManipulate.mockImplementation(() => {
+        throw new Error('unsupported');
+      });
+
+      const prepared = await prepareImage('file:///photo.webp', 'ai');
+
+      expect(prepared).toEqual({ uri: 'file:///photo.webp', mimeType: 'image/webp', width: 0, height: 0 });
+    });
+  });
+
+  describe('getThumbnailUri', () => {
+    it('should write thumbnails to the cache directory and remember them', async () => {
+      mockImageSize(1000, 1000);
+
+      const thumbnail = await getThumbnailUri('file:///sticker.png', 84);
+
+      expect(thumbnail).toMatch(/^\/mock\/cache\/thumbnails\/.+-84\.png$/);
+      expect(LegacyFileSystem.moveAsync).toHaveBeenCalledWith({ from: 'file:///cache/out.png', to: thumbnail });
+      expect(getCachedThumbnailUri('file:///sticker.png', 84)).toBe(thumbnail);
+    });
+
+    it('should reuse a thumbnail file from an earlier launch', async () => {
+      (LegacyFileSystem.getInfoAsync as jest.Mock).mockResolvedValueOnce({ exists: true });
+
+      const thumbnail = await getThumbnailUri('file:///sticker.png', 84);
+
+      expect(thumbnail).toContain('/mock/cache/thumbnails/');
+      expect(mockManipulate).not.toHaveBeenCalled();
+    });
+
+    it('should return remote URIs as-is', async () => {
+      expect(await getThumbnailUri('https://example.com/a.png')).toBe('https://example.com/a.png');
+    });
+  });
+});
@@ -0,0 +1,202 @@
+/**
+ * Image Storage Service Tests
+ *
+ * Tests the bounded upload queue, content-hash deduplication within a note,
+ * resuming from recorded uploads and deleting a note's images.
+ */
+
+const mockUpload = jest.fn();
+const mockCreateSignedUrl = jest.fn();
+const mockList = jest.fn();
+const mockRemove = jest.fn();
+
+jest.mock('@/services/supabase', () => ({
+  supabase: {
+    storage: {
+      from: jest.fn(() => ({
+        upload: mockUpload,
+        createSignedUrl: mockCreateSignedUrl,
+        list: mockList,
+        remove: mockRemove,
+      })),
+    },
+  },
+}));
+
+// File contents by URI
+const mockFiles: Record<string, string> = {};
+
+jest.mock('expo-file-system/legacy', () => ({
+  cacheDirectory: '/mock/cache/',
+  readAsStringAsync: jest.fn((uri: string) => Promise.resolve(mockFiles[uri] ?? '')),
+  getInfoAsync: jest.fn().mockResolvedValue({ exists: false }),
+  makeDirectoryAsync: jest.fn().mockResolvedValue(undefined),
+  moveAsync: jest.fn().mockResolvedValue(undefined),
+  EncodingType: { Base64: 'base64' },
+}));
+
+jest.mock('expo-crypto', () => ({
+  CryptoDigestAlgorithm: { SHA256: 'SHA-256' },
+  digestStringAsync: jest.fn((_algorithm: string, value: string) =>
+    Promise.resolve(require('crypto').createHash('sha256').update(value).digest('hex'))
+  ),
+}));
+
+import { deleteNoteImages, migrateNoteImages, uploadNoteImage } from '@/services/imageStorageService';
+import { resetImagePipelineCache } from '@/services/imagePipeline';
+import { useImageUploadStore } from '@/stores/imageUploadStore';
+
+const USER_ID = 'user-1';
+const NOTE_FOLDER = 'note-images/user-1/note-1';
+
+describe('imageStorageService', () => {
+  beforeEach(() => {
+    jest.clearAllMocks();
+    resetImagePipelineCache();
+    useImageUploadStore.getState().clearUploads();
+    Object.keys(mockFiles).forEach((uri) => delete mockFiles[uri]);
+
+    mockUpload.mockResolvedValue({ data: {}, error: null });
+    mockList.mockResolvedValue({ data: [], error: null });
+    mockRemove.mockResolvedValue({ data: [], error: null });
+    mockCreateSignedUrl.mockImplementation((path: string) =>
+      Promise.resolve({ data: { signedUrl: `https://storage.supabase.co/sign/${path}` } })
+    );
+    jest.spyOn(console, 'log').mockImplementation(() => {});
+    jest.spyOn(console, 'warn').mockImplementation(() => {});
+    jest.spyOn(console, 'error').mockImplementation(() => {});
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  it("should store images in the note's folder by content hash", async () => {
+    mockFiles['file:///photo.jpg'] = 'cGhvdG8=';
+
+    const url = await uploadNoteImage('file:///photo.jpg', USER_ID, 'note-1');
+
+    expect(url).toMatch(/\/user-1\/note-1\/[0-9a-f]{64}\.jpg$/);
+    expect(mockUpload).toHaveBeenCalledWith(
+      expect.stringMatching(/^user-1\/note-1\/[0-9a-f]{64}\.jpg$/),
+      expect.anything(),
+      expect.objectContaining({ contentType: 'image/jpeg', upsert: false })
+    );
+  });
+
+  it('should upload identical images once per note', async () => {
+    mockFiles['file:///a.jpg'] = 'c2FtZQ==';
+    mockFiles['file:///b.jpg'] = 'c2FtZQ==';
+
+    const first = await uploadNoteImage('file:///a.jpg', USER_ID, 'note-1');
+    const second = await uploadNoteImage('file:///b.jpg', USER_ID, 'note-1');
+    const otherNote = await uploadNoteImage('file:///a.jpg', USER_ID, 'note-2');
+
+    expect(second).toBe(first);
+    expect(otherNote).toContain('/user-1/note-2/');
+    expect(mockUpload).toHaveBeenCalledTimes(2);
+  });
+
+  it('should treat an existing object as uploaded', async () => {
+    mockFiles['file:///photo.jpg'] = 'cGhvdG8=';
+    mockUpload.mockResolvedValue({ data: null, error: { statusCode: '409', message: 'The resource already exists' } });
+
+    const url = await uploadNoteImage('file:///photo.jpg', USER_ID, 'note-1');
+
+    expect(url).toContain('/user-1/note-1/');
+  });
+
+  it('should resume from recorded uploads', async () => {
+    mockFiles['file:///photo.jpg'] = 'cGhvdG8=';
+
+    await uploadNoteImage('file:///photo.jpg', USER_ID, 'note-1');
+    await uploadNoteImage('file:///photo.jpg', USER_ID, 'note-1');
+
+    expect(mockUpload).toHaveBeenCalledTimes(1);
+    expect(useImageUploadStore.getState().getUpload(NOTE_FOLDER, 'file:///photo.jpg')).toBeDefined();
+  });
+
+  it('should re-sign recorded URLs close to expiry without uploading again', async () => {
+    mockFiles['file:///a.jpg'] = 'cGhvdG8=';
+    mockFiles['file:///b.jpg'] = 'cGhvdG8=';
+    await uploadNoteImage('file:///a.jpg', USER_ID, 'note-1');
+    const record = useImageUploadStore.getState().getUpload(NOTE_FOLDER, 'file:///a.jpg')!;
+    useImageUploadStore.getState().recordUpload('file:///a.jpg', {
+      ...record,
+      url: 'https://storage.supabase.co/sign/expiring',
+      expiresAt: Date.now() + 1000,
+    });
+    mockCreateSignedUrl.mockClear();
+
+    // Same local file, and another file with the same content
+    const renewed = await uploadNoteImage('file:///a.jpg', USER_ID, 'note-1');
+    const shared = await uploadNoteImage('file:///b.jpg', USER_ID, 'note-1');
+
+    expect(renewed).not.toBe('https://storage.supabase.co/sign/expiring');
+    expect(shared).toBe(renewed);
+    expect(mockUpload).toHaveBeenCalledTimes(1);
+    expect(mockCreateSignedUrl).toHaveBeenCalledTimes(1);
+    expect(mockCreateSignedUrl).toHaveBeenCalledWith(record.path, expect.any(Number));
+    expect(useImageUploadStore.getState().getUpload(NOTE_FOLDER, 'file:///a.jpg')!.expiresAt).toBeGreaterThan(
+      Date.now() + 300 * 24 * 60 * 60 * 1000
+    );
+  });
+
+  it('should limit concurrent uploads', async () => {
+    let active = 0;
+    let maxActive = 0;
+    mockUpload.mockImplementation(async () => {
+      active++;
+      maxActive = Math.max(maxActive, active);
+      await new Promise((resolve) => setTimeout(resolve, 5));
+      active--;
+      return { data: {}, error: null };
+    });
+
+    const images = Array.from({ length: 10 }, (_, i) => `file:///photo-${i}.jpg`);
+    images.forEach((uri, i) => (mockFiles[uri] = Buffer.from(`photo ${i}`).toString('base64')));
+
+    const migrated = await migrateNoteImages(images, USER_ID, 'note-1');
+
+    expect(migrated.every((url) => url.startsWith('https://'))).toBe(true);
+    expect(mockUpload).toHaveBeenCalledTimes(10);
+    expect(maxActive).toBeLessThanOrEqual(3);
+    expect(useImageUploadStore.getState().progress.completed).toBe(10);
+  });
+
+  it('should restart progress counts once the queue has drained', async () => {
+    mockFiles['file:///a.jpg'] = 'YQ==';
+    mockFiles['file:///b.jpg'] = 'Yg==';
+    await migrateNoteImages(['file:///a.jpg'], USER_ID, 'note-1');
+    expect(useImageUploadStore.getState().progress).toEqual({ queued: 1, completed: 1, failed: 0 });
+
+    await migrateNoteImages(['file:///b.jpg'], USER_ID, 'note-2');
+
+    expect(useImageUploadStore.getState().progress).toEqual({ queued: 1, completed: 1, failed: 0 });
+  });
+
+  it("should delete every image in the note's folder and forget its uploads", async () => {
+    mockFiles['file:///a.jpg'] = 'YQ==';
+    await uploadNoteImage('file:///a.jpg', USER_ID, 'note-1');
+    await uploadNoteImage('file:///a.jpg', USER_ID, 'note-2');
+    const path = mockUpload.mock.calls[0][0] as string;
+    mockList.mockResolvedValue({ data: [{ name: path.split('/')[2] }], error: null });
+
+    await deleteNoteImages(USER_ID, 'note-1');
+
+    expect(mockList).toHaveBeenCalledWith('user-1/note-1');
+    expect(mockRemove).toHaveBeenCalledWith([path]);
+    expect(useImageUploadStore.getState().getUpload(NOTE_FOLDER, 'file:///a.jpg')).toBeUndefined();
+    expect(useImageUploadStore.getState().getUpload('note-images/user-1/note-2', 'file:///a.jpg')).toBeDefined();
+  });
+
+  it('should keep the local URI when an upload fails', async () => {
+    mockFiles['file:///photo.jpg'] = 'cGhvdG8=';
+    mockUpload.mockResolvedValue({ data: null, error: new Error('network') });
+
+    const migrated = await migrateNoteImages(['file:///photo.jpg', 'https://remote/img.jpg'], USER_ID, 'note-1');
+
+    expect(migrated).toEqual(['file:///photo.jpg', 'https://remote/img.jpg']);
+    expect(useImageUploadStore.getState().progress.failed).toBe(1);
+  });
+});
@@ -0,0 +1,125 @@
+/**
+ * Unit Tests for modeDetectionService
+ *
+ * Tests the compiled keyword matcher, per-note result caching and the
+ * batch API.
+ */
+
+import {
+  clearModeDetectionCache,
+  detectDevelopContentType,
+  detectModeForNote,
+  detectModesBatch,
+  findKeywords,
+  MANAGE_PATTERNS,
+  DEVELOP_PATTERNS,
+  ORGANIZE_PATTERNS,
+  EXPERIENCE_PATTERNS,
+} from '@/services/modeDetectionService';
+import { Note, NoteColor } from '@/types';
+
+// jest.setup.js mocks this service for store tests
+jest.unmock('@/services/modeDetectionService');
+
+const createNote = (id: string, title: string, content: string, labels: string[] = []): Note => ({
+  id,
+  title,
+  content,
+  color: NoteColor.White,
+  labels,
+  isPinned: false,
+  isArchived: false,
+  isDeleted: false,
+  createdAt: 1000,
+  updatedAt: 1000,
+});
+
+const ALL_KEYWORDS = [
+  ...MANAGE_PATTERNS.keywords,
+  ...DEVELOP_PATTERNS.keywords,
+  ...ORGANIZE_PATTERNS.keywords,
+  ...EXPERIENCE_PATTERNS.keywords,
+];
+
+describe('modeDetectionService', () => {
+  beforeEach(() => {
+    clearModeDetectionCache();
+  });
+
+  describe('findKeywords', () => {
+    it('should find the same keywords as a substring scan', () => {
+      const samples = [
+        'TODO: pick up groceries, then follow up with the landlord',
+        'What if the character learns the plot twist in chapter 3?',
+        'Dear diary, today I felt grateful for the trip',
+        'Bookmark this tutorial: https://example.com/how-to-guide',
+        '',
+      ];
+
+      for (const sample of samples) {
+        const lower = sample.toLowerCase();
+        const expected = ALL_KEYWORDS.filter((keyword) => lower.includes(keyword));
+        const found = findKeywords(sample);
+        expect(ALL_KEYWORDS.filter((keyword) => found.has(keyword))).toEqual(expected);
+      }
+    });
+
+    it('should report overlapping keywords', () => {
+      const found = findKeywords('todo');
+      expect(found.has('todo')).toBe(true);
+      expect(found.has('do')).toBe(true);
+    });
+  });
+
+  describe('detectModeForNote', () => {
+    it('should detect manage mode for checklists', () => {
+      const note = createNote('a', 'Errands', '- [ ] buy milk\n- [ ] pay rent\n- [x] call mom');
+      expect(detectModeForNote(note).mode).toBe('manage');
+    });
+
+    it('should detect the develop content type', () => {
+      const content = 'Brainstorm: the protagonist and the plot of chapter one of my novel';
+      expect(detectDevelopContentType(content)).toBe('story');
+    });
+
+    it('should reuse results while the note is unchanged', () => {
+      const note = createNote('a', 'Trip', 'Today I visited the museum');
+      const first = detectModeForNote(note);
+
+      // Metadata-only edits keep the cached result
+      expect(detectModeForNote({ ...note, isPinned: true, updatedAt: 2000 })).toBe(first);
+      expect(detectModeForNote({ ...note, content: 'Buy tickets by friday' })).not.toBe(first);
+      expect(detectModeForNote({ ...note, labels: ['todo'] })).not.toBe(first);
+    });
+  });
+
+  describe('detectModesBatch', () => {
+    it('should return results keyed by note id', () => {
+      const notes = [
+        createNote('a', 'Errands', '- [ ] buy milk\n- [ ] pay rent'),
+        createNote('b', 'Journal', 'Dear diary, today I felt grateful'),
+      ];
+
+      const results = detectModesBatch(notes);
+
+      expect(Object.keys(results)).toEqual(['a', 'b']);
+      clearModeDetectionCache();
+      expect(results.a).toEqual(detectModeForNote(notes[0]));
+      expect(results.b).toEqual(detectModeForNote(notes[1]));
+    });
+
+    it('should agree with single-note detection on mixed content', () => {
+      const lines = ['- [ ] buy milk', 'idea for a character draft', 'today I felt grateful', 'recipe tutorial'];
+      const notes = Array.from({ length: 40 }, (_, i) =>
+        createNote(`n${i}`, `Note ${i}`, lines.filter((_, j) => (i >> j) & 1).join('\n'))
+      );
+
+      const batch = detectModesBatch(notes);
+      clearModeDetectionCache();
+
+      for (const note of notes) {
+        expect(detectModeForNote(note)).toEqual(batch[note.id]);
+      }
+    });
+  });
+});
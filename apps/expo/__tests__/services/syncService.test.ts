@@ -7,15 +7,22 @@ const mockSelect = jest.fn();
 const mockUpsert = jest.fn();
 const mockDelete = jest.fn();
 const mockEq = jest.fn();
+const mockGt = jest.fn();
+const mockGte = jest.fn();
+const mockLt = jest.fn();
 const mockOrder = jest.fn();
+const mockLimit = jest.fn();
+const mockRpc = jest.fn();
 
 jest.mock('@/services/supabase', () => ({
   supabase: {
     from: jest.fn(() => ({
       select: mockSelect,
-      upsert: mockUpsert,
+      // Upserts select back the written ids and sync_seq values
+      upsert: (...args: unknown[]) => ({ select: () => mockUpsert(...args) }),
       delete: mockDelete,
     })),
+    rpc: mockRpc,
     channel: jest.fn(() => ({
       on: jest.fn().mockReturnThis(),
       subscribe: jest.fn().mockReturnThis(),
@@ -25,9 +32,20 @@ jest.mock('@/services/supabase', () => ({
 }));
 
 // Mock note store
-const mockNoteStoreState: { notes: any[]; updateNote: jest.Mock } = {
+const mockNoteStoreState: {
+  notes: any[];
+  pendingBodyIds: Record<string, true>;
+  getAllNotes: () => any[];
+  updateNote: jest.Mock;
+  upsertNotes: jest.Mock;
+  loadNoteBodies: jest.Mock;
+} = {
   notes: [],
+  pendingBodyIds: {},
+  getAllNotes: () => mockNoteStoreState.notes,
   updateNote: jest.fn(),
+  upsertNotes: jest.fn(),
+  loadNoteBodies: jest.fn().mockResolvedValue(undefined),
 };
 
 jest.mock('@/stores/noteStore', () => ({
@@ -56,28 +74,45 @@ jest.mock('@/stores/userStore', () => ({
 // Import after mocks
 import {
   syncNotes,
+  syncBoards,
   uploadNote,
   deleteNoteFromCloud,
   fetchNotesFromCloud,
   subscribeToNotes,
   unsubscribeFromNotes,
+  getSyncStats,
 } from '@/services/syncService';
+import { useSyncStateStore } from '@/stores/syncStateStore';
+import { useBoardStore } from '@/stores/boardStore';
 import { Note } from '@/types';
 
 describe('SyncService', () => {
   beforeEach(() => {
     jest.clearAllMocks();
     mockNoteStoreState.notes = [];
+    mockNoteStoreState.pendingBodyIds = {};
+    useSyncStateStore.getState().resetCursors();
 
     // Default mock chain setup
-    mockSelect.mockReturnValue({
+    const query = {
       eq: mockEq,
-    });
-    mockEq.mockReturnValue({
+      gt: mockGt,
+      gte: mockGte,
+      lt: mockLt,
       order: mockOrder,
+    };
+    mockSelect.mockReturnValue(query);
+    mockEq.mockReturnValue(query);
+    mockGt.mockReturnValue(query);
+    mockGte.mockReturnValue(query);
+    mockLt.mockReturnValue(query);
+    mockOrder.mockReturnValue({
+      limit: mockLimit,
     });
-    mockOrder.mockResolvedValue({ data: [], error: null });
-    mockUpsert.mockResolvedValue({ error: null });
+    mockLimit.mockResolvedValue({ data: [], error: null });
+    // Oldest transaction still running on the server
+    mockRpc.mockResolvedValue({ data: 100, error: null });
+    mockUpsert.mockResolvedValue({ data: [], error: null });
     mockDelete.mockReturnValue({
       eq: jest.fn().mockResolvedValue({ error: null }),
     });
@@ -87,7 +122,7 @@ describe('SyncService', () => {
     const userId = 'user-123';
 
     it('should return empty result when no notes to sync', async () => {
-      mockEq.mockResolvedValue({ data: [], error: null });
+      mockLimit.mockResolvedValue({ data: [], error: null });
 
       const result = await syncNotes(userId);
 
@@ -112,7 +147,7 @@ describe('SyncService', () => {
       };
 
       mockNoteStoreState.notes = [localNote];
-      mockEq.mockResolvedValue({ data: [], error: null });
+      mockLimit.mockResolvedValue({ data: [], error: null });
 
       const result = await syncNotes(userId);
 
@@ -137,15 +172,40 @@ describe('SyncService', () => {
       };
 
       mockNoteStoreState.notes = [];
-      mockEq.mockResolvedValue({ data: [cloudNote], error: null });
+      mockLimit.mockResolvedValue({ data: [cloudNote], error: null });
 
       const result = await syncNotes(userId);
 
       expect(result.downloaded).toBe(1);
     });
 
+    it('should not upload notes whose body could not be loaded', async () => {
+      const now = Date.now();
+      const note = (id: string): Note => ({
+        id,
+        title: id,
+        content: 'Preview',
+        labels: [],
+        color: '#FFFFFF',
+        isPinned: false,
+        isArchived: false,
+        isDeleted: false,
+        images: [],
+        createdAt: now,
+        updatedAt: now,
+      });
+      mockNoteStoreState.notes = [note('loaded'), note('unreadable')];
+      mockNoteStoreState.pendingBodyIds = { unreadable: true };
+      mockNoteStoreState.loadNoteBodies.mockRejectedValueOnce(new Error('disk error'));
+
+      const result = await syncNotes(userId);
+
+      expect(result.uploaded).toBe(1);
+      expect(mockUpsert).toHaveBeenCalledWith([expect.objectContaining({ id: 'loaded' })]);
+    });
+
     it('should handle fetch error', async () => {
-      mockEq.mockResolvedValue({
+      mockLimit.mockResolvedValue({
         data: null,
         error: { message: 'Network error' },
       });
@@ -155,6 +215,16 @@ describe('SyncService', () => {
       expect(result.errors).toContain('Fetch error: Network error');
     });
 
+    it('should not fetch rows when the sync horizon is unavailable', async () => {
+      mockRpc.mockResolvedValue({ data: null, error: { message: 'Network error' } });
+
+      const result = await syncNotes(userId);
+
+      expect(mockLimit).not.toHaveBeenCalled();
+      expect(result.errors).toContain('Fetch error: Network error');
+      expect(useSyncStateStore.getState().getCursor('notes', userId).pulledXid).toBeNull();
+    });
+
     it('should handle upload error', async () => {
       const localNote: Note = {
         id: 'note-1',
@@ -171,7 +241,7 @@ describe('SyncService', () => {
       };
 
       mockNoteStoreState.notes = [localNote];
-      mockEq.mockResolvedValue({ data: [], error: null });
+      mockLimit.mockResolvedValue({ data: [], error: null });
       mockUpsert.mockResolvedValue({ error: { message: 'Upload failed' } });
 
       const result = await syncNotes(userId);
@@ -179,6 +249,277 @@ describe('SyncService', () => {
       expect(result.errors).toContain('Upload error: Upload failed');
     });
 
+    describe('delta sync', () => {
+      const baseTime = 1704067200000; // 2024-01-01 00:00:00 UTC
+
+      const createNote = (id: string, updatedAt: number): Note => ({
+        id,
+        title: id,
+        content: '',
+        labels: [],
+        color: '#FFFFFF',
+        isPinned: false,
+        isArchived: false,
+        isDeleted: false,
+        images: [],
+        createdAt: baseTime,
+        updatedAt,
+      });
+
+      const createCloudRow = (id: string, updatedAt: number, syncSeq = 1) => ({
+        id,
+        user_id: userId,
+        title: id,
+        content: '',
+        labels: [],
+        color: '#FFFFFF',
+        is_pinned: false,
+        is_archived: false,
+        is_deleted: false,
+        images: [],
+        created_at: new Date(baseTime).toISOString(),
+        updated_at: new Date(updatedAt).toISOString(),
+        sync_seq: syncSeq,
+      });
+
+      it('should run a full sync first, then fetch only rows committed after the cursor', async () => {
+        const cloudRow = createCloudRow('cloud-1', baseTime + 1000, 7);
+        mockLimit.mockResolvedValue({ data: [cloudRow], error: null });
+
+        const first = await syncNotes(userId);
+        expect(first.stats?.mode).toBe('full');
+        expect(mockGte).not.toHaveBeenCalled();
+        expect(mockLt).toHaveBeenCalledWith('sync_xid', 100);
+
+        mockRpc.mockResolvedValue({ data: 120, error: null });
+        mockLimit.mockResolvedValue({ data: [], error: null });
+        const second = await syncNotes(userId);
+
+        expect(second.stats?.mode).toBe('delta');
+        expect(mockGte).toHaveBeenCalledWith('sync_xid', 100);
+        expect(mockLt).toHaveBeenCalledWith('sync_xid', 120);
+        expect(mockOrder).toHaveBeenCalledWith('sync_seq', { ascending: true });
+        expect(second.downloaded).toBe(0);
+      });
+
+      it('should pull a row whose transaction committed after a later sync_seq was pulled', async () => {
+        // Transaction 99 took sync_seq 10 and is still running; transaction 98
+        // took sync_seq 11 afterwards and has committed
+        mockRpc.mockResolvedValueOnce({ data: 99, error: null });
+        mockLimit.mockResolvedValueOnce({
+          data: [createCloudRow('committed-first', baseTime, 11)],
+          error: null,
+        });
+        const first = await syncNotes(userId);
+        expect(first.downloaded).toBe(1);
+        expect(mockLt).toHaveBeenCalledWith('sync_xid', 99);
+
+        // Transaction 99 commits; a sync_seq cursor would now ask for > 11
+        mockRpc.mockResolvedValueOnce({ data: 120, error: null });
+        mockLimit.mockResolvedValueOnce({
+          data: [createCloudRow('committed-late', baseTime, 10)],
+          error: null,
+        });
+        const second = await syncNotes(userId);
+
+        expect(mockGte).toHaveBeenCalledWith('sync_xid', 99);
+        expect(mockGt).not.toHaveBeenCalled();
+        expect(second.downloaded).toBe(1);
+        expect(useSyncStateStore.getState().getCursor('notes', userId).pulledXid).toBe(120);
+      });
+
+      it('should only upload local notes changed since the last push', async () => {
+        mockNoteStoreState.notes = [
+          createNote('note-a', baseTime + 1000),
+          createNote('note-b', baseTime + 2000),
+        ];
+        const first = await syncNotes(userId);
+        expect(first.uploaded).toBe(2);
+
+        // Cloud copy of note-b exists so the next sync runs in delta mode
+        useSyncStateStore.getState().setCursor('notes', {
+          userId,
+          pulledXid: 1,
+          pushedAt: baseTime + 2000,
+          echoes: {},
+          synced: {},
+        });
+        mockUpsert.mockClear();
+        mockNoteStoreState.notes = [
+          createNote('note-a', baseTime + 1000),
+          createNote('note-b', baseTime + 3000),
+        ];
+
+        const second = await syncNotes(userId);
+
+        expect(second.uploaded).toBe(1);
+        expect(mockUpsert).toHaveBeenCalledWith([
+          expect.objectContaining({ id: 'note-b' }),
+        ]);
+      });
+
+      it('should not advance the push cursor when an upload fails', async () => {
+        mockNoteStoreState.notes = [createNote('note-a', baseTime + 1000)];
+        mockUpsert.mockResolvedValue({ error: { message: 'Upload failed' } });
+
+        await syncNotes(userId);
+
+        expect(useSyncStateStore.getState().getCursor('notes', userId).pushedAt).toBe(0);
+      });
+
+      it('should page through large fetches after the last sync_seq seen', async () => {
+        const fullPage = Array.from({ length: 500 }, (_, i) =>
+          createCloudRow(`cloud-${i}`, baseTime + i, i + 1)
+        );
+        mockLimit
+          .mockResolvedValueOnce({ data: fullPage, error: null })
+          .mockResolvedValueOnce({ data: [createCloudRow('cloud-last', baseTime, 501)], error: null });
+
+        const result = await syncNotes(userId);
+
+        expect(mockLimit).toHaveBeenCalledTimes(2);
+        expect(mockGt).toHaveBeenCalledTimes(1);
+        expect(mockGt).toHaveBeenCalledWith('sync_seq', 500);
+        expect(result.downloaded).toBe(501);
+        expect(result.stats?.pages).toBe(2);
+        expect(useSyncStateStore.getState().getCursor('notes', userId).pulledXid).toBe(100);
+      });
+
+      it('should pull rows inserted with an old updated_at', async () => {
+        useSyncStateStore.getState().setCursor('notes', {
+          userId,
+          pulledXid: 90,
+          pushedAt: baseTime + 5000,
+          echoes: {},
+          synced: {},
+        });
+        // Created offline on another device, so its edit time is behind the cursor
+        mockLimit.mockResolvedValue({
+          data: [createCloudRow('offline-note', baseTime, 11)],
+          error: null,
+        });
+
+        const result = await syncNotes(userId);
+
+        expect(mockGte).toHaveBeenCalledWith('sync_xid', 90);
+        expect(result.downloaded).toBe(1);
+      });
+
+      it('should skip its own writes when they are pulled back', async () => {
+        mockNoteStoreState.notes = [createNote('note-a', baseTime + 1000)];
+        mockUpsert.mockResolvedValue({ data: [{ id: 'note-a', sync_seq: 42, sync_xid: 105 }], error: null });
+        await syncNotes(userId);
+
+        // The uploaded row comes back with a server-side updated_at
+        mockUpsert.mockClear();
+        mockRpc.mockResolvedValue({ data: 110, error: null });
+        mockLimit.mockResolvedValue({
+          data: [createCloudRow('note-a', baseTime + 900, 42)],
+          error: null,
+        });
+        const second = await syncNotes(userId);
+
+        expect(second.downloaded).toBe(0);
+        expect(second.uploaded).toBe(0);
+        expect(mockUpsert).not.toHaveBeenCalled();
+        const cursor = useSyncStateStore.getState().getCursor('notes', userId);
+        expect(cursor.pulledXid).toBe(110);
+        expect(cursor.echoes).toEqual({});
+      });
+
+      it('should still pull later changes to a record it wrote', async () => {
+        mockNoteStoreState.notes = [createNote('note-a', baseTime + 1000)];
+        mockUpsert.mockResolvedValue({ data: [{ id: 'note-a', sync_seq: 42, sync_xid: 105 }], error: null });
+        await syncNotes(userId);
+        expect(useSyncStateStore.getState().getCursor('notes', userId).echoes).toEqual({
+          'note-a': { seq: 42, xid: 105 },
+        });
+
+        mockLimit.mockResolvedValue({
+          data: [createCloudRow('note-a', baseTime + 5000, 43)],
+          error: null,
+        });
+        const second = await syncNotes(userId);
+
+        expect(second.downloaded).toBe(1);
+      });
+
+      it('should move the push cursor to the local sync start time', async () => {
+        const now = jest.spyOn(Date, 'now').mockReturnValue(baseTime + 10000);
+        mockNoteStoreState.notes = [createNote('note-a', baseTime + 1000)];
+        // Another device's clock is far ahead
+        mockLimit.mockResolvedValue({
+          data: [createCloudRow('cloud-1', baseTime + 999999, 3)],
+          error: null,
+        });
+
+        await syncNotes(userId);
+        now.mockRestore();
+
+        expect(useSyncStateStore.getState().getCursor('notes', userId).pushedAt).toBe(baseTime + 9999);
+      });
+
+      it('should upsert in bounded chunks', async () => {
+        mockNoteStoreState.notes = Array.from({ length: 450 }, (_, i) =>
+          createNote(`note-${i}`, baseTime + i)
+        );
+
+        const result = await syncNotes(userId);
+
+        expect(mockUpsert).toHaveBeenCalledTimes(3);
+        expect(mockUpsert.mock.calls[0][0]).toHaveLength(200);
+        expect(mockUpsert.mock.calls[2][0]).toHaveLength(50);
+        expect(result.uploaded).toBe(450);
+      });
+
+      it('should retry a failed chunk', async () => {
+        mockNoteStoreState.notes = [createNote('note-a', baseTime + 1000)];
+        mockUpsert
+          .mockResolvedValueOnce({ error: { message: 'Timeout' } })
+          .mockResolvedValueOnce({ error: null });
+
+        const result = await syncNotes(userId);
+
+        expect(mockUpsert).toHaveBeenCalledTimes(2);
+        expect(result.uploaded).toBe(1);
+        expect(result.errors).toHaveLength(0);
+        expect(result.stats?.retries).toBe(1);
+      });
+
+      it('should merge downloads into the note store in one batch', async () => {
+        mockNoteStoreState.notes = [
+          createNote('note-a', baseTime),
+          createNote('note-b', baseTime),
+        ];
+        mockLimit.mockResolvedValue({
+          data: [createCloudRow('note-b', baseTime + 5000), createCloudRow('note-c', baseTime + 5000)],
+          error: null,
+        });
+
+        await syncNotes(userId);
+
+        expect(mockNoteStoreState.upsertNotes).toHaveBeenCalledTimes(1);
+        const [downloaded] = mockNoteStoreState.upsertNotes.mock.calls[0];
+        expect(downloaded.map((n: Note) => n.id)).toEqual(['note-b', 'note-c']);
+        expect(downloaded[0].updatedAt).toBe(baseTime + 5000);
+        expect(mockNoteStoreState.updateNote).not.toHaveBeenCalled();
+      });
+
+      it('should record sync stats', async () => {
+        mockLimit.mockResolvedValue({
+          data: [createCloudRow('cloud-1', baseTime)],
+          error: null,
+        });
+
+        await syncNotes(userId);
+
+        const stats = getSyncStats().notes;
+        expect(stats?.rowsFetched).toBe(1);
+        expect(stats?.bytesFetched).toBeGreaterThan(0);
+        expect(stats?.durationMs).toBeGreaterThanOrEqual(0);
+      });
+    });
+
     describe('conflict resolution', () => {
       // Use explicit fixed timestamps to avoid timing issues
       const baseTime = 1704067200000; // 2024-01-01 00:00:00 UTC
@@ -217,7 +558,7 @@ describe('SyncService', () => {
         const cloudNote = createCloudNote(baseTime + 5000); // 5 seconds after base (NEWER)
 
         mockNoteStoreState.notes = [localNote];
-        mockEq.mockResolvedValue({ data: [cloudNote], error: null });
+        mockLimit.mockResolvedValue({ data: [cloudNote], error: null });
 
         const result = await syncNotes(userId);
 
@@ -231,7 +572,7 @@ describe('SyncService', () => {
         const cloudNote = createCloudNote(baseTime + 1000); // 1 second after base
 
         mockNoteStoreState.notes = [localNote];
-        mockEq.mockResolvedValue({ data: [cloudNote], error: null });
+        mockLimit.mockResolvedValue({ data: [cloudNote], error: null });
 
         const result = await syncNotes(userId);
 
@@ -245,7 +586,7 @@ describe('SyncService', () => {
         const cloudNote = createCloudNote(baseTime + 5000); // Cloud newer but local wins
 
         mockNoteStoreState.notes = [localNote];
-        mockEq.mockResolvedValue({ data: [cloudNote], error: null });
+        mockLimit.mockResolvedValue({ data: [cloudNote], error: null });
 
         const result = await syncNotes(userId, {
           conflictStrategy: 'local_wins',
@@ -260,7 +601,7 @@ describe('SyncService', () => {
         const cloudNote = createCloudNote(baseTime + 1000);
 
         mockNoteStoreState.notes = [localNote];
-        mockEq.mockResolvedValue({ data: [cloudNote], error: null });
+        mockLimit.mockResolvedValue({ data: [cloudNote], error: null });
 
         const result = await syncNotes(userId, {
           conflictStrategy: 'cloud_wins',
@@ -272,6 +613,40 @@ describe('SyncService', () => {
     });
   });
 
+  describe('syncBoards', () => {
+    const userId = 'user-123';
+
+    afterEach(() => {
+      useBoardStore.setState({ boards: [], mergedBoardIds: [] });
+    });
+
+    it('should delete boards merged away by the label migration before syncing', async () => {
+      const mockIn = jest.fn().mockResolvedValue({ error: null });
+      mockDelete.mockReturnValue({ in: mockIn });
+      useBoardStore.setState({ boards: [], mergedBoardIds: ['merged-1', 'merged-2'] });
+
+      const result = await syncBoards(userId);
+
+      expect(mockIn).toHaveBeenCalledWith('id', ['merged-1', 'merged-2']);
+      expect(mockLimit).toHaveBeenCalled();
+      expect(result.errors).toHaveLength(0);
+      expect(useBoardStore.getState().mergedBoardIds).toEqual([]);
+    });
+
+    it('should keep merged ids and skip the sync when the delete fails', async () => {
+      mockDelete.mockReturnValue({
+        in: jest.fn().mockResolvedValue({ error: { message: 'Network error' } }),
+      });
+      useBoardStore.setState({ boards: [], mergedBoardIds: ['merged-1'] });
+
+      const result = await syncBoards(userId);
+
+      expect(result.errors).toContain('Delete merged boards error: Network error');
+      expect(mockLimit).not.toHaveBeenCalled();
+      expect(useBoardStore.getState().mergedBoardIds).toEqual(['merged-1']);
+    });
+  });
+
   describe('uploadNote', () => {
     const userId = 'user-123';
     const note: Note = {
@@ -0,0 +1,338 @@
+/**
+ * Unit Tests for triggerEngine
+ *
+ * Tests event-indexed skill dispatch, coalescing of bursty events,
+ * per-event timings and the bounded recent behavior history.
+ */
+
+import {
+  flushScheduledTriggerEvents,
+  onAppOpened,
+  onNoteDeleted,
+  onNoteUpdated,
+  triggerEngine,
+} from '@/services/triggerEngine';
+import { defineSkill, noAction, skillRegistry } from '@/services/skills';
+import type { Skill, SkillContext } from '@/services/agents/Agent';
+import { useBehaviorStore } from '@/stores/behaviorStore';
+import { useNudgeStore } from '@/stores/nudgeStore';
+import { Note, NoteColor } from '@/types';
+
+// jest.setup.js mocks this service for store tests
+jest.unmock('@/services/triggerEngine');
+
+jest.mock('@/services/behaviorLearner', () => ({
+  behaviorLearner: {
+    shouldSuppressSkill: jest.fn(() => false),
+  },
+}));
+
+jest.mock('@/services/nudgeDeliveryService', () => ({
+  nudgeDeliveryService: {
+    processTriggeredSkills: jest.fn().mockResolvedValue(undefined),
+  },
+}));
+
+const createNote = (id: string, content = 'Some content'): Note => ({
+  id,
+  title: `Note ${id}`,
+  content,
+  color: NoteColor.White,
+  labels: [],
+  isPinned: false,
+  isArchived: false,
+  isDeleted: false,
+  createdAt: 1000,
+  updatedAt: 1000,
+});
+
+const registered: string[] = [];
+
+const register = (skill: Skill) => {
+  skillRegistry.register(skill, 'manager');
+  registered.push(skill.id);
+  return skill;
+};
+
+describe('triggerEngine', () => {
+  beforeEach(() => {
+    triggerEngine.resetEventTimings();
+    useBehaviorStore.setState({
+      behaviors: {},
+      recentBehaviorIds: { manage: [], develop: [], organize: [], experience: [] },
+    });
+  });
+
+  afterEach(() => {
+    registered.splice(0).forEach((id) => skillRegistry.unregister(id));
+    jest.useRealTimers();
+  });
+
+  describe('skill dispatch', () => {
+    it('should only evaluate skills subscribed to the event', async () => {
+      const createdWhen = jest.fn(() => true);
+      const updatedWhen = jest.fn(() => true);
+      register(
+        defineSkill({ id: 'test-created', name: 'Created', description: '' })
+          .onEvent('note_created')
+          .when(createdWhen)
+          .do(async () => noAction())
+          .build()
+      );
+      register(
+        defineSkill({ id: 'test-updated', name: 'Updated', description: '' })
+          .onEvent('note_updated')
+          .when(updatedWhen)
+          .do(async () => noAction())
+          .build()
+      );
+
+      const results = await triggerEngine.processEvent(
+        { event: 'note_created', noteId: 'a', timestamp: Date.now() },
+        { note: createNote('a') }
+      );
+
+      expect(results.map((r) => r.skill.id)).toEqual(['test-created']);
+      expect(updatedWhen).not.toHaveBeenCalled();
+    });
+
+    it('should evaluate pattern-only skills for every event', () => {
+      const patternSkill = register(
+        defineSkill({ id: 'test-pattern', name: 'Pattern', description: '' })
+          .onPattern('no_deadline')
+          .do(async () => noAction())
+          .build()
+      );
+      register(
+        defineSkill({ id: 'test-scheduled', name: 'Scheduled', description: '' })
+          .onSchedule('daily')
+          .do(async () => noAction())
+          .build()
+      );
+
+      expect(skillRegistry.getForEvent('note_created')).toContain(patternSkill);
+      expect(skillRegistry.getForEvent('board_accessed')).toContain(patternSkill);
+      expect(skillRegistry.getForEvent('daily_check').map((s) => s.id)).not.toContain('test-scheduled');
+    });
+
+    it('should evaluate skills with event and pattern triggers for every event', () => {
+      const mixedSkill = register(
+        defineSkill({ id: 'test-mixed', name: 'Mixed', description: '' })
+          .onEvent('note_created')
+          .onPattern('no_deadline')
+          .do(async () => noAction())
+          .build()
+      );
+      register(
+        defineSkill({ id: 'test-updated', name: 'Updated', description: '' })
+          .onEvent('note_updated')
+          .do(async () => noAction())
+          .build()
+      );
+
+      expect(skillRegistry.getForEvent('note_created')).toContain(mixedSkill);
+      expect(skillRegistry.getForEvent('note_updated').map((s) => s.id)).toEqual(['test-mixed', 'test-updated']);
+      expect(skillRegistry.getForEvent('note_accessed')).toContain(mixedSkill);
+    });
+
+    it('should fire a pattern trigger on events the skill does not subscribe to', async () => {
+      register(
+        defineSkill({ id: 'test-no-deadline', name: 'No deadline', description: '' })
+          .onEvent('note_created')
+          .onPattern('no_deadline')
+          .when(() => false)
+          .do(async () => noAction())
+          .build()
+      );
+      register(
+        defineSkill({ id: 'test-updated', name: 'Updated', description: '' })
+          .onEvent('note_updated')
+          .when(() => false)
+          .do(async () => noAction())
+          .build()
+      );
+      const behavior = useBehaviorStore.getState().initBehavior('task', 'manage');
+
+      for (const event of ['note_updated', 'note_accessed'] as const) {
+        useNudgeStore.setState({ skillCooldowns: {} });
+        const results = await triggerEngine.processEvent(
+          { event, noteId: 'task', timestamp: Date.now() },
+          { note: createNote('task'), behavior }
+        );
+
+        const result = results.find((r) => r.skill.id === 'test-no-deadline');
+        expect(result?.triggered).toBe(true);
+      }
+    });
+
+    it('should pass recent behaviors of the note mode as history', async () => {
+      let history: SkillContext['behaviorHistory'];
+      register(
+        defineSkill({ id: 'test-history', name: 'History', description: '' })
+          .onEvent('note_created')
+          .when((context) => {
+            history = context.behaviorHistory;
+            return false;
+          })
+          .do(async () => noAction())
+          .build()
+      );
+
+      const store = useBehaviorStore.getState();
+      store.initBehaviors([
+        { noteId: 'm1', mode: 'manage' },
+        { noteId: 'd1', mode: 'develop' },
+      ]);
+      const behavior = store.initBehavior('m2', 'manage');
+
+      await triggerEngine.processEvent(
+        { event: 'note_created', noteId: 'm2', timestamp: Date.now() },
+        { note: createNote('m2'), behavior }
+      );
+
+      expect(history?.map((b) => b.noteId).sort()).toEqual(['m1', 'm2']);
+    });
+  });
+
+  describe('recent behavior history', () => {
+    // note-1 (oldest) .. note-N (newest), all in one mode
+    const createBehaviors = (count: number) => {
+      jest.useFakeTimers();
+      for (let i = 1; i <= count; i++) {
+        jest.setSystemTime(i * 1000);
+        useBehaviorStore.getState().initBehavior(`note-${i}`, 'manage');
+      }
+    };
+
+    it('should leave the recent lists alone when an older behavior is deleted', () => {
+      createBehaviors(25);
+      const before = useBehaviorStore.getState().recentBehaviorIds;
+
+      useBehaviorStore.getState().deleteBehavior('note-1');
+
+      expect(useBehaviorStore.getState().recentBehaviorIds).toBe(before);
+    });
+
+    it('should refill a full list when a recent behavior is deleted', () => {
+      createBehaviors(25);
+
+      useBehaviorStore.getState().deleteBehavior('note-25');
+
+      const manage = useBehaviorStore.getState().recentBehaviorIds.manage;
+      expect(manage).toHaveLength(20);
+      expect(manage[0]).toBe('note-24');
+      expect(manage[19]).toBe('note-5');
+    });
+
+    it('should move a behavior between lists when its mode changes', () => {
+      createBehaviors(3);
+      const before = useBehaviorStore.getState().recentBehaviorIds;
+
+      useBehaviorStore.getState().updateBehavior('note-2', { mode: 'develop' });
+
+      const recent = useBehaviorStore.getState().recentBehaviorIds;
+      expect(recent.manage).toEqual(['note-3', 'note-1']);
+      expect(recent.develop).toEqual(['note-2']);
+      expect(recent.organize).toBe(before.organize);
+    });
+  });
+
+  describe('instrumentation', () => {
+    it('should record timings per event type', async () => {
+      register(
+        defineSkill({ id: 'test-timed', name: 'Timed', description: '' })
+          .onEvent('note_accessed')
+          .when(() => false)
+          .do(async () => noAction())
+          .build()
+      );
+
+      await triggerEngine.processEvent(
+        { event: 'note_accessed', noteId: 'a', timestamp: Date.now() },
+        { note: createNote('a') }
+      );
+      await triggerEngine.processEvent(
+        { event: 'note_accessed', noteId: 'a', timestamp: Date.now() },
+        { note: createNote('a') }
+      );
+
+      const timing = triggerEngine.getEventTimings().note_accessed;
+      expect(timing?.count).toBe(2);
+      expect(timing?.skillsEvaluated).toBe(2);
+      expect(timing?.maxMs).toBeGreaterThanOrEqual(0);
+    });
+  });
+
+  describe('coalescing', () => {
+    it('should run one evaluation for a burst of note updates', async () => {
+      jest.useFakeTimers();
+      const spy = jest.spyOn(triggerEngine, 'processEvent');
+
+      const first = onNoteUpdated(createNote('a', 'd'));
+      onNoteUpdated(createNote('a', 'dr'));
+      const last = onNoteUpdated(createNote('a', 'draft'));
+
+      expect(spy).not.toHaveBeenCalled();
+      await jest.advanceTimersByTimeAsync(1500);
+
+      expect(spy).toHaveBeenCalledTimes(1);
+      expect(spy.mock.calls[0][1].note?.content).toBe('draft');
+      expect(await first).toBe(await last);
+      expect(triggerEngine.getEventTimings().note_updated?.coalesced).toBe(2);
+      spy.mockRestore();
+    });
+
+    it('should keep updates to different notes separate', async () => {
+      jest.useFakeTimers();
+      const spy = jest.spyOn(triggerEngine, 'processEvent');
+
+      onNoteUpdated(createNote('a'));
+      onNoteUpdated(createNote('b'));
+      await jest.advanceTimersByTimeAsync(1500);
+
+      expect(spy).toHaveBeenCalledTimes(2);
+      spy.mockRestore();
+    });
+
+    it('should not delay past the max wait during a continuous burst', async () => {
+      jest.useFakeTimers();
+      const spy = jest.spyOn(triggerEngine, 'processEvent');
+
+      for (let i = 0; i < 12; i++) {
+        onAppOpened();
+        await jest.advanceTimersByTimeAsync(500);
+      }
+
+      // 6s of opens every 500ms with a 3s max wait
+      expect(spy).toHaveBeenCalledTimes(2);
+      spy.mockRestore();
+    });
+
+    it('should run pending events on flush', async () => {
+      jest.useFakeTimers();
+      const spy = jest.spyOn(triggerEngine, 'processEvent');
+
+      const pending = onNoteUpdated(createNote('a'));
+      await flushScheduledTriggerEvents();
+
+      expect(spy).toHaveBeenCalledTimes(1);
+      await expect(pending).resolves.toEqual([]);
+      spy.mockRestore();
+    });
+
+    it('should drop a pending update when the note is deleted', async () => {
+      jest.useFakeTimers();
+      const spy = jest.spyOn(triggerEngine, 'processEvent');
+      const note = createNote('a');
+
+      const pending = onNoteUpdated(note);
+      await onNoteDeleted(note);
+      await jest.advanceTimersByTimeAsync(5000);
+
+      expect(spy).toHaveBeenCalledTimes(1);
+      expect(spy.mock.calls[0][0].event).toBe('note_deleted');
+      await expect(pending).resolves.toEqual([]);
+      spy.mockRestore();
+    });
+  });
+});
@@ -31,6 +31,9 @@ jest.mock('@/services/authService', () => ({
 
 // Import after mocks
 import { useAuthStore } from '@/stores/authStore';
+import { useSyncStateStore } from '@/stores/syncStateStore';
+import { useImageUploadStore } from '@/stores/imageUploadStore';
+import { clearModeDetectionCache } from '@/services/modeDetectionService';
 
 describe('AuthStore', () => {
   beforeEach(() => {
@@ -127,6 +130,41 @@ describe('AuthStore', () => {
 
       expect(mockOnAuthStateChange).toHaveBeenCalled();
     });
+
+    it('should clear sync cursors, upload records and detection cache when signed out', async () => {
+      mockGetSession.mockResolvedValue({
+        data: { session: null },
+        error: null,
+      });
+      useSyncStateStore.getState().setCursor('notes', {
+        userId: '123',
+        pulledXid: 5,
+        pushedAt: 1000,
+        echoes: {},
+        synced: {},
+      });
+      useImageUploadStore.getState().recordUpload('file:///a.jpg', {
+        url: 'https://example.com/a.jpg',
+        bucket: 'note-images',
+        path: '123/note-1/abc.jpg',
+        hash: 'abc',
+        uploadedAt: 1000,
+        expiresAt: 2000,
+      });
+
+      const { result } = renderHook(() => useAuthStore());
+      await act(async () => {
+        await result.current.initialize();
+      });
+      const onAuthChange = mockOnAuthStateChange.mock.calls[0][0];
+      await act(async () => {
+        await onAuthChange('SIGNED_OUT', null);
+      });
+
+      expect(useSyncStateStore.getState().getCursor('notes', '123').pulledXid).toBeNull();
+      expect(useImageUploadStore.getState().uploads).toEqual({});
+      expect(clearModeDetectionCache).toHaveBeenCalled();
+    });
   });
 
   describe('signInWithGoogle', () => {
@@ -5,7 +5,14 @@
  * and board data computation utilities.
  */
 
-import { useBoardStore, computeBoardsFromNotes, deriveGradientFromColors } from '@/stores/boardStore';
+import {
+  useBoardStore,
+  computeBoardsFromNotes,
+  computeBoardsFromLabelIndex,
+  deriveGradientFromColors,
+  normalizeBoardHashtags,
+} from '@/stores/boardStore';
+import { applyNoteChanges, buildNoteIndexes } from '@/stores/noteIndexes';
 import { NoteColor, Note, Board } from '@/types';
 
 // Mock generateUUID to return predictable IDs
@@ -17,7 +24,7 @@ jest.mock('@/utils/uuid', () => ({
 describe('boardStore', () => {
   beforeEach(() => {
     // Reset store state before each test
-    useBoardStore.setState({ boards: [] });
+    useBoardStore.setState({ boards: [], mergedBoardIds: [] });
     mockUuidCounter = 0;
   });
 
@@ -222,6 +229,120 @@ describe('computeBoardsFromNotes', () => {
   });
 });
 
+describe('computeBoardsFromLabelIndex', () => {
+  const createMockNote = (id: string, overrides: Partial<Note> = {}): Note => ({
+    id,
+    title: 'Test Note',
+    content: 'Test content',
+    labels: [],
+    color: NoteColor.White,
+    isPinned: false,
+    isArchived: false,
+    isDeleted: false,
+    createdAt: 1000,
+    updatedAt: 1000,
+    ...overrides,
+  });
+
+  it('should match computeBoardsFromNotes', () => {
+    const notes = [
+      createMockNote('a', { labels: ['anime'], updatedAt: 3000 }),
+      createMockNote('b', { labels: ['anime', 'manga'], updatedAt: 2000 }),
+      createMockNote('c', { labels: ['manga'], isArchived: true }),
+      createMockNote('d', { labels: ['trash'], isDeleted: true }),
+    ];
+    const { labelIndex, notesById } = buildNoteIndexes(notes);
+
+    expect(computeBoardsFromLabelIndex(labelIndex, notesById, [])).toEqual(
+      computeBoardsFromNotes(notes, [])
+    );
+  });
+
+  it('should reuse board data for boards whose notes did not change', () => {
+    const state = buildNoteIndexes([
+      createMockNote('a', { labels: ['anime'] }),
+      createMockNote('b', { labels: ['manga'] }),
+    ]);
+    const before = computeBoardsFromLabelIndex(state.labelIndex, state.notesById, []);
+
+    const edited = { ...state.notesById.a, updatedAt: 5000 };
+    applyNoteChanges(state, [{ prev: state.notesById.a, next: edited }]);
+    const after = computeBoardsFromLabelIndex(state.labelIndex, state.notesById, []);
+
+    const find = (boards: typeof before, hashtag: string) => boards.find((b) => b.hashtag === hashtag);
+    expect(find(after, 'manga')).toBe(find(before, 'manga'));
+    expect(find(after, 'anime')).not.toBe(find(before, 'anime'));
+    expect(find(after, 'anime')?.mostRecentUpdate).toBe(5000);
+  });
+});
+
+describe('normalizeBoardHashtags', () => {
+  const createBoard = (id: string, hashtag: string, updatedAt: number, extra: Partial<Board> = {}): Board => ({
+    id,
+    hashtag,
+    createdAt: 1000,
+    updatedAt,
+    ...extra,
+  });
+
+  it('should re-key customizations by normalized label', () => {
+    const { boards, removedIds } = normalizeBoardHashtags([createBoard('b1', 'goal', 2000)], 5000);
+
+    expect(boards).toEqual([createBoard('b1', 'goals', 5000)]);
+    expect(removedIds).toEqual([]);
+  });
+
+  it('should leave already normalized boards untouched', () => {
+    const board = createBoard('b1', 'my-list', 2000);
+
+    expect(normalizeBoardHashtags([board], 5000).boards[0]).toBe(board);
+  });
+
+  it('should merge customizations that now share a board, newest first', () => {
+    const { boards, removedIds } = normalizeBoardHashtags(
+      [
+        createBoard('old', 'goal', 2000, { customStyle: { coverColor: '#111111' }, boardDesignId: 'design-1' }),
+        createBoard('new', 'goals', 3000, { customStyle: { coverColor: '#222222' } }),
+      ],
+      5000
+    );
+
+    expect(removedIds).toEqual(['old']);
+    expect(boards).toHaveLength(1);
+    expect(boards[0]).toEqual(
+      expect.objectContaining({
+        id: 'new',
+        hashtag: 'goals',
+        customStyle: { coverColor: '#222222' },
+        boardDesignId: 'design-1',
+        updatedAt: 5000,
+      })
+    );
+  });
+
+  it('should keep the id of the board that already owns the normalized hashtag', () => {
+    const { boards, removedIds } = normalizeBoardHashtags(
+      [
+        createBoard('owner', 'goals', 2000, { boardDesignId: 'design-1' }),
+        createBoard('newest', 'Goal', 3000, { customStyle: { coverColor: '#222222' } }),
+      ],
+      5000
+    );
+
+    // The owner's cloud row holds UNIQUE(user_id, 'goals'), so the merge is
+    // written to that row and the other one is deleted
+    expect(boards).toEqual([
+      expect.objectContaining({
+        id: 'owner',
+        hashtag: 'goals',
+        customStyle: { coverColor: '#222222' },
+        boardDesignId: 'design-1',
+      }),
+    ]);
+    expect(removedIds).toEqual(['newest']);
+  });
+});
+
 describe('deriveGradientFromColors', () => {
   it('should return default colors for empty array', () => {
     const gradient = deriveGradientFromColors([]);
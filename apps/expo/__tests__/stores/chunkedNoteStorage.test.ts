@@ -0,0 +1,286 @@
+/**
+ * Unit Tests for chunkedNoteStorage
+ *
+ * Tests per-note records, dirty-only writes, preview hydration with lazy
+ * bodies, the sharded search index, and migration from the legacy
+ * single-key blob.
+ */
+
+import AsyncStorage from '@react-native-async-storage/async-storage';
+import {
+  createChunkedNoteStorage,
+  getNoteContentPreview,
+  NOTE_PREVIEW_LENGTH,
+  PersistedNoteState,
+  SEARCH_SHARD_COUNT,
+} from '@/stores/chunkedNoteStorage';
+import { buildSearchIndex, searchIndex as searchNoteIndex, updateSearchIndex } from '@/stores/noteSearchIndex';
+import { Note, NoteColor } from '@/types';
+import { StorageValue } from 'zustand/middleware';
+
+const mockStorage = AsyncStorage as jest.Mocked<typeof AsyncStorage>;
+
+// In-memory backing store for the AsyncStorage mock
+let records: Map<string, string>;
+
+const createNote = (id: string, content = `Content of ${id}`): Note => ({
+  id,
+  title: `Note ${id}`,
+  content,
+  color: NoteColor.White,
+  labels: [],
+  isPinned: false,
+  isArchived: false,
+  isDeleted: false,
+  createdAt: 1000,
+  updatedAt: 1000,
+});
+
+const toValue = (notes: Note[], extra: Partial<PersistedNoteState> = {}): StorageValue<PersistedNoteState> => ({
+  state: {
+    notesById: Object.fromEntries(notes.map((n) => [n.id, n])),
+    noteIds: notes.map((n) => n.id),
+    ...extra,
+  },
+  version: 1,
+});
+
+const writtenKeys = () => mockStorage.multiSet.mock.calls.flatMap(([pairs]) => pairs.map(([key]) => key));
+
+describe('chunkedNoteStorage', () => {
+  const longBody = 'word '.repeat(NOTE_PREVIEW_LENGTH);
+
+  beforeEach(() => {
+    jest.clearAllMocks();
+    records = new Map();
+    mockStorage.getItem.mockImplementation(async (key) => records.get(key) ?? null);
+    mockStorage.setItem.mockImplementation(async (key, value) => {
+      records.set(key, value);
+    });
+    mockStorage.removeItem.mockImplementation(async (key) => {
+      records.delete(key);
+    });
+    mockStorage.getAllKeys.mockImplementation(async () => Array.from(records.keys()));
+    mockStorage.multiGet.mockImplementation(async (keys) =>
+      keys.map((key) => [key, records.get(key) ?? null] as [string, string | null])
+    );
+    mockStorage.multiSet.mockImplementation(async (pairs) => {
+      pairs.forEach(([key, value]) => records.set(key, value));
+    });
+    mockStorage.multiRemove.mockImplementation(async (keys) => {
+      keys.forEach((key) => records.delete(key));
+    });
+  });
+
+  it('should store one record per note plus an id list', async () => {
+    const storage = createChunkedNoteStorage('notes');
+    storage.setItem('notes', toValue([createNote('a'), createNote('b')]));
+    await storage.flush();
+
+    expect(JSON.parse(records.get('notes:index')!)).toEqual({ version: 1, noteIds: ['a', 'b'] });
+    expect(JSON.parse(records.get('notes:meta:a')!).content).toBe('Content of a');
+    // Short notes have no separate body
+    expect(records.has('notes:body:a')).toBe(false);
+  });
+
+  it('should only write notes that changed', async () => {
+    const storage = createChunkedNoteStorage('notes');
+    const notes = Array.from({ length: 500 }, (_, i) => createNote(`n${i}`));
+    const value = toValue(notes);
+    storage.setItem('notes', value);
+    await storage.flush();
+    mockStorage.multiSet.mockClear();
+
+    const edited = { ...notes[42], title: 'Edited' };
+    storage.setItem('notes', {
+      ...value,
+      state: { ...value.state, notesById: { ...value.state.notesById, n42: edited } },
+    });
+    await storage.flush();
+
+    expect(writtenKeys()).toEqual(['notes:meta:n42']);
+  });
+
+  it('should split long content into a preview and a body', async () => {
+    const storage = createChunkedNoteStorage('notes');
+    storage.setItem('notes', toValue([createNote('long', longBody)]));
+    await storage.flush();
+
+    const meta = JSON.parse(records.get('notes:meta:long')!);
+    expect(meta.content).toBe(getNoteContentPreview(longBody));
+    expect(meta.hasBody).toBe(true);
+    expect(records.get('notes:body:long')).toBe(longBody);
+  });
+
+  it('should hydrate previews and read bodies on demand', async () => {
+    const writer = createChunkedNoteStorage('notes');
+    writer.setItem('notes', toValue([createNote('long', longBody), createNote('short')]));
+    await writer.flush();
+    mockStorage.multiGet.mockClear();
+
+    const reader = createChunkedNoteStorage('notes');
+    const hydrated = await reader.getItem('notes');
+
+    expect(hydrated?.state.notesById.long.content).toBe(getNoteContentPreview(longBody));
+    expect(hydrated?.state.pendingBodyIds).toEqual({ long: true });
+    // Bodies aren't read during hydration
+    expect(mockStorage.multiGet).toHaveBeenCalledTimes(1);
+
+    expect(await reader.readBodies(['long'])).toEqual({ long: longBody });
+  });
+
+  it('should reject when bodies cannot be read', async () => {
+    const storage = createChunkedNoteStorage('notes');
+    mockStorage.multiGet.mockRejectedValueOnce(new Error('disk error'));
+
+    await expect(storage.readBodies(['long'])).rejects.toThrow('disk error');
+  });
+
+  it('should keep a pending body when only metadata changes', async () => {
+    const writer = createChunkedNoteStorage('notes');
+    writer.setItem('notes', toValue([createNote('long', longBody)]));
+    await writer.flush();
+
+    const reader = createChunkedNoteStorage('notes');
+    const hydrated = (await reader.getItem('notes'))!;
+    const pinned = { ...hydrated.state.notesById.long, isPinned: true };
+    reader.setItem('notes', {
+      ...hydrated,
+      state: { ...hydrated.state, notesById: { long: pinned } },
+    });
+    await reader.flush();
+
+    expect(JSON.parse(records.get('notes:meta:long')!).isPinned).toBe(true);
+    expect(records.get('notes:body:long')).toBe(longBody);
+  });
+
+  it('should drop body records when content becomes short', async () => {
+    const storage = createChunkedNoteStorage('notes');
+    storage.setItem('notes', toValue([createNote('long', longBody)]));
+    await storage.flush();
+
+    storage.setItem('notes', toValue([createNote('long', 'Short now')]));
+    await storage.flush();
+
+    expect(records.has('notes:body:long')).toBe(false);
+    expect(JSON.parse(records.get('notes:meta:long')!).hasBody).toBeUndefined();
+  });
+
+  it('should remove records of deleted notes', async () => {
+    const storage = createChunkedNoteStorage('notes');
+    storage.setItem('notes', toValue([createNote('a'), createNote('long', longBody)]));
+    await storage.flush();
+
+    storage.setItem('notes', toValue([createNote('a')]));
+    await storage.flush();
+
+    expect(records.has('notes:meta:long')).toBe(false);
+    expect(records.has('notes:body:long')).toBe(false);
+    expect(JSON.parse(records.get('notes:index')!).noteIds).toEqual(['a']);
+  });
+
+  it('should only rewrite the search index when its revision changes', async () => {
+    const storage = createChunkedNoteStorage('notes');
+    const notes = [createNote('a')];
+    const searchIndex = buildSearchIndex(notes);
+    storage.setItem('notes', toValue(notes, { searchIndex }));
+    await storage.flush();
+    storage.setItem('notes', toValue(notes, { searchIndex }));
+    await storage.flush();
+
+    expect(writtenKeys().filter((key) => key === 'notes:search')).toHaveLength(1);
+    // A new index writes every shard
+    expect(writtenKeys().filter((key) => key.startsWith('notes:search:'))).toHaveLength(SEARCH_SHARD_COUNT * 2);
+  });
+
+  it('should only rewrite the search shards an edit touched', async () => {
+    const storage = createChunkedNoteStorage('notes');
+    const notes = Array.from({ length: 500 }, (_, i) => createNote(`n${i}`));
+    const searchIndex = buildSearchIndex(notes);
+    storage.setItem('notes', toValue(notes, { searchIndex }));
+    await storage.flush();
+    mockStorage.multiSet.mockClear();
+
+    // Terms "note", "n42", "content", "of" out and "zebra" in: first letters
+    // n, c, o and z, plus the shard holding the note's stamp
+    const edited = { ...notes[42], title: 'Zebra', updatedAt: 2000 };
+    updateSearchIndex(searchIndex, [{ prev: notes[42], next: edited }]);
+    storage.setItem('notes', toValue(notes, { searchIndex }));
+    await storage.flush();
+
+    const searchKeys = writtenKeys().filter((key) => key.startsWith('notes:search'));
+    expect(searchKeys).toContain('notes:search');
+    expect(searchKeys.filter((key) => key.startsWith('notes:search:terms:'))).toHaveLength(4);
+    expect(searchKeys.filter((key) => key.startsWith('notes:search:docs:'))).toHaveLength(1);
+  });
+
+  it('should read the search index separately from hydration', async () => {
+    const writer = createChunkedNoteStorage('notes');
+    const notes = [createNote('a'), createNote('b', 'Zebra crossing')];
+    writer.setItem('notes', toValue(notes, { searchIndex: buildSearchIndex(notes) }));
+    await writer.flush();
+    mockStorage.getItem.mockClear();
+
+    const reader = createChunkedNoteStorage('notes');
+    const hydrated = await reader.getItem('notes');
+    expect(hydrated?.state.searchIndex).toBeUndefined();
+    expect(mockStorage.getItem).not.toHaveBeenCalledWith('notes:search');
+
+    const restored = (await reader.readSearchIndex())!;
+    expect(searchNoteIndex(restored, ['zebra']).map((match) => match.id)).toEqual(['b']);
+    expect(restored.docStamps).toEqual({ a: 1000, b: 1000 });
+  });
+
+  it('should not restore a search index in the single-record layout', async () => {
+    records.set('notes:search', JSON.stringify(buildSearchIndex([createNote('a')])));
+
+    const storage = createChunkedNoteStorage('notes');
+
+    expect(await storage.readSearchIndex()).toBeUndefined();
+  });
+
+  it('should migrate a legacy single-key blob', async () => {
+    const legacy = toValue([createNote('a'), createNote('long', longBody)]);
+    records.set('notes', JSON.stringify(legacy));
+
+    const storage = createChunkedNoteStorage('notes');
+    const hydrated = await storage.getItem('notes');
+    expect(hydrated).toEqual(legacy);
+    expect(storage.hasLegacyData()).toBe(true);
+
+    storage.setItem('notes', hydrated!);
+    await storage.flush();
+
+    expect(records.has('notes')).toBe(false);
+    expect(storage.hasLegacyData()).toBe(false);
+    expect(JSON.parse(records.get('notes:index')!).noteIds).toEqual(['a', 'long']);
+    expect(records.get('notes:body:long')).toBe(longBody);
+  });
+
+  it('should not write after a failed read', async () => {
+    mockStorage.getItem.mockRejectedValueOnce(new Error('disk error'));
+    const storage = createChunkedNoteStorage('notes');
+
+    expect(await storage.getItem('notes')).toBeNull();
+    storage.setItem('notes', toValue([]));
+    await storage.flush();
+
+    expect(mockStorage.multiSet).not.toHaveBeenCalled();
+  });
+
+  it('should not write back bodies marked clean', async () => {
+    const writer = createChunkedNoteStorage('notes');
+    writer.setItem('notes', toValue([createNote('long', longBody)]));
+    await writer.flush();
+    mockStorage.multiSet.mockClear();
+
+    const reader = createChunkedNoteStorage('notes');
+    const hydrated = (await reader.getItem('notes'))!;
+    const loaded = { ...hydrated.state.notesById.long, content: longBody };
+    reader.markClean([loaded]);
+    reader.setItem('notes', toValue([loaded]));
+    await reader.flush();
+
+    expect(mockStorage.multiSet).not.toHaveBeenCalled();
+  });
+});
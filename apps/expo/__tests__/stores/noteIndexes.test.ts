@@ -0,0 +1,283 @@
+/**
+ * Unit Tests for noteIndexes
+ *
+ * Tests the normalized note indexes behind noteStore: building, incremental
+ * updates, and memoized selectors. Scaling tests check that single-note
+ * updates and label queries do the same work regardless of collection size.
+ */
+
+import {
+  applyNoteChanges,
+  buildNoteIndexes,
+  createNoteListSelector,
+  NoteIndexState,
+} from '@/stores/noteIndexes';
+import { normalizeLabel } from '@/utils/labelNormalization';
+import { Note, NoteColor } from '@/types';
+
+jest.mock('@/utils/labelNormalization', () => {
+  const actual = jest.requireActual('@/utils/labelNormalization');
+  return { ...actual, normalizeLabel: jest.fn(actual.normalizeLabel) };
+});
+
+const mockNormalizeLabel = normalizeLabel as jest.Mock;
+
+const createNote = (id: string, overrides: Partial<Note> = {}): Note => ({
+  id,
+  title: `Note ${id}`,
+  content: `Content ${id}`,
+  color: NoteColor.White,
+  labels: [],
+  isPinned: false,
+  isArchived: false,
+  isDeleted: false,
+  createdAt: 1000,
+  updatedAt: 1000,
+  ...overrides,
+});
+
+// N notes; every 10th is tagged "work", every 25th is archived, note-0 is pinned
+const createCollection = (count: number): NoteIndexState =>
+  buildNoteIndexes(
+    Array.from({ length: count }, (_, i) =>
+      createNote(`note-${i}`, {
+        labels: i % 10 === 0 ? ['work'] : ['misc'],
+        isArchived: i % 25 === 24,
+        isPinned: i === 0,
+      })
+    )
+  );
+
+const applyToState = (state: NoteIndexState, patch: Partial<NoteIndexState>): NoteIndexState => ({
+  ...state,
+  ...patch,
+});
+
+describe('noteIndexes', () => {
+  beforeEach(() => {
+    mockNormalizeLabel.mockClear();
+  });
+
+  describe('buildNoteIndexes', () => {
+    it('should index notes by id, status and normalized label', () => {
+      const state = buildNoteIndexes([
+        createNote('a', { labels: ['Idea'], isPinned: true }),
+        createNote('b', { isArchived: true }),
+        createNote('c', { isDeleted: true, labels: ['ideas'] }),
+      ]);
+
+      expect(state.noteIds).toEqual(['a', 'b', 'c']);
+      expect(state.notesById.b.title).toBe('Note b');
+      expect(state.statusIndex).toEqual({
+        active: ['a'],
+        archived: ['b'],
+        deleted: ['c'],
+        pinned: ['a'],
+      });
+      // 'Idea' and 'ideas' normalize to the same preset label
+      expect(state.labelIndex).toEqual({ ideas: ['a', 'c'] });
+    });
+
+    it('should ignore duplicate ids', () => {
+      const state = buildNoteIndexes([createNote('a'), createNote('a', { title: 'Dup' })]);
+
+      expect(state.noteIds).toEqual(['a']);
+      expect(state.notesById.a.title).toBe('Note a');
+    });
+  });
+
+  describe('applyNoteChanges', () => {
+    it('should prepend new notes in the order given', () => {
+      const state = buildNoteIndexes([createNote('a')]);
+
+      const next = applyToState(
+        state,
+        applyNoteChanges(state, [{ next: createNote('b') }, { next: createNote('c') }])
+      );
+
+      expect(next.noteIds).toEqual(['b', 'c', 'a']);
+      expect(next.statusIndex.active).toEqual(['b', 'c', 'a']);
+    });
+
+    it('should keep buckets ordered when a note moves back', () => {
+      const state = buildNoteIndexes([createNote('a'), createNote('b'), createNote('c')]);
+      const archivedB = { ...state.notesById.b, isArchived: true };
+      const archived = applyToState(state, applyNoteChanges(state, [{ prev: state.notesById.b, next: archivedB }]));
+
+      const restored = applyToState(
+        archived,
+        applyNoteChanges(archived, [{ prev: archivedB, next: { ...archivedB, isArchived: false } }])
+      );
+
+      expect(archived.statusIndex.active).toEqual(['a', 'c']);
+      expect(restored.statusIndex.active).toEqual(['a', 'b', 'c']);
+      expect(restored.statusIndex.archived).toEqual([]);
+    });
+
+    it('should drop removed notes from every index', () => {
+      const state = buildNoteIndexes([createNote('a', { labels: ['work'], isPinned: true }), createNote('b')]);
+
+      const next = applyToState(state, applyNoteChanges(state, [{ prev: state.notesById.a }]));
+
+      expect(next.notesById.a).toBeUndefined();
+      expect(next.noteIds).toEqual(['b']);
+      expect(next.noteSeq.a).toBeUndefined();
+      expect(next.statusIndex.pinned).toEqual([]);
+      expect(next.labelIndex.work).toBeUndefined();
+    });
+
+    it('should only copy the buckets a change touches', () => {
+      const state = createCollection(100);
+      const note = state.notesById['note-10'];
+
+      const patch = applyNoteChanges(state, [
+        { prev: note, next: { ...note, labels: ['home'], isArchived: true } },
+      ]);
+
+      expect(patch.noteIds).toBeUndefined();
+      expect(patch.statusIndex!.active).not.toBe(state.statusIndex.active);
+      expect(patch.statusIndex!.archived).not.toBe(state.statusIndex.archived);
+      expect(patch.statusIndex!.deleted).toBe(state.statusIndex.deleted);
+      expect(patch.statusIndex!.pinned).toBe(state.statusIndex.pinned);
+      expect(patch.labelIndex!.misc).toBe(state.labelIndex.misc);
+      expect(patch.labelIndex!.home).toEqual(['note-10']);
+    });
+
+    it('should leave indexes untouched for content-only edits', () => {
+      const state = createCollection(100);
+      const note = state.notesById['note-3'];
+
+      const patch = applyNoteChanges(state, [{ prev: note, next: { ...note, content: 'Edited' } }]);
+
+      expect(state.notesById['note-3'].content).toBe('Edited');
+      expect(patch.noteRevision).toBe(state.noteRevision + 1);
+      expect(patch.changedNoteIds).toEqual(['note-3']);
+      expect(patch.statusIndex).toBeUndefined();
+      expect(patch.labelIndex).toBeUndefined();
+      expect(mockNormalizeLabel).not.toHaveBeenCalled();
+    });
+  });
+
+  describe('scaling', () => {
+    const countLabelUpdateWork = (count: number): number => {
+      const state = createCollection(count);
+      const note = state.notesById['note-20'];
+      mockNormalizeLabel.mockClear();
+
+      applyNoteChanges(state, [{ prev: note, next: { ...note, labels: ['work', 'ideas'] } }]);
+
+      return mockNormalizeLabel.mock.calls.length;
+    };
+
+    const countLabelQueryWork = (count: number): number => {
+      const state = createCollection(count);
+      // Only the first 10 tagged notes, so the result size is the same for every N
+      const trimmed = { ...state, labelIndex: { ...state.labelIndex, work: state.labelIndex.work.slice(0, 10) } };
+      const filter = jest.fn((n: Note) => !n.isArchived && !n.isDeleted);
+      const selectWork = createNoteListSelector((s) => s.labelIndex.work, filter);
+      mockNormalizeLabel.mockClear();
+
+      selectWork(trimmed);
+
+      return filter.mock.calls.length + mockNormalizeLabel.mock.calls.length;
+    };
+
+    it('should do the same label work for an update at any collection size', () => {
+      expect(countLabelUpdateWork(100)).toBe(countLabelUpdateWork(10000));
+    });
+
+    it('should visit only tagged notes for a label query', () => {
+      expect(countLabelQueryWork(100)).toBe(10);
+      expect(countLabelQueryWork(10000)).toBe(10);
+    });
+
+    // Notes the list selectors resolve after one content edit, once warm
+    const countListEditWork = (count: number): number => {
+      let state = createCollection(count);
+      const filter = jest.fn((n: Note) => !n.isArchived && !n.isDeleted);
+      const selectActive = createNoteListSelector((s) => s.statusIndex.active, filter);
+      const selectWork = createNoteListSelector((s) => s.labelIndex.work, filter);
+      selectActive(state);
+      selectWork(state);
+      filter.mockClear();
+
+      const note = state.notesById['note-20'];
+      state = applyToState(state, applyNoteChanges(state, [{ prev: note, next: { ...note, title: 'Edited' } }]));
+      selectActive(state);
+      selectWork(state);
+
+      return filter.mock.calls.length;
+    };
+
+    it('should only resolve the edited note in each list after an edit', () => {
+      expect(countListEditWork(100)).toBe(2);
+      expect(countListEditWork(10000)).toBe(2);
+    });
+  });
+
+  describe('createNoteListSelector', () => {
+    it('should return the same array until a listed note changes', () => {
+      const state = buildNoteIndexes([createNote('a'), createNote('b', { isArchived: true })]);
+      const selectActive = createNoteListSelector((s) => s.statusIndex.active);
+      const first = selectActive(state);
+
+      // A change to a note outside the list keeps the cached array
+      const archivedEdit = applyToState(
+        state,
+        applyNoteChanges(state, [{ prev: state.notesById.b, next: { ...state.notesById.b, title: 'Edited' } }])
+      );
+      expect(selectActive(archivedEdit)).toBe(first);
+
+      // A change to a listed note produces a new array
+      const activeEdit = applyToState(
+        archivedEdit,
+        applyNoteChanges(archivedEdit, [{ prev: archivedEdit.notesById.a, next: { ...archivedEdit.notesById.a, title: 'Edited' } }])
+      );
+      const second = selectActive(activeEdit);
+      expect(second).not.toBe(first);
+      expect(second[0].title).toBe('Edited');
+    });
+
+    it('should swap an edited note in place and keep the others', () => {
+      let state = buildNoteIndexes([createNote('a'), createNote('b'), createNote('c')]);
+      const selectActive = createNoteListSelector((s) => s.statusIndex.active);
+      const first = selectActive(state);
+
+      const edited = { ...state.notesById.b, title: 'Edited' };
+      state = applyToState(state, applyNoteChanges(state, [{ prev: state.notesById.b, next: edited }]));
+      const second = selectActive(state);
+
+      expect(second).not.toBe(first);
+      expect(second).toEqual([first[0], edited, first[2]]);
+    });
+
+    it('should resolve again when a note joins a filtered list', () => {
+      let state = buildNoteIndexes([createNote('a', { labels: ['work'] }), createNote('b', { labels: ['work'], isArchived: true })]);
+      const selectWork = createNoteListSelector((s) => s.labelIndex.work, (n) => !n.isArchived);
+      expect(selectWork(state).map((n) => n.id)).toEqual(['a']);
+
+      const restored = { ...state.notesById.b, isArchived: false };
+      state = applyToState(state, applyNoteChanges(state, [{ prev: state.notesById.b, next: restored }]));
+
+      expect(selectWork(state).map((n) => n.id)).toEqual(['a', 'b']);
+    });
+
+    it('should resolve again after missing a change', () => {
+      let state = buildNoteIndexes([createNote('a'), createNote('b')]);
+      const selectActive = createNoteListSelector((s) => s.statusIndex.active);
+      selectActive(state);
+
+      state = applyToState(state, applyNoteChanges(state, [{ prev: state.notesById.a, next: { ...state.notesById.a, title: 'One' } }]));
+      state = applyToState(state, applyNoteChanges(state, [{ prev: state.notesById.b, next: { ...state.notesById.b, title: 'Two' } }]));
+
+      expect(selectActive(state).map((n) => n.title)).toEqual(['One', 'Two']);
+    });
+
+    it('should return an empty list for a missing label', () => {
+      const state = buildNoteIndexes([createNote('a')]);
+      const selectMissing = createNoteListSelector((s) => s.labelIndex.missing);
+
+      expect(selectMissing(state)).toEqual([]);
+    });
+  });
+});
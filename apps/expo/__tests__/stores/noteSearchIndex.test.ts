@@ -0,0 +1,239 @@
+/**
+ * Unit Tests for noteSearchIndex
+ *
+ * Tests tokenization, query parsing, incremental index maintenance,
+ * change tracking, restoring from persisted parts, prefix matching and scoring.
+ */
+
+import {
+  buildSearchIndex,
+  createEmptySearchIndex,
+  isSearchIndexCompatible,
+  parseSearchQuery,
+  reconcileSearchIndex,
+  restoreSearchIndex,
+  searchIndex,
+  takeSearchIndexChanges,
+  tokenize,
+  updateSearchIndex,
+  SEARCH_INDEX_VERSION,
+} from '@/stores/noteSearchIndex';
+import { Note, NoteColor } from '@/types';
+
+const createNote = (id: string, title: string, content = ''): Note => ({
+  id,
+  title,
+  content,
+  color: NoteColor.White,
+  labels: [],
+  isPinned: false,
+  isArchived: false,
+  isDeleted: false,
+  createdAt: 1000,
+  updatedAt: 1000,
+});
+
+const matchIds = (index: ReturnType<typeof buildSearchIndex>, query: string) =>
+  searchIndex(index, parseSearchQuery(query).tokens)
+    .sort((a, b) => b.score - a.score)
+    .map((m) => m.id);
+
+describe('noteSearchIndex', () => {
+  describe('tokenize', () => {
+    it('should lowercase and split on punctuation and whitespace', () => {
+      expect(tokenize('Hello, World! Meeting-notes 2024')).toEqual([
+        'hello',
+        'world',
+        'meeting',
+        'notes',
+        '2024',
+      ]);
+    });
+
+    it('should keep non-latin letters', () => {
+      expect(tokenize('café naïve')).toEqual(['café', 'naïve']);
+    });
+
+    it('should return no tokens for empty text', () => {
+      expect(tokenize('')).toEqual([]);
+      expect(tokenize('  ...  ')).toEqual([]);
+    });
+  });
+
+  describe('parseSearchQuery', () => {
+    it('should separate label filters from tokens', () => {
+      expect(parseSearchQuery('Trip plan #travel #Ideas')).toEqual({
+        tokens: ['trip', 'plan'],
+        labels: ['travel', 'Ideas'],
+      });
+    });
+
+    it('should dedupe repeated tokens', () => {
+      expect(parseSearchQuery('todo TODO').tokens).toEqual(['todo']);
+    });
+  });
+
+  describe('searchIndex', () => {
+    const index = buildSearchIndex([
+      createNote('a', 'Team meeting', 'Agenda for the weekly sync'),
+      createNote('b', 'Groceries', 'Milk, eggs, meat'),
+      createNote('c', 'Meetup ideas', 'Host a meeting at the park'),
+    ]);
+
+    it('should match exact tokens and prefixes', () => {
+      expect(matchIds(index, 'groceries')).toEqual(['b']);
+      expect(matchIds(index, 'mee').sort()).toEqual(['a', 'c']);
+    });
+
+    it('should require every token to match', () => {
+      expect(matchIds(index, 'meeting park')).toEqual(['c']);
+      expect(matchIds(index, 'meeting milk')).toEqual([]);
+    });
+
+    it('should rank title and exact matches higher', () => {
+      // "meeting" is an exact title token for a, content-only for c
+      expect(matchIds(index, 'meeting')).toEqual(['a', 'c']);
+    });
+
+    it('should return nothing for unknown tokens', () => {
+      expect(matchIds(index, 'zebra')).toEqual([]);
+    });
+
+    it('should find the same notes as a substring scan for single words', () => {
+      const words = ['meeting', 'project', 'budget', 'anime', 'chapter', 'flight'];
+      const notes = Array.from({ length: 60 }, (_, i) =>
+        createNote(`n${i}`, `${words[i % 6]} ${i}`, `${words[(i * 5) % 6]} and ${words[(i + 2) % 6]}`)
+      );
+      const scanIndex = buildSearchIndex(notes);
+
+      for (const query of ['meeting', 'proj', 'chapter', 'zzz']) {
+        const scanned = notes
+          .filter((n) => n.title.includes(query) || n.content.includes(query))
+          .map((n) => n.id)
+          .sort();
+        expect(matchIds(scanIndex, query).sort()).toEqual(scanned);
+      }
+    });
+  });
+
+  describe('updateSearchIndex', () => {
+    it('should index added notes and unindex removed ones', () => {
+      const index = createEmptySearchIndex();
+      const note = createNote('a', 'Packing list', 'Passport');
+
+      updateSearchIndex(index, [{ next: note }]);
+      expect(matchIds(index, 'passport')).toEqual(['a']);
+
+      updateSearchIndex(index, [{ prev: note }]);
+      expect(matchIds(index, 'passport')).toEqual([]);
+      expect(index.terms).toEqual([]);
+      expect(index.postings).toEqual({});
+    });
+
+    it('should replace tokens when a note is edited', () => {
+      const note = createNote('a', 'Draft', 'first version');
+      const index = buildSearchIndex([note, createNote('b', 'Other', 'first')]);
+
+      updateSearchIndex(index, [{ prev: note, next: { ...note, content: 'second version' } }]);
+
+      expect(matchIds(index, 'first')).toEqual(['b']);
+      expect(matchIds(index, 'second')).toEqual(['a']);
+      // "first" is still used by b, so the term stays in the vocabulary
+      expect(index.terms).toContain('first');
+    });
+
+    it('should skip edits that do not touch title or content', () => {
+      const note = createNote('a', 'Pinned', 'body');
+      const index = buildSearchIndex([note]);
+      const tokensBefore = index.docTokens.a;
+
+      updateSearchIndex(index, [{ prev: note, next: { ...note, isPinned: true } }]);
+
+      expect(index.docTokens.a).toBe(tokensBefore);
+    });
+
+    it('should keep the vocabulary sorted', () => {
+      const index = createEmptySearchIndex();
+      updateSearchIndex(index, [
+        { next: createNote('a', 'zeta alpha') },
+        { next: createNote('b', 'mu beta') },
+      ]);
+
+      expect(index.terms).toEqual([...index.terms].sort());
+    });
+  });
+
+  describe('reconcileSearchIndex', () => {
+    it('should re-index only notes whose stamp changed', () => {
+      const a = createNote('a', 'Alpha');
+      const b = createNote('b', 'Beta');
+      const index = buildSearchIndex([a, b]);
+      const betaTokens = index.docTokens.b;
+
+      const editedA = { ...a, title: 'Gamma', updatedAt: 2000 };
+      const skipped = reconcileSearchIndex(index, [editedA, b]);
+
+      expect(skipped).toEqual([]);
+      expect(matchIds(index, 'gamma')).toEqual(['a']);
+      expect(matchIds(index, 'alpha')).toEqual([]);
+      expect(index.docTokens.b).toBe(betaTokens);
+    });
+
+    it('should drop documents for notes that no longer exist', () => {
+      const index = buildSearchIndex([createNote('a', 'Alpha'), createNote('b', 'Beta')]);
+
+      reconcileSearchIndex(index, [createNote('a', 'Alpha')]);
+
+      expect(index.docTokens.b).toBeUndefined();
+      expect(matchIds(index, 'beta')).toEqual([]);
+    });
+
+    it('should report stale notes it was not allowed to index', () => {
+      const index = createEmptySearchIndex();
+      const revision = index.revision;
+
+      const skipped = reconcileSearchIndex(index, [createNote('a', 'Alpha')], () => false);
+
+      expect(skipped).toEqual(['a']);
+      expect(index.revision).toBe(revision);
+    });
+  });
+
+  describe('takeSearchIndexChanges', () => {
+    it('should report the terms and notes an edit touched, once', () => {
+      const note = createNote('a', 'Draft', 'first');
+      const index = buildSearchIndex([note, createNote('b', 'Other', 'untouched')]);
+      expect(takeSearchIndexChanges(index).terms.size).toBe(0);
+
+      updateSearchIndex(index, [{ prev: note, next: { ...note, content: 'second' } }]);
+
+      const changes = takeSearchIndexChanges(index);
+      expect(Array.from(changes.terms).sort()).toEqual(['draft', 'first', 'second']);
+      expect(Array.from(changes.docs)).toEqual(['a']);
+      expect(takeSearchIndexChanges(index).docs.size).toBe(0);
+    });
+  });
+
+  describe('restoreSearchIndex', () => {
+    it('should derive the vocabulary and token lists from postings', () => {
+      const index = buildSearchIndex([createNote('a', 'Alpha beta'), createNote('b', 'Beta', ''), createNote('c', '')]);
+
+      const restored = restoreSearchIndex(index.version, index.revision, index.postings, index.docStamps);
+
+      expect(restored.terms).toEqual(index.terms);
+      expect(restored.docTokens.a.sort()).toEqual([...index.docTokens.a].sort());
+      expect(restored.docTokens.c).toEqual([]);
+      expect(matchIds(restored, 'beta').sort()).toEqual(['a', 'b']);
+    });
+  });
+
+  describe('isSearchIndexCompatible', () => {
+    it('should reject missing or outdated indexes', () => {
+      expect(isSearchIndexCompatible(createEmptySearchIndex())).toBe(true);
+      expect(isSearchIndexCompatible(undefined)).toBe(false);
+      expect(
+        isSearchIndexCompatible({ ...createEmptySearchIndex(), version: SEARCH_INDEX_VERSION - 1 })
+      ).toBe(false);
+    });
+  });
+});
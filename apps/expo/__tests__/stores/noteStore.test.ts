@@ -5,8 +5,15 @@
  * and query functions using Zustand's direct state access.
  */
 
-import { useNoteStore } from '@/stores/noteStore';
-import { NoteColor } from '@/types';
+import {
+  useNoteStore,
+  selectActiveNotes,
+  selectArchivedNotes,
+  selectNotesByLabel,
+} from '@/stores/noteStore';
+import { getNoteContentPreview } from '@/stores/chunkedNoteStorage';
+import { Note, NoteColor } from '@/types';
+import AsyncStorage from '@react-native-async-storage/async-storage';
 
 // Mock generateUUID to return predictable IDs
 let mockUuidCounter = 0;
@@ -15,9 +22,12 @@ jest.mock('@/utils/uuid', () => ({
 }));
 
 describe('noteStore', () => {
-  beforeEach(() => {
+  beforeEach(async () => {
+    // The search index loads once after hydration
+    await useNoteStore.getState().loadSearchIndex();
     // Reset store state before each test
-    useNoteStore.setState({ notes: [], labels: [] });
+    useNoteStore.getState().replaceNotes([]);
+    useNoteStore.setState({ labels: [], pendingBodyIds: {} });
     mockUuidCounter = 0;
   });
 
@@ -35,7 +45,7 @@ describe('noteStore', () => {
         isDeleted: false,
       });
 
-      const notes = useNoteStore.getState().notes;
+      const notes = useNoteStore.getState().getAllNotes();
       expect(notes).toHaveLength(1);
 
       const note = notes[0];
@@ -102,7 +112,7 @@ describe('noteStore', () => {
 
       store.permanentlyDeleteNote(newNote.id);
 
-      const notes = useNoteStore.getState().notes;
+      const notes = useNoteStore.getState().getAllNotes();
       expect(notes).toHaveLength(0);
     });
   });
@@ -302,8 +312,65 @@ describe('noteStore', () => {
       expect(results[0].title).toBe('Active Note 1');
     });
 
+    it('should search notes by token prefix', () => {
+      const results = useNoteStore.getState().searchNotes('act');
+      expect(results).toHaveLength(2);
+    });
+
+    it('should filter search results by label', () => {
+      expect(useNoteStore.getState().searchNotes('note #label1')).toHaveLength(1);
+      expect(useNoteStore.getState().searchNotes('#label1')[0].title).toBe('Active Note 1');
+      expect(useNoteStore.getState().searchNotes('note', { labels: ['missing'] })).toHaveLength(0);
+    });
+
+    it('should rank title matches above content matches', () => {
+      const store = useNoteStore.getState();
+      store.addNote({
+        title: 'Groceries',
+        content: 'Remember the milk',
+        color: NoteColor.White,
+        labels: [],
+        isPinned: false,
+        isArchived: false,
+        isDeleted: false,
+      });
+      store.addNote({
+        title: 'Milk',
+        content: 'Oat or regular',
+        color: NoteColor.White,
+        labels: [],
+        isPinned: false,
+        isArchived: false,
+        isDeleted: false,
+      });
+
+      const results = useNoteStore.getState().searchNotes('milk');
+      expect(results.map((n) => n.title)).toEqual(['Milk', 'Groceries']);
+    });
+
+    it('should reflect note edits and deletions in search', () => {
+      const [note] = useNoteStore.getState().searchNotes('Content 1');
+
+      useNoteStore.getState().updateNote(note.id, { content: 'Rewritten body' });
+      expect(useNoteStore.getState().searchNotes('rewritten')).toHaveLength(1);
+      expect(useNoteStore.getState().searchNotes('Content 1')).toHaveLength(0);
+
+      useNoteStore.getState().deleteNote(note.id);
+      expect(useNoteStore.getState().searchNotes('rewritten')).toHaveLength(0);
+    });
+
+    it('should wait for the search index before matching tokens', () => {
+      useNoteStore.setState({ searchIndexReady: false });
+      expect(useNoteStore.getState().searchNotes('Active')).toEqual([]);
+      // The list itself doesn't wait
+      expect(useNoteStore.getState().getActiveNotes()).toHaveLength(2);
+
+      useNoteStore.setState({ searchIndexReady: true });
+      expect(useNoteStore.getState().searchNotes('Active')).toHaveLength(2);
+    });
+
     it('should get note by id', () => {
-      const notes = useNoteStore.getState().notes;
+      const notes = useNoteStore.getState().getAllNotes();
       const firstNote = notes[0];
 
       const found = useNoteStore.getState().getNoteById(firstNote.id);
@@ -316,6 +383,212 @@ describe('noteStore', () => {
     });
   });
 
+  describe('Indexes and Selectors', () => {
+    const addTestNote = (title: string, labels: string[] = []) =>
+      useNoteStore.getState().addNote({
+        title,
+        content: `${title} content`,
+        color: NoteColor.White,
+        labels,
+        isPinned: false,
+        isArchived: false,
+        isDeleted: false,
+      });
+
+    it('should keep newest notes first across indexes', () => {
+      const first = addTestNote('First', ['work']);
+      const second = addTestNote('Second', ['work']);
+
+      const state = useNoteStore.getState();
+      expect(state.noteIds).toEqual([second.id, first.id]);
+      expect(state.statusIndex.active).toEqual([second.id, first.id]);
+      expect(state.labelIndex.work).toEqual([second.id, first.id]);
+    });
+
+    it('should move notes between status buckets', () => {
+      const note = addTestNote('Movable');
+      useNoteStore.getState().pinNote(note.id);
+      useNoteStore.getState().archiveNote(note.id);
+
+      const { statusIndex } = useNoteStore.getState();
+      expect(statusIndex.active).toEqual([]);
+      expect(statusIndex.archived).toEqual([note.id]);
+      // Archiving unpins
+      expect(statusIndex.pinned).toEqual([]);
+
+      useNoteStore.getState().permanentlyDeleteNote(note.id);
+      expect(useNoteStore.getState().statusIndex.archived).toEqual([]);
+      expect(useNoteStore.getState().noteSeq[note.id]).toBeUndefined();
+    });
+
+    it('should keep the label index in sync with label actions', () => {
+      const note = addTestNote('Labeled', ['work']);
+      const store = useNoteStore.getState();
+
+      store.addLabelToNote(note.id, 'ideas');
+      expect(useNoteStore.getState().labelIndex.ideas).toEqual([note.id]);
+
+      store.removeLabelFromNote(note.id, 'work');
+      expect(useNoteStore.getState().labelIndex.work).toBeUndefined();
+
+      const ideasLabel = useNoteStore.getState().labels.find((l) => l.name === 'ideas')!;
+      store.renameLabel(ideasLabel.id, 'projects');
+      expect(useNoteStore.getState().labelIndex.ideas).toBeUndefined();
+      expect(useNoteStore.getState().getNotesByLabel('projects').map((n) => n.id)).toEqual([note.id]);
+    });
+
+    it('should only remove a deleted label from notes carrying it', () => {
+      const tagged = addTestNote('Tagged', ['temp']);
+      const untagged = addTestNote('Untagged', ['keep']);
+      const label = useNoteStore.getState().addLabel('temp');
+      const untaggedBefore = useNoteStore.getState().getNoteById(untagged.id);
+
+      useNoteStore.getState().deleteLabel(label.id);
+
+      expect(useNoteStore.getState().getNoteById(tagged.id)?.labels).toEqual([]);
+      expect(useNoteStore.getState().getNoteById(untagged.id)).toBe(untaggedBefore);
+      expect(useNoteStore.getState().labelIndex.temp).toBeUndefined();
+    });
+
+    it('should not touch untouched buckets when a note body changes', () => {
+      const note = addTestNote('Editable', ['work']);
+      const archived = addTestNote('Archived');
+      useNoteStore.getState().archiveNote(archived.id);
+
+      const before = useNoteStore.getState();
+      const archivedList = selectArchivedNotes(before);
+
+      useNoteStore.getState().updateNote(note.id, { content: 'New content' });
+
+      const after = useNoteStore.getState();
+      expect(after.statusIndex).toBe(before.statusIndex);
+      expect(after.labelIndex).toBe(before.labelIndex);
+      expect(after.noteIds).toBe(before.noteIds);
+      expect(selectArchivedNotes(after)).toBe(archivedList);
+      expect(selectActiveNotes(after)[0].content).toBe('New content');
+    });
+
+    it('should return stable arrays from memoized selectors', () => {
+      addTestNote('Work', ['work']);
+      const other = addTestNote('Other', ['home']);
+
+      const workNotes = selectNotesByLabel('work')(useNoteStore.getState());
+      const activeNotes = selectActiveNotes(useNoteStore.getState());
+
+      // Editing a note outside the label leaves the label list untouched
+      useNoteStore.getState().updateNote(other.id, { title: 'Other edited' });
+      expect(selectNotesByLabel('work')(useNoteStore.getState())).toBe(workNotes);
+      expect(selectActiveNotes(useNoteStore.getState())).not.toBe(activeNotes);
+    });
+
+    it('should merge and prepend notes with upsertNotes', () => {
+      const existing = addTestNote('Existing');
+      const incoming = {
+        ...existing,
+        id: 'cloud-note',
+        title: 'From cloud',
+        labels: ['work'],
+      };
+
+      useNoteStore.getState().upsertNotes([
+        incoming,
+        { ...existing, title: 'Existing (cloud)' },
+      ]);
+
+      const state = useNoteStore.getState();
+      expect(state.noteIds).toEqual(['cloud-note', existing.id]);
+      expect(state.getNoteById(existing.id)?.title).toBe('Existing (cloud)');
+      expect(state.labelIndex.work).toEqual(['cloud-note']);
+    });
+  });
+
+  describe('Lazy Note Bodies', () => {
+    const fullBody = `${'intro '.repeat(60)}hidden-ending`;
+
+    // A note as hydrated from storage: content is the preview, body not read yet
+    const hydratePreviewNote = (): Note => {
+      const note: Note = {
+        id: 'long-note',
+        title: 'Long note',
+        content: getNoteContentPreview(fullBody),
+        color: NoteColor.White,
+        labels: [],
+        isPinned: false,
+        isArchived: false,
+        isDeleted: false,
+        createdAt: 1000,
+        updatedAt: 1000,
+      };
+      useNoteStore.getState().replaceNotes([note]);
+      useNoteStore.setState({ pendingBodyIds: { [note.id]: true } });
+      return note;
+    };
+
+    it('should replace the preview with the stored body', async () => {
+      hydratePreviewNote();
+      (AsyncStorage.multiGet as jest.Mock).mockResolvedValueOnce([
+        ['toonnotes-notes:body:long-note', fullBody],
+      ]);
+
+      await useNoteStore.getState().loadNoteBodies();
+
+      const state = useNoteStore.getState();
+      expect(state.notesById['long-note'].content).toBe(fullBody);
+      expect(state.pendingBodyIds).toEqual({});
+      expect(AsyncStorage.multiGet).toHaveBeenCalledWith(['toonnotes-notes:body:long-note']);
+    });
+
+    it('should index deferred notes once their body loads', async () => {
+      hydratePreviewNote();
+      // Metadata edits leave the preview in place
+      useNoteStore.getState().pinNote('long-note');
+      expect(useNoteStore.getState().searchNotes('hidden')).toEqual([]);
+
+      (AsyncStorage.multiGet as jest.Mock).mockResolvedValueOnce([
+        ['toonnotes-notes:body:long-note', fullBody],
+      ]);
+      await useNoteStore.getState().loadNoteBodies(['long-note']);
+
+      expect(useNoteStore.getState().searchNotes('hidden').map((n) => n.id)).toEqual(['long-note']);
+    });
+
+    it('should keep the note pending when the body read fails', async () => {
+      const note = hydratePreviewNote();
+      (AsyncStorage.multiGet as jest.Mock).mockRejectedValueOnce(new Error('disk error'));
+
+      await expect(useNoteStore.getState().loadNoteBodies()).rejects.toThrow('disk error');
+
+      // Editing afterwards must not turn the preview into the note's content
+      useNoteStore.getState().updateNote('long-note', { title: 'Renamed' });
+
+      const state = useNoteStore.getState();
+      expect(state.pendingBodyIds).toEqual({ 'long-note': true });
+      expect(state.notesById['long-note'].title).toBe('Renamed');
+      expect(state.notesById['long-note'].content).toBe(note.content);
+    });
+
+    it('should keep the note pending when its body is missing', async () => {
+      hydratePreviewNote();
+      (AsyncStorage.multiGet as jest.Mock).mockResolvedValueOnce([
+        ['toonnotes-notes:body:long-note', null],
+      ]);
+
+      await useNoteStore.getState().loadNoteBodies();
+
+      expect(useNoteStore.getState().pendingBodyIds).toEqual({ 'long-note': true });
+    });
+
+    it('should not overwrite content edited while the body was pending', async () => {
+      hydratePreviewNote();
+      useNoteStore.getState().updateNote('long-note', { content: 'Rewritten' });
+      expect(useNoteStore.getState().pendingBodyIds).toEqual({});
+
+      await useNoteStore.getState().loadNoteBodies(['long-note']);
+
+      expect(useNoteStore.getState().notesById['long-note'].content).toBe('Rewritten');
+    });
+  });
+
   describe('Edge Cases', () => {
     it('should handle empty note title', () => {
       const store = useNoteStore.getState();
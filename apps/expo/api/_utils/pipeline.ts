@@ -0,0 +1,242 @@
+/**
+ * API Request Pipeline
+ *
+ * Wraps a route handler with the steps every endpoint shares, in order:
+ * 1. Timing (per-route latency and throughput, logged when the response finishes)
+ * 2. CORS headers and preflight
+ * 3. Method validation
+ * 4. Rate limiting (see rateLimit.ts)
+ * 5. Payload size, checked from Content-Length before the body is parsed
+ * 6. Required fields and base64 image size, checked from string length
+ *    before anything is decoded
+ * 7. Error mapping: upstream quota errors -> 429, everything else -> 500
+ *
+ * Usage:
+ *   export default withApiPipeline({ route: 'generate-theme', imageFields: ['imageData'] }, handler);
+ */
+
+import type { VercelRequest, VercelResponse } from '@vercel/node';
+import { handlePreflight, setCorsHeaders, validateBody, validateMethod } from './security';
+import { checkRateLimit, DEFAULT_RATE_LIMIT, RateLimitRule } from './rateLimit';
+
+// Vercel rejects request bodies over 4.5MB; fail earlier with a clear error
+export const DEFAULT_MAX_BODY_BYTES = 4 * 1024 * 1024;
+// Routes that only take note text and metadata
+export const TEXT_MAX_BODY_BYTES = 256 * 1024;
+// Decoded size allowed for a single base64 image field
+export const DEFAULT_MAX_IMAGE_BYTES = 3 * 1024 * 1024;
+
+export type ApiHandler = (req: VercelRequest, res: VercelResponse) => Promise<unknown> | unknown;
+
+export interface PipelineOptions {
+  route: string;
+  allowedMethods?: string[];
+  // false disables rate limiting; a custom rule is counted per route
+  rateLimit?: RateLimitRule | false;
+  maxBodyBytes?: number;
+  requiredFields?: string[];
+  // Body fields holding base64 image data
+  imageFields?: string[];
+  maxImageBytes?: number;
+}
+
+// ============================================
+// Route Timing
+// ============================================
+
+export interface RouteTiming {
+  requests: number;
+  rejected: number;     // 4xx responses
+  errors: number;       // 5xx responses
+  totalMs: number;
+  maxMs: number;
+  firstRequestAt: number;
+}
+
+const routeTimings = new Map<string, RouteTiming>();
+
+function recordRouteTiming(route: string, statusCode: number, durationMs: number, startedAt: number): void {
+  let timing = routeTimings.get(route);
+  if (!timing) {
+    timing = { requests: 0, rejected: 0, errors: 0, totalMs: 0, maxMs: 0, firstRequestAt: startedAt };
+    routeTimings.set(route, timing);
+  }
+
+  timing.requests++;
+  if (statusCode >= 500) timing.errors++;
+  else if (statusCode >= 400) timing.rejected++;
+  timing.totalMs += durationMs;
+  timing.maxMs = Math.max(timing.maxMs, durationMs);
+}
+
+/**
+ * Latency and throughput per route since the instance started
+ */
+export function getRouteTimings(): Record<string, RouteTiming & { avgMs: number; requestsPerMinute: number }> {
+  const now = Date.now();
+  const snapshot: Record<string, RouteTiming & { avgMs: number; requestsPerMinute: number }> = {};
+  for (const [route, timing] of routeTimings) {
+    const minutes = Math.max((now - timing.firstRequestAt) / 60000, 1 / 60);
+    snapshot[route] = {
+      ...timing,
+      avgMs: timing.requests > 0 ? timing.totalMs / timing.requests : 0,
+      requestsPerMinute: timing.requests / minutes,
+    };
+  }
+  return snapshot;
+}
+
+export function resetRouteTimings(): void {
+  routeTimings.clear();
+}
+
+// ============================================
+// Helpers
+// ============================================
+
+/**
+ * Client identifier for rate limiting
+ */
+export function getClientId(req: VercelRequest): string {
+  const forwarded = req.headers['x-forwarded-for'];
+  if (typeof forwarded === 'string') {
+    return forwarded.split(',')[0].trim();
+  }
+  return req.socket?.remoteAddress || 'unknown';
+}
+
+/**
+ * Decoded size of base64 data, computed from its length (no decoding)
+ */
+export function getBase64ByteLength(data: string): number {
+  const commaIndex = data.startsWith('data:') ? data.indexOf(',') : -1;
+  const length = data.length - (commaIndex + 1);
+  if (length <= 0) return 0;
+
+  let padding = 0;
+  if (data.endsWith('==')) padding = 2;
+  else if (data.endsWith('=')) padding = 1;
+  return Math.floor((length * 3) / 4) - padding;
+}
+
+/**
+ * Send an error response, mapping upstream quota errors to 429
+ */
+export function sendApiError(
+  res: VercelResponse,
+  error: any,
+  fallbackMessage = 'Internal server error',
+  details: Record<string, unknown> = {}
+) {
+  if (error?.message?.includes('429') || error?.message?.includes('quota')) {
+    return res.status(429).json({
+      error: 'Rate limit exceeded',
+      retryAfter: 60,
+    });
+  }
+
+  return res.status(500).json({ error: error?.message || fallbackMessage, ...details });
+}
+
+async function applyRateLimit(
+  req: VercelRequest,
+  res: VercelResponse,
+  route: string,
+  rule: RateLimitRule | undefined
+): Promise<boolean> {
+  const clientId = getClientId(req);
+  const key = rule ? `${route}:${clientId}` : clientId;
+  const decision = await checkRateLimit(key, rule ?? DEFAULT_RATE_LIMIT);
+
+  res.setHeader('X-RateLimit-Limit', decision.limit.toString());
+  res.setHeader('X-RateLimit-Remaining', decision.remaining.toString());
+  res.setHeader('X-RateLimit-Reset', Math.ceil(decision.resetMs / 1000).toString());
+
+  if (!decision.allowed) {
+    const retryAfter = Math.max(1, Math.ceil(decision.retryAfterMs / 1000));
+    res.setHeader('Retry-After', retryAfter.toString());
+    res.status(429).json({
+      error: 'Too many requests',
+      retryAfter,
+    });
+    return false;
+  }
+  return true;
+}
+
+function validatePayloadSize(req: VercelRequest, res: VercelResponse, maxBodyBytes: number): boolean {
+  const contentLength = Number(req.headers['content-length']);
+  if (contentLength > maxBodyBytes) {
+    res.status(413).json({ error: `Payload too large (max ${Math.floor(maxBodyBytes / 1024)}KB)` });
+    return false;
+  }
+  return true;
+}
+
+function validateImageFields(
+  req: VercelRequest,
+  res: VercelResponse,
+  fields: string[],
+  maxImageBytes: number
+): boolean {
+  const body = req.body || {};
+  for (const field of fields) {
+    const value = body[field];
+    if (value === undefined || value === null) continue;
+
+    if (typeof value !== 'string') {
+      res.status(400).json({ error: `${field} must be a base64 string` });
+      return false;
+    }
+    if (getBase64ByteLength(value) > maxImageBytes) {
+      res.status(413).json({ error: `${field} is too large (max ${Math.floor(maxImageBytes / 1024)}KB)` });
+      return false;
+    }
+  }
+  return true;
+}
+
+// ============================================
+// Pipeline
+// ============================================
+
+/**
+ * Wrap a route handler with the shared request pipeline
+ */
+export function withApiPipeline(options: PipelineOptions, handler: ApiHandler) {
+  const {
+    route,
+    allowedMethods = ['POST'],
+    rateLimit,
+    maxBodyBytes = DEFAULT_MAX_BODY_BYTES,
+    requiredFields = [],
+    imageFields = [],
+    maxImageBytes = DEFAULT_MAX_IMAGE_BYTES,
+  } = options;
+
+  return async function pipelineHandler(req: VercelRequest, res: VercelResponse) {
+    const startedAt = Date.now();
+    res.once('finish', () => {
+      const durationMs = Date.now() - startedAt;
+      recordRouteTiming(route, res.statusCode, durationMs, startedAt);
+      console.log(`[API] ${route} ${res.statusCode} ${durationMs}ms`);
+    });
+
+    try {
+      setCorsHeaders(req, res);
+      if (handlePreflight(req, res)) return;
+      if (!validateMethod(req, res, allowedMethods)) return;
+      if (rateLimit !== false && !(await applyRateLimit(req, res, route, rateLimit))) return;
+      if (!validatePayloadSize(req, res, maxBodyBytes)) return;
+      if (requiredFields.length > 0 && !validateBody(req, res, requiredFields)) return;
+      if (imageFields.length > 0 && !validateImageFields(req, res, imageFields, maxImageBytes)) return;
+
+      await handler(req, res);
+    } catch (error) {
+      console.error(`[API] ${route} failed:`, error);
+      if (!res.headersSent) {
+        sendApiError(res, error);
+      }
+    }
+  };
+}
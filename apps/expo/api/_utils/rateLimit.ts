@@ -0,0 +1,196 @@
+/**
+ * Rate Limiting
+ *
+ * Limits are checked through a RateLimitStore:
+ * - MemoryRateLimitStore: token bucket per client, local to the function
+ *   instance. Bursts up to the limit are allowed, then requests are admitted
+ *   at the refill rate instead of being cut off until a window resets.
+ * - RedisRateLimitStore: sliding-window counter shared by all instances
+ *   (two fixed-window counters weighted by overlap), so scaling out doesn't
+ *   multiply the limit.
+ *
+ * The Redis store is used when RATE_LIMIT_REDIS_URL (or Vercel KV's KV_URL)
+ * is set. If Redis is unreachable the check falls back to the memory store
+ * rather than rejecting traffic, and skips Redis for a while so requests
+ * don't each wait out the connection timeout.
+ */
+
+import { RedisClient, RedisCommandClient, RedisReplyError } from './redisClient';
+
+export interface RateLimitRule {
+  limit: number;     // Requests allowed per window
+  windowMs: number;
+}
+
+export interface RateLimitDecision {
+  allowed: boolean;
+  limit: number;
+  remaining: number;
+  resetMs: number;       // Until the full limit is available again
+  retryAfterMs: number;  // Until the next request would be allowed (0 if allowed)
+}
+
+export interface RateLimitStore {
+  /**
+   * Count one request for `key` and decide whether it is allowed
+   */
+  hit(key: string, rule: RateLimitRule, now: number): Promise<RateLimitDecision>;
+}
+
+// Default: 30 requests per minute per client
+export const DEFAULT_RATE_LIMIT: RateLimitRule = {
+  limit: 30,
+  windowMs: 60 * 1000,
+};
+
+// ============================================
+// Memory Store (token bucket)
+// ============================================
+
+interface Bucket {
+  tokens: number;
+  updatedAt: number;
+}
+
+// Buckets kept before idle (full) ones are pruned
+const MAX_MEMORY_BUCKETS = 10000;
+
+export class MemoryRateLimitStore implements RateLimitStore {
+  private buckets = new Map<string, Bucket>();
+
+  async hit(key: string, rule: RateLimitRule, now: number): Promise<RateLimitDecision> {
+    const refillPerMs = rule.limit / rule.windowMs;
+    const bucket = this.buckets.get(key);
+
+    let tokens = rule.limit;
+    if (bucket) {
+      tokens = Math.min(rule.limit, bucket.tokens + (now - bucket.updatedAt) * refillPerMs);
+    } else if (this.buckets.size >= MAX_MEMORY_BUCKETS) {
+      this.prune(now, refillPerMs, rule.limit);
+    }
+
+    const allowed = tokens >= 1;
+    if (allowed) tokens -= 1;
+    this.buckets.set(key, { tokens, updatedAt: now });
+
+    return {
+      allowed,
+      limit: rule.limit,
+      remaining: Math.floor(tokens),
+      resetMs: Math.ceil((rule.limit - tokens) / refillPerMs),
+      retryAfterMs: allowed ? 0 : Math.ceil((1 - tokens) / refillPerMs),
+    };
+  }
+
+  private prune(now: number, refillPerMs: number, limit: number): void {
+    for (const [key, bucket] of this.buckets) {
+      if (bucket.tokens + (now - bucket.updatedAt) * refillPerMs >= limit) {
+        this.buckets.delete(key);
+      }
+    }
+  }
+}
+
+// ============================================
+// Redis Store (sliding-window counter)
+// ============================================
+
+export class RedisRateLimitStore implements RateLimitStore {
+  constructor(
+    private client: RedisCommandClient,
+    private prefix: string = 'ratelimit:'
+  ) {}
+
+  async hit(key: string, rule: RateLimitRule, now: number): Promise<RateLimitDecision> {
+    const window = Math.floor(now / rule.windowMs);
+    const elapsed = now - window * rule.windowMs;
+    const currentKey = `${this.prefix}${key}:${window}`;
+    const previousKey = `${this.prefix}${key}:${window - 1}`;
+
+    const replies = await this.client.pipeline([
+      ['INCR', currentKey],
+      ['PEXPIRE', currentKey, rule.windowMs * 2],
+      ['GET', previousKey],
+    ]);
+    const failed = replies.find((reply) => reply instanceof RedisReplyError);
+    if (failed) throw failed;
+
+    const current = Number(replies[0]);
+    const previous = Number(replies[2] ?? 0);
+
+    // The previous window counts in proportion to how much of it is still inside the sliding window
+    const previousWeight = (rule.windowMs - elapsed) / rule.windowMs;
+    const count = previous * previousWeight + current;
+    const allowed = count <= rule.limit;
+
+    let retryAfterMs = 0;
+    if (!allowed) {
+      // Current window alone is over the limit: wait for the next window
+      retryAfterMs = current > rule.limit || previous === 0
+        ? rule.windowMs - elapsed
+        : Math.min(
+            rule.windowMs - elapsed,
+            Math.ceil(((count - rule.limit) / previous) * rule.windowMs)
+          );
+    }
+
+    return {
+      allowed,
+      limit: rule.limit,
+      remaining: Math.max(0, Math.floor(rule.limit - count)),
+      resetMs: rule.windowMs * 2 - elapsed,
+      retryAfterMs,
+    };
+  }
+}
+
+// ============================================
+// Store Selection
+// ============================================
+
+const memoryStore = new MemoryRateLimitStore();
+
+// After the store fails, it is skipped for this long before being retried
+const STORE_RETRY_DELAY_MS = 30 * 1000;
+
+function createDefaultStore(): RateLimitStore {
+  const redisUrl = process.env.RATE_LIMIT_REDIS_URL || process.env.KV_URL;
+  return redisUrl ? new RedisRateLimitStore(new RedisClient(redisUrl)) : memoryStore;
+}
+
+let store = createDefaultStore();
+let storeSkippedUntil = 0;
+
+/**
+ * Replace the rate limit store (tests, custom backends)
+ */
+export function setRateLimitStore(next: RateLimitStore): void {
+  store = next;
+  storeSkippedUntil = 0;
+}
+
+/**
+ * Count a request against `key`. Falls back to the per-instance memory
+ * store when the configured store fails, and keeps using it for
+ * STORE_RETRY_DELAY_MS before trying the store again.
+ */
+export async function checkRateLimit(
+  key: string,
+  rule: RateLimitRule = DEFAULT_RATE_LIMIT
+): Promise<RateLimitDecision> {
+  const now = Date.now();
+  if (store === memoryStore || now < storeSkippedUntil) {
+    return memoryStore.hit(key, rule, now);
+  }
+
+  try {
+    return await store.hit(key, rule, now);
+  } catch (error) {
+    storeSkippedUntil = Date.now() + STORE_RETRY_DELAY_MS;
+    console.warn(
+      `[RateLimit] Store unavailable, using in-memory limits for ${STORE_RETRY_DELAY_MS / 1000}s:`,
+      error
+    );
+    return memoryStore.hit(key, rule, now);
+  }
+}
@@ -0,0 +1,217 @@
+/**
+ * Minimal Redis Client
+ *
+ * Speaks RESP over a single TCP/TLS connection, enough for the rate limiter:
+ * pipelined commands, AUTH from the URL, and a timeout that drops the
+ * connection (replies would otherwise be matched to the wrong commands).
+ * Works with Redis, Vercel KV / Upstash (rediss://) and local stand-ins.
+ *
+ * The connection is reused across invocations of a warm function instance.
+ */
+
+import * as net from 'net';
+import * as tls from 'tls';
+
+export type RespValue = string | number | null | RespValue[] | RedisReplyError;
+
+/**
+ * Error reply from the server (e.g. "-ERR wrong number of arguments")
+ */
+export class RedisReplyError extends Error {
+  constructor(message: string) {
+    super(message);
+    this.name = 'RedisReplyError';
+  }
+}
+
+/**
+ * Anything that can run a batch of Redis commands
+ */
+export interface RedisCommandClient {
+  pipeline(commands: (string | number)[][]): Promise<RespValue[]>;
+}
+
+const DEFAULT_TIMEOUT_MS = 1000;
+
+function encodeCommand(args: (string | number)[]): string {
+  let out = `*${args.length}\r\n`;
+  for (const arg of args) {
+    const value = String(arg);
+    out += `$${Buffer.byteLength(value)}\r\n${value}\r\n`;
+  }
+  return out;
+}
+
+/**
+ * Parse one reply starting at `start`; null if the buffer doesn't hold all of it yet
+ */
+function parseReply(buf: Buffer, start: number): { value: RespValue; end: number } | null {
+  const lineEnd = buf.indexOf('\r\n', start);
+  if (lineEnd === -1) return null;
+
+  const type = String.fromCharCode(buf[start]);
+  const line = buf.toString('utf8', start + 1, lineEnd);
+  const next = lineEnd + 2;
+
+  switch (type) {
+    case '+':
+      return { value: line, end: next };
+    case '-':
+      return { value: new RedisReplyError(line), end: next };
+    case ':':
+      return { value: Number(line), end: next };
+    case '$': {
+      const length = Number(line);
+      if (length < 0) return { value: null, end: next };
+      if (buf.length < next + length + 2) return null;
+      return { value: buf.toString('utf8', next, next + length), end: next + length + 2 };
+    }
+    case '*': {
+      const count = Number(line);
+      if (count < 0) return { value: null, end: next };
+      const items: RespValue[] = [];
+      let offset = next;
+      for (let i = 0; i < count; i++) {
+        const item = parseReply(buf, offset);
+        if (!item) return null;
+        items.push(item.value);
+        offset = item.end;
+      }
+      return { value: items, end: offset };
+    }
+    default:
+      throw new Error(`Unexpected Redis reply type: ${type}`);
+  }
+}
+
+interface PendingReply {
+  resolve: (value: RespValue) => void;
+  reject: (error: Error) => void;
+}
+
+export class RedisClient implements RedisCommandClient {
+  private socket: net.Socket | null = null;
+  private connecting: Promise<void> | null = null;
+  private buffer = Buffer.alloc(0);
+  private pending: PendingReply[] = [];
+
+  constructor(
+    private url: string,
+    private timeoutMs: number = DEFAULT_TIMEOUT_MS
+  ) {}
+
+  /**
+   * Send commands in one write and return their replies in order.
+   * Error replies are returned as RedisReplyError values, not thrown.
+   */
+  async pipeline(commands: (string | number)[][]): Promise<RespValue[]> {
+    let timer: ReturnType<typeof setTimeout> | undefined;
+    const timeout = new Promise<never>((_, reject) => {
+      timer = setTimeout(() => {
+        const error = new Error(`Redis timed out after ${this.timeoutMs}ms`);
+        this.disconnect(error);
+        reject(error);
+      }, this.timeoutMs);
+    });
+
+    try {
+      return await Promise.race([
+        this.connect().then(() => this.send(commands)),
+        timeout,
+      ]);
+    } finally {
+      clearTimeout(timer);
+    }
+  }
+
+  /**
+   * Close the connection (pending commands are rejected)
+   */
+  disconnect(error: Error = new Error('Redis connection closed')): void {
+    const socket = this.socket;
+    const pending = this.pending;
+
+    this.socket = null;
+    this.connecting = null;
+    this.buffer = Buffer.alloc(0);
+    this.pending = [];
+
+    pending.forEach(({ reject }) => reject(error));
+    socket?.destroy();
+  }
+
+  private connect(): Promise<void> {
+    if (this.connecting) return this.connecting;
+
+    const { protocol, hostname, port, username, password } = new URL(this.url);
+    const secure = protocol === 'rediss:';
+    const options = { host: hostname, port: Number(port) || 6379 };
+
+    const connected = new Promise<void>((resolve, reject) => {
+      const socket = secure
+        ? tls.connect({ ...options, servername: hostname })
+        : net.connect(options);
+
+      socket.setNoDelay(true);
+      socket.once(secure ? 'secureConnect' : 'connect', () => resolve());
+      socket.on('data', (chunk: Buffer) => this.onData(chunk));
+      socket.on('error', (error) => {
+        if (this.socket === socket) this.disconnect(error);
+        reject(error);
+      });
+      socket.on('close', () => {
+        if (this.socket === socket) this.disconnect();
+      });
+      this.socket = socket;
+    });
+
+    this.connecting = password
+      ? connected.then(async () => {
+          const auth = username
+            ? ['AUTH', decodeURIComponent(username), decodeURIComponent(password)]
+            : ['AUTH', decodeURIComponent(password)];
+          const [reply] = await this.send([auth]);
+          if (reply instanceof RedisReplyError) throw reply;
+        })
+      : connected;
+
+    // A failed connection or AUTH is retried on the next call
+    this.connecting.catch((error: Error) => {
+      if (this.socket) this.disconnect(error);
+    });
+
+    return this.connecting;
+  }
+
+  private send(commands: (string | number)[][]): Promise<RespValue[]> {
+    const socket = this.socket;
+    if (!socket) {
+      return Promise.reject(new Error('Redis not connected'));
+    }
+
+    const replies = commands.map(
+      () => new Promise<RespValue>((resolve, reject) => this.pending.push({ resolve, reject }))
+    );
+    socket.write(commands.map(encodeCommand).join(''));
+    return Promise.all(replies);
+  }
+
+  private onData(chunk: Buffer): void {
+    this.buffer = this.buffer.length > 0 ? Buffer.concat([this.buffer, chunk]) : chunk;
+
+    let offset = 0;
+    try {
+      while (offset < this.buffer.length) {
+        const reply = parseReply(this.buffer, offset);
+        if (!reply) break;
+        offset = reply.end;
+        this.pending.shift()?.resolve(reply.value);
+      }
+    } catch (error) {
+      this.disconnect(error as Error);
+      return;
+    }
+
+    this.buffer = this.buffer.subarray(offset);
+  }
+}
@@ -0,0 +1,395 @@
+/**
+ * API Response Cache
+ *
+ * Content-addressed cache for the Gemini-backed endpoints:
+ * - Keys are a SHA-256 of the route and its normalized inputs (images by content hash)
+ * - TTL + LRU eviction
+ * - Pluggable backend (in-memory by default, file-based for local runs and tests)
+ * - Identical in-flight requests share one upstream call
+ * - Hit/miss/coalesced counts and upstream latency per route
+ *
+ * The in-memory backend lives as long as the function instance (resets on cold start).
+ * Set API_CACHE_BACKEND=file (and optionally API_CACHE_DIR) to use the file backend,
+ * or API_CACHE_BACKEND=off to disable caching. Requests sent with
+ * `Cache-Control: no-cache` always go upstream (used by the health check).
+ */
+
+import { createHash } from 'crypto';
+import { promises as fs } from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+import type { VercelRequest, VercelResponse } from '@vercel/node';
+
+const DEFAULT_MAX_ENTRIES = 500;
+
+// ============================================
+// Backends
+// ============================================
+
+export interface CacheEntry<T = unknown> {
+  value: T;
+  expiresAt: number;
+}
+
+/**
+ * Storage for cached responses. Expiry is checked by the cache, not the backend.
+ */
+export interface ResponseCacheBackend {
+  get(key: string): Promise<CacheEntry | undefined>;
+  set(key: string, entry: CacheEntry): Promise<void>;
+  delete(key: string): Promise<void>;
+  clear(): Promise<void>;
+}
+
+/**
+ * In-memory LRU (Map insertion order = recency)
+ */
+export class MemoryCacheBackend implements ResponseCacheBackend {
+  private entries = new Map<string, CacheEntry>();
+
+  constructor(private maxEntries: number = DEFAULT_MAX_ENTRIES) {}
+
+  get size(): number {
+    return this.entries.size;
+  }
+
+  async get(key: string): Promise<CacheEntry | undefined> {
+    const entry = this.entries.get(key);
+    if (!entry) return undefined;
+
+    // Move to most recently used
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    return entry;
+  }
+
+  async set(key: string, entry: CacheEntry): Promise<void> {
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+
+    while (this.entries.size > this.maxEntries) {
+      const oldest = this.entries.keys().next().value as string;
+      this.entries.delete(oldest);
+    }
+  }
+
+  async delete(key: string): Promise<void> {
+    this.entries.delete(key);
+  }
+
+  async clear(): Promise<void> {
+    this.entries.clear();
+  }
+}
+
+/**
+ * One JSON file per entry; file mtime tracks recency for LRU eviction
+ */
+export class FileCacheBackend implements ResponseCacheBackend {
+  constructor(
+    private dir: string = path.join(os.tmpdir(), 'toonnotes-api-cache'),
+    private maxEntries: number = DEFAULT_MAX_ENTRIES
+  ) {}
+
+  private filePath(key: string): string {
+    return path.join(this.dir, `${key}.json`);
+  }
+
+  async get(key: string): Promise<CacheEntry | undefined> {
+    const file = this.filePath(key);
+    try {
+      const entry = JSON.parse(await fs.readFile(file, 'utf8')) as CacheEntry;
+      const now = new Date();
+      await fs.utimes(file, now, now).catch(() => undefined);
+      return entry;
+    } catch {
+      return undefined;
+    }
+  }
+
+  async set(key: string, entry: CacheEntry): Promise<void> {
+    await fs.mkdir(this.dir, { recursive: true });
+    await fs.writeFile(this.filePath(key), JSON.stringify(entry));
+    await this.evict();
+  }
+
+  async delete(key: string): Promise<void> {
+    await fs.rm(this.filePath(key), { force: true });
+  }
+
+  async clear(): Promise<void> {
+    await fs.rm(this.dir, { recursive: true, force: true });
+  }
+
+  private async evict(): Promise<void> {
+    const files = (await fs.readdir(this.dir)).filter((f) => f.endsWith('.json'));
+    if (files.length <= this.maxEntries) return;
+
+    const stats = await Promise.all(
+      files.map(async (f) => {
+        const stat = await fs.stat(path.join(this.dir, f)).catch(() => null);
+        return { file: f, mtimeMs: stat?.mtimeMs ?? 0 };
+      })
+    );
+    stats.sort((a, b) => a.mtimeMs - b.mtimeMs);
+
+    const excess = stats.slice(0, files.length - this.maxEntries);
+    await Promise.all(excess.map(({ file }) => fs.rm(path.join(this.dir, file), { force: true })));
+  }
+}
+
+function createDefaultBackend(): ResponseCacheBackend | null {
+  switch (process.env.API_CACHE_BACKEND) {
+    case 'off':
+      return null;
+    case 'file':
+      return new FileCacheBackend(process.env.API_CACHE_DIR || undefined);
+    default:
+      return new MemoryCacheBackend();
+  }
+}
+
+let backend = createDefaultBackend();
+
+/**
+ * Replace the cache backend (null disables caching)
+ */
+export function setResponseCacheBackend(next: ResponseCacheBackend | null): void {
+  backend = next;
+}
+
+// ============================================
+// Cache Keys
+// ============================================
+
+/**
+ * Content hash of base64 image data (ignores data URL prefix and line breaks)
+ */
+export function hashImageData(imageData: string): string {
+  const base64 = imageData.replace(/^data:[^;,]+;base64,/, '').replace(/\s+/g, '');
+  return createHash('sha256').update(Buffer.from(base64, 'base64')).digest('hex');
+}
+
+/**
+ * Normalize inputs so equivalent requests hash the same:
+ * strings trimmed with unified line endings, object keys sorted,
+ * undefined values dropped. Arrays keep their order.
+ */
+function normalizeInput(value: unknown): unknown {
+  if (typeof value === 'string') {
+    return value.replace(/\r\n?/g, '\n').trim();
+  }
+  if (Array.isArray(value)) {
+    return value.map(normalizeInput);
+  }
+  if (value && typeof value === 'object') {
+    const normalized: Record<string, unknown> = {};
+    for (const key of Object.keys(value).sort()) {
+      const field = (value as Record<string, unknown>)[key];
+      if (field !== undefined) {
+        normalized[key] = normalizeInput(field);
+      }
+    }
+    return normalized;
+  }
+  return value;
+}
+
+/**
+ * Content-addressed key for a route and the inputs its prompt is built from
+ */
+export function createCacheKey(route: string, inputs: Record<string, unknown>): string {
+  return createHash('sha256')
+    .update(route)
+    .update('\u0000')
+    .update(JSON.stringify(normalizeInput(inputs)))
+    .digest('hex');
+}
+
+// ============================================
+// Metrics
+// ============================================
+
+export interface RouteCacheMetrics {
+  hits: number;
+  misses: number;
+  coalesced: number;
+  bypassed: number;
+  upstreamCalls: number;
+  upstreamErrors: number;
+  upstreamTotalMs: number;
+  upstreamMaxMs: number;
+}
+
+const routeMetrics = new Map<string, RouteCacheMetrics>();
+
+function getRouteMetrics(route: string): RouteCacheMetrics {
+  let metrics = routeMetrics.get(route);
+  if (!metrics) {
+    metrics = {
+      hits: 0,
+      misses: 0,
+      coalesced: 0,
+      bypassed: 0,
+      upstreamCalls: 0,
+      upstreamErrors: 0,
+      upstreamTotalMs: 0,
+      upstreamMaxMs: 0,
+    };
+    routeMetrics.set(route, metrics);
+  }
+  return metrics;
+}
+
+/**
+ * Metrics per route since the instance started
+ */
+export function getCacheMetrics(): Record<string, RouteCacheMetrics & { hitRate: number; upstreamAvgMs: number }> {
+  const snapshot: Record<string, RouteCacheMetrics & { hitRate: number; upstreamAvgMs: number }> = {};
+  for (const [route, metrics] of routeMetrics) {
+    const lookups = metrics.hits + metrics.coalesced + metrics.misses;
+    snapshot[route] = {
+      ...metrics,
+      hitRate: lookups > 0 ? (metrics.hits + metrics.coalesced) / lookups : 0,
+      upstreamAvgMs: metrics.upstreamCalls > 0 ? metrics.upstreamTotalMs / metrics.upstreamCalls : 0,
+    };
+  }
+  return snapshot;
+}
+
+export function resetCacheMetrics(): void {
+  routeMetrics.clear();
+}
+
+// ============================================
+// Cached Upstream Calls
+// ============================================
+
+export type CacheStatus = 'HIT' | 'MISS' | 'COALESCED' | 'BYPASS';
+
+export interface CachedResult<T> {
+  value: T | null;
+  cacheStatus: CacheStatus;
+}
+
+interface ResponseCacheOptions {
+  route: string;
+  key: string;
+  ttlMs: number;
+  // Skip the cache lookup (the fresh result is still stored)
+  bypass?: boolean;
+}
+
+// Upstream calls in progress, by cache key
+const inFlight = new Map<string, Promise<unknown>>();
+
+async function readEntry<T>(key: string): Promise<T | undefined> {
+  if (!backend) return undefined;
+  try {
+    const entry = await backend.get(key);
+    if (!entry) return undefined;
+    if (entry.expiresAt <= Date.now()) {
+      await backend.delete(key);
+      return undefined;
+    }
+    return entry.value as T;
+  } catch (error) {
+    // A broken cache must never fail the request
+    console.warn('[Cache] Read failed:', error);
+    return undefined;
+  }
+}
+
+async function writeEntry(key: string, value: unknown, ttlMs: number): Promise<void> {
+  if (!backend) return;
+  try {
+    await backend.set(key, { value, expiresAt: Date.now() + ttlMs });
+  } catch (error) {
+    console.warn('[Cache] Write failed:', error);
+  }
+}
+
+/**
+ * Return a cached response for `key`, join an identical request in flight,
+ * or call upstream and cache the result. Null results (fallbacks, parse
+ * failures) are returned but not cached; upstream errors are rethrown to
+ * every waiting caller.
+ */
+export async function withResponseCache<T>(
+  options: ResponseCacheOptions,
+  fetchUpstream: () => Promise<T | null>
+): Promise<CachedResult<T>> {
+  const { route, key, ttlMs, bypass = false } = options;
+  const metrics = getRouteMetrics(route);
+
+  if (!bypass) {
+    const pending = inFlight.get(key) as Promise<T | null> | undefined;
+    if (pending) {
+      metrics.coalesced++;
+      return { value: await pending, cacheStatus: 'COALESCED' };
+    }
+
+    const cached = await readEntry<T>(key);
+    if (cached !== undefined) {
+      metrics.hits++;
+      console.log(`[Cache] ${route} HIT ${key.slice(0, 12)}`);
+      return { value: cached, cacheStatus: 'HIT' };
+    }
+
+    // Another request may have started while the backend was read
+    const started = inFlight.get(key) as Promise<T | null> | undefined;
+    if (started) {
+      metrics.coalesced++;
+      return { value: await started, cacheStatus: 'COALESCED' };
+    }
+    metrics.misses++;
+  } else {
+    metrics.bypassed++;
+  }
+
+  const startedAt = Date.now();
+  const upstream = (async () => {
+    metrics.upstreamCalls++;
+    try {
+      const value = await fetchUpstream();
+      if (value !== null) {
+        await writeEntry(key, value, ttlMs);
+      }
+      return value;
+    } catch (error) {
+      metrics.upstreamErrors++;
+      throw error;
+    } finally {
+      const elapsed = Date.now() - startedAt;
+      metrics.upstreamTotalMs += elapsed;
+      metrics.upstreamMaxMs = Math.max(metrics.upstreamMaxMs, elapsed);
+      console.log(`[Cache] ${route} ${bypass ? 'BYPASS' : 'MISS'} ${key.slice(0, 12)} upstream ${elapsed}ms`);
+    }
+  })();
+
+  if (!bypass) {
+    inFlight.set(key, upstream);
+  }
+  try {
+    return { value: await upstream, cacheStatus: bypass ? 'BYPASS' : 'MISS' };
+  } finally {
+    if (inFlight.get(key) === upstream) {
+      inFlight.delete(key);
+    }
+  }
+}
+
+/**
+ * True if the client asked for a fresh response
+ */
+export function shouldBypassCache(req: VercelRequest): boolean {
+  const cacheControl = req.headers['cache-control'];
+  return typeof cacheControl === 'string' && /no-cache|no-store/.test(cacheControl);
+}
+
+/**
+ * Report cache status to the client
+ */
+export function setCacheHeaders(res: VercelResponse, cacheStatus: CacheStatus): void {
+  res.setHeader('X-Cache', cacheStatus);
+}
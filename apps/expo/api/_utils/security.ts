@@ -1,10 +1,12 @@
 /**
  * API Security Utilities
  *
- * Shared security middleware for Vercel Edge Functions:
+ * Shared security checks for Vercel Edge Functions:
  * - CORS allowlist
- * - Rate limiting
  * - Request validation
+ *
+ * Routes don't call these directly; see pipeline.ts (which also applies
+ * rate limiting from rateLimit.ts).
  */
 
 import type { VercelRequest, VercelResponse } from '@vercel/node';
@@ -23,64 +25,6 @@ const ALLOWED_ORIGINS = [
   'exp://localhost:8081',
 ];
 
-// Rate limiting store (in-memory, resets on cold start)
-// For production, consider using Vercel KV or Redis
-const rateLimitStore = new Map<string, { count: number; resetAt: number }>();
-
-// Rate limit configuration
-const RATE_LIMIT = {
-  maxRequests: 30, // requests per window
-  windowMs: 60 * 1000, // 1 minute window
-};
-
-/**
- * Get client identifier for rate limiting
- */
-function getClientId(req: VercelRequest): string {
-  // Use X-Forwarded-For header or fall back to a default
-  const forwarded = req.headers['x-forwarded-for'];
-  if (typeof forwarded === 'string') {
-    return forwarded.split(',')[0].trim();
-  }
-  return 'unknown';
-}
-
-/**
- * Check rate limit for a client
- */
-function checkRateLimit(clientId: string): { allowed: boolean; remaining: number; resetIn: number } {
-  const now = Date.now();
-  const entry = rateLimitStore.get(clientId);
-
-  if (!entry || now > entry.resetAt) {
-    // New window
-    rateLimitStore.set(clientId, {
-      count: 1,
-      resetAt: now + RATE_LIMIT.windowMs,
-    });
-    return {
-      allowed: true,
-      remaining: RATE_LIMIT.maxRequests - 1,
-      resetIn: RATE_LIMIT.windowMs,
-    };
-  }
-
-  if (entry.count >= RATE_LIMIT.maxRequests) {
-    return {
-      allowed: false,
-      remaining: 0,
-      resetIn: entry.resetAt - now,
-    };
-  }
-
-  entry.count++;
-  return {
-    allowed: true,
-    remaining: RATE_LIMIT.maxRequests - entry.count,
-    resetIn: entry.resetAt - now,
-  };
-}
-
 /**
  * Set CORS headers with allowlist
  */
@@ -118,32 +62,6 @@ export function handlePreflight(req: VercelRequest, res: VercelResponse): boolea
   return false;
 }
 
-/**
- * Apply rate limiting
- */
-export function applyRateLimit(
-  req: VercelRequest,
-  res: VercelResponse
-): { allowed: boolean } {
-  const clientId = getClientId(req);
-  const { allowed, remaining, resetIn } = checkRateLimit(clientId);
-
-  // Set rate limit headers
-  res.setHeader('X-RateLimit-Limit', RATE_LIMIT.maxRequests.toString());
-  res.setHeader('X-RateLimit-Remaining', remaining.toString());
-  res.setHeader('X-RateLimit-Reset', Math.ceil(resetIn / 1000).toString());
-
-  if (!allowed) {
-    res.status(429).json({
-      error: 'Too many requests',
-      retryAfter: Math.ceil(resetIn / 1000),
-    });
-    return { allowed: false };
-  }
-
-  return { allowed: true };
-}
-
 /**
  * Validate required HTTP method
  */
@@ -159,44 +77,6 @@ export function validateMethod(
   return true;
 }
 
-/**
- * Combined security middleware
- * Returns true if request should continue, false if response was sent
- */
-export function applySecurity(
-  req: VercelRequest,
-  res: VercelResponse,
-  options: {
-    allowedMethods?: string[];
-    skipRateLimit?: boolean;
-  } = {}
-): boolean {
-  const { allowedMethods = ['POST'], skipRateLimit = false } = options;
-
-  // Set CORS headers
-  setCorsHeaders(req, res);
-
-  // Handle preflight
-  if (handlePreflight(req, res)) {
-    return false;
-  }
-
-  // Validate method
-  if (!validateMethod(req, res, allowedMethods)) {
-    return false;
-  }
-
-  // Apply rate limiting
-  if (!skipRateLimit) {
-    const { allowed } = applyRateLimit(req, res);
-    if (!allowed) {
-      return false;
-    }
-  }
-
-  return true;
-}
-
 /**
  * Validate request body has required fields
  */
@@ -13,9 +13,19 @@
 
 import type { VercelRequest, VercelResponse } from '@vercel/node';
 import { GoogleGenerativeAI } from '@google/generative-ai';
-import { applySecurity } from './_utils/security';
+import { sendApiError, TEXT_MAX_BODY_BYTES, withApiPipeline } from './_utils/pipeline';
+import {
+  createCacheKey,
+  setCacheHeaders,
+  shouldBypassCache,
+  withResponseCache,
+} from './_utils/responseCache';
 
 const GEMINI_API_KEY = process.env.GEMINI_API_KEY;
+const GEMINI_MODEL = 'gemini-2.0-flash';
+
+// Re-opening a note or retrying re-sends identical content
+const CACHE_TTL_MS = 24 * 60 * 60 * 1000;
 
 // The 30 preset label names for matching
 const PRESET_LABELS = [
@@ -75,12 +85,23 @@ interface AnalysisResult {
   };
 }
 
-export default async function handler(req: VercelRequest, res: VercelResponse) {
-  // Apply security middleware (CORS, rate limiting, method validation)
-  if (!applySecurity(req, res, { allowedMethods: ['POST'] })) {
-    return;
-  }
+// Returned when Gemini's response can't be parsed
+const DEFAULT_ANALYSIS_RESULT: AnalysisResult = {
+  matchedLabels: [],
+  suggestedNewLabels: [],
+  analysis: {
+    topics: [],
+    mood: 'calm',
+    contentType: 'notes',
+  },
+};
+
+export default withApiPipeline({
+  route: 'analyze-note-content',
+  maxBodyBytes: TEXT_MAX_BODY_BYTES,
+}, handler);
 
+async function handler(req: VercelRequest, res: VercelResponse) {
   if (!GEMINI_API_KEY) {
     return res.status(500).json({ error: 'GEMINI_API_KEY not configured' });
   }
@@ -92,15 +113,45 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
       return res.status(400).json({ error: 'noteTitle or noteContent is required' });
     }
 
-    console.log('Analyzing note content for labeling...');
+    const cacheKey = createCacheKey('analyze-note-content', {
+      model: GEMINI_MODEL,
+      noteTitle,
+      noteContent,
+      existingLabels: Array.from(new Set(existingLabels)).sort(),
+    });
+
+    const { value: analysisResult, cacheStatus } = await withResponseCache(
+      { route: 'analyze-note-content', key: cacheKey, ttlMs: CACHE_TTL_MS, bypass: shouldBypassCache(req) },
+      () => analyzeContent(GEMINI_API_KEY, noteTitle, noteContent, existingLabels)
+    );
 
-    const genAI = new GoogleGenerativeAI(GEMINI_API_KEY);
-    const model = genAI.getGenerativeModel({ model: 'gemini-2.0-flash' });
+    setCacheHeaders(res, cacheStatus);
+    return res.status(200).json(analysisResult ?? DEFAULT_ANALYSIS_RESULT);
 
-    // Combine preset labels with user's existing custom labels
-    const allLabels = [...PRESET_LABELS, ...existingLabels.filter(l => !PRESET_LABELS.includes(l.toLowerCase()))];
+  } catch (error: any) {
+    console.error('Error analyzing note content:', error);
+    return sendApiError(res, error);
+  }
+}
 
-    const prompt = `You are a note organization assistant. You understand content in ANY language (Korean, Japanese, Chinese, Spanish, French, German, etc.). Analyze notes regardless of their language and suggest appropriate labels from the English label list.
+/**
+ * Ask Gemini to match the note against labels. Returns null if the response can't be parsed.
+ */
+async function analyzeContent(
+  apiKey: string,
+  noteTitle: string,
+  noteContent: string,
+  existingLabels: string[]
+): Promise<AnalysisResult | null> {
+  console.log('Analyzing note content for labeling...');
+
+  const genAI = new GoogleGenerativeAI(apiKey);
+  const model = genAI.getGenerativeModel({ model: GEMINI_MODEL });
+
+  // Combine preset labels with user's existing custom labels
+  const allLabels = [...PRESET_LABELS, ...existingLabels.filter(l => !PRESET_LABELS.includes(l.toLowerCase()))];
+
+  const prompt = `You are a note organization assistant. You understand content in ANY language (Korean, Japanese, Chinese, Spanish, French, German, etc.). Analyze notes regardless of their language and suggest appropriate labels from the English label list.
 
 ## Note to Analyze
 Title: ${noteTitle || '(Untitled)'}
@@ -157,78 +208,57 @@ Return a JSON object with this exact structure:
 - Maximum 2 suggestedNewLabels
 - Return ONLY the JSON object, no other text`;
 
-    const result = await model.generateContent(prompt);
-    const response = await result.response;
-    let text = response.text();
-
-    // Clean up response - remove markdown code blocks if present
-    text = text.replace(/```json\n?/g, '').replace(/```\n?/g, '').trim();
-
-    console.log('Gemini response:', text);
-
-    let analysisResult: AnalysisResult;
-
-    try {
-      analysisResult = JSON.parse(text);
-    } catch (parseError) {
-      console.error('Failed to parse Gemini response:', parseError);
-      // Return default structure on parse failure
-      return res.status(200).json({
-        matchedLabels: [],
-        suggestedNewLabels: [],
-        analysis: {
-          topics: [],
-          mood: 'calm',
-          contentType: 'notes',
-        },
-      });
-    }
+  const result = await model.generateContent(prompt);
+  const response = await result.response;
+  let text = response.text();
 
-    // Validate and sanitize the response
-    const sanitizedResult: AnalysisResult = {
-      matchedLabels: (analysisResult.matchedLabels || [])
-        .filter((m: MatchedLabel) =>
-          m.labelName &&
-          typeof m.confidence === 'number' &&
-          m.confidence >= 0.3
-        )
-        .map((m: MatchedLabel) => ({
-          labelName: m.labelName.toLowerCase(),
-          confidence: Math.min(1, Math.max(0, m.confidence)),
-          reason: m.reason || '',
-        }))
-        .sort((a: MatchedLabel, b: MatchedLabel) => b.confidence - a.confidence)
-        .slice(0, 5),
-      suggestedNewLabels: (analysisResult.suggestedNewLabels || [])
-        .filter((s: SuggestedNewLabel) => s.name && s.category)
-        .map((s: SuggestedNewLabel) => ({
-          name: s.name.toLowerCase().replace(/\s+/g, '-'),
-          category: s.category,
-          reason: s.reason || '',
-        }))
-        .slice(0, 2),
-      analysis: {
-        topics: analysisResult.analysis?.topics || [],
-        // Validate mood against allowed values, default to 'calm' if invalid
-        mood: VALID_MOODS.includes(analysisResult.analysis?.mood as ValidMood)
-          ? analysisResult.analysis.mood
-          : 'calm',
-        contentType: analysisResult.analysis?.contentType || 'notes',
-      },
-    };
-
-    return res.status(200).json(sanitizedResult);
+  // Clean up response - remove markdown code blocks if present
+  text = text.replace(/```json\n?/g, '').replace(/```\n?/g, '').trim();
 
-  } catch (error: any) {
-    console.error('Error analyzing note content:', error);
+  console.log('Gemini response:', text);
 
-    if (error.message?.includes('429') || error.message?.includes('quota')) {
-      return res.status(429).json({
-        error: 'Rate limit exceeded',
-        retryAfter: 60,
-      });
-    }
+  let analysisResult: AnalysisResult;
 
-    return res.status(500).json({ error: error.message || 'Internal server error' });
+  try {
+    analysisResult = JSON.parse(text);
+  } catch (parseError) {
+    console.error('Failed to parse Gemini response:', parseError);
+    // Not cached - the handler falls back to the default structure
+    return null;
   }
+
+  // Validate and sanitize the response
+  const sanitizedResult: AnalysisResult = {
+    matchedLabels: (analysisResult.matchedLabels || [])
+      .filter((m: MatchedLabel) =>
+        m.labelName &&
+        typeof m.confidence === 'number' &&
+        m.confidence >= 0.3
+      )
+      .map((m: MatchedLabel) => ({
+        labelName: m.labelName.toLowerCase(),
+        confidence: Math.min(1, Math.max(0, m.confidence)),
+        reason: m.reason || '',
+      }))
+      .sort((a: MatchedLabel, b: MatchedLabel) => b.confidence - a.confidence)
+      .slice(0, 5),
+    suggestedNewLabels: (analysisResult.suggestedNewLabels || [])
+      .filter((s: SuggestedNewLabel) => s.name && s.category)
+      .map((s: SuggestedNewLabel) => ({
+        name: s.name.toLowerCase().replace(/\s+/g, '-'),
+        category: s.category,
+        reason: s.reason || '',
+      }))
+      .slice(0, 2),
+    analysis: {
+      topics: analysisResult.analysis?.topics || [],
+      // Validate mood against allowed values, default to 'calm' if invalid
+      mood: VALID_MOODS.includes(analysisResult.analysis?.mood as ValidMood)
+        ? analysisResult.analysis.mood
+        : 'calm',
+      contentType: analysisResult.analysis?.contentType || 'notes',
+    },
+  };
+
+  return sanitizedResult;
 }
@@ -1,33 +1,72 @@
 import type { VercelRequest, VercelResponse } from '@vercel/node';
 import { GoogleGenerativeAI } from '@google/generative-ai';
-import { applySecurity, validateBody } from './_utils/security';
+import { sendApiError, withApiPipeline } from './_utils/pipeline';
+import {
+  createCacheKey,
+  hashImageData,
+  setCacheHeaders,
+  shouldBypassCache,
+  withResponseCache,
+} from './_utils/responseCache';
 
 const GEMINI_API_KEY = process.env.GEMINI_API_KEY;
+const GEMINI_MODEL = 'gemini-2.0-flash';
 
-export default async function handler(req: VercelRequest, res: VercelResponse) {
-  // Apply security middleware (CORS, rate limiting, method validation)
-  if (!applySecurity(req, res, { allowedMethods: ['POST'] })) {
-    return;
-  }
+// Overrides depend only on the image and the theme's base colors
+const CACHE_TTL_MS = 7 * 24 * 60 * 60 * 1000;
+
+export default withApiPipeline({
+  route: 'extract-colors',
+  requiredFields: ['imageData'],
+  imageFields: ['imageData'],
+}, handler);
 
+async function handler(req: VercelRequest, res: VercelResponse) {
   if (!GEMINI_API_KEY) {
     return res.status(500).json({ error: 'GEMINI_API_KEY not configured' });
   }
 
-  // Validate required fields
-  if (!validateBody(req, res, ['imageData'])) {
-    return;
-  }
-
   try {
     const { imageData, mimeType, themeId, baseColors } = req.body;
 
-    console.log(`Extracting colors for ${themeId} theme...`);
+    const cacheKey = createCacheKey('extract-colors', {
+      model: GEMINI_MODEL,
+      image: hashImageData(imageData),
+      mimeType: mimeType || 'image/jpeg',
+      themeId,
+      baseColors,
+    });
+
+    const { value: colorData, cacheStatus } = await withResponseCache(
+      { route: 'extract-colors', key: cacheKey, ttlMs: CACHE_TTL_MS, bypass: shouldBypassCache(req) },
+      () => extractColors(GEMINI_API_KEY, imageData, mimeType, themeId, baseColors)
+    );
+
+    setCacheHeaders(res, cacheStatus);
+    return res.status(200).json(colorData);
+
+  } catch (error: any) {
+    console.error('Error extracting colors:', error);
+    return sendApiError(res, error);
+  }
+}
 
-    const genAI = new GoogleGenerativeAI(GEMINI_API_KEY);
-    const model = genAI.getGenerativeModel({ model: 'gemini-2.0-flash' });
+/**
+ * Ask Gemini for color overrides that harmonize the image with a theme
+ */
+async function extractColors(
+  apiKey: string,
+  imageData: string,
+  mimeType: string | undefined,
+  themeId: string,
+  baseColors?: Record<string, string>
+): Promise<unknown> {
+  console.log(`Extracting colors for ${themeId} theme...`);
 
-    const prompt = `Analyze this image and extract colors that would harmonize with the following base theme colors:
+  const genAI = new GoogleGenerativeAI(apiKey);
+  const model = genAI.getGenerativeModel({ model: GEMINI_MODEL });
+
+  const prompt = `Analyze this image and extract colors that would harmonize with the following base theme colors:
 
 Base Theme Colors:
 - Background: ${baseColors?.background || '#FFFFFF'}
@@ -57,38 +96,23 @@ Return a JSON object with ONLY the colors you want to override (don't include co
 Only include colors that you're confident would improve the theme based on the image.
 Return ONLY the JSON object, no other text.`;
 
-    const result = await model.generateContent([
-      prompt,
-      {
-        inlineData: {
-          mimeType: mimeType || 'image/jpeg',
-          data: imageData
-        }
+  const result = await model.generateContent([
+    prompt,
+    {
+      inlineData: {
+        mimeType: mimeType || 'image/jpeg',
+        data: imageData
       }
-    ]);
-
-    const response = await result.response;
-    let text = response.text();
-
-    // Clean up the response
-    text = text.replace(/```json\n?/g, '').replace(/```\n?/g, '').trim();
+    }
+  ]);
 
-    console.log('Color extraction response:', text);
+  const response = await result.response;
+  let text = response.text();
 
-    const colorData = JSON.parse(text);
+  // Clean up the response
+  text = text.replace(/```json\n?/g, '').replace(/```\n?/g, '').trim();
 
-    return res.status(200).json(colorData);
+  console.log('Color extraction response:', text);
 
-  } catch (error: any) {
-    console.error('Error extracting colors:', error);
-
-    if (error.message?.includes('429') || error.message?.includes('quota')) {
-      return res.status(429).json({
-        error: 'Rate limit exceeded',
-        retryAfter: 60
-      });
-    }
-
-    return res.status(500).json({ error: error.message || 'Internal server error' });
-  }
+  return JSON.parse(text);
 }
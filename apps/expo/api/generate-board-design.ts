@@ -1,24 +1,20 @@
 import type { VercelRequest, VercelResponse } from '@vercel/node';
 import { GoogleGenerativeAI } from '@google/generative-ai';
-import { applySecurity, validateBody } from './_utils/security';
+import { sendApiError, TEXT_MAX_BODY_BYTES, withApiPipeline } from './_utils/pipeline';
 
 const GEMINI_API_KEY = process.env.GEMINI_API_KEY;
 
-export default async function handler(req: VercelRequest, res: VercelResponse) {
-  // Apply security middleware (CORS, rate limiting, method validation)
-  if (!applySecurity(req, res, { allowedMethods: ['POST'] })) {
-    return;
-  }
+export default withApiPipeline({
+  route: 'generate-board-design',
+  maxBodyBytes: TEXT_MAX_BODY_BYTES,
+  requiredFields: ['hashtag'],
+}, handler);
 
+async function handler(req: VercelRequest, res: VercelResponse) {
   if (!GEMINI_API_KEY) {
     return res.status(500).json({ error: 'GEMINI_API_KEY not configured' });
   }
 
-  // Validate required fields
-  if (!validateBody(req, res, ['hashtag'])) {
-    return;
-  }
-
   try {
     const { hashtag, noteContent, userHint } = req.body;
 
@@ -96,14 +92,6 @@ Return ONLY the JSON object.`;
 
   } catch (error: any) {
     console.error('Error generating board design:', error);
-
-    if (error.message?.includes('429') || error.message?.includes('quota')) {
-      return res.status(429).json({
-        error: 'Rate limit exceeded',
-        retryAfter: 60
-      });
-    }
-
-    return res.status(500).json({ error: error.message || 'Internal server error' });
+    return sendApiError(res, error);
   }
 }
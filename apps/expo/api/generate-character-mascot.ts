@@ -1,6 +1,6 @@
 import type { VercelRequest, VercelResponse } from '@vercel/node';
 import { GoogleGenerativeAI } from '@google/generative-ai';
-import { applySecurity } from './_utils/security';
+import { sendApiError, TEXT_MAX_BODY_BYTES, withApiPipeline } from './_utils/pipeline';
 
 const GEMINI_API_KEY = process.env.GEMINI_API_KEY;
 
@@ -90,12 +90,12 @@ function extractCharacterQuality(
   };
 }
 
-export default async function handler(req: VercelRequest, res: VercelResponse) {
-  // Apply security middleware (CORS, rate limiting, method validation)
-  if (!applySecurity(req, res, { allowedMethods: ['POST'] })) {
-    return;
-  }
+export default withApiPipeline({
+  route: 'generate-character-mascot',
+  maxBodyBytes: TEXT_MAX_BODY_BYTES,
+}, handler);
 
+async function handler(req: VercelRequest, res: VercelResponse) {
   if (!GEMINI_API_KEY) {
     return res.status(500).json({ error: 'GEMINI_API_KEY not configured' });
   }
@@ -234,14 +234,6 @@ Make the character appealing and full of personality!`;
 
   } catch (error: any) {
     console.error('Character Mascot error:', error);
-
-    if (error.message?.includes('429') || error.message?.includes('quota')) {
-      return res.status(429).json({
-        error: 'Rate limit exceeded',
-        retryAfter: 60
-      });
-    }
-
-    return res.status(500).json({ error: error.message || 'Failed to generate character' });
+    return sendApiError(res, error, 'Failed to generate character');
   }
 }
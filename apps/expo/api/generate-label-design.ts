@@ -12,9 +12,19 @@
 
 import type { VercelRequest, VercelResponse } from '@vercel/node';
 import { GoogleGenerativeAI } from '@google/generative-ai';
-import { applySecurity, validateBody } from './_utils/security';
+import { sendApiError, TEXT_MAX_BODY_BYTES, withApiPipeline } from './_utils/pipeline';
+import {
+  createCacheKey,
+  setCacheHeaders,
+  shouldBypassCache,
+  withResponseCache,
+} from './_utils/responseCache';
 
 const GEMINI_API_KEY = process.env.GEMINI_API_KEY;
+const GEMINI_MODEL = 'gemini-2.0-flash';
+
+// Recreating a label (or retrying) asks for the same design
+const CACHE_TTL_MS = 7 * 24 * 60 * 60 * 1000;
 
 interface GenerateDesignRequest {
   labelName: string;
@@ -81,30 +91,54 @@ const AVAILABLE_ICONS = [
   'Globe', 'World', 'Translate', 'ChatTeardrop',
 ];
 
-export default async function handler(req: VercelRequest, res: VercelResponse) {
-  // Apply security middleware (CORS, rate limiting, method validation)
-  if (!applySecurity(req, res, { allowedMethods: ['POST'] })) {
-    return;
-  }
+export default withApiPipeline({
+  route: 'generate-label-design',
+  maxBodyBytes: TEXT_MAX_BODY_BYTES,
+  requiredFields: ['labelName'],
+}, handler);
 
+async function handler(req: VercelRequest, res: VercelResponse) {
   if (!GEMINI_API_KEY) {
     return res.status(500).json({ error: 'GEMINI_API_KEY not configured' });
   }
 
-  // Validate required fields
-  if (!validateBody(req, res, ['labelName'])) {
-    return;
-  }
-
   try {
     const { labelName, context } = req.body as GenerateDesignRequest;
 
-    console.log(`Generating design for label: ${labelName}`);
+    const cacheKey = createCacheKey('generate-label-design', {
+      model: GEMINI_MODEL,
+      labelName,
+      context,
+    });
+
+    const { value: design, cacheStatus } = await withResponseCache(
+      { route: 'generate-label-design', key: cacheKey, ttlMs: CACHE_TTL_MS, bypass: shouldBypassCache(req) },
+      () => generateLabelDesign(GEMINI_API_KEY, labelName, context)
+    );
+
+    setCacheHeaders(res, cacheStatus);
+    return res.status(200).json(design ?? createDefaultDesign(labelName));
 
-    const genAI = new GoogleGenerativeAI(GEMINI_API_KEY);
-    const model = genAI.getGenerativeModel({ model: 'gemini-2.0-flash' });
+  } catch (error: any) {
+    console.error('Error generating label design:', error);
+    return sendApiError(res, error);
+  }
+}
 
-    const prompt = `You are a visual design system expert creating a note label design. Generate a cohesive, aesthetically pleasing design for this label.
+/**
+ * Ask Gemini for a label design. Returns null if the response can't be parsed.
+ */
+async function generateLabelDesign(
+  apiKey: string,
+  labelName: string,
+  context?: string
+): Promise<GeneratedLabelDesign | null> {
+  console.log(`Generating design for label: ${labelName}`);
+
+  const genAI = new GoogleGenerativeAI(apiKey);
+  const model = genAI.getGenerativeModel({ model: GEMINI_MODEL });
+
+  const prompt = `You are a visual design system expert creating a note label design. Generate a cohesive, aesthetically pleasing design for this label.
 
 ## Label to Design
 Name: ${labelName}
@@ -160,66 +194,53 @@ Generate a JSON object with this exact structure:
 
 Return ONLY the JSON object, no other text.`;
 
-    const result = await model.generateContent(prompt);
-    const response = await result.response;
-    let text = response.text();
-
-    // Clean up response - remove markdown code blocks if present
-    text = text.replace(/```json\n?/g, '').replace(/```\n?/g, '').trim();
-
-    console.log('Gemini response:', text);
-
-    let designData: any;
-
-    try {
-      designData = JSON.parse(text);
-    } catch (parseError) {
-      console.error('Failed to parse Gemini response:', parseError);
-      // Return a default design on parse failure
-      return res.status(200).json(createDefaultDesign(labelName));
-    }
-
-    // Validate and sanitize the response
-    const sanitizedDesign: GeneratedLabelDesign = {
-      id: labelName.toLowerCase().replace(/\s+/g, '-'),
-      name: labelName,
-      category: validateCategory(designData.category),
-      icon: designData.icon || '📝✨',
-      noteIcon: validateIcon(designData.noteIcon),
-      mood: validateMood(designData.mood),
-      description: (designData.description || `Notes about ${labelName}`).slice(0, 30),
-      colors: validateColors(designData.colors),
-      bgStyle: validateBgStyle(designData.bgStyle),
-      bgGradient: designData.bgStyle === 'gradient' && Array.isArray(designData.bgGradient)
-        ? designData.bgGradient.slice(0, 2)
-        : undefined,
-      bgPattern: designData.bgStyle === 'pattern' && AVAILABLE_PATTERNS.includes(designData.bgPattern)
-        ? designData.bgPattern
-        : undefined,
-      fontStyle: validateFontStyle(designData.fontStyle),
-      stickerType: validateStickerType(designData.stickerType),
-      stickerEmoji: designData.stickerEmoji || '✨',
-      stickerPosition: validatePosition(designData.stickerPosition),
-      aiPromptHints: Array.isArray(designData.aiPromptHints)
-        ? designData.aiPromptHints.slice(0, 4)
-        : [labelName, 'notes', 'organized'],
-      artStyle: designData.artStyle || `anime character related to ${labelName}, cute style`,
-    };
-
-    return res.status(200).json(sanitizedDesign);
+  const result = await model.generateContent(prompt);
+  const response = await result.response;
+  let text = response.text();
 
-  } catch (error: any) {
-    console.error('Error generating label design:', error);
+  // Clean up response - remove markdown code blocks if present
+  text = text.replace(/```json\n?/g, '').replace(/```\n?/g, '').trim();
+
+  console.log('Gemini response:', text);
 
-    if (error.message?.includes('429') || error.message?.includes('quota')) {
-      return res.status(429).json({
-        error: 'Rate limit exceeded',
-        retryAfter: 60,
-      });
-    }
+  let designData: any;
 
-    return res.status(500).json({ error: error.message || 'Internal server error' });
+  try {
+    designData = JSON.parse(text);
+  } catch (parseError) {
+    console.error('Failed to parse Gemini response:', parseError);
+    // Not cached - the handler falls back to a default design
+    return null;
   }
+
+  // Validate and sanitize the response
+  const sanitizedDesign: GeneratedLabelDesign = {
+    id: labelName.toLowerCase().replace(/\s+/g, '-'),
+    name: labelName,
+    category: validateCategory(designData.category),
+    icon: designData.icon || '📝✨',
+    noteIcon: validateIcon(designData.noteIcon),
+    mood: validateMood(designData.mood),
+    description: (designData.description || `Notes about ${labelName}`).slice(0, 30),
+    colors: validateColors(designData.colors),
+    bgStyle: validateBgStyle(designData.bgStyle),
+    bgGradient: designData.bgStyle === 'gradient' && Array.isArray(designData.bgGradient)
+      ? designData.bgGradient.slice(0, 2)
+      : undefined,
+    bgPattern: designData.bgStyle === 'pattern' && AVAILABLE_PATTERNS.includes(designData.bgPattern)
+      ? designData.bgPattern
+      : undefined,
+    fontStyle: validateFontStyle(designData.fontStyle),
+    stickerType: validateStickerType(designData.stickerType),
+    stickerEmoji: designData.stickerEmoji || '✨',
+    stickerPosition: validatePosition(designData.stickerPosition),
+    aiPromptHints: Array.isArray(designData.aiPromptHints)
+      ? designData.aiPromptHints.slice(0, 4)
+      : [labelName, 'notes', 'organized'],
+    artStyle: designData.artStyle || `anime character related to ${labelName}, cute style`,
+  };
+
+  return sanitizedDesign;
 }
 
 // Helper functions for validation
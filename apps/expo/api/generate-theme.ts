@@ -1,33 +1,64 @@
 import type { VercelRequest, VercelResponse } from '@vercel/node';
 import { GoogleGenerativeAI } from '@google/generative-ai';
-import { applySecurity, validateBody } from './_utils/security';
+import { sendApiError, withApiPipeline } from './_utils/pipeline';
+import {
+  createCacheKey,
+  hashImageData,
+  setCacheHeaders,
+  shouldBypassCache,
+  withResponseCache,
+} from './_utils/responseCache';
 
 const GEMINI_API_KEY = process.env.GEMINI_API_KEY;
+const GEMINI_MODEL = 'gemini-2.0-flash';
 
-export default async function handler(req: VercelRequest, res: VercelResponse) {
-  // Apply security middleware (CORS, rate limiting, method validation)
-  if (!applySecurity(req, res, { allowedMethods: ['POST'] })) {
-    return;
-  }
+// Same image, same theme - reopening the picker or retrying shouldn't re-run Gemini
+const CACHE_TTL_MS = 7 * 24 * 60 * 60 * 1000;
+
+export default withApiPipeline({
+  route: 'generate-theme',
+  requiredFields: ['imageData'],
+  imageFields: ['imageData'],
+}, handler);
 
+async function handler(req: VercelRequest, res: VercelResponse) {
   if (!GEMINI_API_KEY) {
     return res.status(500).json({ error: 'GEMINI_API_KEY not configured' });
   }
 
-  // Validate required fields
-  if (!validateBody(req, res, ['imageData'])) {
-    return;
-  }
-
   try {
     const { imageData, mimeType } = req.body;
 
-    console.log('Generating theme from image...');
+    const cacheKey = createCacheKey('generate-theme', {
+      model: GEMINI_MODEL,
+      image: hashImageData(imageData),
+      mimeType: mimeType || 'image/jpeg',
+    });
+
+    const { value: themeData, cacheStatus } = await withResponseCache(
+      { route: 'generate-theme', key: cacheKey, ttlMs: CACHE_TTL_MS, bypass: shouldBypassCache(req) },
+      () => generateTheme(GEMINI_API_KEY, imageData, mimeType)
+    );
+
+    setCacheHeaders(res, cacheStatus);
+    return res.status(200).json(themeData);
+
+  } catch (error: any) {
+    console.error('Error generating theme:', error);
+    return sendApiError(res, error);
+  }
+}
 
-    const genAI = new GoogleGenerativeAI(GEMINI_API_KEY);
-    const model = genAI.getGenerativeModel({ model: 'gemini-2.0-flash' });
+/**
+ * Ask Gemini for a note theme inspired by the image
+ */
+async function generateTheme(apiKey: string, imageData: string, mimeType?: string): Promise<unknown> {
+  console.log('Generating theme from image...');
 
-    const prompt = `Analyze this image and create a note theme based on its visual style and colors.
+  const genAI = new GoogleGenerativeAI(apiKey);
+  const model = genAI.getGenerativeModel({ model: GEMINI_MODEL });
+
+  const prompt = `Analyze this image and create a note theme based on its visual style and colors.
 
 Return a JSON object with this exact structure:
 {
@@ -50,38 +81,23 @@ Return a JSON object with this exact structure:
 Extract colors directly from the image. Make the theme feel cohesive and inspired by the image's mood and aesthetic.
 Return ONLY the JSON object, no other text.`;
 
-    const result = await model.generateContent([
-      prompt,
-      {
-        inlineData: {
-          mimeType: mimeType || 'image/jpeg',
-          data: imageData
-        }
+  const result = await model.generateContent([
+    prompt,
+    {
+      inlineData: {
+        mimeType: mimeType || 'image/jpeg',
+        data: imageData
       }
-    ]);
-
-    const response = await result.response;
-    let text = response.text();
-
-    // Clean up the response - remove markdown code blocks if present
-    text = text.replace(/```json\n?/g, '').replace(/```\n?/g, '').trim();
+    }
+  ]);
 
-    console.log('Gemini response:', text);
+  const response = await result.response;
+  let text = response.text();
 
-    const themeData = JSON.parse(text);
+  // Clean up the response - remove markdown code blocks if present
+  text = text.replace(/```json\n?/g, '').replace(/```\n?/g, '').trim();
 
-    return res.status(200).json(themeData);
+  console.log('Gemini response:', text);
 
-  } catch (error: any) {
-    console.error('Error generating theme:', error);
-
-    if (error.message?.includes('429') || error.message?.includes('quota')) {
-      return res.status(429).json({
-        error: 'Rate limit exceeded',
-        retryAfter: 60
-      });
-    }
-
-    return res.status(500).json({ error: error.message || 'Internal server error' });
-  }
+  return JSON.parse(text);
 }
@@ -12,7 +12,7 @@
 
 import type { VercelRequest, VercelResponse } from '@vercel/node';
 import { GoogleGenerativeAI } from '@google/generative-ai';
-import { applySecurity } from './_utils/security';
+import { TEXT_MAX_BODY_BYTES, withApiPipeline } from './_utils/pipeline';
 
 const GEMINI_API_KEY = process.env.GEMINI_API_KEY;
 const SLACK_WEBHOOK_URL = process.env.SLACK_WEBHOOK_URL;
@@ -31,11 +31,12 @@ const AGENT_VOICES: Record<string, string> = {
     'Warm and reflective. Connects experiences to personal growth. Uses empathetic language.',
 };
 
-export default async function handler(req: VercelRequest, res: VercelResponse) {
-  if (!applySecurity(req, res, { allowedMethods: ['POST'] })) {
-    return;
-  }
+export default withApiPipeline({
+  route: 'goal-agent',
+  maxBodyBytes: TEXT_MAX_BODY_BYTES,
+}, handler);
 
+async function handler(req: VercelRequest, res: VercelResponse) {
   const { action } = req.body;
 
   if (action === 'analyze') {
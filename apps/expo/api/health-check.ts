@@ -12,7 +12,7 @@
  */
 
 import type { VercelRequest, VercelResponse } from '@vercel/node';
-import { applySecurity } from './_utils/security';
+import { withApiPipeline } from './_utils/pipeline';
 
 const SLACK_WEBHOOK_URL = process.env.SLACK_WEBHOOK_URL;
 const CRON_SECRET = process.env.CRON_SECRET;
@@ -71,6 +71,8 @@ async function checkEndpoint(endpoint: typeof ENDPOINTS_TO_CHECK[0]): Promise<En
       method: endpoint.method,
       headers: {
         'Content-Type': 'application/json',
+        // Exercise the upstream model, not the response cache
+        'Cache-Control': 'no-cache',
       },
       body: endpoint.method === 'POST' ? JSON.stringify(endpoint.body) : undefined,
       signal: controller.signal,
@@ -216,15 +218,16 @@ function verifyCronAuth(req: VercelRequest): boolean {
   return true;
 }
 
-export default async function handler(
+export default withApiPipeline({
+  route: 'health-check',
+  allowedMethods: ['GET'],
+  rateLimit: false,
+}, handler);
+
+async function handler(
   req: VercelRequest,
   res: VercelResponse
 ) {
-  // Apply security middleware (CORS, skip rate limiting for health check)
-  if (!applySecurity(req, res, { allowedMethods: ['GET'], skipRateLimit: true })) {
-    return;
-  }
-
   // Verify cron authorization
   if (!verifyCronAuth(req)) {
     return res.status(401).json({ error: 'Unauthorized' });
@@ -1,5 +1,5 @@
 import type { VercelRequest, VercelResponse } from '@vercel/node';
-import { applySecurity } from './_utils/security';
+import { withApiPipeline } from './_utils/pipeline';
 
 /**
  * Onboarding Config Edge Function
@@ -176,16 +176,17 @@ const ONBOARDING_CONFIG: OnboardingConfig = {
 // Handler
 // ============================================================================
 
-export default async function handler(
+export default withApiPipeline({
+  route: 'onboarding-config',
+  allowedMethods: ['GET'],
+  // Frequently called, read-only
+  rateLimit: false,
+}, handler);
+
+async function handler(
   req: VercelRequest,
   res: VercelResponse
 ) {
-  // Apply security middleware (CORS, rate limiting, method validation)
-  // Skip rate limiting for config endpoint (frequently called, read-only)
-  if (!applySecurity(req, res, { allowedMethods: ['GET'], skipRateLimit: true })) {
-    return;
-  }
-
   // Return config with cache headers
   // Cache for 1 hour on CDN, revalidate in background
   res.setHeader('Cache-Control', 's-maxage=3600, stale-while-revalidate');
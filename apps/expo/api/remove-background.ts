@@ -1,7 +1,7 @@
 import type { VercelRequest, VercelResponse } from '@vercel/node';
 import { GoogleGenerativeAI } from '@google/generative-ai';
 import sharp from 'sharp';
-import { applySecurity } from './_utils/security';
+import { sendApiError, withApiPipeline } from './_utils/pipeline';
 
 const GEMINI_API_KEY = process.env.GEMINI_API_KEY;
 
@@ -183,12 +183,12 @@ async function convertBackgroundToTransparent(imageBase64: string): Promise<stri
  *   - mimeType: always 'image/png'
  *   - fallback: true if original image returned instead
  */
-export default async function handler(req: VercelRequest, res: VercelResponse) {
-  // Apply security middleware (CORS, rate limiting, method validation)
-  if (!applySecurity(req, res, { allowedMethods: ['POST'] })) {
-    return;
-  }
+export default withApiPipeline({
+  route: 'remove-background',
+  imageFields: ['imageData', 'imageBase64'],
+}, handler);
 
+async function handler(req: VercelRequest, res: VercelResponse) {
   if (!GEMINI_API_KEY) {
     return res.status(500).json({ error: 'GEMINI_API_KEY not configured' });
   }
@@ -318,17 +318,6 @@ Output a PNG with the subject on a solid white background.`;
 
   } catch (error: any) {
     console.error('Error in remove-background endpoint:', error);
-
-    if (error.message?.includes('429') || error.message?.includes('quota')) {
-      return res.status(429).json({
-        error: 'Rate limit exceeded',
-        retryAfter: 60
-      });
-    }
-
-    return res.status(500).json({
-      error: error.message || 'Failed to remove background',
-      fallback: true
-    });
+    return sendApiError(res, error, 'Failed to remove background', { fallback: true });
   }
 }
@@ -15,7 +15,7 @@ import { Tag } from 'phosphor-react-native';
 import {
   useNoteStore,
   useBoardStore,
-  computeBoardsFromNotes,
+  computeBoardsFromLabelIndex,
 } from '@/stores';
 import { BoardCard } from '@/components/boards/BoardCard';
 import { ModeTabBar } from '@/components/boards/ModeTabBar';
@@ -28,7 +28,10 @@ import { CoachMarkTooltip } from '@/components/onboarding';
 
 export default function BoardsScreen() {
   const router = useRouter();
-  const { notes } = useNoteStore();
+  const labelIndex = useNoteStore((state) => state.labelIndex);
+  // notesById is updated in place - noteRevision changes with every edit
+  const notesById = useNoteStore((state) => state.notesById);
+  const noteRevision = useNoteStore((state) => state.noteRevision);
   const { boards: boardCustomizations, updateBoardMode } = useBoardStore();
   const { colors, isDark } = useTheme();
 
@@ -56,10 +59,10 @@ export default function BoardsScreen() {
     dismissCoachMark();
   };
 
-  // Compute boards from notes (sorted by most recent activity)
+  // Compute boards from the label index (sorted by most recent activity)
   const allBoards = useMemo((): BoardData[] => {
-    return computeBoardsFromNotes(notes, boardCustomizations);
-  }, [notes, boardCustomizations]);
+    return computeBoardsFromLabelIndex(labelIndex, notesById, boardCustomizations);
+  }, [labelIndex, notesById, noteRevision, boardCustomizations]);
 
   // Get board mode by hashtag
   const getBoardMode = useCallback((hashtag: string): Mode | undefined => {
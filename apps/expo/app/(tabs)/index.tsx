@@ -13,7 +13,13 @@ import { SafeAreaView } from 'react-native-safe-area-context';
 import { useRouter } from 'expo-router';
 import { Plus, MagnifyingGlass, X, PushPin, XCircle, NotePencil } from 'phosphor-react-native';
 
-import { useNoteStore, useUserStore, useDesignStore, useShareStatusStore } from '@/stores';
+import {
+  useNoteStore,
+  useUserStore,
+  useDesignStore,
+  useShareStatusStore,
+  selectActiveNotes,
+} from '@/stores';
 import { NoteCard } from '@/components/notes/NoteCard';
 import { Note, NoteColor } from '@/types';
 import { useTheme } from '@/src/theme';
@@ -27,7 +33,10 @@ const ITEM_HEIGHT = ITEM_WIDTH + 12; // Square aspect ratio + margin bottom
 
 export default function NotesScreen() {
   const router = useRouter();
-  const { notes, getActiveNotes, searchNotes, addNote } = useNoteStore();
+  const activeNotes = useNoteStore(selectActiveNotes);
+  const searchNotes = useNoteStore((state) => state.searchNotes);
+  const searchIndexReady = useNoteStore((state) => state.searchIndexReady);
+  const addNote = useNoteStore((state) => state.addNote);
   const { colors, isDark } = useTheme();
   const { getDesignById } = useDesignStore();
   const { fetchShareStatusForNotes, getShareStatus } = useShareStatusStore();
@@ -42,13 +51,15 @@ export default function NotesScreen() {
     return getDesignById(designId) || null;
   }, [getDesignById]);
 
-  // Get filtered notes
+  // Get filtered notes (search goes through the store's full-text index,
+  // ranked by relevance; `#label` terms filter by label). The index loads
+  // after the list, so results refresh once it is ready.
   const filteredNotes = useMemo(() => {
     if (searchQuery.trim()) {
       return searchNotes(searchQuery);
     }
-    return getActiveNotes();
-  }, [notes, searchQuery]);
+    return activeNotes;
+  }, [activeNotes, searchQuery, searchNotes, searchIndexReady]);
 
   // Fetch share status for visible notes
   useEffect(() => {
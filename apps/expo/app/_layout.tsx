@@ -94,7 +94,8 @@ import { usePathname } from 'expo-router';
 import { migrateNotesWithLabelsToDesigns } from '@/services/migrationService';
 import { registerCustomHandlers } from '@/services/customHandlers';
 import { goalNudgeScheduler } from '@/services/goalNudgeScheduler';
-import { LogBox } from 'react-native';
+import { flushScheduledTriggerEvents } from '@/services/triggerEngine';
+import { AppState, LogBox } from 'react-native';
 
 // Ignore RevenueCat errors (no products configured on simulator)
 // This suppresses the error overlay when products aren't set up in App Store Connect
@@ -231,6 +232,13 @@ export default function RootLayout() {
     registerCustomHandlers();
     goalNudgeScheduler.start();
 
+    // Run coalesced trigger events before the app can be suspended
+    const appStateSubscription = AppState.addEventListener('change', (state) => {
+      if (state === 'background') {
+        flushScheduledTriggerEvents();
+      }
+    });
+
     // TEMP: Clear skill cooldowns from AsyncStorage directly for testing
     (async () => {
       try {
@@ -244,6 +252,7 @@ export default function RootLayout() {
 
     return () => {
       goalNudgeScheduler.stop();
+      appStateSubscription.remove();
     };
   }, []);
 
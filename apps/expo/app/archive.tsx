@@ -11,7 +11,7 @@ import { SafeAreaView } from 'react-native-safe-area-context';
 import { useRouter } from 'expo-router';
 import { ArrowLeft, Archive } from 'phosphor-react-native';
 
-import { useNoteStore, useDesignStore } from '@/stores';
+import { useNoteStore, useDesignStore, selectArchivedNotes } from '@/stores';
 import { NoteCard } from '@/components/notes/NoteCard';
 import { Note } from '@/types';
 import { useTheme } from '@/src/theme';
@@ -24,11 +24,11 @@ const ITEM_WIDTH = (SCREEN_WIDTH - GRID_PADDING * 2 - GRID_GAP) / 2;
 
 export default function ArchiveScreen() {
   const router = useRouter();
-  const { getArchivedNotes, unarchiveNote } = useNoteStore();
+  const unarchiveNote = useNoteStore((state) => state.unarchiveNote);
   const { getDesignById } = useDesignStore();
   const { colors, isDark } = useTheme();
 
-  const archivedNotes = getArchivedNotes();
+  const archivedNotes = useNoteStore(selectArchivedNotes);
 
   const handleNotePress = (note: Note) => {
     router.push(`/note/${note.id}`);
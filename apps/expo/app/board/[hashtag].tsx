@@ -40,7 +40,13 @@ import {
 } from 'phosphor-react-native';
 import { LinearGradient } from 'expo-linear-gradient';
 
-import { useNoteStore, useDesignStore, useBoardStore, useBoardDesignStore } from '@/stores';
+import {
+  useNoteStore,
+  useDesignStore,
+  useBoardStore,
+  useBoardDesignStore,
+  selectNotesByLabel,
+} from '@/stores';
 import { NoteCard } from '@/components/notes/NoteCard';
 import { Note, NoteColor } from '@/types';
 import { getPresetForHashtag } from '@/constants/boardPresets';
@@ -104,7 +110,8 @@ const GRID_GAP = 10;
 export default function BoardDetailScreen() {
   const router = useRouter();
   const { hashtag } = useLocalSearchParams<{ hashtag: string }>();
-  const { getNotesByLabel, addNote, addLabelToNote } = useNoteStore();
+  const addNote = useNoteStore((state) => state.addNote);
+  const addLabelToNote = useNoteStore((state) => state.addLabelToNote);
   const { getDesignById } = useDesignStore();
   const { getBoardByHashtag } = useBoardStore();
   const { getDesignById: getBoardDesignById } = useBoardDesignStore();
@@ -126,7 +133,7 @@ export default function BoardDetailScreen() {
   }, [decodedHashtag]);
 
   // Get notes with this hashtag
-  const notes = getNotesByLabel(decodedHashtag);
+  const notes = useNoteStore(selectNotesByLabel(decodedHashtag));
 
   // Get board and its custom design (if any)
   const board = getBoardByHashtag(decodedHashtag);
@@ -173,21 +173,23 @@ export default function NoteEditorScreen() {
   const { id } = useLocalSearchParams<{ id: string }>();
   const router = useRouter();
   const navigation = useNavigation();
-  const {
-    updateNote,
-    deleteNote,
-    archiveNote,
-    pinNote,
-    unpinNote,
-    labels,
-    addLabel,
-    addLabelToNote,
-    removeLabelFromNote,
-    setActiveDesignLabel,
-  } = useNoteStore();
-
-  // Subscribe directly to the specific note - this ensures re-render when note.designId changes
-  const note = useNoteStore((state) => state.notes.find((n) => n.id === id));
+  // Per-field selectors, so edits to other notes don't re-render the editor
+  const updateNote = useNoteStore((state) => state.updateNote);
+  const deleteNote = useNoteStore((state) => state.deleteNote);
+  const archiveNote = useNoteStore((state) => state.archiveNote);
+  const pinNote = useNoteStore((state) => state.pinNote);
+  const unpinNote = useNoteStore((state) => state.unpinNote);
+  const labels = useNoteStore((state) => state.labels);
+  const addLabel = useNoteStore((state) => state.addLabel);
+  const addLabelToNote = useNoteStore((state) => state.addLabelToNote);
+  const removeLabelFromNote = useNoteStore((state) => state.removeLabelFromNote);
+  const setActiveDesignLabel = useNoteStore((state) => state.setActiveDesignLabel);
+
+  // Subscribe directly to the specific note - this ensures re-render when note.designId changes.
+  // Notes hydrated with a content preview stay hidden until their full body is loaded,
+  // so the editor never initializes from (and saves back) a truncated body.
+  const note = useNoteStore((state) => (state.pendingBodyIds[id] ? undefined : state.notesById[id]));
+  const isBodyPending = useNoteStore((state) => !!state.pendingBodyIds[id]);
 
   const { designs, getDesignById } = useDesignStore();
   const { settings } = useUserStore();
@@ -242,6 +244,15 @@ export default function NoteEditorScreen() {
     }
   }, [id]);
 
+  // Load the full body if only the preview has been read from storage
+  useEffect(() => {
+    if (isBodyPending) {
+      useNoteStore.getState().loadNoteBodies([id]).catch((error) => {
+        console.error('[NoteEditor] Failed to load note body:', error);
+      });
+    }
+  }, [id, isBodyPending]);
+
   // Sync designId from note when it changes (e.g., after navigation, store hydration, or auto-apply)
   useEffect(() => {
     if (note?.designId !== designId) {
@@ -714,6 +725,14 @@ export default function NoteEditorScreen() {
     handleSelectHashtag(tagName);
   };
 
+  if (isBodyPending) {
+    return (
+      <SafeAreaView className="flex-1 bg-white items-center justify-center">
+        <ActivityIndicator color={colors.accent} />
+      </SafeAreaView>
+    );
+  }
+
   if (!note) {
     return (
       <SafeAreaView className="flex-1 bg-white items-center justify-center">
@@ -12,7 +12,7 @@ import { SafeAreaView } from 'react-native-safe-area-context';
 import { useRouter } from 'expo-router';
 import { ArrowLeft, Trash, ArrowCounterClockwise, X } from 'phosphor-react-native';
 
-import { useNoteStore, useDesignStore } from '@/stores';
+import { useNoteStore, useDesignStore, selectDeletedNotes } from '@/stores';
 import { NoteCard } from '@/components/notes/NoteCard';
 import { Note } from '@/types';
 import { useTheme } from '@/src/theme';
@@ -25,11 +25,12 @@ const ITEM_WIDTH = (SCREEN_WIDTH - GRID_PADDING * 2 - GRID_GAP) / 2;
 
 export default function TrashScreen() {
   const router = useRouter();
-  const { getDeletedNotes, restoreNote, permanentlyDeleteNote } = useNoteStore();
+  const restoreNote = useNoteStore((state) => state.restoreNote);
+  const permanentlyDeleteNote = useNoteStore((state) => state.permanentlyDeleteNote);
   const { getDesignById } = useDesignStore();
   const { colors, isDark, semantic } = useTheme();
 
-  const deletedNotes = getDeletedNotes();
+  const deletedNotes = useNoteStore(selectDeletedNotes);
 
   const handleRestore = (noteId: string) => {
     restoreNote(noteId);
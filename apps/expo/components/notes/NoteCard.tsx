@@ -6,10 +6,12 @@
  * - Clean rounded corners with subtle shadow (iOS-native feel)
  * - Stickers and decorations preserved (per user preference)
  * - Memoized to prevent unnecessary re-renders
+ * - Stickers render from cached thumbnails, not the full-size image
  */
 
 import React, { memo, useMemo } from 'react';
-import { View, Text, TouchableOpacity, StyleSheet, Image } from 'react-native';
+import { View, Text, TouchableOpacity, StyleSheet } from 'react-native';
+import { Image } from 'expo-image';
 import { Check } from 'phosphor-react-native';
 import { Note, NoteDesign, DesignViewContext } from '@/types';
 import { composeStyle } from '@/services/designEngine';
@@ -17,6 +19,7 @@ import { useFontsLoaded } from '@/app/_layout';
 import { SYSTEM_FONT_FALLBACKS, PresetFontStyle } from '@/constants/fonts';
 import { ShareStatus } from '@/services/shareService';
 import { PublicBadge } from './PublicBadge';
+import { useThumbnail } from '@/hooks/useThumbnail';
 import {
   // Productivity
   CheckSquare,
@@ -192,6 +195,9 @@ function parseLineType(line: string): { type: 'checkbox' | 'bullet' | 'text'; ch
   return { type: 'text', text: line };
 }
 
+// Sticker thumbnails are drawn at 28pt; 3x covers high-density screens
+const STICKER_THUMBNAIL_SIZE = 84;
+
 function NoteCardComponent({
   note,
   design = null,
@@ -205,6 +211,8 @@ function NoteCardComponent({
   // Check if Google Fonts are loaded
   const fontsLoaded = useFontsLoaded();
 
+  const stickerThumbnail = useThumbnail(design?.sticker?.imageUri, STICKER_THUMBNAIL_SIZE);
+
   // Parse content into lines with formatting
   const parsedLines = useMemo(() => {
     const lines = note.content.slice(0, 200).split('\n').slice(0, compact ? 4 : 6);
@@ -406,9 +414,11 @@ function NoteCardComponent({
               design?.sticker?.imageUri ? (
                 // Character sticker from design
                 <Image
-                  source={{ uri: design.sticker.imageUri }}
+                  source={stickerThumbnail ? { uri: stickerThumbnail } : undefined}
                   style={styles.stickerThumbnail}
-                  resizeMode="contain"
+                  contentFit="contain"
+                  cachePolicy="memory-disk"
+                  recyclingKey={design.sticker.imageUri}
                 />
               ) : style.noteIcon && NOTE_ICON_MAP[style.noteIcon] ? (
                 // Phosphor icon for notes (crisp, monochrome)
@@ -0,0 +1,46 @@
+/**
+ * useThumbnail Hook
+ *
+ * Resolves a small cached copy of a local image for list rendering, so
+ * cards don't decode full-resolution stickers and photos on every scroll.
+ */
+
+import { useEffect, useState } from 'react';
+import { getCachedThumbnailUri, getThumbnailUri } from '@/services/imagePipeline';
+
+/**
+ * Thumbnail URI for an image (undefined while it's being generated)
+ *
+ * @param uri - Source image URI
+ * @param size - Longest side of the thumbnail in pixels
+ */
+export function useThumbnail(uri: string | undefined, size?: number): string | undefined {
+  const [thumbnail, setThumbnail] = useState<string | undefined>(() =>
+    uri ? getCachedThumbnailUri(uri, size) : undefined
+  );
+
+  useEffect(() => {
+    if (!uri) {
+      setThumbnail(undefined);
+      return;
+    }
+
+    const cached = getCachedThumbnailUri(uri, size);
+    if (cached) {
+      setThumbnail(cached);
+      return;
+    }
+
+    // Don't keep showing the previous image while the new one is generated
+    setThumbnail(undefined);
+    let cancelled = false;
+    getThumbnailUri(uri, size).then((result) => {
+      if (!cancelled) setThumbnail(result);
+    });
+    return () => {
+      cancelled = true;
+    };
+  }, [uri, size]);
+
+  return thumbnail;
+}
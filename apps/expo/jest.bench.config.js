@@ -0,0 +1,10 @@
+// Jest config for the benchmarks in __tests__/benchmarks (npm run test:bench).
+// They time synthetic workloads, so they're kept out of the default run.
+
+const baseConfig = require('./jest.config');
+
+module.exports = {
+  ...baseConfig,
+  testMatch: ['<rootDir>/__tests__/benchmarks/**/*.bench.test.[jt]s'],
+  testPathIgnorePatterns: ['/node_modules/'],
+};
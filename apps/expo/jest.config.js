@@ -19,6 +19,9 @@ module.exports = {
 
   testMatch: ['**/__tests__/**/*.test.[jt]s?(x)', '**/?(*.)+(spec|test).[jt]s?(x)'],
 
+  // Benchmarks assert on timings, so they only run via `npm run test:bench`
+  testPathIgnorePatterns: ['/node_modules/', '<rootDir>/__tests__/benchmarks/'],
+
   collectCoverageFrom: [
     'stores/**/*.{ts,tsx}',
     'services/**/*.{ts,tsx}',
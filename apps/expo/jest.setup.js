@@ -141,6 +141,28 @@ jest.mock('expo-image-picker', () => ({
   ),
 }));
 
+// Mock expo-image-manipulator (images pass through at a fixed size)
+jest.mock('expo-image-manipulator', () => {
+  const createImageRef = (uri) => ({
+    width: 1000,
+    height: 1000,
+    saveAsync: jest.fn(() => Promise.resolve({ uri: `${uri}.prepared`, width: 1000, height: 1000 })),
+    release: jest.fn(),
+  });
+  return {
+    ImageManipulator: {
+      manipulate: jest.fn((source) => ({
+        resize: jest.fn(),
+        renderAsync: jest.fn(() =>
+          Promise.resolve(createImageRef(typeof source === 'string' ? source : 'mock://image'))
+        ),
+        release: jest.fn(),
+      })),
+    },
+    SaveFormat: { JPEG: 'jpeg', PNG: 'png', WEBP: 'webp' },
+  };
+});
+
 // Mock expo-crypto with proper UUID format
 jest.mock('expo-crypto', () => ({
   randomUUID: jest.fn(() => {
@@ -285,6 +307,12 @@ jest.mock('@/services/modeDetectionService', () => ({
     confidence: 0.8,
     organizeStage: undefined,
   })),
+  detectModesBatch: jest.fn((notes) =>
+    Object.fromEntries(
+      notes.map((note) => [note.id, { mode: 'manage', confidence: 0.8, organizeStage: undefined }])
+    )
+  ),
+  clearModeDetectionCache: jest.fn(),
 }));
 
 jest.mock('@/services/goalAnalysisService', () => ({
@@ -4,6 +4,7 @@ import { recordError, log } from '@/services/firebaseAnalytics';
 import * as Crypto from 'expo-crypto';
 import { NoteDesign, DesignTheme, BoardDesign, GeminiBoardDesignResponse, Note, TypographyPosterStyle, CharacterMascotType, TypographyStyleConfig, CharacterMascotConfig, TypographyImageResponse, CharacterMascotResponse, TextAnalysis } from '@/types';
 import { themeToNoteDesign } from './designEngine';
+import { prepareImage } from './imagePipeline';
 import { LabelPreset } from '@/constants/labelPresets';
 import {
   parseThemeResponse,
@@ -52,7 +53,9 @@ interface LuckyThemeResponse extends ThemeResponse {
 
 /**
  * Convert image URI to base64
- * Uses legacy FileSystem API for reliable cross-platform compatibility
+ * Downscales to the AI target size first (see imagePipeline) so full-resolution
+ * photos aren't sent to the API. Uses legacy FileSystem API for reliable
+ * cross-platform compatibility.
  */
 async function imageUriToBase64(uri: string): Promise<{ base64: string; mimeType: string }> {
   try {
@@ -65,27 +68,18 @@ async function imageUriToBase64(uri: string): Promise<{ base64: string; mimeType
     }
     devLog('File exists:', fileInfo.exists, 'Size:', fileInfo.size);
 
+    const prepared = await prepareImage(uri, 'ai');
+    devLog('Prepared image:', prepared.width, 'x', prepared.height);
+
     // Read file as base64 using the legacy FileSystem API
-    const base64 = await LegacyFileSystem.readAsStringAsync(uri, {
+    const base64 = await LegacyFileSystem.readAsStringAsync(prepared.uri, {
       encoding: LegacyFileSystem.EncodingType.Base64,
     });
 
     devLog('Base64 length:', base64.length);
+    devLog('MIME type:', prepared.mimeType);
 
-    // Determine MIME type from URI extension or default to jpeg
-    const extension = uri.split('.').pop()?.toLowerCase() || 'jpg';
-    const mimeTypes: Record<string, string> = {
-      jpg: 'image/jpeg',
-      jpeg: 'image/jpeg',
-      png: 'image/png',
-      gif: 'image/gif',
-      webp: 'image/webp',
-      heic: 'image/jpeg', // HEIC from iPhone, treat as jpeg after conversion
-    };
-    const mimeType = mimeTypes[extension] || 'image/jpeg';
-    devLog('MIME type:', mimeType);
-
-    return { base64, mimeType };
+    return { base64, mimeType: prepared.mimeType };
   } catch (error) {
     console.error('Failed to read image:', error);
     throw new Error(`Failed to read image file: ${error}`);
@@ -589,14 +583,45 @@ async function generateThemedSticker(
   }
 }
 
+interface ThemedDesignAssets {
+  stickerUri: string | null;
+  colorOverrides?: Partial<DesignTheme['colors']>;
+}
+
+// Concurrent requests for the same theme + image (double taps, retries)
+const pendingThemedAssets = new Map<string, Promise<ThemedDesignAssets>>();
+
+// Color overrides by theme and image content, reused for the session
+const COLOR_OVERRIDE_CACHE_MAX = 20;
+const colorOverrideCache = new Map<string, Partial<DesignTheme['colors']>>();
+
 /**
- * Generate a note design from a theme preset
- * Optionally uses an image to extract colors that harmonize with the theme
+ * Content key for image data (djb2 hash plus length)
  */
-export async function generateThemedDesign(
+function hashImageData(base64: string): string {
+  let hash = 5381;
+  for (let i = 0; i < base64.length; i++) {
+    hash = (hash * 33) ^ base64.charCodeAt(i);
+  }
+  return `${(hash >>> 0).toString(36)}:${base64.length}`;
+}
+
+function cacheColorOverrides(key: string, colors: Partial<DesignTheme['colors']>): void {
+  colorOverrideCache.delete(key);
+  colorOverrideCache.set(key, colors);
+  while (colorOverrideCache.size > COLOR_OVERRIDE_CACHE_MAX) {
+    const oldest = colorOverrideCache.keys().next().value as string;
+    colorOverrideCache.delete(oldest);
+  }
+}
+
+/**
+ * Extract image colors (if any) and generate the themed sticker
+ */
+async function loadThemedDesignAssets(
   theme: DesignTheme,
   imageUri?: string
-): Promise<NoteDesign> {
+): Promise<ThemedDesignAssets> {
   let imageBase64: string | undefined;
   let mimeType: string | undefined;
   let colorOverrides: Partial<DesignTheme['colors']> | undefined;
@@ -608,31 +633,40 @@ export async function generateThemedDesign(
       imageBase64 = imageData.base64;
       mimeType = imageData.mimeType;
 
-      // Try to get color adjustments from API
-      try {
-        const colorResponse = await fetch(`${API_BASE_URL}/api/extract-colors`, {
-          method: 'POST',
-          headers: {
-            'Content-Type': 'application/json',
-          },
-          body: JSON.stringify({
-            imageData: imageBase64,
-            mimeType: mimeType,
-            themeId: theme.id,
-            baseColors: theme.colors,
-          }),
-        });
-
-        if (colorResponse.ok) {
-          const colorData = await colorResponse.json();
-          if (colorData.colors) {
-            colorOverrides = colorData.colors;
-            devLog('Color overrides from image:', colorOverrides);
+      const colorKey = `${theme.id}:${hashImageData(imageBase64)}`;
+      const cachedColors = colorOverrideCache.get(colorKey);
+
+      if (cachedColors) {
+        colorOverrides = cachedColors;
+        devLog('Using cached color overrides:', colorOverrides);
+      } else {
+        // Try to get color adjustments from API
+        try {
+          const colorResponse = await fetch(`${API_BASE_URL}/api/extract-colors`, {
+            method: 'POST',
+            headers: {
+              'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+              imageData: imageBase64,
+              mimeType: mimeType,
+              themeId: theme.id,
+              baseColors: theme.colors,
+            }),
+          });
+
+          if (colorResponse.ok) {
+            const colorData = await colorResponse.json();
+            if (colorData.colors) {
+              colorOverrides = colorData.colors;
+              cacheColorOverrides(colorKey, colorData.colors);
+              devLog('Color overrides from image:', colorOverrides);
+            }
           }
+        } catch (e) {
+          // Color extraction is optional, continue without it
+          devLog('Color extraction skipped:', e);
         }
-      } catch (e) {
-        // Color extraction is optional, continue without it
-        devLog('Color extraction skipped:', e);
       }
     } catch (error) {
       devWarn('Could not process image, using default theme colors:', error);
@@ -642,6 +676,30 @@ export async function generateThemedDesign(
   // Generate themed sticker
   const stickerUri = await generateThemedSticker(theme, imageBase64, mimeType);
 
+  return { stickerUri, colorOverrides };
+}
+
+/**
+ * Generate a note design from a theme preset
+ * Optionally uses an image to extract colors that harmonize with the theme
+ */
+export async function generateThemedDesign(
+  theme: DesignTheme,
+  imageUri?: string
+): Promise<NoteDesign> {
+  // Share the API calls with an identical request already in flight
+  const requestKey = `${theme.id}:${imageUri ?? ''}`;
+  let assets = pendingThemedAssets.get(requestKey);
+  if (assets) {
+    devLog('Joining in-flight themed design request:', requestKey);
+  } else {
+    assets = loadThemedDesignAssets(theme, imageUri).finally(() => {
+      pendingThemedAssets.delete(requestKey);
+    });
+    pendingThemedAssets.set(requestKey, assets);
+  }
+  const { stickerUri, colorOverrides } = await assets;
+
   // Create sticker object
   const sticker: NoteDesign['sticker'] = {
     id: Crypto.randomUUID(),
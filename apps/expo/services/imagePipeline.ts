@@ -0,0 +1,265 @@
+/**
+ * Image Pipeline
+ *
+ * Shared preparation for images before they leave the device or hit the list UI:
+ * - prepareImage: downscale and re-encode to a target size (uploads, AI calls)
+ * - readImageWithHash: read a prepared image once and hash its content, so
+ *   identical images are stored once
+ * - getThumbnailUri: small cached copies for list rendering (NoteCard)
+ *
+ * PNG, GIF and WebP sources become PNG (they may have transparency, which
+ * stickers need); everything else becomes JPEG. Only JPEG and PNG files are
+ * ever uploaded without re-encoding.
+ * If an image can't be processed the original URI is used, so callers never
+ * lose an image to a failed resize.
+ */
+
+import * as LegacyFileSystem from 'expo-file-system/legacy';
+import * as Crypto from 'expo-crypto';
+import { ImageManipulator, SaveFormat } from 'expo-image-manipulator';
+
+export type ImageTarget = 'upload' | 'ai' | 'thumbnail';
+
+export interface ImageTargetSpec {
+  maxDimension: number;  // Longest side in pixels
+  compress: number;      // JPEG quality (0-1)
+}
+
+export const IMAGE_TARGETS: Record<ImageTarget, ImageTargetSpec> = {
+  // Note attachments: sharp on a tablet, a fraction of a full-resolution photo
+  upload: { maxDimension: 2048, compress: 0.8 },
+  // Gemini downsamples anything larger, so more pixels only cost upload time
+  ai: { maxDimension: 1024, compress: 0.8 },
+  thumbnail: { maxDimension: 256, compress: 0.7 },
+};
+
+export interface PreparedImage {
+  uri: string;
+  mimeType: string;
+  width: number;   // 0 when the original was passed through unprocessed
+  height: number;
+}
+
+const MIME_TYPES: Record<string, string> = {
+  jpg: 'image/jpeg',
+  jpeg: 'image/jpeg',
+  png: 'image/png',
+  gif: 'image/gif',
+  webp: 'image/webp',
+  heic: 'image/jpeg', // HEIC from iPhone, treat as jpeg after conversion
+};
+
+// Formats that can be used as-is when already small enough
+const PASSTHROUGH_EXTENSIONS = new Set(['jpg', 'jpeg', 'png']);
+
+// Formats that may have an alpha channel, so they're re-encoded as PNG
+const ALPHA_EXTENSIONS = new Set(['png', 'gif', 'webp']);
+
+// Prepared images kept per source URI and target
+const MAX_PREPARED_CACHE = 200;
+const THUMBNAIL_DIR = `${LegacyFileSystem.cacheDirectory}thumbnails/`;
+
+const preparedCache = new Map<string, PreparedImage>();
+const thumbnailCache = new Map<string, string>();
+const pendingTasks = new Map<string, Promise<any>>();
+
+function getUriExtension(uri: string): string {
+  return uri.split('?')[0].split('.').pop()?.toLowerCase() || 'jpg';
+}
+
+/**
+ * MIME type from a URI's extension (defaults to JPEG)
+ */
+export function getImageMimeType(uri: string): string {
+  return MIME_TYPES[getUriExtension(uri)] || 'image/jpeg';
+}
+
+/**
+ * MIME type an image is prepared as: PNG if the source may be transparent,
+ * JPEG otherwise
+ */
+function getPreparedMimeType(uri: string): string {
+  return ALPHA_EXTENSIONS.has(getUriExtension(uri)) ? 'image/png' : 'image/jpeg';
+}
+
+export function getImageExtension(mimeType: string): string {
+  return mimeType === 'image/png' ? 'png' : 'jpg';
+}
+
+/**
+ * Run a task once per key; concurrent callers share the result
+ */
+function runOnce<T>(key: string, task: () => Promise<T>): Promise<T> {
+  const pending = pendingTasks.get(key);
+  if (pending) return pending;
+
+  const promise = task().finally(() => pendingTasks.delete(key));
+  pendingTasks.set(key, promise);
+  return promise;
+}
+
+function remember<T>(cache: Map<string, T>, key: string, value: T): void {
+  if (cache.size >= MAX_PREPARED_CACHE) {
+    const oldestKey = cache.keys().next().value;
+    if (oldestKey !== undefined) cache.delete(oldestKey);
+  }
+  cache.set(key, value);
+}
+
+/**
+ * djb2 hash of a string, used for stable cache file names
+ */
+function hashString(value: string): string {
+  let hash = 5381;
+  for (let i = 0; i < value.length; i++) {
+    hash = ((hash << 5) + hash + value.charCodeAt(i)) | 0;
+  }
+  return (hash >>> 0).toString(36);
+}
+
+// ============================================
+// Resize / Re-encode
+// ============================================
+
+async function renderImage(uri: string, spec: ImageTargetSpec): Promise<PreparedImage> {
+  const mimeType = getPreparedMimeType(uri);
+  const keepPng = mimeType === 'image/png';
+
+  const original = await ImageManipulator.manipulate(uri).renderAsync();
+  try {
+    const scale = Math.min(1, spec.maxDimension / Math.max(original.width, original.height));
+
+    // Already small enough and in a format we upload as-is
+    if (scale === 1 && PASSTHROUGH_EXTENSIONS.has(getUriExtension(uri))) {
+      return { uri, mimeType, width: original.width, height: original.height };
+    }
+
+    const context = ImageManipulator.manipulate(original);
+    if (scale < 1) {
+      context.resize({
+        width: Math.round(original.width * scale),
+        height: Math.round(original.height * scale),
+      });
+    }
+    const resized = await context.renderAsync();
+    const saved = await resized.saveAsync({
+      compress: spec.compress,
+      format: keepPng ? SaveFormat.PNG : SaveFormat.JPEG,
+    });
+    resized.release();
+    context.release();
+
+    return {
+      uri: saved.uri,
+      mimeType,
+      width: saved.width,
+      height: saved.height,
+    };
+  } finally {
+    original.release();
+  }
+}
+
+/**
+ * Downscale and re-encode an image for a target. Results are reused per
+ * source URI; on failure the original is returned unchanged.
+ */
+export async function prepareImage(
+  uri: string,
+  target: ImageTarget = 'upload'
+): Promise<PreparedImage> {
+  const key = `${target}:${uri}`;
+  const cached = preparedCache.get(key);
+  if (cached) return cached;
+
+  return runOnce(key, async () => {
+    try {
+      const prepared = await renderImage(uri, IMAGE_TARGETS[target]);
+      remember(preparedCache, key, prepared);
+      return prepared;
+    } catch (error) {
+      console.warn('[ImagePipeline] Could not prepare image, using original:', error);
+      return { uri, mimeType: getImageMimeType(uri), width: 0, height: 0 };
+    }
+  });
+}
+
+// ============================================
+// Content Hashing
+// ============================================
+
+/**
+ * Read an image as base64 along with the SHA-256 of its content
+ */
+export async function readImageWithHash(uri: string): Promise<{ base64: string; hash: string }> {
+  const base64 = await LegacyFileSystem.readAsStringAsync(uri, {
+    encoding: LegacyFileSystem.EncodingType.Base64,
+  });
+  const hash = await Crypto.digestStringAsync(Crypto.CryptoDigestAlgorithm.SHA256, base64);
+  return { base64, hash };
+}
+
+// ============================================
+// Thumbnails
+// ============================================
+
+/**
+ * Thumbnail already known this session (no I/O), for the first render
+ */
+export function getCachedThumbnailUri(
+  uri: string,
+  size: number = IMAGE_TARGETS.thumbnail.maxDimension
+): string | undefined {
+  return thumbnailCache.get(`${size}:${uri}`);
+}
+
+/**
+ * Small copy of a local image for list rendering. Thumbnails are written to
+ * the cache directory under a name derived from the source URI, so they
+ * survive restarts until the OS clears the cache. Remote URIs are returned
+ * as-is (expo-image caches those on disk).
+ */
+export async function getThumbnailUri(
+  uri: string,
+  size: number = IMAGE_TARGETS.thumbnail.maxDimension
+): Promise<string> {
+  if (!uri.startsWith('file://')) return uri;
+
+  const key = `${size}:${uri}`;
+  const cached = thumbnailCache.get(key);
+  if (cached) return cached;
+
+  return runOnce(`thumbnail:${key}`, async () => {
+    const extension = getImageExtension(getPreparedMimeType(uri));
+    const thumbnailUri = `${THUMBNAIL_DIR}${hashString(uri)}-${size}.${extension}`;
+
+    try {
+      const info = await LegacyFileSystem.getInfoAsync(thumbnailUri);
+      if (!info.exists) {
+        const rendered = await renderImage(uri, { ...IMAGE_TARGETS.thumbnail, maxDimension: size });
+        if (rendered.uri === uri) {
+          // Source is already thumbnail-sized
+          remember(thumbnailCache, key, uri);
+          return uri;
+        }
+        await LegacyFileSystem.makeDirectoryAsync(THUMBNAIL_DIR, { intermediates: true });
+        await LegacyFileSystem.moveAsync({ from: rendered.uri, to: thumbnailUri });
+      }
+
+      remember(thumbnailCache, key, thumbnailUri);
+      return thumbnailUri;
+    } catch (error) {
+      console.warn('[ImagePipeline] Thumbnail failed, using original:', error);
+      return uri;
+    }
+  });
+}
+
+/**
+ * Clear in-memory caches (files in the cache directory are left to the OS)
+ */
+export function resetImagePipelineCache(): void {
+  preparedCache.clear();
+  thumbnailCache.clear();
+  pendingTasks.clear();
+}
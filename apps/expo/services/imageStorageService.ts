@@ -5,16 +5,25 @@
  * Enables cross-platform image sync by replacing local file:// URIs with
  * cloud storage URLs.
  *
+ * Images are resized before upload (see imagePipeline.ts), named by content
+ * hash so identical images are stored once per folder, and uploaded through a
+ * bounded queue. Finished uploads are recorded in imageUploadStore so an
+ * interrupted sync resumes without re-uploading.
+ *
+ * Note images stay in their note's folder, so deleting a note deletes exactly
+ * the images it owns; a photo used by two notes is stored in both.
+ *
  * Storage structure:
- * - note-images/{user_id}/{note_id}/{filename}
- * - design-assets/{user_id}/stickers/{filename}
- * - design-assets/{user_id}/sources/{filename}
+ * - note-images/{user_id}/{note_id}/{content_hash}.{ext}
+ *   (older uploads: note-images/{user_id}/{note_id}/{filename})
+ * - design-assets/{user_id}/stickers/{content_hash}.{ext}
+ * - design-assets/{user_id}/sources/{content_hash}.{ext}
  */
 
 import { supabase } from './supabase';
-import * as FileSystem from 'expo-file-system';
-import { Platform } from 'react-native';
 import { decode } from 'base64-arraybuffer';
+import { useImageUploadStore, UploadRecord } from '@/stores/imageUploadStore';
+import { getImageExtension, prepareImage, readImageWithHash } from './imagePipeline';
 
 // Bucket names matching the migration
 const NOTE_IMAGES_BUCKET = 'note-images';
@@ -39,20 +48,161 @@ export function isStorageUrl(uri: string | undefined): boolean {
   return SUPABASE_STORAGE_PATTERN.test(uri) || uri.includes('.supabase.co/storage');
 }
 
+// Uploads running at once; the rest wait so a first sync with hundreds of
+// photo notes doesn't hold every image in memory at the same time
+const MAX_CONCURRENT_UPLOADS = 3;
+
+// Signed URLs are valid for 1 year
+const SIGNED_URL_EXPIRY_SECONDS = 60 * 60 * 24 * 365;
+
+// Recorded URLs are only reused while they have this long left, so a new
+// note doesn't get a link that is about to expire
+const MIN_URL_LIFETIME_MS = 30 * 24 * 60 * 60 * 1000;
+
+// ============================================
+// Upload Queue
+// ============================================
+
+let activeUploads = 0;
+const waitingUploads: Array<() => void> = [];
+const pendingUploads = new Map<string, Promise<string>>();
+
 /**
- * Generate a unique filename with timestamp
+ * Run an upload when a slot is free. Uploads with the same key share one run.
  */
-function generateFilename(originalUri: string): string {
-  const timestamp = Date.now();
-  const random = Math.random().toString(36).substring(2, 8);
+function enqueueUpload(key: string, upload: () => Promise<string>): Promise<string> {
+  const pending = pendingUploads.get(key);
+  if (pending) return pending;
+
+  const progress = useImageUploadStore.getState();
+  // The last batch's counts stay visible until the queue is used again
+  if (activeUploads === 0 && waitingUploads.length === 0) {
+    progress.resetProgress();
+  }
+  progress.updateProgress({ queued: 1 });
 
-  // Extract extension from original URI
-  const extension = originalUri.split('.').pop()?.toLowerCase() || 'jpg';
-  const validExtension = ['jpg', 'jpeg', 'png', 'gif', 'webp'].includes(extension)
-    ? extension
-    : 'jpg';
+  const run = async (): Promise<string> => {
+    if (activeUploads >= MAX_CONCURRENT_UPLOADS) {
+      // The finishing upload hands its slot over directly
+      await new Promise<void>((resolve) => waitingUploads.push(resolve));
+    } else {
+      activeUploads++;
+    }
+    try {
+      const url = await upload();
+      progress.updateProgress({ completed: 1 });
+      return url;
+    } catch (error) {
+      progress.updateProgress({ failed: 1 });
+      throw error;
+    } finally {
+      pendingUploads.delete(key);
+      const next = waitingUploads.shift();
+      if (next) {
+        next();
+      } else {
+        activeUploads--;
+      }
+    }
+  };
 
-  return `${timestamp}-${random}.${validExtension}`;
+  const promise = run();
+  pendingUploads.set(key, promise);
+  return promise;
+}
+
+/**
+ * Whether a Storage error means the object is already there
+ */
+function isAlreadyExistsError(error: any): boolean {
+  return (
+    String(error?.statusCode) === '409' ||
+    /already exists|duplicate/i.test(error?.message || '')
+  );
+}
+
+/**
+ * Whether a recorded signed URL can still be handed out
+ */
+function hasFreshUrl(record: UploadRecord): boolean {
+  return record.expiresAt - Date.now() > MIN_URL_LIFETIME_MS;
+}
+
+/**
+ * Create a signed URL for a stored object
+ */
+async function signStoragePath(
+  bucket: string,
+  path: string
+): Promise<Pick<UploadRecord, 'url' | 'expiresAt'>> {
+  const expiresAt = Date.now() + SIGNED_URL_EXPIRY_SECONDS * 1000;
+  const { data } = await supabase.storage
+    .from(bucket)
+    .createSignedUrl(path, SIGNED_URL_EXPIRY_SECONDS);
+
+  if (!data?.signedUrl) {
+    throw new Error('Failed to generate signed URL');
+  }
+  return { url: data.signedUrl, expiresAt };
+}
+
+/**
+ * Resize, hash and upload a local image into {user_id}/{folder}. Images are
+ * named by content hash, so identical images in a folder upload once and
+ * later copies reuse the first URL. Recorded URLs close to expiry are
+ * re-signed instead of reused.
+ */
+async function uploadImage(
+  bucket: string,
+  folder: string,
+  localUri: string,
+  userId: string
+): Promise<string> {
+  const uploadState = useImageUploadStore.getState();
+  const uploadFolder = `${bucket}/${userId}/${folder}`;
+
+  // Uploaded by an earlier (possibly interrupted) sync
+  const previous = uploadState.getUpload(uploadFolder, localUri);
+  if (previous && hasFreshUrl(previous)) return previous.url;
+
+  return enqueueUpload(`${uploadFolder}:${localUri}`, async () => {
+    let record: UploadRecord;
+
+    if (previous) {
+      // Still stored - only the URL needs renewing
+      record = { ...previous, ...(await signStoragePath(bucket, previous.path)) };
+    } else {
+      const prepared = await prepareImage(localUri, 'upload');
+      const { base64, hash } = await readImageWithHash(prepared.uri);
+      const existing = uploadState.getUploadForHash(uploadFolder, hash);
+
+      if (existing) {
+        record = hasFreshUrl(existing)
+          ? existing
+          : { ...existing, ...(await signStoragePath(bucket, existing.path)) };
+      } else {
+        const path = `${userId}/${folder}/${hash}.${getImageExtension(prepared.mimeType)}`;
+
+        const { error } = await supabase.storage
+          .from(bucket)
+          .upload(path, decode(base64), {
+            contentType: prepared.mimeType,
+            upsert: false, // Same path means same content - keep the existing file
+          });
+
+        if (error && !isAlreadyExistsError(error)) {
+          console.error('[ImageStorage] Upload error:', error);
+          throw error;
+        }
+
+        record = { bucket, path, hash, uploadedAt: Date.now(), ...(await signStoragePath(bucket, path)) };
+        console.log('[ImageStorage] Uploaded image:', path);
+      }
+    }
+
+    uploadState.recordUpload(localUri, { ...record, uploadedAt: Date.now() });
+    return record.url;
+  });
 }
 
 /**
@@ -60,7 +210,7 @@ function generateFilename(originalUri: string): string {
  *
  * @param localUri - Local file:// URI to upload
  * @param userId - User ID for folder structure
- * @param noteId - Note ID for organizing note images
+ * @param noteId - Note the image belongs to (its Storage folder)
  * @returns Storage URL or throws error
  */
 export async function uploadNoteImage(
@@ -74,45 +224,9 @@ export async function uploadNoteImage(
   }
 
   try {
-    // Read file as base64
-    const base64 = await FileSystem.readAsStringAsync(localUri, {
-      encoding: 'base64',
-    });
-
-    // Generate storage path
-    const filename = generateFilename(localUri);
-    const storagePath = `${userId}/${noteId}/${filename}`;
-
-    // Determine content type
-    const extension = filename.split('.').pop()?.toLowerCase();
-    const contentType = extension === 'png' ? 'image/png' : 'image/jpeg';
-
-    // Upload to Supabase Storage
-    const { data, error } = await supabase.storage
-      .from(NOTE_IMAGES_BUCKET)
-      .upload(storagePath, decode(base64), {
-        contentType,
-        upsert: false, // Don't overwrite existing files
-      });
-
-    if (error) {
-      console.error('[ImageStorage] Upload error:', error);
-      throw error;
-    }
-
-    // Get signed URL (valid for 1 year)
-    const { data: urlData } = await supabase.storage
-      .from(NOTE_IMAGES_BUCKET)
-      .createSignedUrl(storagePath, 60 * 60 * 24 * 365); // 1 year
-
-    if (!urlData?.signedUrl) {
-      throw new Error('Failed to generate signed URL');
-    }
-
-    console.log('[ImageStorage] Uploaded note image:', storagePath);
-    return urlData.signedUrl;
+    return await uploadImage(NOTE_IMAGES_BUCKET, noteId, localUri, userId);
   } catch (error) {
-    console.error('[ImageStorage] Failed to upload note image:', error);
+    console.error('[ImageStorage] Failed to upload note image for note:', noteId, error);
     throw error;
   }
 }
@@ -135,39 +249,8 @@ export async function uploadDesignAsset(
   }
 
   try {
-    const base64 = await FileSystem.readAsStringAsync(localUri, {
-      encoding: 'base64',
-    });
-
-    const filename = generateFilename(localUri);
     const folder = type === 'sticker' ? 'stickers' : 'sources';
-    const storagePath = `${userId}/${folder}/${filename}`;
-
-    const extension = filename.split('.').pop()?.toLowerCase();
-    const contentType = extension === 'png' ? 'image/png' : 'image/jpeg';
-
-    const { data, error } = await supabase.storage
-      .from(DESIGN_ASSETS_BUCKET)
-      .upload(storagePath, decode(base64), {
-        contentType,
-        upsert: false,
-      });
-
-    if (error) {
-      console.error('[ImageStorage] Design asset upload error:', error);
-      throw error;
-    }
-
-    const { data: urlData } = await supabase.storage
-      .from(DESIGN_ASSETS_BUCKET)
-      .createSignedUrl(storagePath, 60 * 60 * 24 * 365);
-
-    if (!urlData?.signedUrl) {
-      throw new Error('Failed to generate signed URL');
-    }
-
-    console.log('[ImageStorage] Uploaded design asset:', storagePath);
-    return urlData.signedUrl;
+    return await uploadImage(DESIGN_ASSETS_BUCKET, folder, localUri, userId);
   } catch (error) {
     console.error('[ImageStorage] Failed to upload design asset:', error);
     throw error;
@@ -176,10 +259,11 @@ export async function uploadDesignAsset(
 
 /**
  * Migrate an array of image URIs, uploading any local files to Storage
+ * through the shared upload queue
  *
  * @param images - Array of image URIs (local or remote)
  * @param userId - User ID for folder structure
- * @param noteId - Note ID for organizing images
+ * @param noteId - Note ID (its Storage folder)
  * @returns Array of storage URLs
  */
 export async function migrateNoteImages(
@@ -210,6 +294,9 @@ export async function migrateNoteImages(
 /**
  * Delete images from Storage when a note is permanently deleted
  *
+ * Removes the note's folder. Other notes keep their own copies, so nothing
+ * they use is affected.
+ *
  * @param userId - User ID
  * @param noteId - Note ID
  */
@@ -234,6 +321,7 @@ export async function deleteNoteImages(userId: string, noteId: string): Promise<
     if (deleteError) {
       console.error('[ImageStorage] Failed to delete files:', deleteError);
     } else {
+      useImageUploadStore.getState().removeUploadsInFolder(`${NOTE_IMAGES_BUCKET}/${userId}/${noteId}`);
       console.log('[ImageStorage] Deleted images for note:', noteId);
     }
   } catch (error) {
@@ -252,7 +340,7 @@ export async function refreshSignedUrl(
   try {
     const { data } = await supabase.storage
       .from(bucket)
-      .createSignedUrl(storagePath, 60 * 60 * 24 * 365);
+      .createSignedUrl(storagePath, SIGNED_URL_EXPIRY_SECONDS);
 
     return data?.signedUrl || null;
   } catch (error) {
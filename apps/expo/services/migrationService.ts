@@ -44,7 +44,7 @@ export async function migrateLocalDataToCloud(userId: string): Promise<Migration
 
     console.log('[Migration] Starting migration for user:', userId);
     console.log('[Migration] Local data:', {
-      notes: noteStore.notes.length,
+      notes: noteStore.noteIds.length,
       labels: labelStore.labels.length,
       designs: designStore.designs.length,
       boards: boardStore.boards.length,
@@ -96,8 +96,17 @@ export async function migrateLocalDataToCloud(userId: string): Promise<Migration
     }
 
     // 3. Migrate notes
-    if (noteStore.notes.length > 0) {
-      const notesToInsert = noteStore.notes.map((note) => ({
+    if (noteStore.noteIds.length > 0) {
+      // Upload full content, not hydrated previews
+      await noteStore.loadNoteBodies();
+      // Notes whose body couldn't be read are left for a later sync
+      const { pendingBodyIds } = useNoteStore.getState();
+      const unloadedCount = Object.keys(pendingBodyIds).length;
+      if (unloadedCount > 0) {
+        errors.push(`Notes: ${unloadedCount} note bodies could not be loaded`);
+      }
+      const loadedNotes = noteStore.getAllNotes().filter((note) => !pendingBodyIds[note.id]);
+      const notesToInsert = loadedNotes.map((note) => ({
         id: note.id,
         user_id: userId,
         title: note.title,
@@ -231,7 +240,7 @@ export async function hasCloudData(userId: string): Promise<boolean> {
  */
 export function hasLocalData(): boolean {
   const noteStore = useNoteStore.getState();
-  return noteStore.notes.length > 0;
+  return noteStore.noteIds.length > 0;
 }
 
 /**
@@ -249,7 +258,7 @@ export function getLocalDataCounts(): {
   const labelStore = useLabelStore.getState();
 
   return {
-    notes: noteStore.notes.length,
+    notes: noteStore.noteIds.length,
     labels: labelStore.labels.length,
     designs: designStore.designs.length,
     boards: boardStore.boards.length,
@@ -269,7 +278,7 @@ export function migrateNotesWithLabelsToDesigns(): number {
   const noteStore = useNoteStore.getState();
   let migratedCount = 0;
 
-  for (const note of noteStore.notes) {
+  for (const note of noteStore.getAllNotes()) {
     // Skip if note already has a design or no labels
     if (note.designId || note.labels.length === 0) continue;
 
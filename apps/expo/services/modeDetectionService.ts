@@ -12,6 +12,11 @@
  * - DEVELOP: Growing ideas (brainstorming, creativity, drafts)
  * - ORGANIZE: Keeping for later (references, bookmarks, learning)
  * - EXPERIENCE: Recording life (journal, memories, reflections)
+ *
+ * Every keyword table is compiled once into a single Aho-Corasick matcher,
+ * so a note's content is lowercased and scanned once per detection instead
+ * of once per keyword. Results are cached per note and reused until the
+ * note's title, content or labels change.
  */
 
 import {
@@ -140,6 +145,143 @@ const EXPERIENCE_PATTERNS = {
   },
 };
 
+/**
+ * Indicators for the DEVELOP content type
+ */
+const DEVELOP_CONTENT_INDICATORS: Record<Exclude<DevelopContentType, 'general'>, string[]> = {
+  story: [
+    'character', 'plot', 'chapter', 'story', 'novel', 'fiction',
+    'protagonist', 'dialogue', 'scene', 'narrative',
+  ],
+  business: [
+    'market', 'customer', 'revenue', 'startup', 'business', 'product',
+    'pricing', 'competitor', 'growth', 'monetize', 'user acquisition',
+  ],
+  blog: [
+    'post', 'article', 'blog', 'headline', 'reader', 'audience',
+    'seo', 'content', 'publish', 'draft',
+  ],
+  design: [
+    'design', 'ui', 'ux', 'feature', 'app', 'website', 'interface',
+    'wireframe', 'prototype', 'user flow', 'mockup',
+  ],
+};
+
+/**
+ * Indicators for learning content (ORGANIZE learn stage)
+ */
+const LEARN_INDICATORS = [
+  'learn', 'study', 'memorize', 'flashcard', 'quiz', 'practice',
+  'vocabulary', 'definition', 'concept', 'term',
+];
+
+// ============================================
+// Compiled Keyword Matcher
+// ============================================
+
+/**
+ * Aho-Corasick automaton over lowercase keywords. Finds every keyword that
+ * occurs as a substring (same semantics as `includes`) in one pass.
+ */
+interface KeywordMatcher {
+  keywords: string[];
+  // Per node: char code -> child node
+  next: Map<number, number>[];
+  // Per node: longest proper suffix that is also a trie node
+  fail: number[];
+  // Per node: keyword ids ending here (including via fail links)
+  output: number[][];
+}
+
+function compileKeywordMatcher(keywordLists: string[][]): KeywordMatcher {
+  const keywords = Array.from(new Set(keywordLists.flat()));
+  const next: Map<number, number>[] = [new Map()];
+  const fail = [0];
+  const output: number[][] = [[]];
+
+  keywords.forEach((keyword, id) => {
+    let node = 0;
+    for (let i = 0; i < keyword.length; i++) {
+      const code = keyword.charCodeAt(i);
+      let child = next[node].get(code);
+      if (child === undefined) {
+        child = next.length;
+        next.push(new Map());
+        fail.push(0);
+        output.push([]);
+        next[node].set(code, child);
+      }
+      node = child;
+    }
+    output[node].push(id);
+  });
+
+  // Breadth-first so every fail target is resolved before its dependents
+  const queue = Array.from(next[0].values());
+  for (let head = 0; head < queue.length; head++) {
+    const node = queue[head];
+    next[node].forEach((child, code) => {
+      let target = fail[node];
+      while (target !== 0 && !next[target].has(code)) {
+        target = fail[target];
+      }
+      fail[child] = next[target].get(code) ?? 0;
+      output[child] = output[child].concat(output[fail[child]]);
+      queue.push(child);
+    });
+  }
+
+  return { keywords, next, fail, output };
+}
+
+const KEYWORD_MATCHER = compileKeywordMatcher([
+  MANAGE_PATTERNS.keywords,
+  DEVELOP_PATTERNS.keywords,
+  ORGANIZE_PATTERNS.keywords,
+  EXPERIENCE_PATTERNS.keywords,
+  ...Object.values(DEVELOP_CONTENT_INDICATORS),
+  LEARN_INDICATORS,
+]);
+
+/**
+ * Every known keyword contained in the content (case-insensitive)
+ */
+function findKeywords(content: string): Set<string> {
+  const { keywords, next, fail, output } = KEYWORD_MATCHER;
+  const text = content.toLowerCase();
+  const found = new Set<string>();
+
+  let node = 0;
+  for (let i = 0; i < text.length; i++) {
+    const code = text.charCodeAt(i);
+    while (node !== 0 && !next[node].has(code)) {
+      node = fail[node];
+    }
+    node = next[node].get(code) ?? 0;
+    for (const id of output[node]) {
+      found.add(keywords[id]);
+    }
+  }
+
+  return found;
+}
+
+// Fuzzy preset lookups score every preset - remember them per label
+const MAX_LABEL_PRESET_CACHE = 500;
+const labelPresetCache = new Map<string, LabelPreset | undefined>();
+
+function getLabelPreset(labelName: string): LabelPreset | undefined {
+  if (labelPresetCache.has(labelName)) {
+    return labelPresetCache.get(labelName);
+  }
+  if (labelPresetCache.size >= MAX_LABEL_PRESET_CACHE) {
+    labelPresetCache.clear();
+  }
+  const preset = getPresetForLabelFuzzy(labelName);
+  labelPresetCache.set(labelName, preset);
+  return preset;
+}
+
 // ============================================
 // Detection Result Types
 // ============================================
@@ -171,7 +313,7 @@ function detectModeFromLabels(labels: string[]): ModeSignal[] {
   const signals: ModeSignal[] = [];
 
   for (const labelName of labels) {
-    const preset = getPresetForLabelFuzzy(labelName);
+    const preset = getLabelPreset(labelName);
     if (preset) {
       signals.push({
         type: 'label',
@@ -187,14 +329,17 @@ function detectModeFromLabels(labels: string[]): ModeSignal[] {
 
 /**
  * Detect mode from content keywords
+ * Pass `matches` from findKeywords to reuse a scan of the same content.
  */
-function detectModeFromKeywords(content: string): ModeSignal[] {
+function detectModeFromKeywords(
+  content: string,
+  matches: Set<string> = findKeywords(content)
+): ModeSignal[] {
   const signals: ModeSignal[] = [];
-  const lowerContent = content.toLowerCase();
 
   const checkKeywords = (keywords: string[], mode: Mode, weight: number) => {
     for (const keyword of keywords) {
-      if (lowerContent.includes(keyword)) {
+      if (matches.has(keyword)) {
         signals.push({
           type: 'keyword',
           mode,
@@ -345,43 +490,18 @@ function determineWinningMode(scores: Record<Mode, number>): { mode: Mode; confi
 // Content Type Detection for DEVELOP Mode
 // ============================================
 
-function detectDevelopContentType(content: string): DevelopContentType | undefined {
-  const lowerContent = content.toLowerCase();
-
-  // Story/Novel indicators
-  const storyIndicators = [
-    'character', 'plot', 'chapter', 'story', 'novel', 'fiction',
-    'protagonist', 'dialogue', 'scene', 'narrative',
-  ];
-  const storyMatches = storyIndicators.filter((i) => lowerContent.includes(i)).length;
-
-  // Business indicators
-  const businessIndicators = [
-    'market', 'customer', 'revenue', 'startup', 'business', 'product',
-    'pricing', 'competitor', 'growth', 'monetize', 'user acquisition',
-  ];
-  const businessMatches = businessIndicators.filter((i) => lowerContent.includes(i)).length;
-
-  // Blog/Content indicators
-  const blogIndicators = [
-    'post', 'article', 'blog', 'headline', 'reader', 'audience',
-    'seo', 'content', 'publish', 'draft',
-  ];
-  const blogMatches = blogIndicators.filter((i) => lowerContent.includes(i)).length;
-
-  // Design/Product indicators
-  const designIndicators = [
-    'design', 'ui', 'ux', 'feature', 'app', 'website', 'interface',
-    'wireframe', 'prototype', 'user flow', 'mockup',
-  ];
-  const designMatches = designIndicators.filter((i) => lowerContent.includes(i)).length;
+function detectDevelopContentType(
+  content: string,
+  matches: Set<string> = findKeywords(content)
+): DevelopContentType | undefined {
+  const countMatches = (indicators: string[]) => indicators.filter((i) => matches.has(i)).length;
 
   // Find the highest match
   const scores = {
-    story: storyMatches,
-    business: businessMatches,
-    blog: blogMatches,
-    design: designMatches,
+    story: countMatches(DEVELOP_CONTENT_INDICATORS.story),
+    business: countMatches(DEVELOP_CONTENT_INDICATORS.business),
+    blog: countMatches(DEVELOP_CONTENT_INDICATORS.blog),
+    design: countMatches(DEVELOP_CONTENT_INDICATORS.design),
   };
 
   const maxScore = Math.max(...Object.values(scores));
@@ -399,23 +519,22 @@ function detectDevelopContentType(content: string): DevelopContentType | undefin
 // Organize Stage Detection
 // ============================================
 
-function detectOrganizeStage(content: string, labels: string[]): OrganizeStage {
+function detectOrganizeStage(
+  content: string,
+  labels: string[],
+  matches?: Set<string>
+): OrganizeStage {
   // Check if any label suggests a specific stage
   for (const label of labels) {
-    const preset = getPresetForLabelFuzzy(label);
+    const preset = getLabelPreset(label);
     if (preset?.organizeStage) {
       return preset.organizeStage;
     }
   }
 
   // Check for learning content indicators
-  const learnIndicators = [
-    'learn', 'study', 'memorize', 'flashcard', 'quiz', 'practice',
-    'vocabulary', 'definition', 'concept', 'term',
-  ];
-  const hasLearnIndicators = learnIndicators.some((i) =>
-    content.toLowerCase().includes(i)
-  );
+  const contentMatches = matches ?? findKeywords(content);
+  const hasLearnIndicators = LEARN_INDICATORS.some((i) => contentMatches.has(i));
   if (hasLearnIndicators) return 'learn';
 
   // Default to store for most organized content
@@ -426,14 +545,26 @@ function detectOrganizeStage(content: string, labels: string[]): OrganizeStage {
 // Main Detection Function
 // ============================================
 
+// Results per note id, reused while title/content/labels are unchanged
+const MAX_DETECTION_CACHE = 1000;
+const detectionCache = new Map<string, { key: string; result: ModeDetectionResult }>();
+
 /**
- * Detect the appropriate mode for a note
- *
- * @param note - The note to analyze
- * @returns Detection result with mode, confidence, and signals
+ * Cache key for the inputs detection depends on
  */
-export function detectModeForNote(note: Note): ModeDetectionResult {
+function hashDetectionInput(note: Note): string {
+  const str = `${note.title}\n${note.content}`;
+  let hash = 0;
+  for (let i = 0; i < str.length; i++) {
+    hash = ((hash << 5) - hash) + str.charCodeAt(i);
+    hash |= 0;
+  }
+  return `${hash.toString(36)}:${str.length}:${note.labels.join('\u0000')}`;
+}
+
+function runDetection(note: Note): ModeDetectionResult {
   const content = `${note.title}\n${note.content}`;
+  const matches = findKeywords(content);
   const signals: ModeSignal[] = [];
 
   // 1. Check labels first (highest priority)
@@ -443,7 +574,7 @@ export function detectModeForNote(note: Note): ModeDetectionResult {
   signals.push(...detectModeFromPatterns(content));
 
   // 3. Check keywords
-  signals.push(...detectModeFromKeywords(content));
+  signals.push(...detectModeFromKeywords(content, matches));
 
   // 4. Check structure
   signals.push(...detectModeFromStructure(content));
@@ -461,14 +592,64 @@ export function detectModeForNote(note: Note): ModeDetectionResult {
 
   // Add mode-specific details
   if (mode === 'develop') {
-    result.developContentType = detectDevelopContentType(content);
+    result.developContentType = detectDevelopContentType(content, matches);
   } else if (mode === 'organize') {
-    result.organizeStage = detectOrganizeStage(content, note.labels);
+    result.organizeStage = detectOrganizeStage(content, note.labels, matches);
   }
 
   return result;
 }
 
+/**
+ * Detect the appropriate mode for a note
+ * Results are cached per note; treat them as read-only.
+ *
+ * @param note - The note to analyze
+ * @returns Detection result with mode, confidence, and signals
+ */
+export function detectModeForNote(note: Note): ModeDetectionResult {
+  const key = hashDetectionInput(note);
+  const cached = detectionCache.get(note.id);
+  if (cached?.key === key) {
+    // Refresh recency
+    detectionCache.delete(note.id);
+    detectionCache.set(note.id, cached);
+    return cached.result;
+  }
+
+  const result = runDetection(note);
+  detectionCache.delete(note.id);
+  detectionCache.set(note.id, { key, result });
+  if (detectionCache.size > MAX_DETECTION_CACHE) {
+    // Evict least recently used
+    detectionCache.delete(detectionCache.keys().next().value as string);
+  }
+  return result;
+}
+
+/**
+ * Detect modes for many notes at once (e.g. backfilling behaviors after sync)
+ *
+ * @returns Detection results keyed by note id
+ */
+export function detectModesBatch(notes: Note[]): Record<string, ModeDetectionResult> {
+  const results: Record<string, ModeDetectionResult> = {};
+  for (const note of notes) {
+    // Large batches would flush the per-note cache, so only read from it
+    const cached = detectionCache.get(note.id);
+    results[note.id] = cached?.key === hashDetectionInput(note) ? cached.result : runDetection(note);
+  }
+  return results;
+}
+
+/**
+ * Drop cached detection results (e.g. on sign out)
+ */
+export function clearModeDetectionCache(): void {
+  detectionCache.clear();
+  labelPresetCache.clear();
+}
+
 /**
  * Get the mode for a single label (for board mode inference)
  */
@@ -481,7 +662,7 @@ export function getModeForSingleLabel(labelName: string): Mode {
  * Infer mode for a board based on its hashtag
  */
 export function inferBoardMode(hashtag: string): ModeDetectionResult {
-  const preset = getPresetForLabelFuzzy(hashtag);
+  const preset = getLabelPreset(hashtag);
 
   if (preset) {
     return {
@@ -529,4 +710,5 @@ export {
   detectModeFromStructure,
   detectDevelopContentType,
   detectOrganizeStage,
+  findKeywords,
 };
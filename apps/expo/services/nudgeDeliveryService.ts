@@ -378,9 +378,7 @@ class NudgeDeliveryService {
       case 'move_note':
         if (action.noteId) {
           const { useNoteStore } = require('@/stores');
-          const note = useNoteStore.getState().notes.find(
-            (n: Note) => n.id === action.noteId
-          );
+          const note = useNoteStore.getState().getNoteById(action.noteId);
           if (note) {
             // Add the target board as a label
             useNoteStore.getState().addLabelToNote(action.noteId, action.targetBoard);
@@ -192,6 +192,10 @@ export function defineSkill(options: SkillOptions): SkillBuilder {
 class SkillRegistry {
   private skills: Map<string, Skill> = new Map();
   private skillsByAgent: Map<AgentId, Set<string>> = new Map();
+  // Event type -> skills evaluated for it (rebuilt lazily after register/unregister)
+  private skillsByEvent: Map<string, Skill[]> | null = null;
+  // Skills evaluated for every event (pattern or custom triggers, no event triggers)
+  private anyEventSkills: Skill[] = [];
 
   constructor() {
     // Initialize agent skill sets
@@ -207,6 +211,7 @@ class SkillRegistry {
   register(skill: Skill, agentId: AgentId): void {
     this.skills.set(skill.id, skill);
     this.skillsByAgent.get(agentId)?.add(skill.id);
+    this.skillsByEvent = null;
     console.log(`[SkillRegistry] Registered skill: ${skill.id} for agent: ${agentId}`);
   }
 
@@ -218,6 +223,7 @@ class SkillRegistry {
     for (const agentSkills of this.skillsByAgent.values()) {
       agentSkills.delete(skillId);
     }
+    this.skillsByEvent = null;
   }
 
   /**
@@ -234,6 +240,57 @@ class SkillRegistry {
     return Array.from(this.skills.values());
   }
 
+  /**
+   * Get skills that can react to an event, in registration order.
+   * Time- and manual-only skills are never returned (they're fired externally).
+   */
+  getForEvent(event: string): Skill[] {
+    if (!this.skillsByEvent) {
+      this.buildEventIndex();
+    }
+    return this.skillsByEvent!.get(event) ?? this.anyEventSkills;
+  }
+
+  private buildEventIndex(): void {
+    const skills = this.getAll();
+    const eventsBySkill = new Map<string, Set<string>>();
+    const allEvents = new Set<string>();
+    const anyEventSkills: Skill[] = [];
+
+    for (const skill of skills) {
+      const events = new Set<string>();
+      // Pattern triggers are checked on whatever event arrives (triggers are
+      // OR-ed), so a skill with any of them is a candidate for every event
+      let matchesAnyEvent = skill.triggers.length === 0;
+      for (const trigger of skill.triggers) {
+        if (trigger.condition.type === 'event' && trigger.condition.event) {
+          events.add(trigger.condition.event);
+          allEvents.add(trigger.condition.event);
+        } else if (trigger.type !== 'time' && trigger.type !== 'manual') {
+          matchesAnyEvent = true;
+        }
+      }
+      eventsBySkill.set(skill.id, events);
+
+      if (matchesAnyEvent) {
+        anyEventSkills.push(skill);
+      }
+    }
+
+    const skillsByEvent = new Map<string, Skill[]>();
+    for (const event of allEvents) {
+      skillsByEvent.set(
+        event,
+        skills.filter(
+          (skill) => eventsBySkill.get(skill.id)!.has(event) || anyEventSkills.includes(skill)
+        )
+      );
+    }
+
+    this.skillsByEvent = skillsByEvent;
+    this.anyEventSkills = anyEventSkills;
+  }
+
   /**
    * Get skills for a specific agent
    */
@@ -4,6 +4,14 @@
  * Handles bidirectional synchronization between local store and Supabase cloud.
  * Uses "last write wins" conflict resolution strategy.
  *
+ * Sync is incremental: each table keeps a cursor (see syncStateStore) so only
+ * rows committed in the cloud since the last pull are fetched (bounded by the
+ * server's transaction horizon, paged by the server-assigned sync_seq), and
+ * only local records edited since the last push are uploaded (chunked, with
+ * retry). This device's own writes are recognised by id and sync_seq and
+ * skipped when pulled back. The first sync
+ * for an account, or one run with `mode: 'full'`, compares everything.
+ *
  * Syncs: Notes, Designs, Boards, Labels (Pro users only)
  */
 
@@ -13,8 +21,17 @@ import { useUserStore } from '@/stores/userStore';
 import { useDesignStore } from '@/stores/designStore';
 import { useBoardStore } from '@/stores/boardStore';
 import { useLabelStore } from '@/stores/labelStore';
+import {
+  useSyncStateStore,
+  SyncCursor,
+  SyncEcho,
+  SyncMode,
+  SyncStats,
+  SyncTable,
+} from '@/stores/syncStateStore';
 import { Note, NoteDesign, Board, Label } from '@/types';
 import { RealtimeChannel } from '@supabase/supabase-js';
+import type { ModeDetectionResult } from './modeDetectionService';
 import {
   migrateNoteImages,
   isLocalUri,
@@ -41,12 +58,396 @@ type ConflictStrategy = 'cloud_wins' | 'local_wins' | 'latest_wins';
 
 interface SyncOptions {
   conflictStrategy?: ConflictStrategy;
+  // Force a full comparison instead of a cursor-based delta
+  mode?: SyncMode;
 }
 
 interface SyncResult {
   uploaded: number;
   downloaded: number;
   errors: string[];
+  stats?: SyncStats;
+}
+
+// Rows requested per page when pulling from the cloud
+const SYNC_PAGE_SIZE = 500;
+
+// Rows sent per upsert request
+const UPSERT_CHUNK_SIZE = 200;
+
+// Returned by upserts so this device can recognise its writes when pulled back
+const WRITTEN_COLUMNS = 'id, sync_seq, sync_xid';
+
+interface WrittenRow {
+  id: string;
+  sync_seq: number;
+  sync_xid: number;
+}
+
+// Retries per failed upsert chunk (exponential backoff)
+const UPSERT_MAX_RETRIES = 2;
+const UPSERT_RETRY_BASE_MS = 250;
+
+const sleep = (ms: number) => new Promise<void>((resolve) => setTimeout(resolve, ms));
+
+/**
+ * Approximate wire size of a JSON payload (for sync stats)
+ */
+function estimatePayloadBytes(rows: unknown[]): number {
+  return rows.length > 0 ? JSON.stringify(rows).length : 0;
+}
+
+/**
+ * Resolve the sync mode and effective cursor for a table
+ */
+function beginSync(
+  table: SyncTable,
+  userId: string,
+  options: SyncOptions
+): { cursor: SyncCursor; stats: SyncStats } {
+  const storedCursor = useSyncStateStore.getState().getCursor(table, userId);
+  const mode: SyncMode =
+    options.mode ?? (storedCursor.pulledXid !== null ? 'delta' : 'full');
+
+  // A full sync ignores both high-water marks (recorded writes are exact
+  // id/version matches, so they still apply)
+  const cursor: SyncCursor =
+    mode === 'full' ? { ...storedCursor, pulledXid: null, pushedAt: 0 } : storedCursor;
+
+  const stats: SyncStats = {
+    table,
+    mode,
+    startedAt: Date.now(),
+    durationMs: 0,
+    pages: 0,
+    rowsFetched: 0,
+    bytesFetched: 0,
+    chunks: 0,
+    rowsUploaded: 0,
+    bytesUploaded: 0,
+    retries: 0,
+  };
+
+  return { cursor, stats };
+}
+
+/**
+ * Stamp the duration and publish stats to the sync state store
+ */
+function finishSync(result: SyncResult, stats: SyncStats): SyncResult {
+  stats.durationMs = Date.now() - stats.startedAt;
+  useSyncStateStore.getState().recordStats(stats);
+  result.stats = stats;
+
+  console.log(
+    `[Sync] ${stats.table} (${stats.mode}): fetched ${stats.rowsFetched} rows/${stats.bytesFetched}B in ${stats.pages} page(s), ` +
+      `uploaded ${stats.rowsUploaded} rows/${stats.bytesUploaded}B in ${stats.chunks} chunk(s), ${stats.durationMs}ms`
+  );
+
+  return result;
+}
+
+/**
+ * Fetch rows committed since the cursor, one page at a time.
+ * With no cursor this fetches every row the user owns.
+ *
+ * sync_seq is taken when a row is written, not when its transaction commits,
+ * so a higher value can become visible before a lower one. Pulls are bounded
+ * by transaction id instead: sync_horizon() returns the oldest transaction
+ * still running, every transaction below it has finished, so the rows written
+ * by transactions in [cursor, horizon) are final and the next pull starts at
+ * the horizon. Within that range pages are keyed on sync_seq, which is unique,
+ * so rows changing mid-pull can't shift the pages.
+ */
+async function fetchChangedRows(
+  table: SyncTable,
+  userId: string,
+  cursor: SyncCursor,
+  stats: SyncStats
+): Promise<{ rows: any[]; horizon: number; error: string | null }> {
+  let rows: any[] = [];
+
+  const { data: horizon, error: horizonError } = await supabase.rpc('sync_horizon');
+  if (horizonError) {
+    return { rows, horizon: 0, error: horizonError.message };
+  }
+
+  let afterSeq: number | null = null;
+  while (true) {
+    let query = supabase.from(table).select('*').eq('user_id', userId).lt('sync_xid', horizon);
+    if (cursor.pulledXid !== null) {
+      query = query.gte('sync_xid', cursor.pulledXid);
+    }
+    if (afterSeq !== null) {
+      query = query.gt('sync_seq', afterSeq);
+    }
+
+    const { data, error } = await query
+      .order('sync_seq', { ascending: true })
+      .limit(SYNC_PAGE_SIZE);
+
+    if (error) {
+      return { rows, horizon, error: error.message };
+    }
+
+    const page = data ?? [];
+    stats.pages += 1;
+    stats.rowsFetched += page.length;
+    stats.bytesFetched += estimatePayloadBytes(page);
+    rows = rows.concat(page);
+
+    if (page.length < SYNC_PAGE_SIZE) {
+      return { rows, horizon, error: null };
+    }
+    afterSeq = page[page.length - 1].sync_seq;
+  }
+}
+
+/**
+ * Drop pulled rows that are this device's own writes coming back
+ */
+function withoutEchoes(rows: any[], cursor: SyncCursor): any[] {
+  return rows.filter((row) => cursor.echoes[row.id]?.seq !== row.sync_seq);
+}
+
+/**
+ * Upsert rows in bounded chunks, retrying each failed chunk with backoff.
+ * Returns the number of rows written, their new sync_seq values and the last
+ * error (if any chunk gave up).
+ */
+async function upsertInChunks(
+  table: SyncTable,
+  rows: any[],
+  stats: SyncStats
+): Promise<{ uploaded: number; written: WrittenRow[]; error: string | null }> {
+  let uploaded = 0;
+  const written: WrittenRow[] = [];
+  let lastError: string | null = null;
+
+  for (let i = 0; i < rows.length; i += UPSERT_CHUNK_SIZE) {
+    const chunk = rows.slice(i, i + UPSERT_CHUNK_SIZE);
+    stats.chunks += 1;
+
+    for (let attempt = 0; attempt <= UPSERT_MAX_RETRIES; attempt++) {
+      if (attempt > 0) {
+        stats.retries += 1;
+        await sleep(UPSERT_RETRY_BASE_MS * 2 ** (attempt - 1));
+      }
+
+      const { data, error } = await supabase.from(table).upsert(chunk).select(WRITTEN_COLUMNS);
+      if (!error) {
+        written.push(...((data as WrittenRow[] | null) ?? []));
+        uploaded += chunk.length;
+        stats.rowsUploaded += chunk.length;
+        stats.bytesUploaded += estimatePayloadBytes(chunk);
+        lastError = null;
+        break;
+      }
+
+      lastError = error.message;
+      console.warn(`[Sync] Upsert ${table} chunk failed (attempt ${attempt + 1}):`, error.message);
+    }
+
+    if (lastError) {
+      return { uploaded, written, error: lastError };
+    }
+  }
+
+  return { uploaded, written, error: null };
+}
+
+/**
+ * Decide which side wins when a record changed both locally and in the cloud
+ */
+function resolveConflict(
+  localTime: number,
+  cloudTime: number,
+  strategy: ConflictStrategy
+): 'upload' | 'download' | null {
+  if (localTime === cloudTime) return null;
+
+  switch (strategy) {
+    case 'latest_wins':
+      return localTime > cloudTime ? 'upload' : 'download';
+    case 'local_wins':
+      return 'upload';
+    case 'cloud_wins':
+      return 'download';
+    default:
+      return null;
+  }
+}
+
+/**
+ * Build the upload/download plan for one table.
+ *
+ * Cloud rows are the (possibly delta) fetch result, without this device's own
+ * writes; local records are looked up by id. Local records missing from the
+ * fetch are uploaded only if they changed since the last push - in delta mode
+ * an absent row usually just means the cloud copy hasn't changed.
+ */
+function planSync<T extends { id: string }>(
+  localItems: T[],
+  cloudRows: any[],
+  cursor: SyncCursor,
+  strategy: ConflictStrategy,
+  getLocalTime: (item: T) => number,
+  getCloudTime: (row: any) => number
+): { toUpload: T[]; toDownload: any[] } {
+  const localMap = new Map(localItems.map((item) => [item.id, item]));
+  const fetchedIds = new Set<string>();
+
+  const toUpload: T[] = [];
+  const toDownload: any[] = [];
+
+  for (const row of cloudRows) {
+    fetchedIds.add(row.id);
+    const localItem = localMap.get(row.id);
+
+    if (!localItem) {
+      // Only exists in cloud, download it
+      toDownload.push(row);
+      continue;
+    }
+
+    const action = resolveConflict(getLocalTime(localItem), getCloudTime(row), strategy);
+    if (action === 'upload') {
+      toUpload.push(localItem);
+    } else if (action === 'download') {
+      toDownload.push(row);
+    }
+  }
+
+  for (const [id, localItem] of localMap) {
+    if (fetchedIds.has(id)) continue;
+    const localTime = getLocalTime(localItem);
+    // Skip records already in the cloud at this exact version
+    if (localTime > cursor.pushedAt && cursor.synced[id] !== localTime) {
+      toUpload.push(localItem);
+    }
+  }
+
+  return { toUpload, toDownload };
+}
+
+/**
+ * Remember records this device wrote to the cloud: their sync_seq, so they are
+ * skipped when pulled back, and the local timestamp they were written at, so
+ * they aren't uploaded again
+ */
+function recordWrites(
+  table: SyncTable,
+  userId: string,
+  written: WrittenRow[],
+  localTimes: Map<string, number>
+): void {
+  if (written.length === 0) return;
+
+  const store = useSyncStateStore.getState();
+  const cursor = store.getCursor(table, userId);
+  const echoes = { ...cursor.echoes };
+  const synced = { ...cursor.synced };
+  for (const row of written) {
+    echoes[row.id] = { seq: row.sync_seq, xid: row.sync_xid };
+    const localTime = localTimes.get(row.id);
+    if (localTime !== undefined) synced[row.id] = localTime;
+  }
+  store.setCursor(table, { ...cursor, echoes, synced });
+}
+
+/**
+ * Timestamps of records by id
+ */
+function timesById<T extends { id: string }>(items: T[], getTime: (item: T) => number): Map<string, number> {
+  return new Map(items.map((item): [string, number] => [item.id, getTime(item)]));
+}
+
+interface SyncPass {
+  // Transaction horizon the pull reached (see fetchChangedRows)
+  horizon: number;
+  // Rows upserted during the pass, with the local timestamp of each record
+  written: WrittenRow[];
+  uploadedTimes: Map<string, number>;
+  // Local timestamps of downloaded records
+  downloadedTimes: Map<string, number>;
+  uploadSucceeded: boolean;
+  // Local records deliberately left out of the pass; the push mark stays below them
+  skippedTimes?: number[];
+}
+
+/**
+ * Advance the table cursor after a sync pass.
+ *
+ * The pull mark moves to the transaction horizon of the fetch (which only
+ * returns when every page arrived). The push mark only moves if every chunk was
+ * written, and then to the device time the pass started: everything edited
+ * locally before that is now in the cloud. It is only ever compared with local
+ * edit times, so server and other devices' clocks never leak into it.
+ */
+function advanceCursor(table: SyncTable, cursor: SyncCursor, stats: SyncStats, pass: SyncPass): void {
+  // Start from the stored cursor so writes recorded by single uploads during
+  // this pass are kept
+  const stored = useSyncStateStore.getState().getCursor(table, cursor.userId!);
+
+  const pulledXid = Math.max(cursor.pulledXid ?? 0, pass.horizon);
+
+  let pushedAt = cursor.pushedAt;
+  if (pass.uploadSucceeded) {
+    pushedAt = Math.max(pushedAt, Math.min(stats.startedAt, ...(pass.skippedTimes ?? [])) - 1);
+  }
+
+  // Writes by transactions below the pull mark have been pulled back already
+  const echoes: Record<string, SyncEcho> = {};
+  for (const [id, echo] of Object.entries(stored.echoes)) {
+    if (echo.xid >= pulledXid) echoes[id] = echo;
+  }
+  for (const row of pass.written) {
+    if (row.sync_xid >= pulledXid) echoes[row.id] = { seq: row.sync_seq, xid: row.sync_xid };
+  }
+
+  const synced: Record<string, number> = {};
+  const addSynced = (id: string, time: number) => {
+    if (time > pushedAt) synced[id] = time;
+  };
+  Object.entries(stored.synced).forEach(([id, time]) => addSynced(id, time));
+  pass.written.forEach((row) => {
+    const time = pass.uploadedTimes.get(row.id);
+    if (time !== undefined) addSynced(row.id, time);
+  });
+  pass.downloadedTimes.forEach((time, id) => addSynced(id, time));
+
+  useSyncStateStore.getState().setCursor(table, {
+    userId: cursor.userId,
+    pulledXid,
+    pushedAt,
+    echoes,
+    synced,
+  });
+}
+
+/**
+ * Merge downloaded records into a list by id in a single pass.
+ * Existing records are replaced in place; new ones are prepended (or appended).
+ */
+function mergeById<T extends { id: string }>(
+  current: T[],
+  incoming: T[],
+  merge: (existing: T, next: T) => T,
+  position: 'prepend' | 'append' = 'prepend'
+): T[] {
+  const incomingMap = new Map(incoming.map((item) => [item.id, item]));
+  const matched = new Set<string>();
+
+  const merged = current.map((item) => {
+    const next = incomingMap.get(item.id);
+    if (!next) return item;
+    matched.add(item.id);
+    return merge(item, next);
+  });
+
+  const added = incoming.filter((item) => !matched.has(item.id));
+  if (added.length === 0) return merged;
+  return position === 'prepend' ? [...added, ...merged] : [...merged, ...added];
 }
 
 /**
@@ -65,69 +466,49 @@ export async function syncNotes(
     return result;
   }
 
+  const { cursor, stats } = beginSync('notes', userId, options);
+
   try {
-    const localNotes = useNoteStore.getState().notes;
+    // Compare and upload full content, not hydrated previews. Notes whose
+    // body can't be read are left out until it can.
+    try {
+      await useNoteStore.getState().loadNoteBodies();
+    } catch (error) {
+      console.error('[Sync] Failed to load note bodies:', error);
+    }
+    const { pendingBodyIds } = useNoteStore.getState();
+    const allNotes = useNoteStore.getState().getAllNotes();
+    const localNotes = allNotes.filter((note) => !pendingBodyIds[note.id]);
+    const skippedTimes = allNotes
+      .filter((note) => pendingBodyIds[note.id])
+      .map((note) => note.updatedAt);
 
-    // Fetch cloud notes
-    const { data: cloudNotes, error } = await supabase
-      .from('notes')
-      .select('*')
-      .eq('user_id', userId);
+    // Fetch cloud notes changed since the last pull
+    const { rows: cloudNotes, horizon, error } = await fetchChangedRows('notes', userId, cursor, stats);
 
     if (error) {
-      result.errors.push(`Fetch error: ${error.message}`);
-      return result;
+      result.errors.push(`Fetch error: ${error}`);
+      return finishSync(result, stats);
     }
 
-    const cloudNotesMap = new Map(cloudNotes?.map((n) => [n.id, n]) ?? []);
-    const localNotesMap = new Map(localNotes.map((n) => [n.id, n]));
-
-    const toUpload: Note[] = [];
-    const toDownload: Note[] = [];
-
-    // Process local notes
-    for (const [id, localNote] of localNotesMap) {
-      const cloudNote = cloudNotesMap.get(id);
-
-      if (!cloudNote) {
-        // Only exists locally, upload it
-        toUpload.push(localNote);
-      } else {
-        // Exists in both, resolve conflict
-        const localTime = localNote.updatedAt;
-        const cloudTime = new Date(cloudNote.updated_at).getTime();
-
-        if (options.conflictStrategy === 'latest_wins') {
-          if (localTime > cloudTime) {
-            toUpload.push(localNote);
-          } else if (cloudTime > localTime) {
-            toDownload.push(mapCloudToLocal(cloudNote));
-          }
-          // If equal, no action needed
-        } else if (options.conflictStrategy === 'local_wins') {
-          if (localTime !== cloudTime) {
-            toUpload.push(localNote);
-          }
-        } else if (options.conflictStrategy === 'cloud_wins') {
-          if (localTime !== cloudTime) {
-            toDownload.push(mapCloudToLocal(cloudNote));
-          }
-        }
-      }
-    }
-
-    // Find notes only in cloud
-    for (const [id, cloudNote] of cloudNotesMap) {
-      if (!localNotesMap.has(id)) {
-        toDownload.push(mapCloudToLocal(cloudNote));
-      }
-    }
+    const { toUpload, toDownload: cloudToDownload } = planSync(
+      localNotes,
+      withoutEchoes(cloudNotes, cursor),
+      cursor,
+      options.conflictStrategy ?? 'latest_wins',
+      (note) => note.updatedAt,
+      (row) => new Date(row.updated_at).getTime()
+    );
+    const toDownload = cloudToDownload.map(mapCloudToLocal);
 
     console.log('[Sync] To upload:', toUpload.length, 'To download:', toDownload.length);
 
     // Upload local changes (with image migration)
+    let uploadSucceeded = true;
+    let written: WrittenRow[] = [];
     if (toUpload.length > 0) {
-      // Migrate images for all notes being uploaded
+      // Migrate images for all notes being uploaded. Uploads go through the
+      // bounded image queue, so only a few images are in memory at a time.
       const migratedNotes = await Promise.all(
         toUpload.map(async (note) => {
           if (note.images?.some(isLocalUri)) {
@@ -140,49 +521,69 @@ export async function syncNotes(
         })
       );
 
-      const { error: uploadError } = await supabase
-        .from('notes')
-        .upsert(migratedNotes.map((n) => mapLocalToCloud(n, userId)));
+      const { uploaded, written: upserted, error: uploadError } = await upsertInChunks(
+        'notes',
+        migratedNotes.map((n) => mapLocalToCloud(n, userId)),
+        stats
+      );
+      written = upserted;
 
+      result.uploaded = uploaded;
       if (uploadError) {
-        result.errors.push(`Upload error: ${uploadError.message}`);
-      } else {
-        result.uploaded = toUpload.length;
+        uploadSucceeded = false;
+        result.errors.push(`Upload error: ${uploadError}`);
       }
     }
 
-    // Download cloud changes to local store
+    // Download cloud changes to local store (single indexed merge by id)
     if (toDownload.length > 0) {
-      const noteStore = useNoteStore.getState();
-      const newNotes: Note[] = [];
-
-      for (const note of toDownload) {
-        // Check if note exists locally
-        const existingNote = noteStore.notes.find((n) => n.id === note.id);
-        if (existingNote) {
-          noteStore.updateNote(note.id, note);
-        } else {
-          // Collect new notes to add
-          newNotes.push(note);
-        }
-      }
-
-      // Add all new notes at once using setState (triggers re-render)
-      if (newNotes.length > 0) {
-        useNoteStore.setState((state) => ({
-          notes: [...newNotes, ...state.notes]
-        }));
-      }
+      useNoteStore.getState().upsertNotes(toDownload);
+      backfillBehaviors(toDownload);
 
       result.downloaded = toDownload.length;
     }
 
-    return result;
+    advanceCursor('notes', cursor, stats, {
+      horizon,
+      written,
+      uploadedTimes: timesById(toUpload, (n) => n.updatedAt),
+      downloadedTimes: timesById(toDownload, (n) => n.updatedAt),
+      uploadSucceeded,
+      skippedTimes,
+    });
+
+    return finishSync(result, stats);
   } catch (error) {
     result.errors.push(
       error instanceof Error ? error.message : 'Unknown sync error'
     );
-    return result;
+    return finishSync(result, stats);
+  }
+}
+
+/**
+ * MODE Framework: initialize behaviors for downloaded notes that don't have one
+ * (lazy require to avoid circular dependency)
+ */
+function backfillBehaviors(notes: Note[]): void {
+  try {
+    const { detectModesBatch } = require('./modeDetectionService');
+    const { useBehaviorStore } = require('@/stores/behaviorStore');
+    const behaviorStore = useBehaviorStore.getState();
+
+    const missing = notes.filter((note) => !note.isDeleted && !behaviorStore.getBehavior(note.id));
+    if (missing.length === 0) return;
+
+    const detections: Record<string, ModeDetectionResult> = detectModesBatch(missing);
+    behaviorStore.initBehaviors(
+      missing.map((note) => ({
+        noteId: note.id,
+        mode: detections[note.id].mode,
+        organizeStage: detections[note.id].organizeStage,
+      }))
+    );
+  } catch (error) {
+    console.error('[Sync] Behavior backfill failed:', error);
   }
 }
 
@@ -299,15 +700,17 @@ export async function uploadNote(note: Note, userId: string): Promise<boolean> {
       noteStore.updateNote(note.id, { images: migratedImages });
     }
 
-    const { error } = await supabase
+    const { data, error } = await supabase
       .from('notes')
-      .upsert(mapLocalToCloud(noteToUpload, userId));
+      .upsert(mapLocalToCloud(noteToUpload, userId))
+      .select(WRITTEN_COLUMNS);
 
     if (error) {
       console.error('[Sync] Error uploading note:', error);
       return false;
     }
 
+    recordWrites('notes', userId, data ?? [], new Map([[note.id, noteToUpload.updatedAt]]));
     return true;
   } catch (error) {
     console.error('[Sync] Error uploading note:', error);
@@ -434,6 +837,8 @@ export async function syncDesigns(
     return result;
   }
 
+  const { cursor, stats } = beginSync('designs', userId, options);
+
   try {
     // Filter out designs with invalid UUIDs (legacy custom-* IDs)
     const allLocalDesigns = useDesignStore.getState().designs;
@@ -445,96 +850,67 @@ export async function syncDesigns(
       return true;
     });
 
-    const { data: cloudDesigns, error } = await supabase
-      .from('designs')
-      .select('*')
-      .eq('user_id', userId);
+    const { rows: cloudDesigns, horizon, error } = await fetchChangedRows('designs', userId, cursor, stats);
 
     if (error) {
-      result.errors.push(`Fetch designs error: ${error.message}`);
-      return result;
-    }
-
-    const cloudDesignsMap = new Map(cloudDesigns?.map((d) => [d.id, d]) ?? []);
-    const localDesignsMap = new Map(localDesigns.map((d) => [d.id, d]));
-
-    const toUpload: NoteDesign[] = [];
-    const toDownload: NoteDesign[] = [];
-
-    // Process local designs
-    for (const [id, localDesign] of localDesignsMap) {
-      const cloudDesign = cloudDesignsMap.get(id);
-
-      if (!cloudDesign) {
-        toUpload.push(localDesign);
-      } else {
-        const localTime = localDesign.createdAt;
-        const cloudTime = new Date(cloudDesign.created_at).getTime();
-
-        if (options.conflictStrategy === 'latest_wins') {
-          if (localTime > cloudTime) {
-            toUpload.push(localDesign);
-          } else if (cloudTime > localTime) {
-            toDownload.push(mapDesignCloudToLocal(cloudDesign));
-          }
-        } else if (options.conflictStrategy === 'local_wins') {
-          if (localTime !== cloudTime) {
-            toUpload.push(localDesign);
-          }
-        } else if (options.conflictStrategy === 'cloud_wins') {
-          if (localTime !== cloudTime) {
-            toDownload.push(mapDesignCloudToLocal(cloudDesign));
-          }
-        }
-      }
+      result.errors.push(`Fetch designs error: ${error}`);
+      return finishSync(result, stats);
     }
 
-    // Find designs only in cloud
-    for (const [id, cloudDesign] of cloudDesignsMap) {
-      if (!localDesignsMap.has(id)) {
-        toDownload.push(mapDesignCloudToLocal(cloudDesign));
-      }
-    }
+    // Designs are compared by createdAt (they are versioned, not edited)
+    const { toUpload, toDownload: cloudToDownload } = planSync(
+      localDesigns,
+      withoutEchoes(cloudDesigns, cursor),
+      cursor,
+      options.conflictStrategy ?? 'latest_wins',
+      (design) => design.createdAt,
+      (row) => new Date(row.created_at).getTime()
+    );
+    const toDownload = cloudToDownload.map(mapDesignCloudToLocal);
 
     console.log('[Sync] Designs - To upload:', toUpload.length, 'To download:', toDownload.length);
 
     // Upload local changes
+    let uploadSucceeded = true;
+    let written: WrittenRow[] = [];
     if (toUpload.length > 0) {
-      const { error: uploadError } = await supabase
-        .from('designs')
-        .upsert(toUpload.map((d) => mapDesignLocalToCloud(d, userId)));
+      const { uploaded, written: upserted, error: uploadError } = await upsertInChunks(
+        'designs',
+        toUpload.map((d) => mapDesignLocalToCloud(d, userId)),
+        stats
+      );
 
+      written = upserted;
+      result.uploaded = uploaded;
       if (uploadError) {
-        result.errors.push(`Upload designs error: ${uploadError.message}`);
-      } else {
-        result.uploaded = toUpload.length;
+        uploadSucceeded = false;
+        result.errors.push(`Upload designs error: ${uploadError}`);
       }
     }
 
-    // Download cloud changes to local store
+    // Download cloud changes to local store (single merge by id)
     if (toDownload.length > 0) {
-      const designStore = useDesignStore.getState();
-
-      for (const design of toDownload) {
-        const existingDesign = designStore.designs.find((d) => d.id === design.id);
-        if (existingDesign) {
-          designStore.updateDesign(design.id, design);
-        } else {
-          useDesignStore.setState((state) => ({
-            designs: [design, ...state.designs],
-          }));
-        }
-      }
+      useDesignStore.setState((state) => ({
+        designs: mergeById(state.designs, toDownload, (existing, next) => ({ ...existing, ...next })),
+      }));
 
       result.downloaded = toDownload.length;
     }
 
-    return result;
+    advanceCursor('designs', cursor, stats, {
+      horizon,
+      written,
+      uploadedTimes: timesById(toUpload, (d) => d.createdAt),
+      downloadedTimes: timesById(toDownload, (d) => d.createdAt),
+      uploadSucceeded,
+    });
+
+    return finishSync(result, stats);
   } catch (error) {
     result.errors.push(
       error instanceof Error ? error.message : 'Unknown design sync error'
     );
-    return result;
+    return finishSync(result, stats);
   }
 }
 
@@ -549,15 +925,17 @@ export async function uploadDesign(design: NoteDesign, userId: string): Promise<
   }
 
   try {
-    const { error } = await supabase
+    const { data, error } = await supabase
       .from('designs')
-      .upsert(mapDesignLocalToCloud(design, userId));
+      .upsert(mapDesignLocalToCloud(design, userId))
+      .select(WRITTEN_COLUMNS);
 
     if (error) {
       console.error('[Sync] Error uploading design:', error);
       return false;
     }
 
+    recordWrites('designs', userId, data ?? [], new Map([[design.id, design.createdAt]]));
     return true;
   } catch (error) {
     console.error('[Sync] Error uploading design:', error);
@@ -666,103 +1044,87 @@ export async function syncBoards(
     return result;
   }
 
-  try {
-    const localBoards = useBoardStore.getState().boards;
+  const { cursor, stats } = beginSync('boards', userId, options);
 
-    const { data: cloudBoards, error } = await supabase
-      .from('boards')
-      .select('*')
-      .eq('user_id', userId);
+  try {
+    // Boards merged into another by the label migration: delete their rows
+    // first, so they aren't pulled back and don't hold the merged hashtag
+    const { mergedBoardIds } = useBoardStore.getState();
+    if (mergedBoardIds.length > 0) {
+      const { error: deleteError } = await supabase
+        .from('boards')
+        .delete()
+        .in('id', mergedBoardIds);
 
-    if (error) {
-      result.errors.push(`Fetch boards error: ${error.message}`);
-      return result;
+      if (deleteError) {
+        result.errors.push(`Delete merged boards error: ${deleteError.message}`);
+        return finishSync(result, stats);
+      }
+      useBoardStore.getState().clearMergedBoardIds(mergedBoardIds);
     }
 
-    const cloudBoardsMap = new Map(cloudBoards?.map((b) => [b.id, b]) ?? []);
-    const localBoardsMap = new Map(localBoards.map((b) => [b.id, b]));
-
-    const toUpload: Board[] = [];
-    const toDownload: Board[] = [];
-
-    // Process local boards
-    for (const [id, localBoard] of localBoardsMap) {
-      const cloudBoard = cloudBoardsMap.get(id);
+    const localBoards = useBoardStore.getState().boards;
 
-      if (!cloudBoard) {
-        toUpload.push(localBoard);
-      } else {
-        const localTime = localBoard.updatedAt;
-        const cloudTime = new Date(cloudBoard.updated_at).getTime();
+    const { rows: cloudBoards, horizon, error } = await fetchChangedRows('boards', userId, cursor, stats);
 
-        if (options.conflictStrategy === 'latest_wins') {
-          if (localTime > cloudTime) {
-            toUpload.push(localBoard);
-          } else if (cloudTime > localTime) {
-            toDownload.push(mapBoardCloudToLocal(cloudBoard));
-          }
-        } else if (options.conflictStrategy === 'local_wins') {
-          if (localTime !== cloudTime) {
-            toUpload.push(localBoard);
-          }
-        } else if (options.conflictStrategy === 'cloud_wins') {
-          if (localTime !== cloudTime) {
-            toDownload.push(mapBoardCloudToLocal(cloudBoard));
-          }
-        }
-      }
+    if (error) {
+      result.errors.push(`Fetch boards error: ${error}`);
+      return finishSync(result, stats);
     }
 
-    // Find boards only in cloud
-    for (const [id, cloudBoard] of cloudBoardsMap) {
-      if (!localBoardsMap.has(id)) {
-        toDownload.push(mapBoardCloudToLocal(cloudBoard));
-      }
-    }
+    const { toUpload, toDownload: cloudToDownload } = planSync(
+      localBoards,
+      withoutEchoes(cloudBoards, cursor),
+      cursor,
+      options.conflictStrategy ?? 'latest_wins',
+      (board) => board.updatedAt,
+      (row) => new Date(row.updated_at).getTime()
+    );
+    const toDownload = cloudToDownload.map(mapBoardCloudToLocal);
 
     console.log('[Sync] Boards - To upload:', toUpload.length, 'To download:', toDownload.length);
 
     // Upload local changes
+    let uploadSucceeded = true;
+    let written: WrittenRow[] = [];
     if (toUpload.length > 0) {
-      const { error: uploadError } = await supabase
-        .from('boards')
-        .upsert(toUpload.map((b) => mapBoardLocalToCloud(b, userId)));
+      const { uploaded, written: upserted, error: uploadError } = await upsertInChunks(
+        'boards',
+        toUpload.map((b) => mapBoardLocalToCloud(b, userId)),
+        stats
+      );
 
+      written = upserted;
+      result.uploaded = uploaded;
       if (uploadError) {
-        result.errors.push(`Upload boards error: ${uploadError.message}`);
-      } else {
-        result.uploaded = toUpload.length;
+        uploadSucceeded = false;
+        result.errors.push(`Upload boards error: ${uploadError}`);
       }
     }
 
-    // Download cloud changes to local store
+    // Download cloud changes to local store (single merge by id, new boards appended)
     if (toDownload.length > 0) {
-      for (const board of toDownload) {
-        const existingBoard = useBoardStore.getState().boards.find((b) => b.id === board.id);
-        if (existingBoard) {
-          // Update existing board
-          useBoardStore.setState((state) => ({
-            boards: state.boards.map((b) =>
-              b.id === board.id ? board : b
-            ),
-          }));
-        } else {
-          // Add new board
-          useBoardStore.setState((state) => ({
-            boards: [...state.boards, board],
-          }));
-        }
-      }
+      useBoardStore.setState((state) => ({
+        boards: mergeById(state.boards, toDownload, (_existing, next) => next, 'append'),
+      }));
 
       result.downloaded = toDownload.length;
     }
 
-    return result;
+    advanceCursor('boards', cursor, stats, {
+      horizon,
+      written,
+      uploadedTimes: timesById(toUpload, (b) => b.updatedAt),
+      downloadedTimes: timesById(toDownload, (b) => b.updatedAt),
+      uploadSucceeded,
+    });
+
+    return finishSync(result, stats);
   } catch (error) {
     result.errors.push(
       error instanceof Error ? error.message : 'Unknown board sync error'
     );
-    return result;
+    return finishSync(result, stats);
   }
 }
 
@@ -771,15 +1133,17 @@ export async function syncBoards(
  */
 export async function uploadBoard(board: Board, userId: string): Promise<boolean> {
   try {
-    const { error } = await supabase
+    const { data, error } = await supabase
       .from('boards')
-      .upsert(mapBoardLocalToCloud(board, userId));
+      .upsert(mapBoardLocalToCloud(board, userId))
+      .select(WRITTEN_COLUMNS);
 
     if (error) {
       console.error('[Sync] Error uploading board:', error);
       return false;
     }
 
+    recordWrites('boards', userId, data ?? [], new Map([[board.id, board.updatedAt]]));
     return true;
   } catch (error) {
     console.error('[Sync] Error uploading board:', error);
@@ -894,99 +1258,75 @@ export async function syncLabels(
     return result;
   }
 
+  const { cursor, stats } = beginSync('labels', userId, options);
+
   try {
     const localLabels = useLabelStore.getState().labels;
 
-    const { data: cloudLabels, error } = await supabase
-      .from('labels')
-      .select('*')
-      .eq('user_id', userId);
+    const { rows: cloudLabels, horizon, error } = await fetchChangedRows('labels', userId, cursor, stats);
 
     if (error) {
-      result.errors.push(`Fetch labels error: ${error.message}`);
-      return result;
-    }
-
-    const cloudLabelsMap = new Map(cloudLabels?.map((l) => [l.id, l]) ?? []);
-    const localLabelsMap = new Map(localLabels.map((l) => [l.id, l]));
-
-    const toUpload: Label[] = [];
-    const toDownload: Label[] = [];
-
-    // Process local labels
-    for (const [id, localLabel] of localLabelsMap) {
-      const cloudLabel = cloudLabelsMap.get(id);
-
-      if (!cloudLabel) {
-        toUpload.push(localLabel);
-      } else {
-        const localTime = localLabel.lastUsedAt || localLabel.createdAt;
-        const cloudTime = cloudLabel.last_used_at
-          ? new Date(cloudLabel.last_used_at).getTime()
-          : new Date(cloudLabel.created_at).getTime();
-
-        if (options.conflictStrategy === 'latest_wins') {
-          if (localTime > cloudTime) {
-            toUpload.push(localLabel);
-          } else if (cloudTime > localTime) {
-            toDownload.push(mapLabelCloudToLocal(cloudLabel));
-          }
-        } else if (options.conflictStrategy === 'local_wins') {
-          if (localTime !== cloudTime) {
-            toUpload.push(localLabel);
-          }
-        } else if (options.conflictStrategy === 'cloud_wins') {
-          if (localTime !== cloudTime) {
-            toDownload.push(mapLabelCloudToLocal(cloudLabel));
-          }
-        }
-      }
+      result.errors.push(`Fetch labels error: ${error}`);
+      return finishSync(result, stats);
     }
 
-    // Find labels only in cloud
-    for (const [id, cloudLabel] of cloudLabelsMap) {
-      if (!localLabelsMap.has(id)) {
-        toDownload.push(mapLabelCloudToLocal(cloudLabel));
-      }
-    }
+    const getLabelTime = (label: Label) => label.lastUsedAt || label.createdAt;
+    const { toUpload, toDownload: cloudToDownload } = planSync(
+      localLabels,
+      withoutEchoes(cloudLabels, cursor),
+      cursor,
+      options.conflictStrategy ?? 'latest_wins',
+      getLabelTime,
+      (row) =>
+        row.last_used_at
+          ? new Date(row.last_used_at).getTime()
+          : new Date(row.created_at).getTime()
+    );
+    const toDownload = cloudToDownload.map(mapLabelCloudToLocal);
 
     console.log('[Sync] Labels - To upload:', toUpload.length, 'To download:', toDownload.length);
 
     // Upload local changes
+    let uploadSucceeded = true;
+    let written: WrittenRow[] = [];
     if (toUpload.length > 0) {
-      const { error: uploadError } = await supabase
-        .from('labels')
-        .upsert(toUpload.map((l) => mapLabelLocalToCloud(l, userId)));
+      const { uploaded, written: upserted, error: uploadError } = await upsertInChunks(
+        'labels',
+        toUpload.map((l) => mapLabelLocalToCloud(l, userId)),
+        stats
+      );
 
+      written = upserted;
+      result.uploaded = uploaded;
       if (uploadError) {
-        result.errors.push(`Upload labels error: ${uploadError.message}`);
-      } else {
-        result.uploaded = toUpload.length;
+        uploadSucceeded = false;
+        result.errors.push(`Upload labels error: ${uploadError}`);
       }
     }
 
-    // Download cloud changes to local store
+    // Download cloud changes to local store (single merge by id)
     if (toDownload.length > 0) {
-      for (const label of toDownload) {
-        const existingLabel = useLabelStore.getState().labels.find((l) => l.id === label.id);
-        if (existingLabel) {
-          useLabelStore.getState().updateLabel(label.id, label);
-        } else {
-          useLabelStore.setState((state) => ({
-            labels: [label, ...state.labels],
-          }));
-        }
-      }
+      useLabelStore.setState((state) => ({
+        labels: mergeById(state.labels, toDownload, (existing, next) => ({ ...existing, ...next })),
+      }));
 
       result.downloaded = toDownload.length;
     }
 
-    return result;
+    advanceCursor('labels', cursor, stats, {
+      horizon,
+      written,
+      uploadedTimes: timesById(toUpload, getLabelTime),
+      downloadedTimes: timesById(toDownload, getLabelTime),
+      uploadSucceeded,
+    });
+
+    return finishSync(result, stats);
   } catch (error) {
     result.errors.push(
       error instanceof Error ? error.message : 'Unknown label sync error'
     );
-    return result;
+    return finishSync(result, stats);
   }
 }
 
@@ -995,15 +1335,17 @@ export async function syncLabels(
  */
 export async function uploadLabel(label: Label, userId: string): Promise<boolean> {
   try {
-    const { error } = await supabase
+    const { data, error } = await supabase
       .from('labels')
-      .upsert(mapLabelLocalToCloud(label, userId));
+      .upsert(mapLabelLocalToCloud(label, userId))
+      .select(WRITTEN_COLUMNS);
 
     if (error) {
       console.error('[Sync] Error uploading label:', error);
       return false;
     }
 
+    recordWrites('labels', userId, data ?? [], new Map([[label.id, label.lastUsedAt || label.createdAt]]));
     return true;
   } catch (error) {
     console.error('[Sync] Error uploading label:', error);
@@ -1064,3 +1406,22 @@ export function subscribeToLabels(
 
   return channel;
 }
+
+// ============================================
+// SYNC STATS
+// ============================================
+
+/**
+ * Get stats from the most recent sync of each table
+ */
+export function getSyncStats(): Partial<Record<SyncTable, SyncStats>> {
+  return useSyncStateStore.getState().lastStats;
+}
+
+/**
+ * Forget all sync cursors so the next sync compares everything.
+ * Call on sign-out or when local data is wiped.
+ */
+export function resetSyncCursors(): void {
+  useSyncStateStore.getState().resetCursors();
+}
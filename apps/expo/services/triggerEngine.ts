@@ -9,6 +9,11 @@
  * - Manual triggers: User-initiated
  *
  * The engine also manages cooldowns and deduplication.
+ *
+ * Events are dispatched only to skills subscribed to them (see
+ * skillRegistry.getForEvent). Bursty events (note_updated while typing,
+ * app_opened after sync) are coalesced by a scheduler, and evaluation time
+ * is recorded per event type (getEventTimings).
  */
 
 import {
@@ -276,6 +281,49 @@ function setCooldown(skillId: string, durationMs: number): void {
   useNudgeStore.getState().setSkillCooldown(skillId, durationMs);
 }
 
+// ============================================
+// Instrumentation
+// ============================================
+
+/**
+ * Evaluation timings for one event type
+ */
+export interface TriggerEventTiming {
+  count: number;            // Events evaluated
+  coalesced: number;        // Events merged into a later one by the scheduler
+  skillsEvaluated: number;  // Total candidate skills across all events
+  totalMs: number;
+  maxMs: number;
+  lastMs: number;
+}
+
+// Evaluations slower than a frame are logged
+const SLOW_EVENT_MS = 16;
+
+const eventTimings: Partial<Record<TriggerEvent, TriggerEventTiming>> = {};
+
+function getTiming(event: TriggerEvent): TriggerEventTiming {
+  let timing = eventTimings[event];
+  if (!timing) {
+    timing = { count: 0, coalesced: 0, skillsEvaluated: 0, totalMs: 0, maxMs: 0, lastMs: 0 };
+    eventTimings[event] = timing;
+  }
+  return timing;
+}
+
+function recordEventTiming(event: TriggerEvent, durationMs: number, skillCount: number): void {
+  const timing = getTiming(event);
+  timing.count++;
+  timing.skillsEvaluated += skillCount;
+  timing.totalMs += durationMs;
+  timing.maxMs = Math.max(timing.maxMs, durationMs);
+  timing.lastMs = durationMs;
+
+  if (durationMs > SLOW_EVENT_MS) {
+    console.warn(`[TriggerEngine] Slow event: ${event} took ${durationMs.toFixed(1)}ms (${skillCount} skills)`);
+  }
+}
+
 // ============================================
 // Main Trigger Engine
 // ============================================
@@ -322,17 +370,20 @@ export class TriggerEngine {
     event: TriggerEventPayload,
     context: TriggerContext
   ): Promise<TriggerEvaluationResult[]> {
+    const startedAt = performance.now();
     const results: TriggerEvaluationResult[] = [];
-    const skills = skillRegistry.getAll();
+    // Only skills subscribed to this event
+    const skills = skillRegistry.getForEvent(event.event);
 
-    console.log(`[TriggerEngine] Processing event: ${event.event}, skills registered: ${skills.length}`);
+    console.log(`[TriggerEngine] Processing event: ${event.event}, candidate skills: ${skills.length}`);
 
-    // Get recent behavior history for pattern detection
-    const allBehaviors = Object.values(useBehaviorStore.getState().behaviors);
-    const behaviorHistory = allBehaviors
-      .filter(b => context.behavior ? b.mode === context.behavior.mode : true)
-      .sort((a, b) => b.createdAt - a.createdAt)
-      .slice(0, 20); // Last 20 behaviors for pattern analysis
+    if (skills.length === 0) {
+      recordEventTiming(event.event, performance.now() - startedAt, 0);
+      return results;
+    }
+
+    // Recent behavior history for pattern detection (bounded, kept by behaviorStore)
+    const behaviorHistory = useBehaviorStore.getState().getRecentBehaviors(context.behavior?.mode);
 
     const skillContext: SkillContext = {
       note: context.note,
@@ -378,13 +429,9 @@ export class TriggerEngine {
         continue;
       }
 
-      // Evaluate triggers
-      const shouldTrigger = evaluateSkillTriggers(skill, skillContext, event);
-
-      // Also check custom shouldTrigger if defined
-      const customShouldTrigger = skill.shouldTrigger(skillContext);
-
-      const triggered = shouldTrigger || customShouldTrigger;
+      // Evaluate triggers, then the custom shouldTrigger if none matched
+      const triggered =
+        evaluateSkillTriggers(skill, skillContext, event) || skill.shouldTrigger(skillContext);
 
       results.push({
         skill,
@@ -399,9 +446,30 @@ export class TriggerEngine {
       }
     }
 
+    recordEventTiming(event.event, performance.now() - startedAt, skills.length);
     return results;
   }
 
+  /**
+   * Evaluation timings per event type since launch (or the last reset)
+   */
+  getEventTimings(): Partial<Record<TriggerEvent, TriggerEventTiming>> {
+    const snapshot: Partial<Record<TriggerEvent, TriggerEventTiming>> = {};
+    for (const [event, timing] of Object.entries(eventTimings)) {
+      snapshot[event as TriggerEvent] = { ...timing };
+    }
+    return snapshot;
+  }
+
+  /**
+   * Clear recorded timings
+   */
+  resetEventTimings(): void {
+    for (const event of Object.keys(eventTimings)) {
+      delete eventTimings[event as TriggerEvent];
+    }
+  }
+
   /**
    * Manually trigger a specific skill
    */
@@ -487,9 +555,7 @@ export class TriggerEngine {
 
       // Get the note from store (lazy import to avoid circular dep)
       const { useNoteStore } = require('@/stores');
-      const note = useNoteStore.getState().notes.find(
-        (n: Note) => n.id === behavior.noteId
-      );
+      const note = useNoteStore.getState().getNoteById(behavior.noteId);
 
       if (note) {
         await this.processEvent(event, { note, behavior });
@@ -511,9 +577,7 @@ export class TriggerEngine {
       };
 
       const { useNoteStore } = require('@/stores');
-      const note = useNoteStore.getState().notes.find(
-        (n: Note) => n.id === behavior.noteId
-      );
+      const note = useNoteStore.getState().getNoteById(behavior.noteId);
 
       if (note) {
         await this.processEvent(event, { note, behavior });
@@ -525,6 +589,117 @@ export class TriggerEngine {
 // Export singleton instance
 export const triggerEngine = TriggerEngine.getInstance();
 
+// ============================================
+// Event Coalescing
+// ============================================
+
+interface CoalescingOptions {
+  delayMs: number;    // Quiet period before the event runs
+  maxWaitMs: number;  // Upper bound on delay during a continuous burst
+}
+
+// Typing fires note_updated on every keystroke
+const NOTE_UPDATED_COALESCING: CoalescingOptions = { delayMs: 1500, maxWaitMs: 10000 };
+// Sync and foregrounding can fire app_opened back to back
+const APP_OPENED_COALESCING: CoalescingOptions = { delayMs: 1000, maxWaitMs: 3000 };
+
+interface ScheduledEvent {
+  event: TriggerEvent;
+  run: () => Promise<TriggerEvaluationResult[]>;
+  firstScheduledAt: number;
+  timer: ReturnType<typeof setTimeout>;
+  promise: Promise<TriggerEvaluationResult[]>;
+  resolve: (results: TriggerEvaluationResult[]) => void;
+  reject: (error: unknown) => void;
+}
+
+/**
+ * Trailing-edge scheduler: events scheduled under the same key during a
+ * burst run once, with the latest arguments, and every caller receives that
+ * run's results.
+ */
+class TriggerEventScheduler {
+  private pending = new Map<string, ScheduledEvent>();
+
+  schedule(
+    key: string,
+    event: TriggerEvent,
+    run: () => Promise<TriggerEvaluationResult[]>,
+    options: CoalescingOptions
+  ): Promise<TriggerEvaluationResult[]> {
+    const now = Date.now();
+    let scheduled = this.pending.get(key);
+
+    if (scheduled) {
+      clearTimeout(scheduled.timer);
+      scheduled.run = run;
+      getTiming(event).coalesced++;
+    } else {
+      let resolve!: (results: TriggerEvaluationResult[]) => void;
+      let reject!: (error: unknown) => void;
+      const promise = new Promise<TriggerEvaluationResult[]>((res, rej) => {
+        resolve = res;
+        reject = rej;
+      });
+      scheduled = {
+        event,
+        run,
+        firstScheduledAt: now,
+        timer: undefined as unknown as ReturnType<typeof setTimeout>,
+        promise,
+        resolve,
+        reject,
+      };
+      this.pending.set(key, scheduled);
+    }
+
+    const deadline = scheduled.firstScheduledAt + options.maxWaitMs;
+    const delay = Math.max(0, Math.min(options.delayMs, deadline - now));
+    scheduled.timer = setTimeout(() => this.fire(key), delay);
+
+    return scheduled.promise;
+  }
+
+  /**
+   * Run every pending event now (e.g. before the app is backgrounded)
+   */
+  async flush(): Promise<void> {
+    const keys = Array.from(this.pending.keys());
+    await Promise.allSettled(keys.map((key) => this.fire(key)));
+  }
+
+  /**
+   * Drop a pending event without running it (callers get no results)
+   */
+  cancel(key: string): void {
+    const scheduled = this.pending.get(key);
+    if (!scheduled) return;
+
+    clearTimeout(scheduled.timer);
+    this.pending.delete(key);
+    scheduled.resolve([]);
+  }
+
+  private fire(key: string): Promise<TriggerEvaluationResult[]> | undefined {
+    const scheduled = this.pending.get(key);
+    if (!scheduled) return undefined;
+
+    clearTimeout(scheduled.timer);
+    this.pending.delete(key);
+    scheduled.run().then(scheduled.resolve, scheduled.reject);
+    return scheduled.promise;
+  }
+}
+
+const eventScheduler = new TriggerEventScheduler();
+
+/**
+ * Run coalesced events that are still waiting
+ */
+export function flushScheduledTriggerEvents(): Promise<void> {
+  return eventScheduler.flush();
+}
+
 // ============================================
 // Event Emitter Helpers
 // ============================================
@@ -565,10 +740,15 @@ export function onNoteCreated(note: Note, behavior?: NoteBehavior) {
 }
 
 /**
- * Emit note_updated event
+ * Emit note_updated event (coalesced per note while the user keeps editing)
  */
 export function onNoteUpdated(note: Note, behavior?: NoteBehavior) {
-  return emitTriggerEvent('note_updated', { note, behavior });
+  return eventScheduler.schedule(
+    `note_updated:${note.id}`,
+    'note_updated',
+    () => emitTriggerEvent('note_updated', { note, behavior }),
+    NOTE_UPDATED_COALESCING
+  );
 }
 
 /**
@@ -607,12 +787,19 @@ export function onNoteArchived(note: Note, behavior?: NoteBehavior) {
  * Emit note_deleted event
  */
 export function onNoteDeleted(note: Note, behavior?: NoteBehavior) {
+  // A coalesced update still waiting would otherwise nudge about a deleted note
+  eventScheduler.cancel(`note_updated:${note.id}`);
   return emitTriggerEvent('note_deleted', { note, behavior });
 }
 
 /**
- * Emit app_opened event
+ * Emit app_opened event (coalesced across back-to-back opens)
  */
 export function onAppOpened() {
-  return emitTriggerEvent('app_opened', {});
+  return eventScheduler.schedule(
+    'app_opened',
+    'app_opened',
+    () => emitTriggerEvent('app_opened', {}),
+    APP_OPENED_COALESCING
+  );
 }
@@ -24,12 +24,15 @@ import {
   subscribeToBoards,
   syncLabels,
   subscribeToLabels,
+  resetSyncCursors,
 } from '@/services/syncService';
+import { clearModeDetectionCache } from '@/services/modeDetectionService';
 import { useNoteStore } from './noteStore';
 import { useUserStore } from './userStore';
 import { useDesignStore } from './designStore';
 import { useBoardStore } from './boardStore';
 import { useLabelStore } from './labelStore';
+import { useImageUploadStore } from './imageUploadStore';
 import { NoteDesign, Board, Label } from '@/types';
 import { purchaseService } from '@/services/purchaseService';
 
@@ -68,7 +71,7 @@ const setupRealtimeSubscriptions = (userId: string): RealtimeChannels => {
     userId,
     (note) => {
       const noteStore = useNoteStore.getState();
-      const existing = noteStore.notes.find((n) => n.id === note.id);
+      const existing = noteStore.getNoteById(note.id);
       if (existing) {
         // Check if this note was recently modified locally
         const recentlyModified = noteStore.recentlyModifiedIds?.get(note.id);
@@ -79,17 +82,11 @@ const setupRealtimeSubscriptions = (userId: string): RealtimeChannels => {
         }
 
         if (note.updatedAt > existing.updatedAt) {
-          // Use setState directly to avoid triggering the grace period tracking
-          useNoteStore.setState((state) => ({
-            notes: state.notes.map((n) =>
-              n.id === note.id ? { ...n, ...note } : n
-            ),
-          }));
+          // Bulk upsert bypasses updateNote to avoid triggering the grace period tracking
+          noteStore.upsertNotes([note]);
         }
       } else {
-        useNoteStore.setState((state) => ({
-          notes: [note, ...state.notes],
-        }));
+        noteStore.upsertNotes([note]);
       }
     },
     (noteId) => {
@@ -397,6 +394,11 @@ export const useAuthStore = create<AuthState>((set, get) => ({
                   labels: null,
                 },
               });
+              // Forget per-account sync cursors, uploaded image records and
+              // cached mode detection results
+              resetSyncCursors();
+              useImageUploadStore.getState().clearUploads();
+              clearModeDetectionCache();
               // Clear user context from Firebase and RevenueCat
               clearAnalyticsUser();
               Analytics.signOut();
@@ -242,6 +242,84 @@ const calculateUsefulnessScore = (mode: Mode, modeData: ModeData): number => {
   }
 };
 
+// ============================================
+// Recent Behaviors
+// ============================================
+
+// Most recently created behaviors kept per mode (trigger evaluation history)
+const RECENT_BEHAVIOR_LIMIT = 20;
+
+type RecentBehaviorIds = Record<Mode, string[]>;
+
+const createEmptyRecentBehaviorIds = (): RecentBehaviorIds => ({
+  manage: [],
+  develop: [],
+  organize: [],
+  experience: [],
+});
+
+/**
+ * Build newest-first recent lists from scratch (hydration)
+ */
+const buildRecentBehaviorIds = (behaviors: Record<string, NoteBehavior>): RecentBehaviorIds => {
+  const recent = createEmptyRecentBehaviorIds();
+  const sorted = Object.values(behaviors).sort((a, b) => b.createdAt - a.createdAt);
+  for (const behavior of sorted) {
+    const list = recent[behavior.mode];
+    if (list && list.length < RECENT_BEHAVIOR_LIMIT) {
+      list.push(behavior.noteId);
+    }
+  }
+  return recent;
+};
+
+/**
+ * Insert a behavior into its mode's recent list, keeping it sorted and bounded
+ */
+const addRecentBehavior = (
+  recent: RecentBehaviorIds,
+  behavior: NoteBehavior,
+  behaviors: Record<string, NoteBehavior>
+): RecentBehaviorIds => {
+  const list = (recent[behavior.mode] ?? []).filter((id) => id !== behavior.noteId);
+  let index = 0;
+  while (index < list.length && (behaviors[list[index]]?.createdAt ?? 0) > behavior.createdAt) {
+    index++;
+  }
+  if (index >= RECENT_BEHAVIOR_LIMIT) return recent;
+
+  list.splice(index, 0, behavior.noteId);
+  if (list.length > RECENT_BEHAVIOR_LIMIT) {
+    list.length = RECENT_BEHAVIOR_LIMIT;
+  }
+  return { ...recent, [behavior.mode]: list };
+};
+
+/**
+ * Take a behavior out of its mode's recent list. Only a full list is rebuilt
+ * (from that mode's behaviors), since an older one may now belong in it;
+ * behaviors outside the list leave it untouched.
+ */
+const removeRecentBehavior = (
+  recent: RecentBehaviorIds,
+  behavior: NoteBehavior,
+  behaviors: Record<string, NoteBehavior>
+): RecentBehaviorIds => {
+  const list = recent[behavior.mode] ?? [];
+  if (!list.includes(behavior.noteId)) return recent;
+
+  if (list.length < RECENT_BEHAVIOR_LIMIT) {
+    return { ...recent, [behavior.mode]: list.filter((id) => id !== behavior.noteId) };
+  }
+
+  const refilled = Object.values(behaviors)
+    .filter((b) => b.mode === behavior.mode && b.noteId !== behavior.noteId)
+    .sort((a, b) => b.createdAt - a.createdAt)
+    .slice(0, RECENT_BEHAVIOR_LIMIT)
+    .map((b) => b.noteId);
+  return { ...recent, [behavior.mode]: refilled };
+};
+
 // ============================================
 // Store Interface
 // ============================================
@@ -251,9 +329,13 @@ interface BehaviorState {
   behaviors: Record<string, NoteBehavior>;
   userPatterns: UserPatterns | null;
 
+  // Newest-first note ids per mode, bounded (derived, not persisted)
+  recentBehaviorIds: RecentBehaviorIds;
+
   // Actions - CRUD
   getBehavior: (noteId: string) => NoteBehavior | undefined;
   initBehavior: (noteId: string, mode: Mode, organizeStage?: OrganizeStage) => NoteBehavior;
+  initBehaviors: (entries: { noteId: string; mode: Mode; organizeStage?: OrganizeStage }[]) => void;
   updateBehavior: (noteId: string, updates: Partial<NoteBehavior>) => void;
   deleteBehavior: (noteId: string) => void;
 
@@ -281,6 +363,7 @@ interface BehaviorState {
   getBehaviorsByMode: (mode: Mode) => NoteBehavior[];
   getLowUsefulnessNotes: (threshold?: number) => NoteBehavior[];
   getStaleNotes: (daysThreshold: number) => NoteBehavior[];
+  getRecentBehaviors: (mode?: Mode) => NoteBehavior[];
 }
 
 // ============================================
@@ -292,6 +375,7 @@ export const useBehaviorStore = create<BehaviorState>()(
     (set, get) => ({
       behaviors: {},
       userPatterns: null,
+      recentBehaviorIds: createEmptyRecentBehaviorIds(),
 
       // CRUD
       getBehavior: (noteId) => get().behaviors[noteId],
@@ -301,12 +385,32 @@ export const useBehaviorStore = create<BehaviorState>()(
         if (existing) return existing;
 
         const behavior = createDefaultBehavior(noteId, mode, organizeStage);
-        set((state) => ({
-          behaviors: { ...state.behaviors, [noteId]: behavior },
-        }));
+        set((state) => {
+          const behaviors = { ...state.behaviors, [noteId]: behavior };
+          return {
+            behaviors,
+            recentBehaviorIds: addRecentBehavior(state.recentBehaviorIds, behavior, behaviors),
+          };
+        });
         return behavior;
       },
 
+      // Bulk init in a single update (e.g. backfill after sync); existing behaviors are kept
+      initBehaviors: (entries) => {
+        if (entries.length === 0) return;
+        set((state) => {
+          const behaviors = { ...state.behaviors };
+          let recentBehaviorIds = state.recentBehaviorIds;
+          for (const { noteId, mode, organizeStage } of entries) {
+            if (!behaviors[noteId]) {
+              behaviors[noteId] = createDefaultBehavior(noteId, mode, organizeStage);
+              recentBehaviorIds = addRecentBehavior(recentBehaviorIds, behaviors[noteId], behaviors);
+            }
+          }
+          return { behaviors, recentBehaviorIds };
+        });
+      },
+
       updateBehavior: (noteId, updates) => {
         set((state) => {
           const existing = state.behaviors[noteId];
@@ -319,16 +423,23 @@ export const useBehaviorStore = create<BehaviorState>()(
             updated.usefulnessScore = calculateUsefulnessScore(updated.mode, updated.modeData);
           }
 
-          return {
-            behaviors: { ...state.behaviors, [noteId]: updated },
-          };
+          const behaviors = { ...state.behaviors, [noteId]: updated };
+          // A mode switch moves the note to another recent list
+          if (updated.mode !== existing.mode) {
+            const recentBehaviorIds = removeRecentBehavior(state.recentBehaviorIds, existing, behaviors);
+            return { behaviors, recentBehaviorIds: addRecentBehavior(recentBehaviorIds, updated, behaviors) };
+          }
+          return { behaviors };
         });
       },
 
       deleteBehavior: (noteId) => {
         set((state) => {
+          const existing = state.behaviors[noteId];
+          if (!existing) return state;
+
           const { [noteId]: _, ...rest } = state.behaviors;
-          return { behaviors: rest };
+          return { behaviors: rest, recentBehaviorIds: removeRecentBehavior(state.recentBehaviorIds, existing, rest) };
         });
       },
 
@@ -552,6 +663,22 @@ export const useBehaviorStore = create<BehaviorState>()(
         const cutoff = Date.now() - thresholdMs;
         return Object.values(get().behaviors).filter((b) => b.lastAccessedAt < cutoff);
       },
+
+      // Most recently created behaviors, newest first (one mode, or across modes)
+      getRecentBehaviors: (mode) => {
+        const { behaviors, recentBehaviorIds } = get();
+        if (mode) {
+          return (recentBehaviorIds[mode] ?? [])
+            .map((id) => behaviors[id])
+            .filter((b): b is NoteBehavior => !!b && b.mode === mode);
+        }
+        return Object.values(recentBehaviorIds)
+          .flat()
+          .map((id) => behaviors[id])
+          .filter((b): b is NoteBehavior => !!b)
+          .sort((a, b) => b.createdAt - a.createdAt)
+          .slice(0, RECENT_BEHAVIOR_LIMIT);
+      },
     }),
     {
       name: 'behavior-storage',
@@ -560,6 +687,15 @@ export const useBehaviorStore = create<BehaviorState>()(
         behaviors: state.behaviors,
         userPatterns: state.userPatterns,
       }),
+      merge: (persistedState, currentState) => {
+        const persisted = persistedState as Partial<BehaviorState> | undefined;
+        const behaviors = persisted?.behaviors ?? currentState.behaviors;
+        return {
+          ...currentState,
+          ...persisted,
+          recentBehaviorIds: buildRecentBehaviorIds(behaviors),
+        };
+      },
     }
   )
 );
@@ -3,6 +3,8 @@ import { persist, createJSONStorage } from 'zustand/middleware';
 import AsyncStorage from '@react-native-async-storage/async-storage';
 import { Board, BoardStyle, BoardData, Note, NoteColor, Mode } from '@/types';
 import { generateUUID } from '@/utils/uuid';
+import { normalizeLabel } from '@/utils/labelNormalization';
+import { LabelIndex } from './noteIndexes';
 
 // Lazy getters to avoid circular dependency
 const getAuthUserId = () => {
@@ -39,6 +41,9 @@ const deleteFromCloud = (boardId: string) => {
 interface BoardState {
   // Persisted board customizations
   boards: Board[];
+  // Boards merged into another by the label migration, still to be deleted
+  // from the cloud (see syncBoards)
+  mergedBoardIds: string[];
 
   // Board actions
   updateBoardStyle: (hashtag: string, style: BoardStyle) => void;
@@ -51,12 +56,16 @@ interface BoardState {
 
   // Board mode actions (MODE Framework)
   updateBoardMode: (hashtag: string, mode: Mode | undefined) => void;
+
+  // Sync bookkeeping
+  clearMergedBoardIds: (ids: string[]) => void;
 }
 
 export const useBoardStore = create<BoardState>()(
   persist(
     (set, get) => ({
       boards: [],
+      mergedBoardIds: [],
 
       updateBoardStyle: (hashtag, style) => {
         const existing = get().boards.find(
@@ -187,14 +196,75 @@ export const useBoardStore = create<BoardState>()(
           syncToCloud(newBoard);
         }
       },
+
+      clearMergedBoardIds: (ids) => {
+        set((state) => ({
+          mergedBoardIds: state.mergedBoardIds.filter((id) => !ids.includes(id)),
+        }));
+      },
     }),
     {
       name: 'toonnotes-boards',
       storage: createJSONStorage(() => AsyncStorage),
+      version: 1,
+      // v0 keyed customizations by lowercased hashtag; boards are now grouped
+      // by normalized label ("goal" and "goals" are one board)
+      migrate: (persistedState, version) => {
+        if (version === 0) {
+          const legacy = persistedState as { boards?: Board[] } | undefined;
+          const { boards, removedIds } = normalizeBoardHashtags(legacy?.boards ?? []);
+          return { boards, mergedBoardIds: removedIds } as Partial<BoardState> as BoardState;
+        }
+        return persistedState as BoardState;
+      },
     }
   )
 );
 
+/**
+ * Re-key board customizations by normalized label. Customizations that now
+ * share a board are merged, newest first, into the board that already owns
+ * the normalized hashtag (its cloud row holds the unique hashtag), or the
+ * newest one. Changed boards get a new updatedAt so the next sync uploads
+ * them; the ids merged away are returned so their rows can be deleted.
+ */
+export function normalizeBoardHashtags(
+  boards: Board[],
+  now = Date.now()
+): { boards: Board[]; removedIds: string[] } {
+  const groups = new Map<string, Board[]>();
+  for (const board of boards) {
+    const hashtag = normalizeLabel(board.hashtag);
+    groups.set(hashtag, [...(groups.get(hashtag) ?? []), board]);
+  }
+
+  const normalized: Board[] = [];
+  const removedIds: string[] = [];
+  for (const [hashtag, group] of groups) {
+    if (group.length === 1 && group[0].hashtag === hashtag) {
+      normalized.push(group[0]);
+      continue;
+    }
+
+    const [newest, ...older] = [...group].sort((a, b) => b.updatedAt - a.updatedAt);
+    const owner = group.find((board) => board.hashtag === hashtag) ?? newest;
+    const merged: Board = { ...newest, id: owner.id, hashtag, updatedAt: now };
+    for (const board of older) {
+      merged.customStyle = merged.customStyle ?? board.customStyle;
+      merged.boardDesignId = merged.boardDesignId ?? board.boardDesignId;
+      if (merged.mode === undefined && board.mode !== undefined) {
+        merged.mode = board.mode;
+        merged.organizeStage = board.organizeStage;
+        merged.modeConfig = board.modeConfig;
+      }
+      merged.createdAt = Math.min(merged.createdAt, board.createdAt);
+    }
+    normalized.push(merged);
+    removedIds.push(...group.filter((board) => board.id !== owner.id).map((board) => board.id));
+  }
+  return { boards: normalized, removedIds };
+}
+
 // ============================================
 // Board Data Computation Utilities
 // ============================================
@@ -227,23 +297,62 @@ export function computeBoardsFromNotes(
   const boardsData: BoardData[] = [];
 
   for (const [hashtag, boardNotes] of labelMap) {
-    // Sort notes by updatedAt descending
-    const sortedNotes = [...boardNotes].sort((a, b) => b.updatedAt - a.updatedAt);
-
-    // Get derived colors from note backgrounds
-    const derivedColors = sortedNotes
-      .slice(0, 3)
-      .map((note) => note.color || NoteColor.White);
-
-    const boardData: BoardData = {
-      hashtag,
-      noteCount: boardNotes.length,
-      previewNotes: sortedNotes.slice(0, 6),
-      mostRecentUpdate: sortedNotes[0]?.updatedAt || 0,
-      derivedColors,
-    };
-
-    boardsData.push(boardData);
+    boardsData.push(buildBoardData(hashtag, boardNotes));
+  }
+
+  // Sort by most recent activity
+  boardsData.sort((a, b) => b.mostRecentUpdate - a.mostRecentUpdate);
+
+  return boardsData;
+}
+
+// Per-label cache: reused while the label's bucket and its notes are unchanged
+const boardDataCache = new Map<string, { notes: Note[]; board: BoardData }>();
+
+/**
+ * Compute BoardData from noteStore's label index.
+ * Only visits notes that carry a label; boards whose notes are unchanged are
+ * returned from cache, so editing one note rebuilds only that note's boards.
+ */
+export function computeBoardsFromLabelIndex(
+  labelIndex: LabelIndex,
+  notesById: Record<string, Note>,
+  boardCustomizations: Board[]
+): BoardData[] {
+  const boardsData: BoardData[] = [];
+
+  for (const hashtag of Object.keys(labelIndex)) {
+    const boardNotes: Note[] = [];
+    for (const id of labelIndex[hashtag]) {
+      const note = notesById[id];
+      if (note && !note.isArchived && !note.isDeleted) {
+        boardNotes.push(note);
+      }
+    }
+
+    if (boardNotes.length === 0) {
+      boardDataCache.delete(hashtag);
+      continue;
+    }
+
+    const cached = boardDataCache.get(hashtag);
+    if (
+      cached &&
+      cached.notes.length === boardNotes.length &&
+      cached.notes.every((note, i) => note === boardNotes[i])
+    ) {
+      boardsData.push(cached.board);
+      continue;
+    }
+
+    const board = buildBoardData(hashtag, boardNotes);
+    boardDataCache.set(hashtag, { notes: boardNotes, board });
+    boardsData.push(board);
+  }
+
+  // Drop cache entries for labels that no longer exist
+  for (const hashtag of boardDataCache.keys()) {
+    if (!labelIndex[hashtag]) boardDataCache.delete(hashtag);
   }
 
   // Sort by most recent activity
@@ -252,6 +361,27 @@ export function computeBoardsFromNotes(
   return boardsData;
 }
 
+/**
+ * Build BoardData for one hashtag from its (active) notes
+ */
+function buildBoardData(hashtag: string, boardNotes: Note[]): BoardData {
+  // Sort notes by updatedAt descending
+  const sortedNotes = [...boardNotes].sort((a, b) => b.updatedAt - a.updatedAt);
+
+  // Get derived colors from note backgrounds
+  const derivedColors = sortedNotes
+    .slice(0, 3)
+    .map((note) => note.color || NoteColor.White);
+
+  return {
+    hashtag,
+    noteCount: boardNotes.length,
+    previewNotes: sortedNotes.slice(0, 6),
+    mostRecentUpdate: sortedNotes[0]?.updatedAt || 0,
+    derivedColors,
+  };
+}
+
 /**
  * Derive a gradient from note colors
  */
@@ -0,0 +1,443 @@
+/**
+ * Chunked Note Storage
+ *
+ * zustand PersistStorage for noteStore that keeps each note in its own
+ * AsyncStorage records instead of re-serializing every note into one blob:
+ *
+ *   <name>:index              { version, noteIds } - written when notes are added/removed
+ *   <name>:meta:<id>          the note, with content cut to a preview
+ *   <name>:body:<id>          full content (only for notes longer than the preview)
+ *   <name>:search             search index header { version, revision, shardCount }
+ *   <name>:search:terms:<n>   postings for terms in shard n (by first character)
+ *   <name>:search:docs:<n>    indexed note stamps for notes in shard n (by id)
+ *
+ * Writes are debounced and diffed by reference against what storage already
+ * holds, so editing one note writes one or two records however many notes
+ * the account has. The search index is a cache written on a slower debounce,
+ * and only the shards holding terms or notes that changed are rewritten.
+ *
+ * Hydration reads the index and meta records only; long bodies are read on
+ * demand with readBodies (noteStore tracks which notes are still showing a
+ * preview in pendingBodyIds), and the search index is read afterwards with
+ * readSearchIndex.
+ *
+ * A legacy single-key blob is read once and rewritten in this layout on the
+ * next write.
+ */
+
+import AsyncStorage from '@react-native-async-storage/async-storage';
+import { Platform } from 'react-native';
+import { PersistStorage, StorageValue } from 'zustand/middleware';
+import { Note } from '@/types';
+import { NoteSearchIndex, restoreSearchIndex, takeSearchIndexChanges } from './noteSearchIndex';
+
+// Notes longer than this get a separate body record
+export const NOTE_PREVIEW_LENGTH = 280;
+
+const DEFAULT_DEBOUNCE_MS = 500;
+const DEFAULT_SEARCH_DEBOUNCE_MS = 5000;
+
+// Search index records per part (postings and note stamps)
+export const SEARCH_SHARD_COUNT = 32;
+
+// Check if we're running in a browser environment (not SSR)
+const isBrowser = typeof window !== 'undefined';
+const isServerRender = () => Platform.OS === 'web' && !isBrowser;
+
+export interface PersistedNoteState {
+  notesById: Record<string, Note>;
+  noteIds: string[];
+  searchIndex?: NoteSearchIndex;
+  // Notes hydrated with a preview whose full content hasn't been read yet
+  pendingBodyIds?: Record<string, true>;
+}
+
+interface StoredNoteIndex {
+  version: number;
+  noteIds: string[];
+}
+
+interface StoredNoteMeta extends Note {
+  hasBody?: boolean;
+}
+
+interface StoredSearchHeader {
+  version: number;
+  revision: number;
+  shardCount: number;
+}
+
+export interface ChunkedNoteStorage extends PersistStorage<PersistedNoteState> {
+  // Read full content for notes hydrated with a preview (missing bodies are
+  // left out; throws if storage can't be read)
+  readBodies: (ids: string[]) => Promise<Record<string, string>>;
+  // Record notes as already matching storage (e.g. after applying bodies)
+  markClean: (notes: Note[]) => void;
+  // Read the persisted search index (undefined if missing, unreadable or in
+  // an older layout)
+  readSearchIndex: () => Promise<NoteSearchIndex | undefined>;
+  // True while the data still lives in a legacy single-key blob
+  hasLegacyData: () => boolean;
+  // Write pending changes immediately
+  flush: () => Promise<void>;
+}
+
+interface ChunkedNoteStorageOptions {
+  debounceMs?: number;
+  searchDebounceMs?: number;
+}
+
+/**
+ * Content as stored in a note's meta record
+ */
+export function getNoteContentPreview(content: string): string {
+  return content.length > NOTE_PREVIEW_LENGTH ? content.slice(0, NOTE_PREVIEW_LENGTH) : content;
+}
+
+/**
+ * Search shard holding a term (terms sharing a first character share a shard)
+ */
+function getTermShard(term: string): number {
+  return term.charCodeAt(0) % SEARCH_SHARD_COUNT;
+}
+
+/**
+ * Search shard holding a note's stamp
+ */
+function getDocShard(id: string): number {
+  let hash = 0;
+  for (let i = 0; i < id.length; i++) {
+    hash = (hash * 31 + id.charCodeAt(i)) | 0;
+  }
+  return Math.abs(hash) % SEARCH_SHARD_COUNT;
+}
+
+/**
+ * Create a per-note storage engine for the persisted store called `name`
+ */
+export function createChunkedNoteStorage(
+  name: string,
+  options: ChunkedNoteStorageOptions = {}
+): ChunkedNoteStorage {
+  const { debounceMs = DEFAULT_DEBOUNCE_MS, searchDebounceMs = DEFAULT_SEARCH_DEBOUNCE_MS } = options;
+
+  const indexKey = `${name}:index`;
+  const searchKey = `${name}:search`;
+  const metaKey = (id: string) => `${name}:meta:${id}`;
+  const bodyKey = (id: string) => `${name}:body:${id}`;
+  const termShardKey = (shard: number) => `${name}:search:terms:${shard}`;
+  const docShardKey = (shard: number) => `${name}:search:docs:${shard}`;
+  const shardNumbers = Array.from({ length: SEARCH_SHARD_COUNT }, (_, shard) => shard);
+
+  // What storage currently holds, by reference
+  const writtenNotes = new Map<string, Note>();
+  const storedBodyIds = new Set<string>();
+  let writtenNoteIds: string[] = [];
+  let writtenSearchIndex: NoteSearchIndex | undefined;
+  let writtenSearchRevision = -1;
+  // Search shards changed since the last successful write
+  const dirtyTermShards = new Set<number>();
+  const dirtyDocShards = new Set<number>();
+
+  let legacyBlob = false;
+  // A failed read must never be followed by writes of an empty store
+  let readFailed = false;
+
+  let latest: StorageValue<PersistedNoteState> | null = null;
+  let noteTimer: ReturnType<typeof setTimeout> | null = null;
+  let searchTimer: ReturnType<typeof setTimeout> | null = null;
+  // Flushes run one at a time so the written snapshot stays consistent
+  let writeQueue: Promise<void> = Promise.resolve();
+
+  const sameIds = (a: string[], b: string[]) =>
+    a === b || (a.length === b.length && a.every((id, i) => id === b[i]));
+
+  const readLegacyBlob = async (): Promise<StorageValue<PersistedNoteState> | null> => {
+    const json = await AsyncStorage.getItem(name);
+    if (!json) return null;
+    legacyBlob = true;
+    console.log(`[NoteStorage] Migrating legacy blob: ${name}`);
+    return JSON.parse(json) as StorageValue<PersistedNoteState>;
+  };
+
+  const writeNotes = async (): Promise<void> => {
+    const value = latest;
+    if (!value || readFailed) return;
+
+    const { notesById, noteIds, pendingBodyIds = {} } = value.state;
+    const sets: [string, string][] = [];
+    const removes: string[] = [];
+    const written: Note[] = [];
+    const bodyIds: string[] = [];
+    const droppedBodyIds: string[] = [];
+
+    for (const id of noteIds) {
+      const note = notesById[id];
+      const prev = writtenNotes.get(id);
+      if (!note || note === prev) continue;
+
+      // Body not loaded and content untouched: the stored body is still correct
+      const keepStoredBody = !!pendingBodyIds[id] && prev !== undefined && note.content === prev.content;
+      const hasBody = keepStoredBody || note.content.length > NOTE_PREVIEW_LENGTH;
+
+      const meta: StoredNoteMeta = { ...note, content: getNoteContentPreview(note.content) };
+      if (hasBody) meta.hasBody = true;
+      sets.push([metaKey(id), JSON.stringify(meta)]);
+
+      if (!keepStoredBody) {
+        if (hasBody) {
+          sets.push([bodyKey(id), note.content]);
+          bodyIds.push(id);
+        } else if (storedBodyIds.has(id)) {
+          removes.push(bodyKey(id));
+          droppedBodyIds.push(id);
+        }
+      }
+      written.push(note);
+    }
+
+    // Adds, removals and reorders rewrite the id list
+    const idsChanged = !sameIds(noteIds, writtenNoteIds);
+    const removedIds: string[] = [];
+    if (idsChanged) {
+      sets.push([indexKey, JSON.stringify({ version: value.version ?? 0, noteIds } as StoredNoteIndex)]);
+      for (const id of writtenNotes.keys()) {
+        if (!notesById[id]) {
+          removedIds.push(id);
+          removes.push(metaKey(id));
+          if (storedBodyIds.has(id)) removes.push(bodyKey(id));
+        }
+      }
+    }
+
+    if (sets.length === 0 && removes.length === 0) return;
+
+    try {
+      if (sets.length > 0) await AsyncStorage.multiSet(sets);
+      if (removes.length > 0) await AsyncStorage.multiRemove(removes);
+
+      written.forEach((note) => writtenNotes.set(note.id, note));
+      bodyIds.forEach((id) => storedBodyIds.add(id));
+      droppedBodyIds.forEach((id) => storedBodyIds.delete(id));
+      removedIds.forEach((id) => {
+        writtenNotes.delete(id);
+        storedBodyIds.delete(id);
+      });
+      writtenNoteIds = noteIds;
+
+      if (legacyBlob) {
+        await AsyncStorage.removeItem(name);
+        legacyBlob = false;
+      }
+    } catch (error) {
+      // Nothing is marked written, so the next flush retries these records
+      console.error(`[NoteStorage] Failed to write ${name}:`, error);
+    }
+  };
+
+  const writeSearchIndex = async (): Promise<void> => {
+    const index = latest?.state.searchIndex;
+    if (!index || readFailed) return;
+    if (index === writtenSearchIndex && index.revision === writtenSearchRevision) return;
+
+    const changes = takeSearchIndexChanges(index);
+    if (index !== writtenSearchIndex) {
+      // A new index (rebuilt, or never written) replaces every shard
+      shardNumbers.forEach((shard) => {
+        dirtyTermShards.add(shard);
+        dirtyDocShards.add(shard);
+      });
+    } else {
+      changes.terms.forEach((term) => dirtyTermShards.add(getTermShard(term)));
+      changes.docs.forEach((id) => dirtyDocShards.add(getDocShard(id)));
+    }
+
+    const termShards = new Map<number, Record<string, Record<string, number>>>();
+    dirtyTermShards.forEach((shard) => termShards.set(shard, {}));
+    for (const term of index.terms) {
+      const shard = termShards.get(getTermShard(term));
+      if (shard) shard[term] = index.postings[term];
+    }
+    const docShards = new Map<number, Record<string, number>>();
+    dirtyDocShards.forEach((shard) => docShards.set(shard, {}));
+    for (const id in index.docStamps) {
+      const shard = docShards.get(getDocShard(id));
+      if (shard) shard[id] = index.docStamps[id];
+    }
+
+    // Emptied shards are written as {} so header and shards change together
+    const header: StoredSearchHeader = {
+      version: index.version,
+      revision: index.revision,
+      shardCount: SEARCH_SHARD_COUNT,
+    };
+    const sets: [string, string][] = [[searchKey, JSON.stringify(header)]];
+    termShards.forEach((postings, shard) => sets.push([termShardKey(shard), JSON.stringify(postings)]));
+    docShards.forEach((stamps, shard) => sets.push([docShardKey(shard), JSON.stringify(stamps)]));
+
+    try {
+      await AsyncStorage.multiSet(sets);
+      writtenSearchIndex = index;
+      writtenSearchRevision = header.revision;
+      dirtyTermShards.clear();
+      dirtyDocShards.clear();
+    } catch (error) {
+      // The shards stay dirty, so the next write retries them
+      console.error('[NoteStorage] Failed to write search index:', error);
+    }
+  };
+
+  const enqueue = (write: () => Promise<void>): Promise<void> => {
+    writeQueue = writeQueue.then(write);
+    return writeQueue;
+  };
+
+  return {
+    getItem: async () => {
+      // During SSR, return null - state will be hydrated on client
+      if (isServerRender()) return null;
+
+      try {
+        const indexJson = await AsyncStorage.getItem(indexKey);
+        if (!indexJson) return await readLegacyBlob();
+
+        const { version, noteIds } = JSON.parse(indexJson) as StoredNoteIndex;
+        const metaEntries = noteIds.length > 0 ? await AsyncStorage.multiGet(noteIds.map(metaKey)) : [];
+
+        const notesById: Record<string, Note> = {};
+        const pendingBodyIds: Record<string, true> = {};
+        for (const [, json] of metaEntries) {
+          if (!json) continue;
+          const { hasBody, ...note } = JSON.parse(json) as StoredNoteMeta;
+          notesById[note.id] = note;
+          writtenNotes.set(note.id, note);
+          if (hasBody) {
+            pendingBodyIds[note.id] = true;
+            storedBodyIds.add(note.id);
+          }
+        }
+        writtenNoteIds = noteIds;
+
+        return {
+          state: {
+            notesById,
+            noteIds: noteIds.filter((id) => notesById[id]),
+            pendingBodyIds,
+          },
+          version,
+        };
+      } catch (error) {
+        readFailed = true;
+        console.error(`[NoteStorage] Failed to read ${name}, writes disabled for this session:`, error);
+        return null;
+      }
+    },
+
+    setItem: (_name, value) => {
+      // During SSR, skip storage operations
+      if (isServerRender()) return;
+
+      latest = value;
+      if (!noteTimer) {
+        noteTimer = setTimeout(() => {
+          noteTimer = null;
+          enqueue(writeNotes);
+        }, debounceMs);
+      }
+      if (!searchTimer) {
+        searchTimer = setTimeout(() => {
+          searchTimer = null;
+          enqueue(writeSearchIndex);
+        }, searchDebounceMs);
+      }
+    },
+
+    removeItem: async () => {
+      if (isServerRender()) return;
+
+      if (noteTimer) clearTimeout(noteTimer);
+      if (searchTimer) clearTimeout(searchTimer);
+      noteTimer = null;
+      searchTimer = null;
+      latest = null;
+
+      try {
+        const keys = await AsyncStorage.getAllKeys();
+        const prefix = `${name}:`;
+        await AsyncStorage.multiRemove([name, ...keys.filter((key) => key.startsWith(prefix))]);
+        writtenNotes.clear();
+        storedBodyIds.clear();
+        writtenNoteIds = [];
+        writtenSearchIndex = undefined;
+        writtenSearchRevision = -1;
+        dirtyTermShards.clear();
+        dirtyDocShards.clear();
+        legacyBlob = false;
+      } catch (error) {
+        console.error(`[NoteStorage] Failed to remove ${name}:`, error);
+      }
+    },
+
+    readBodies: async (ids) => {
+      const bodies: Record<string, string> = {};
+      if (ids.length === 0) return bodies;
+
+      // Read errors propagate - callers must not treat the preview as the body
+      const entries = await AsyncStorage.multiGet(ids.map(bodyKey));
+      entries.forEach(([, body], i) => {
+        if (body !== null) bodies[ids[i]] = body;
+      });
+      return bodies;
+    },
+
+    markClean: (notes) => {
+      notes.forEach((note) => writtenNotes.set(note.id, note));
+    },
+
+    readSearchIndex: async () => {
+      if (isServerRender()) return undefined;
+
+      try {
+        const headerJson = await AsyncStorage.getItem(searchKey);
+        if (!headerJson) return undefined;
+
+        // The previous layout kept the whole index in this record - rebuilt instead
+        const header = JSON.parse(headerJson) as StoredSearchHeader;
+        if (header.shardCount !== SEARCH_SHARD_COUNT) return undefined;
+
+        const entries = await AsyncStorage.multiGet([
+          ...shardNumbers.map(termShardKey),
+          ...shardNumbers.map(docShardKey),
+        ]);
+        const postings: Record<string, Record<string, number>> = {};
+        const docStamps: Record<string, number> = {};
+        entries.forEach(([, json], i) => {
+          if (json) Object.assign(i < SEARCH_SHARD_COUNT ? postings : docStamps, JSON.parse(json));
+        });
+
+        const index = restoreSearchIndex(header.version, header.revision, postings, docStamps);
+        writtenSearchIndex = index;
+        writtenSearchRevision = index.revision;
+        return index;
+      } catch (error) {
+        // The search index is a cache - noteStore rebuilds it if missing
+        console.warn('[NoteStorage] Failed to read search index:', error);
+        return undefined;
+      }
+    },
+
+    hasLegacyData: () => legacyBlob,
+
+    flush: () => {
+      if (noteTimer) clearTimeout(noteTimer);
+      if (searchTimer) clearTimeout(searchTimer);
+      noteTimer = null;
+      searchTimer = null;
+      enqueue(writeNotes);
+      return enqueue(writeSearchIndex);
+    },
+  };
+}
+
+// Storage engine for noteStore
+export const noteStorage = createChunkedNoteStorage('toonnotes-notes');
@@ -0,0 +1,157 @@
+/**
+ * Image Upload Store
+ *
+ * Zustand store for the bookkeeping behind image uploads:
+ * - uploads: local URI -> uploaded URL, so an interrupted sync resumes
+ *   where it stopped instead of re-uploading finished images
+ * - uploadsByHash: content hash -> upload record, so the same sticker or
+ *   photo is stored once per storage folder (a note, or a design asset type)
+ *
+ * Both are keyed by the storage folder the object lives in (see
+ * getUploadFolder), so records never point into another note's folder.
+ * - progress: counts for the current upload queue (not persisted)
+ */
+
+import { create } from 'zustand';
+import { persist, createJSONStorage } from 'zustand/middleware';
+import { debouncedStorage } from './debouncedStorage';
+
+export interface UploadRecord {
+  // Signed URL, valid until expiresAt
+  url: string;
+  bucket: string;
+  // Object path in the bucket, used to re-sign the URL
+  path: string;
+  hash: string;
+  uploadedAt: number;
+  expiresAt: number;
+}
+
+export interface UploadProgress {
+  queued: number;
+  completed: number;
+  failed: number;
+}
+
+// Oldest records are dropped beyond this (they only save a re-upload)
+const MAX_UPLOAD_RECORDS = 2000;
+
+const EMPTY_PROGRESS: UploadProgress = { queued: 0, completed: 0, failed: 0 };
+
+/**
+ * Storage folder holding a record's object, e.g. `note-images/{user_id}/{note_id}`
+ */
+export function getUploadFolder(record: Pick<UploadRecord, 'bucket' | 'path'>): string {
+  return `${record.bucket}/${record.path.slice(0, record.path.lastIndexOf('/'))}`;
+}
+
+interface ImageUploadState {
+  // `${folder}:${localUri}` -> record
+  uploads: Record<string, UploadRecord>;
+  // `${folder}:${hash}` -> record
+  uploadsByHash: Record<string, UploadRecord>;
+  progress: UploadProgress;
+
+  // Actions
+  recordUpload: (localUri: string, record: UploadRecord) => void;
+  removeUploadsInFolder: (folder: string) => void;
+  updateProgress: (delta: Partial<UploadProgress>) => void;
+  resetProgress: () => void;
+  clearUploads: () => void;
+
+  // Queries
+  getUpload: (folder: string, localUri: string) => UploadRecord | undefined;
+  getUploadForHash: (folder: string, hash: string) => UploadRecord | undefined;
+}
+
+export const useImageUploadStore = create<ImageUploadState>()(
+  persist(
+    (set, get) => ({
+      uploads: {},
+      uploadsByHash: {},
+      progress: EMPTY_PROGRESS,
+
+      recordUpload: (localUri, record) => {
+        set((state) => {
+          const folder = getUploadFolder(record);
+          const uploads = { ...state.uploads, [`${folder}:${localUri}`]: record };
+          const hashKey = `${folder}:${record.hash}`;
+
+          const keys = Object.keys(uploads);
+          if (keys.length <= MAX_UPLOAD_RECORDS) {
+            return { uploads, uploadsByHash: { ...state.uploadsByHash, [hashKey]: record } };
+          }
+
+          // Over the cap: keep the newest records and rebuild the hash index from them
+          keys.sort((a, b) => uploads[a].uploadedAt - uploads[b].uploadedAt);
+          const kept: Record<string, UploadRecord> = {};
+          const uploadsByHash: Record<string, UploadRecord> = {};
+          for (const key of keys.slice(keys.length - MAX_UPLOAD_RECORDS)) {
+            const upload = uploads[key];
+            kept[key] = upload;
+            uploadsByHash[`${getUploadFolder(upload)}:${upload.hash}`] = upload;
+          }
+          return { uploads: kept, uploadsByHash };
+        });
+      },
+
+      /**
+       * Forget records for objects in a folder that was deleted from Storage
+       */
+      removeUploadsInFolder: (folder) => {
+        const prefix = `${folder}:`;
+        const without = (records: Record<string, UploadRecord>) => {
+          const kept: Record<string, UploadRecord> = {};
+          for (const [key, record] of Object.entries(records)) {
+            if (!key.startsWith(prefix)) kept[key] = record;
+          }
+          return kept;
+        };
+        set((state) => ({
+          uploads: without(state.uploads),
+          uploadsByHash: without(state.uploadsByHash),
+        }));
+      },
+
+      updateProgress: (delta) => {
+        set((state) => ({
+          progress: {
+            queued: state.progress.queued + (delta.queued ?? 0),
+            completed: state.progress.completed + (delta.completed ?? 0),
+            failed: state.progress.failed + (delta.failed ?? 0),
+          },
+        }));
+      },
+
+      resetProgress: () => {
+        set({ progress: EMPTY_PROGRESS });
+      },
+
+      clearUploads: () => {
+        set({ uploads: {}, uploadsByHash: {}, progress: EMPTY_PROGRESS });
+      },
+
+      getUpload: (folder, localUri) => get().uploads[`${folder}:${localUri}`],
+
+      getUploadForHash: (folder, hash) => get().uploadsByHash[`${folder}:${hash}`],
+    }),
+    {
+      name: 'toonnotes-image-uploads',
+      storage: createJSONStorage(() => debouncedStorage),
+      version: 2,
+      partialize: (state) => ({
+        uploads: state.uploads,
+        uploadsByHash: state.uploadsByHash,
+      }),
+      // v0 records had no path or expiry, so their URLs can't be re-signed, and
+      // v1 records were keyed per account and pointed at shared note images -
+      // drop them (they only save a re-upload)
+      migrate: (persistedState, version) => {
+        if (version < 2) {
+          return { uploads: {}, uploadsByHash: {} } as Partial<ImageUploadState> as ImageUploadState;
+        }
+        return persistedState as ImageUploadState;
+      },
+    }
+  )
+);
@@ -1,8 +1,21 @@
-export { useNoteStore } from './noteStore';
+export {
+  useNoteStore,
+  selectAllNotes,
+  selectActiveNotes,
+  selectArchivedNotes,
+  selectDeletedNotes,
+  selectPinnedNotes,
+  selectNotesByLabel,
+} from './noteStore';
 export { useUserStore } from './userStore';
 export { useDesignStore } from './designStore';
 export { useAuthStore } from './authStore';
-export { useBoardStore, computeBoardsFromNotes, deriveGradientFromColors } from './boardStore';
+export {
+  useBoardStore,
+  computeBoardsFromNotes,
+  computeBoardsFromLabelIndex,
+  deriveGradientFromColors,
+} from './boardStore';
 export { useBoardDesignStore } from './boardDesignStore';
 export { useLabelStore } from './labelStore';
 export {
@@ -36,3 +49,9 @@ export {
 
 // Share status store
 export { useShareStatusStore } from './shareStatusStore';
+
+// Delta sync cursors and stats
+export { useSyncStateStore } from './syncStateStore';
+
+// Resumable image uploads and content-hash dedupe
+export { useImageUploadStore } from './imageUploadStore';
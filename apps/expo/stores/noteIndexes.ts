@@ -0,0 +1,354 @@
+/**
+ * Note Indexes
+ *
+ * Normalized storage for noteStore: notes keyed by id, a display order, and
+ * secondary indexes for status and normalized label. Id lists are
+ * copy-on-write - a change only copies the buckets it touches. notesById is
+ * updated in place (copying it would make every edit O(n)); each change bumps
+ * noteRevision and lists the ids it touched in changedNoteIds, which is what
+ * subscribers and list selectors key on. Editing one note's content does no
+ * per-note work for the rest of the collection.
+ *
+ * Every id list (noteIds and each bucket) is kept in display order (newest
+ * first), ranked by noteSeq.
+ */
+
+import { Note } from '@/types';
+import { normalizeLabel } from '@/utils/labelNormalization';
+
+export type NoteStatus = 'active' | 'archived' | 'deleted' | 'pinned';
+
+export type StatusIndex = Record<NoteStatus, string[]>;
+
+// Normalized label name -> ids of notes carrying it (any status)
+export type LabelIndex = Record<string, string[]>;
+
+export interface NoteIndexState {
+  notesById: Record<string, Note>;
+  // Display order (newest first)
+  noteIds: string[];
+  // Sort key per id; ascending seq == noteIds order
+  noteSeq: Record<string, number>;
+  statusIndex: StatusIndex;
+  labelIndex: LabelIndex;
+  // Bumped by every applyNoteChanges (a rebuild starts a new notesById)
+  noteRevision: number;
+  // Ids added, edited or removed by the change that produced noteRevision
+  changedNoteIds: string[];
+}
+
+export interface NoteChange {
+  prev?: Note;
+  next?: Note;
+}
+
+export const NOTE_STATUSES: NoteStatus[] = ['active', 'archived', 'deleted', 'pinned'];
+
+export const createEmptyNoteIndexes = (): NoteIndexState => ({
+  notesById: {},
+  noteIds: [],
+  noteSeq: {},
+  statusIndex: { active: [], archived: [], deleted: [], pinned: [] },
+  labelIndex: {},
+  noteRevision: 0,
+  changedNoteIds: [],
+});
+
+/**
+ * Status buckets a note belongs to.
+ * active/archived/deleted are exclusive; pinned mirrors the raw isPinned flag.
+ */
+export function getNoteStatuses(note: Note): NoteStatus[] {
+  const statuses: NoteStatus[] = [];
+  if (note.isDeleted) {
+    statuses.push('deleted');
+  } else if (note.isArchived) {
+    statuses.push('archived');
+  } else {
+    statuses.push('active');
+  }
+  if (note.isPinned) {
+    statuses.push('pinned');
+  }
+  return statuses;
+}
+
+/**
+ * Unique normalized label keys for a note
+ */
+export function getNoteLabelKeys(note: Note): string[] {
+  return Array.from(new Set(note.labels.map(normalizeLabel)));
+}
+
+/**
+ * Build all indexes from an ordered note list in one pass
+ */
+export function buildNoteIndexes(notes: Note[]): NoteIndexState {
+  const indexes = createEmptyNoteIndexes();
+
+  notes.forEach((note, position) => {
+    if (indexes.notesById[note.id]) return; // Ignore duplicate ids
+
+    indexes.notesById[note.id] = note;
+    indexes.noteIds.push(note.id);
+    indexes.noteSeq[note.id] = position;
+
+    for (const status of getNoteStatuses(note)) {
+      indexes.statusIndex[status].push(note.id);
+    }
+    for (const key of getNoteLabelKeys(note)) {
+      if (!indexes.labelIndex[key]) indexes.labelIndex[key] = [];
+      indexes.labelIndex[key].push(note.id);
+    }
+  });
+
+  return indexes;
+}
+
+/**
+ * Position of id (or where it would go) in a bucket ordered by seq
+ */
+function findPosition(bucket: string[], seq: Record<string, number>, target: number): number {
+  let low = 0;
+  let high = bucket.length;
+  while (low < high) {
+    const mid = (low + high) >>> 1;
+    if (seq[bucket[mid]] < target) {
+      low = mid + 1;
+    } else {
+      high = mid;
+    }
+  }
+  return low;
+}
+
+function insertSorted(bucket: string[], id: string, seq: Record<string, number>): void {
+  const position = findPosition(bucket, seq, seq[id]);
+  if (bucket[position] !== id) {
+    bucket.splice(position, 0, id);
+  }
+}
+
+function removeSorted(bucket: string[], id: string, seq: Record<string, number>): void {
+  let position = findPosition(bucket, seq, seq[id]);
+  if (bucket[position] !== id) {
+    // Should not happen, but never leave a stale id behind
+    position = bucket.indexOf(id);
+  }
+  if (position >= 0) {
+    bucket.splice(position, 1);
+  }
+}
+
+function diffKeys<T>(before: T[], after: T[]): { removed: T[]; added: T[] } {
+  return {
+    removed: before.filter((key) => !after.includes(key)),
+    added: after.filter((key) => !before.includes(key)),
+  };
+}
+
+/**
+ * Apply a batch of note changes (add: no prev, update: both, remove: no next).
+ *
+ * Writes notes into state.notesById in place and returns the other slices of
+ * state that changed, with the new noteRevision and changedNoteIds. New notes
+ * are prepended in the order given. Untouched buckets keep their identity, so
+ * memoized selectors over them stay cached.
+ */
+export function applyNoteChanges(
+  state: NoteIndexState,
+  changes: NoteChange[]
+): Partial<NoteIndexState> {
+  if (changes.length === 0) return {};
+
+  const result: Partial<NoteIndexState> = {};
+  const notesById = state.notesById;
+  const changedIds = new Set<string>();
+
+  let noteSeq = state.noteSeq;
+  let statusIndex = state.statusIndex;
+  let labelIndex = state.labelIndex;
+  const ownedBuckets = new Set<string[]>();
+
+  const statusBucket = (status: NoteStatus): string[] => {
+    if (statusIndex === state.statusIndex) statusIndex = { ...statusIndex };
+    const bucket = statusIndex[status];
+    if (ownedBuckets.has(bucket)) return bucket;
+    const copy = bucket.slice();
+    ownedBuckets.add(copy);
+    statusIndex[status] = copy;
+    return copy;
+  };
+
+  const labelBucket = (key: string): string[] => {
+    if (labelIndex === state.labelIndex) labelIndex = { ...labelIndex };
+    const bucket = labelIndex[key];
+    if (bucket && ownedBuckets.has(bucket)) return bucket;
+    const copy = bucket ? bucket.slice() : [];
+    ownedBuckets.add(copy);
+    labelIndex[key] = copy;
+    return copy;
+  };
+
+  // Assign seqs to new notes first so bucket inserts can rank them
+  const addedIds: string[] = [];
+  const removedIds = new Set<string>();
+  for (const { prev, next } of changes) {
+    if (!prev && next && !(next.id in state.noteSeq) && !addedIds.includes(next.id)) {
+      addedIds.push(next.id);
+    }
+  }
+  if (addedIds.length > 0) {
+    noteSeq = { ...noteSeq };
+    const firstSeq = state.noteIds.length > 0 ? state.noteSeq[state.noteIds[0]] : 0;
+    addedIds.forEach((id, i) => {
+      noteSeq[id] = firstSeq - addedIds.length + i;
+    });
+  }
+
+  for (const { prev, next } of changes) {
+    const id = (next ?? prev)?.id;
+    if (!id) continue;
+
+    // Resolve against the latest copy so repeated ids in one batch compose
+    const current = notesById[id];
+    const before = current ?? prev;
+    changedIds.add(id);
+
+    if (next) {
+      notesById[id] = next;
+    } else {
+      delete notesById[id];
+      removedIds.add(id);
+    }
+
+    // Status buckets
+    const beforeStatuses = before ? getNoteStatuses(before) : [];
+    const afterStatuses = next ? getNoteStatuses(next) : [];
+    const statusDiff = diffKeys(beforeStatuses, afterStatuses);
+    for (const status of statusDiff.removed) removeSorted(statusBucket(status), id, noteSeq);
+    for (const status of statusDiff.added) insertSorted(statusBucket(status), id, noteSeq);
+
+    // Label buckets (skip normalization when the labels array is untouched)
+    if (before?.labels !== next?.labels) {
+      const beforeKeys = before ? getNoteLabelKeys(before) : [];
+      const afterKeys = next ? getNoteLabelKeys(next) : [];
+      const labelDiff = diffKeys(beforeKeys, afterKeys);
+      for (const key of labelDiff.removed) {
+        const bucket = labelBucket(key);
+        removeSorted(bucket, id, noteSeq);
+        if (bucket.length === 0) delete labelIndex[key];
+      }
+      for (const key of labelDiff.added) insertSorted(labelBucket(key), id, noteSeq);
+    }
+  }
+
+  if (addedIds.length > 0 || removedIds.size > 0) {
+    const liveAdded = addedIds.filter((id) => notesById[id]);
+    const remaining = removedIds.size > 0
+      ? state.noteIds.filter((id) => !removedIds.has(id))
+      : state.noteIds;
+    result.noteIds = liveAdded.length > 0 ? [...liveAdded, ...remaining] : remaining;
+
+    if (removedIds.size > 0) {
+      if (noteSeq === state.noteSeq) noteSeq = { ...noteSeq };
+      removedIds.forEach((id) => {
+        if (!notesById[id]) delete noteSeq[id];
+      });
+    }
+    result.noteSeq = noteSeq;
+  }
+
+  if (statusIndex !== state.statusIndex) result.statusIndex = statusIndex;
+  if (labelIndex !== state.labelIndex) result.labelIndex = labelIndex;
+  result.noteRevision = state.noteRevision + 1;
+  result.changedNoteIds = Array.from(changedIds);
+
+  return result;
+}
+
+/**
+ * Create a memoized selector that resolves an id list (kept in display order)
+ * to notes.
+ *
+ * When the list is the same array as last time and exactly one change has
+ * happened since, only the changed notes are looked at: each one still listed
+ * is swapped in at its position. Anything else (the list itself changed,
+ * a note joined or left the filtered list, or changes were missed) resolves
+ * the whole list again. Returns the previous array when every resolved note
+ * is unchanged, so subscribers only re-render when a note they show changed.
+ */
+export function createNoteListSelector(
+  getIds: (state: NoteIndexState) => string[] | undefined,
+  filter?: (note: Note) => boolean
+): (state: NoteIndexState) => Note[] {
+  let lastIds: string[] | undefined;
+  let lastById: Record<string, Note> | undefined;
+  let lastRevision = -1;
+  let lastResult: Note[] = [];
+  // Position of each listed id in lastResult
+  let positions = new Map<string, number>();
+
+  const isListed = (note: Note | undefined): note is Note => !!note && (!filter || filter(note));
+
+  // Swap changed notes into the last result; undefined if the membership changed
+  const patchResult = (state: NoteIndexState, ids: string[] | undefined): Note[] | undefined => {
+    let next = lastResult;
+    for (const id of state.changedNoteIds) {
+      const note = state.notesById[id];
+      const position = positions.get(id);
+
+      if (position === undefined) {
+        // Unfiltered lists hold every id in the bucket, so it isn't in it.
+        // A filtered list only resolves again if the note now belongs in it.
+        if (!filter || !ids || !isListed(note)) continue;
+        const seq = state.noteSeq[id];
+        if (ids[findPosition(ids, state.noteSeq, seq)] === id) return undefined;
+        continue;
+      }
+
+      if (!isListed(note)) return undefined;
+      if (next[position] !== note) {
+        if (next === lastResult) next = lastResult.slice();
+        next[position] = note;
+      }
+    }
+    return next;
+  };
+
+  const resolveResult = (state: NoteIndexState, ids: string[] | undefined): Note[] => {
+    const next: Note[] = [];
+    const nextPositions = new Map<string, number>();
+    for (const id of ids ?? []) {
+      const note = state.notesById[id];
+      if (isListed(note)) {
+        nextPositions.set(id, next.length);
+        next.push(note);
+      }
+    }
+    positions = nextPositions;
+
+    if (next.length === lastResult.length && next.every((note, i) => note === lastResult[i])) {
+      return lastResult;
+    }
+    return next;
+  };
+
+  return (state) => {
+    const ids = getIds(state);
+    const sameList = ids === lastIds && state.notesById === lastById;
+    if (sameList && state.noteRevision === lastRevision) {
+      return lastResult;
+    }
+
+    const patched =
+      sameList && state.noteRevision === lastRevision + 1 ? patchResult(state, ids) : undefined;
+
+    lastIds = ids;
+    lastById = state.notesById;
+    lastRevision = state.noteRevision;
+    lastResult = patched ?? resolveResult(state, ids);
+    return lastResult;
+  };
+}
+
@@ -0,0 +1,375 @@
+/**
+ * Note Search Index
+ *
+ * Inverted full-text index over note titles and content, owned by noteStore.
+ * Updated incrementally as notes are added, edited and removed, and persisted
+ * with the store so cold start doesn't re-tokenize every note. Each document
+ * is stamped with the note's updatedAt, so a persisted index that fell behind
+ * is repaired note by note instead of rebuilt.
+ *
+ * Queries match whole tokens and token prefixes ("meet" finds "meeting"),
+ * require every query token to match, and rank title hits and exact tokens
+ * above content hits and prefixes. `#label` terms filter by label.
+ *
+ * The index is a plain JSON object that is mutated in place - nothing renders
+ * from it directly, and copying it per keystroke would cost more than the
+ * lookups it saves. Terms and documents touched by a mutation are tracked
+ * (see takeSearchIndexChanges) so storage only rewrites the shards they fall in.
+ */
+
+import { Note } from '@/types';
+import type { NoteChange } from './noteIndexes';
+
+// Bump when tokenization or weighting changes so persisted indexes rebuild
+export const SEARCH_INDEX_VERSION = 2;
+
+const TITLE_WEIGHT = 3;
+// Cap repeated content tokens so long notes don't drown out title matches
+const MAX_CONTENT_HITS = 3;
+// Score multiplier for prefix (vs exact token) matches
+const PREFIX_MATCH_FACTOR = 0.5;
+
+const TOKEN_SEPARATOR = /[^\p{L}\p{N}]+/u;
+
+export interface NoteSearchIndex {
+  version: number;
+  // Bumped on every change (lets storage skip unchanged writes)
+  revision: number;
+  // token -> noteId -> weight
+  postings: Record<string, Record<string, number>>;
+  // noteId -> tokens the note contributes (used to unindex it)
+  docTokens: Record<string, string[]>;
+  // noteId -> note.updatedAt when indexed
+  docStamps: Record<string, number>;
+  // Sorted vocabulary for prefix lookups
+  terms: string[];
+}
+
+export interface ParsedSearchQuery {
+  tokens: string[];
+  labels: string[];
+}
+
+export interface SearchMatch {
+  id: string;
+  score: number;
+}
+
+export interface SearchIndexChanges {
+  terms: Set<string>;
+  docs: Set<string>;
+}
+
+// Terms and documents changed per index since storage last took them
+const trackedChanges = new WeakMap<NoteSearchIndex, SearchIndexChanges>();
+
+function trackChanges(index: NoteSearchIndex): SearchIndexChanges {
+  let changes = trackedChanges.get(index);
+  if (!changes) {
+    changes = { terms: new Set(), docs: new Set() };
+    trackedChanges.set(index, changes);
+  }
+  return changes;
+}
+
+/**
+ * Terms and documents changed since the last call for this index (an index
+ * built with buildSearchIndex starts with none - it is new as a whole)
+ */
+export function takeSearchIndexChanges(index: NoteSearchIndex): SearchIndexChanges {
+  const changes = trackedChanges.get(index) ?? { terms: new Set<string>(), docs: new Set<string>() };
+  trackedChanges.delete(index);
+  return changes;
+}
+
+export const createEmptySearchIndex = (): NoteSearchIndex => ({
+  version: SEARCH_INDEX_VERSION,
+  revision: 0,
+  postings: {},
+  docTokens: {},
+  docStamps: {},
+  terms: [],
+});
+
+/**
+ * Split text into lowercase word tokens
+ */
+export function tokenize(text: string): string[] {
+  if (!text) return [];
+  return text.toLowerCase().split(TOKEN_SEPARATOR).filter(Boolean);
+}
+
+/**
+ * Split a raw query into search tokens and `#label` filters
+ */
+export function parseSearchQuery(query: string): ParsedSearchQuery {
+  const tokens: string[] = [];
+  const labels: string[] = [];
+
+  for (const word of query.trim().split(/\s+/)) {
+    if (word.startsWith('#') && word.length > 1) {
+      labels.push(word.slice(1));
+    } else {
+      tokens.push(...tokenize(word));
+    }
+  }
+
+  return { tokens: Array.from(new Set(tokens)), labels };
+}
+
+/**
+ * Token weights for one note
+ */
+function weighNote(note: Note): Map<string, number> {
+  const weights = new Map<string, number>();
+
+  for (const token of new Set(tokenize(note.title))) {
+    weights.set(token, TITLE_WEIGHT);
+  }
+  const contentHits = new Map<string, number>();
+  for (const token of tokenize(note.content)) {
+    contentHits.set(token, Math.min((contentHits.get(token) ?? 0) + 1, MAX_CONTENT_HITS));
+  }
+  contentHits.forEach((hits, token) => {
+    weights.set(token, (weights.get(token) ?? 0) + hits);
+  });
+
+  return weights;
+}
+
+/**
+ * Index of the first term >= value in the sorted vocabulary
+ */
+function lowerBound(terms: string[], value: string): number {
+  let low = 0;
+  let high = terms.length;
+  while (low < high) {
+    const mid = (low + high) >>> 1;
+    if (terms[mid] < value) {
+      low = mid + 1;
+    } else {
+      high = mid;
+    }
+  }
+  return low;
+}
+
+function isEmpty(record: Record<string, number>): boolean {
+  for (const _key in record) return false;
+  return true;
+}
+
+function removeDocument(index: NoteSearchIndex, id: string): void {
+  const tokens = index.docTokens[id];
+  if (!tokens) return;
+
+  const changes = trackChanges(index);
+  changes.docs.add(id);
+  for (const token of tokens) {
+    changes.terms.add(token);
+    const posting = index.postings[token];
+    if (!posting) continue;
+    delete posting[id];
+    // Drop terms no note uses anymore (keeps prefix scans tight)
+    if (isEmpty(posting)) {
+      delete index.postings[token];
+      const position = lowerBound(index.terms, token);
+      if (index.terms[position] === token) {
+        index.terms.splice(position, 1);
+      }
+    }
+  }
+  delete index.docTokens[id];
+  delete index.docStamps[id];
+}
+
+function addDocument(index: NoteSearchIndex, note: Note): void {
+  const weights = weighNote(note);
+  const tokens: string[] = [];
+  const changes = trackChanges(index);
+  changes.docs.add(note.id);
+
+  weights.forEach((weight, token) => {
+    changes.terms.add(token);
+    let posting = index.postings[token];
+    if (!posting) {
+      posting = {};
+      index.postings[token] = posting;
+      index.terms.splice(lowerBound(index.terms, token), 0, token);
+    }
+    posting[note.id] = weight;
+    tokens.push(token);
+  });
+
+  index.docTokens[note.id] = tokens;
+  index.docStamps[note.id] = note.updatedAt;
+}
+
+/**
+ * Build an index for a full note collection
+ */
+export function buildSearchIndex(notes: Note[]): NoteSearchIndex {
+  const index = createEmptySearchIndex();
+  const postings = index.postings;
+
+  // Collect postings first and sort the vocabulary once
+  for (const note of notes) {
+    if (index.docTokens[note.id]) continue;
+    const tokens: string[] = [];
+    weighNote(note).forEach((weight, token) => {
+      if (!postings[token]) postings[token] = {};
+      postings[token][note.id] = weight;
+      tokens.push(token);
+    });
+    index.docTokens[note.id] = tokens;
+    index.docStamps[note.id] = note.updatedAt;
+  }
+  index.terms = Object.keys(postings).sort();
+
+  return index;
+}
+
+/**
+ * Apply note changes to the index in place.
+ * Edits that leave title and content untouched are skipped.
+ */
+export function updateSearchIndex(index: NoteSearchIndex, changes: NoteChange[]): void {
+  for (const { prev, next } of changes) {
+    const id = (next ?? prev)?.id;
+    if (!id) continue;
+
+    if (prev && next && prev.title === next.title && prev.content === next.content) {
+      // Keep the stamp current so reconciliation doesn't re-index it later
+      if (id in index.docStamps && index.docStamps[id] !== next.updatedAt) {
+        index.docStamps[id] = next.updatedAt;
+        trackChanges(index).docs.add(id);
+        index.revision++;
+      }
+      continue;
+    }
+
+    removeDocument(index, id);
+    if (next) {
+      addDocument(index, next);
+    }
+    index.revision++;
+  }
+}
+
+/**
+ * Rebuild an index from its persisted parts. The vocabulary and each note's
+ * token list are derived from the postings, so they aren't stored.
+ */
+export function restoreSearchIndex(
+  version: number,
+  revision: number,
+  postings: Record<string, Record<string, number>>,
+  docStamps: Record<string, number>
+): NoteSearchIndex {
+  const docTokens: Record<string, string[]> = {};
+  for (const id in docStamps) {
+    docTokens[id] = [];
+  }
+  const terms = Object.keys(postings).sort();
+  for (const term of terms) {
+    for (const id in postings[term]) {
+      if (!docTokens[id]) docTokens[id] = [];
+      docTokens[id].push(term);
+    }
+  }
+
+  return { version, revision, postings, docTokens, docStamps, terms };
+}
+
+/**
+ * Whether a persisted index has the current format
+ */
+export function isSearchIndexCompatible(index: NoteSearchIndex | undefined): index is NoteSearchIndex {
+  return (
+    !!index &&
+    index.version === SEARCH_INDEX_VERSION &&
+    !!index.postings &&
+    !!index.docTokens &&
+    !!index.docStamps &&
+    !!index.terms
+  );
+}
+
+/**
+ * Bring an index in line with a note collection: drop documents for notes
+ * that no longer exist and re-index notes whose stamp doesn't match.
+ * Notes rejected by canIndex (e.g. bodies not loaded yet) are left as they
+ * are; their ids are returned so the caller can index them later.
+ */
+export function reconcileSearchIndex(
+  index: NoteSearchIndex,
+  notes: Note[],
+  canIndex: (note: Note) => boolean = () => true
+): string[] {
+  const skipped: string[] = [];
+  const liveIds = new Set<string>();
+
+  for (const note of notes) {
+    liveIds.add(note.id);
+    if (index.docStamps[note.id] === note.updatedAt) continue;
+    if (!canIndex(note)) {
+      skipped.push(note.id);
+      continue;
+    }
+    removeDocument(index, note.id);
+    addDocument(index, note);
+    index.revision++;
+  }
+
+  for (const id of Object.keys(index.docTokens)) {
+    if (!liveIds.has(id)) {
+      removeDocument(index, id);
+      index.revision++;
+    }
+  }
+
+  return skipped;
+}
+
+/**
+ * Score notes matching every token (exact or prefix).
+ * Results are unordered - callers rank by score and their own tie-breaker.
+ */
+export function searchIndex(index: NoteSearchIndex, tokens: string[]): SearchMatch[] {
+  if (tokens.length === 0) return [];
+
+  let scores: Map<string, number> | undefined;
+
+  for (const token of tokens) {
+    const tokenScores = new Map<string, number>();
+
+    for (let i = lowerBound(index.terms, token); i < index.terms.length; i++) {
+      const term = index.terms[i];
+      if (!term.startsWith(token)) break;
+
+      const factor = term === token ? 1 : PREFIX_MATCH_FACTOR;
+      const posting = index.postings[term];
+      for (const id in posting) {
+        // Later tokens only need to score notes every earlier token matched
+        if (scores && !scores.has(id)) continue;
+        const score = posting[id] * factor;
+        if (score > (tokenScores.get(id) ?? 0)) {
+          tokenScores.set(id, score);
+        }
+      }
+    }
+
+    if (scores) {
+      const previous = scores;
+      tokenScores.forEach((score, id) => {
+        tokenScores.set(id, score + (previous.get(id) ?? 0));
+      });
+    }
+    scores = tokenScores;
+    if (scores.size === 0) break;
+  }
+
+  const matches: SearchMatch[] = [];
+  scores?.forEach((score, id) => matches.push({ id, score }));
+  return matches;
+}
@@ -1,5 +1,5 @@
 import { create } from 'zustand';
-import { persist, createJSONStorage } from 'zustand/middleware';
+import { persist } from 'zustand/middleware';
 import { Note, NoteColor, Label } from '@/types';
 import { generateUUID } from '@/utils/uuid';
 import {
@@ -8,7 +8,25 @@ import {
   validateLabelName,
 } from '@/utils/validation';
 import { normalizeLabel } from '@/utils/labelNormalization';
-import { debouncedStorage } from './debouncedStorage';
+import { getNoteContentPreview, noteStorage, PersistedNoteState } from './chunkedNoteStorage';
+import {
+  NoteChange,
+  NoteIndexState,
+  NoteStatus,
+  applyNoteChanges,
+  buildNoteIndexes,
+  createEmptyNoteIndexes,
+  createNoteListSelector,
+} from './noteIndexes';
+import {
+  NoteSearchIndex,
+  createEmptySearchIndex,
+  isSearchIndexCompatible,
+  parseSearchQuery,
+  reconcileSearchIndex,
+  searchIndex,
+  updateSearchIndex,
+} from './noteSearchIndex';
 import { getPresetForLabel, LabelPresetId } from '@/constants/labelPresets';
 import { Analytics } from '@/services/firebaseAnalytics';
 
@@ -128,9 +146,22 @@ const syncToCloud = (note: Note) => {
   const userId = getAuthUserId();
   if (userId && isPro()) {
     const { uploadNote } = require('@/services/syncService');
-    uploadNote(note, userId).catch((error: Error) => {
-      console.error('[NoteStore] Cloud sync failed:', error);
-    });
+    const upload = async () => {
+      // Never upload a preview in place of the full content
+      const store = useNoteStore.getState();
+      if (!store.pendingBodyIds[note.id]) return note;
+      await store.loadNoteBodies([note.id]);
+      const loaded = useNoteStore.getState();
+      if (loaded.pendingBodyIds[note.id]) {
+        throw new Error(`Body for note ${note.id} could not be loaded`);
+      }
+      return loaded.notesById[note.id] ?? note;
+    };
+    upload()
+      .then((latest) => uploadNote(latest, userId))
+      .catch((error: Error) => {
+        console.error('[NoteStore] Cloud sync failed:', error);
+      });
   }
 };
 
@@ -146,10 +177,56 @@ const deleteFromCloud = (noteId: string) => {
   }
 };
 
-interface NoteState {
-  notes: Note[];
+// ============================================
+// Memoized selectors
+// ============================================
+// Selectors return the same array until a note they resolve to changes, so
+// components using useNoteStore(selector) skip re-renders for unrelated edits.
+
+export const selectAllNotes = createNoteListSelector((state) => state.noteIds);
+
+export const selectActiveNotes = createNoteListSelector((state) => state.statusIndex.active);
+
+export const selectArchivedNotes = createNoteListSelector((state) => state.statusIndex.archived);
+
+export const selectDeletedNotes = createNoteListSelector((state) => state.statusIndex.deleted);
+
+export const selectPinnedNotes = createNoteListSelector((state) => state.statusIndex.pinned);
+
+// One cached selector per normalized label (active notes only)
+const labelSelectors = new Map<string, (state: NoteIndexState) => Note[]>();
+
+export function selectNotesByLabel(labelName: string): (state: NoteIndexState) => Note[] {
+  const normalized = normalizeLabel(labelName);
+  let selector = labelSelectors.get(normalized);
+  if (!selector) {
+    selector = createNoteListSelector(
+      (state) => state.labelIndex[normalized],
+      (note) => !note.isArchived && !note.isDeleted
+    );
+    labelSelectors.set(normalized, selector);
+  }
+  return selector;
+}
+
+export interface SearchNotesOptions {
+  // Only return notes carrying every one of these labels
+  labels?: string[];
+}
+
+interface NoteState extends NoteIndexState {
   labels: Label[];
 
+  // Full-text index over title/content (mutated in place, see noteSearchIndex.ts)
+  searchIndex: NoteSearchIndex;
+  // False until the persisted search index is loaded after hydration
+  // (see loadSearchIndex); token searches return nothing until then
+  searchIndexReady: boolean;
+
+  // Notes hydrated with a content preview whose full body hasn't been read
+  // from storage yet (see chunkedNoteStorage.ts)
+  pendingBodyIds: Record<string, true>;
+
   // Track notes with recent local changes (protect from cloud sync overwrite)
   // Map of noteId -> timestamp when the local change was made
   recentlyModifiedIds: Map<string, number>;
@@ -166,6 +243,18 @@ interface NoteState {
   unpinNote: (id: string) => void;
   clearUnpinnedNotes: () => void;  // Delete all notes except pinned ones
 
+  // Bulk actions (cloud sync / realtime) - no side effects
+  upsertNotes: (notes: Note[]) => void;  // Merge by id; unknown ids are prepended
+  replaceNotes: (notes: Note[]) => void; // Replace the whole collection
+
+  // Read full content for notes hydrated with a preview (all pending by default).
+  // Notes whose body is missing stay pending; rejects if storage can't be read.
+  loadNoteBodies: (ids?: string[]) => Promise<void>;
+
+  // Read the persisted search index (or build one) and bring it in line with
+  // the notes. Runs once; later calls return the same promise.
+  loadSearchIndex: () => Promise<void>;
+
   // Label actions
   addLabel: (name: string) => Label;
   deleteLabel: (id: string) => void;
@@ -179,389 +268,557 @@ interface NoteState {
 
   // Queries
   getNoteById: (id: string) => Note | undefined;
+  getAllNotes: () => Note[];
+  getNoteIdsByStatus: (status: NoteStatus) => string[];
   getActiveNotes: () => Note[];
   getArchivedNotes: () => Note[];
   getDeletedNotes: () => Note[];
   getNotesByLabel: (labelName: string) => Note[];
-  searchNotes: (query: string) => Note[];
+  searchNotes: (query: string, options?: SearchNotesOptions) => Note[];
 }
 
+// Bodies read from storage per state update
+const NOTE_BODY_BATCH_SIZE = 100;
+
+// Notes left out of the search index until their body is loaded
+const deferredSearchIds = new Set<string>();
+
+// Shared by every loadSearchIndex call
+let searchIndexLoad: Promise<void> | null = null;
+
+// The search index to keep in step with note changes - none until it's loaded
+const getReadySearchIndex = (state: NoteState): NoteSearchIndex | null =>
+  state.searchIndexReady ? state.searchIndex : null;
+
+// Apply note changes to the id/status/label indexes and the search index
+const commitNoteChanges = (state: NoteState, changes: NoteChange[]): Partial<NoteState> => {
+  let pendingBodyIds = state.pendingBodyIds;
+
+  const indexable = changes.filter(({ prev, next }) => {
+    const id = (next ?? prev)?.id;
+    if (!id || !pendingBodyIds[id]) return true;
+    if (prev && next && prev.content === next.content) {
+      // Still showing a preview - indexed once the body loads
+      deferredSearchIds.add(id);
+      return false;
+    }
+    // Deleted, or the preview was replaced with new content
+    if (pendingBodyIds === state.pendingBodyIds) pendingBodyIds = { ...pendingBodyIds };
+    delete pendingBodyIds[id];
+    deferredSearchIds.delete(id);
+    return true;
+  });
+  // Before the index loads, edits are picked up when it is reconciled
+  if (state.searchIndexReady) updateSearchIndex(state.searchIndex, indexable);
+
+  const indexes = applyNoteChanges(state, changes);
+  return pendingBodyIds === state.pendingBodyIds ? indexes : { ...indexes, pendingBodyIds };
+};
+
+// Bring the search index in line with a collection (only notes that changed
+// are re-tokenized; notes still showing a preview are deferred)
+const reconcileNoteSearch = (
+  searchIndex: NoteSearchIndex,
+  notes: Note[],
+  pendingBodyIds: Record<string, true>
+) => {
+  deferredSearchIds.clear();
+  reconcileSearchIndex(searchIndex, notes, (note) => !pendingBodyIds[note.id]).forEach((id) =>
+    deferredSearchIds.add(id)
+  );
+};
+
+// Rebuild the id/status/label indexes for a whole collection, and the search
+// index once it is loaded
+const rebuildNoteState = (
+  notes: Note[],
+  searchIndex: NoteSearchIndex | null,
+  pendingBodyIds: Record<string, true>
+) => {
+  if (searchIndex) reconcileNoteSearch(searchIndex, notes, pendingBodyIds);
+  return { ...buildNoteIndexes(notes), pendingBodyIds };
+};
+
+// Pending bodies that still apply to a new collection (same note objects)
+const keepPendingBodies = (state: NoteState, notes: Note[]): Record<string, true> => {
+  const pendingBodyIds: Record<string, true> = {};
+  for (const note of notes) {
+    if (state.pendingBodyIds[note.id] && state.notesById[note.id] === note) {
+      pendingBodyIds[note.id] = true;
+    }
+  }
+  return pendingBodyIds;
+};
+
 export const useNoteStore = create<NoteState>()(
   persist(
-    (set, get) => ({
-      notes: [],
-      labels: [],
-      recentlyModifiedIds: new Map<string, number>(),
-
-      // Note actions
-      addNote: (noteData) => {
-        const now = Date.now();
-
-        // Validate and sanitize inputs
-        const { sanitized: sanitizedTitle } = validateNoteTitle(noteData.title);
-        const { sanitized: sanitizedContent } = validateNoteContent(noteData.content);
-
-        // Check for label presets and auto-apply design
-        let designId = noteData.designId;
-        let activeDesignLabelId: string | undefined;
-
-        if (!designId && noteData.labels && noteData.labels.length > 0) {
-          // Find first label with a preset
-          for (const label of noteData.labels) {
-            const normalizedName = normalizeLabel(label);
-            const preset = getPresetForLabel(normalizedName);
-            if (preset) {
-              designId = `label-preset-${preset.id}`;
-              activeDesignLabelId = normalizedName;
-              break;
+    (set, get) => {
+      // Apply a patch to one note and keep indexes in sync; returns the new note
+      const patchNote = (id: string, patch: (note: Note) => Note): Note | undefined => {
+        let updated: Note | undefined;
+        set((state) => {
+          const prev = state.notesById[id];
+          if (!prev) return {};
+          updated = patch(prev);
+          return commitNoteChanges(state, [{ prev, next: updated }]);
+        });
+        return updated;
+      };
+
+      // Apply a patch to many notes in a single state update
+      const patchNotes = (ids: string[], patch: (note: Note) => Note): void => {
+        if (ids.length === 0) return;
+        set((state) =>
+          commitNoteChanges(
+            state,
+            ids
+              .filter((id) => state.notesById[id])
+              .map((id) => ({ prev: state.notesById[id], next: patch(state.notesById[id]) }))
+          )
+        );
+      };
+
+      return {
+        ...createEmptyNoteIndexes(),
+        searchIndex: createEmptySearchIndex(),
+        searchIndexReady: false,
+        pendingBodyIds: {},
+        labels: [],
+        recentlyModifiedIds: new Map<string, number>(),
+
+        // Note actions
+        addNote: (noteData) => {
+          const now = Date.now();
+
+          // Validate and sanitize inputs
+          const { sanitized: sanitizedTitle } = validateNoteTitle(noteData.title);
+          const { sanitized: sanitizedContent } = validateNoteContent(noteData.content);
+
+          // Check for label presets and auto-apply design
+          let designId = noteData.designId;
+          let activeDesignLabelId: string | undefined;
+
+          if (!designId && noteData.labels && noteData.labels.length > 0) {
+            // Find first label with a preset
+            for (const label of noteData.labels) {
+              const normalizedName = normalizeLabel(label);
+              const preset = getPresetForLabel(normalizedName);
+              if (preset) {
+                designId = `label-preset-${preset.id}`;
+                activeDesignLabelId = normalizedName;
+                break;
+              }
             }
           }
-        }
 
-        const newNote: Note = {
-          ...noteData,
-          title: sanitizedTitle,
-          content: sanitizedContent,
-          id: generateUUID(),
-          createdAt: now,
-          updatedAt: now,
-          labels: noteData.labels || [],
-          isPinned: noteData.isPinned || false,
-          isArchived: false,
-          isDeleted: false,
-          designId,
-          activeDesignLabelId,
-        };
-
-        set((state) => ({ notes: [newNote, ...state.notes] }));
+          const newNote: Note = {
+            ...noteData,
+            title: sanitizedTitle,
+            content: sanitizedContent,
+            id: generateUUID(),
+            createdAt: now,
+            updatedAt: now,
+            labels: noteData.labels || [],
+            isPinned: noteData.isPinned || false,
+            isArchived: false,
+            isDeleted: false,
+            designId,
+            activeDesignLabelId,
+          };
 
-        // Track note creation
-        Analytics.noteCreated(newNote.id);
+          set((state) => commitNoteChanges(state, [{ next: newNote }]));
 
-        // Sync to cloud
-        syncToCloud(newNote);
+          // Track note creation
+          Analytics.noteCreated(newNote.id);
 
-        // MODE Framework: Initialize behavior FIRST, then emit trigger event
-        // This ensures behavior exists when skills are evaluated
-        initializeBehaviorForNote(newNote);
-        emitNoteCreated(newNote);
+          // Sync to cloud
+          syncToCloud(newNote);
 
-        return newNote;
-      },
+          // MODE Framework: Initialize behavior FIRST, then emit trigger event
+          // This ensures behavior exists when skills are evaluated
+          initializeBehaviorForNote(newNote);
+          emitNoteCreated(newNote);
 
-      updateNote: (id, updates) => {
-        // Validate and sanitize inputs if provided
-        const sanitizedUpdates = { ...updates };
-        if (updates.title !== undefined) {
-          const { sanitized } = validateNoteTitle(updates.title);
-          sanitizedUpdates.title = sanitized;
-        }
-        if (updates.content !== undefined) {
-          const { sanitized } = validateNoteContent(updates.content);
-          sanitizedUpdates.content = sanitized;
-        }
+          return newNote;
+        },
 
-        // Mark this note as recently modified locally (protect from cloud sync overwrite)
-        const modificationTimestamp = Date.now();
-        set((state) => {
-          // Defensive: ensure recentlyModifiedIds is a valid Map (might be corrupted from old storage)
-          const existingMap = state.recentlyModifiedIds instanceof Map ? state.recentlyModifiedIds : new Map();
-          const newMap = new Map(existingMap);
-          newMap.set(id, modificationTimestamp);
-          return {
-            notes: state.notes.map((note) =>
-              note.id === id
-                ? { ...note, ...sanitizedUpdates, updatedAt: modificationTimestamp }
-                : note
-            ),
-            recentlyModifiedIds: newMap,
-          };
-        });
+        updateNote: (id, updates) => {
+          // Validate and sanitize inputs if provided
+          const sanitizedUpdates = { ...updates };
+          if (updates.title !== undefined) {
+            const { sanitized } = validateNoteTitle(updates.title);
+            sanitizedUpdates.title = sanitized;
+          }
+          if (updates.content !== undefined) {
+            const { sanitized } = validateNoteContent(updates.content);
+            sanitizedUpdates.content = sanitized;
+          }
 
-        // Clear the protection after 2 seconds (enough time for cloud roundtrip)
-        setTimeout(() => {
+          // Mark this note as recently modified locally (protect from cloud sync overwrite)
+          const modificationTimestamp = Date.now();
+          let updatedNote: Note | undefined;
           set((state) => {
+            // Defensive: ensure recentlyModifiedIds is a valid Map (might be corrupted from old storage)
             const existingMap = state.recentlyModifiedIds instanceof Map ? state.recentlyModifiedIds : new Map();
             const newMap = new Map(existingMap);
-            // Only clear if this is still our timestamp (not a newer modification)
-            if (newMap.get(id) === modificationTimestamp) {
-              newMap.delete(id);
+            newMap.set(id, modificationTimestamp);
+
+            const prev = state.notesById[id];
+            if (!prev) {
+              return { recentlyModifiedIds: newMap };
             }
-            return { recentlyModifiedIds: newMap };
+            updatedNote = { ...prev, ...sanitizedUpdates, updatedAt: modificationTimestamp };
+            return {
+              ...commitNoteChanges(state, [{ prev, next: updatedNote }]),
+              recentlyModifiedIds: newMap,
+            };
           });
-        }, 2000);
-
-        // Sync to cloud
-        const updatedNote = get().notes.find((n) => n.id === id);
-        if (updatedNote) {
-          syncToCloud(updatedNote);
-          // Emit MODE Framework trigger event
-          emitNoteUpdated(updatedNote);
-          // AI Goal-Agent: schedule debounced goal analysis
-          scheduleGoalAnalysis(updatedNote);
-        }
-      },
-
-      deleteNote: (id) => {
-        set((state) => ({
-          notes: state.notes.map((note) =>
-            note.id === id
-              ? { ...note, isDeleted: true, deletedAt: Date.now(), isPinned: false }
-              : note
-          ),
-        }));
-
-        // Track note deletion (soft delete)
-        Analytics.noteDeleted(id);
-
-        // Cancel any pending goal analysis for this note
-        try {
-          const { goalAnalysisService } = require('@/services/goalAnalysisService');
-          goalAnalysisService.cleanupForNote(id);
-        } catch {}
-
-        // Sync soft delete to cloud
-        const deletedNote = get().notes.find((n) => n.id === id);
-        if (deletedNote) {
-          syncToCloud(deletedNote);
-          // Emit MODE Framework trigger event
-          emitNoteDeleted(deletedNote);
-        }
-      },
 
-      restoreNote: (id) => {
-        set((state) => ({
-          notes: state.notes.map((note) =>
-            note.id === id
-              ? { ...note, isDeleted: false, deletedAt: undefined }
-              : note
-          ),
-        }));
-
-        // Track note restoration
-        Analytics.noteRestored(id);
-
-        // Sync restore to cloud
-        const restoredNote = get().notes.find((n) => n.id === id);
-        if (restoredNote) {
-          syncToCloud(restoredNote);
-        }
-      },
+          // Clear the protection after 2 seconds (enough time for cloud roundtrip)
+          setTimeout(() => {
+            set((state) => {
+              const existingMap = state.recentlyModifiedIds instanceof Map ? state.recentlyModifiedIds : new Map();
+              const newMap = new Map(existingMap);
+              // Only clear if this is still our timestamp (not a newer modification)
+              if (newMap.get(id) === modificationTimestamp) {
+                newMap.delete(id);
+              }
+              return { recentlyModifiedIds: newMap };
+            });
+          }, 2000);
+
+          // Sync to cloud
+          if (updatedNote) {
+            syncToCloud(updatedNote);
+            // Emit MODE Framework trigger event
+            emitNoteUpdated(updatedNote);
+            // AI Goal-Agent: schedule debounced goal analysis
+            scheduleGoalAnalysis(updatedNote);
+          }
+        },
 
-      permanentlyDeleteNote: (id) => {
-        // Delete from cloud first
-        deleteFromCloud(id);
+        deleteNote: (id) => {
+          const deletedNote = patchNote(id, (note) => ({
+            ...note,
+            isDeleted: true,
+            deletedAt: Date.now(),
+            isPinned: false,
+          }));
 
-        set((state) => ({
-          notes: state.notes.filter((note) => note.id !== id),
-        }));
-      },
+          // Track note deletion (soft delete)
+          Analytics.noteDeleted(id);
 
-      archiveNote: (id) => {
-        set((state) => ({
-          notes: state.notes.map((note) =>
-            note.id === id
-              ? { ...note, isArchived: true, isPinned: false }
-              : note
-          ),
-        }));
-
-        // Track note archival
-        Analytics.noteArchived(id);
-
-        // Sync archive to cloud
-        const archivedNote = get().notes.find((n) => n.id === id);
-        if (archivedNote) {
-          syncToCloud(archivedNote);
-          // Emit MODE Framework trigger event
-          emitNoteArchived(archivedNote);
-        }
-      },
+          // Cancel any pending goal analysis for this note
+          try {
+            const { goalAnalysisService } = require('@/services/goalAnalysisService');
+            goalAnalysisService.cleanupForNote(id);
+          } catch {}
 
-      unarchiveNote: (id) => {
-        set((state) => ({
-          notes: state.notes.map((note) =>
-            note.id === id ? { ...note, isArchived: false } : note
-          ),
-        }));
+          // Sync soft delete to cloud
+          if (deletedNote) {
+            syncToCloud(deletedNote);
+            // Emit MODE Framework trigger event
+            emitNoteDeleted(deletedNote);
+          }
+        },
 
-        // Track note unarchival (restoration from archive)
-        Analytics.noteRestored(id);
+        restoreNote: (id) => {
+          const restoredNote = patchNote(id, (note) => ({
+            ...note,
+            isDeleted: false,
+            deletedAt: undefined,
+          }));
 
-        // Sync unarchive to cloud
-        const unarchivedNote = get().notes.find((n) => n.id === id);
-        if (unarchivedNote) {
-          syncToCloud(unarchivedNote);
-        }
-      },
+          // Track note restoration
+          Analytics.noteRestored(id);
 
-      pinNote: (id) => {
-        set((state) => ({
-          notes: state.notes.map((note) =>
-            note.id === id ? { ...note, isPinned: true } : note
-          ),
-        }));
+          // Sync restore to cloud
+          if (restoredNote) {
+            syncToCloud(restoredNote);
+          }
+        },
 
-        // Track note pinning
-        Analytics.notePinned(id, true);
+        permanentlyDeleteNote: (id) => {
+          // Delete from cloud first
+          deleteFromCloud(id);
 
-        // Sync pin to cloud
-        const pinnedNote = get().notes.find((n) => n.id === id);
-        if (pinnedNote) {
-          syncToCloud(pinnedNote);
-        }
-      },
+          set((state) => {
+            const prev = state.notesById[id];
+            return prev ? commitNoteChanges(state, [{ prev }]) : {};
+          });
+        },
 
-      unpinNote: (id) => {
-        set((state) => ({
-          notes: state.notes.map((note) =>
-            note.id === id ? { ...note, isPinned: false } : note
-          ),
-        }));
+        archiveNote: (id) => {
+          const archivedNote = patchNote(id, (note) => ({
+            ...note,
+            isArchived: true,
+            isPinned: false,
+          }));
 
-        // Track note unpinning
-        Analytics.notePinned(id, false);
+          // Track note archival
+          Analytics.noteArchived(id);
 
-        // Sync unpin to cloud
-        const unpinnedNote = get().notes.find((n) => n.id === id);
-        if (unpinnedNote) {
-          syncToCloud(unpinnedNote);
-        }
-      },
+          // Sync archive to cloud
+          if (archivedNote) {
+            syncToCloud(archivedNote);
+            // Emit MODE Framework trigger event
+            emitNoteArchived(archivedNote);
+          }
+        },
 
-      clearUnpinnedNotes: () => {
-        set((state) => ({
-          notes: state.notes.filter((note) => note.isPinned),
-        }));
-      },
+        unarchiveNote: (id) => {
+          const unarchivedNote = patchNote(id, (note) => ({ ...note, isArchived: false }));
 
-      // Label actions
-      addLabel: (name) => {
-        // Validate and sanitize the label name
-        const { isValid, sanitized } = validateLabelName(name);
-        if (!isValid || !sanitized) {
-          // Try to find existing label with the raw name (normalized)
-          const normalizedRaw = normalizeLabel(name);
-          const existing = get().labels.find(
-            (l) => l.name === normalizedRaw
-          );
-          if (existing) return existing;
-          // If validation failed and no existing label, return a fallback label
-          // This prevents undefined errors when sanitized is null/undefined
-          const fallbackName = normalizedRaw || 'untitled';
-          const fallbackLabel: Label = {
-            id: generateUUID(),
-            name: fallbackName,
-            createdAt: Date.now(),
-          };
-          set((state) => ({ labels: [...state.labels, fallbackLabel] }));
-          return fallbackLabel;
-        }
+          // Track note unarchival (restoration from archive)
+          Analytics.noteRestored(id);
 
-        // Normalize to canonical form (handles singular/plural)
-        const normalizedName = normalizeLabel(sanitized);
-        const existing = get().labels.find(
-          (l) => l.name === normalizedName
-        );
-        if (existing) return existing;
+          // Sync unarchive to cloud
+          if (unarchivedNote) {
+            syncToCloud(unarchivedNote);
+          }
+        },
 
-        const newLabel: Label = {
-          id: generateUUID(),
-          name: normalizedName,
-          createdAt: Date.now(),
-        };
-        set((state) => ({ labels: [...state.labels, newLabel] }));
+        pinNote: (id) => {
+          const pinnedNote = patchNote(id, (note) => ({ ...note, isPinned: true }));
 
-        // Track label creation
-        Analytics.labelCreated(normalizedName);
+          // Track note pinning
+          Analytics.notePinned(id, true);
 
-        return newLabel;
-      },
+          // Sync pin to cloud
+          if (pinnedNote) {
+            syncToCloud(pinnedNote);
+          }
+        },
 
-      deleteLabel: (id) => {
-        const label = get().labels.find((l) => l.id === id);
-        if (!label) return;
+        unpinNote: (id) => {
+          const unpinnedNote = patchNote(id, (note) => ({ ...note, isPinned: false }));
 
-        const normalizedLabelName = normalizeLabel(label.name);
+          // Track note unpinning
+          Analytics.notePinned(id, false);
 
-        // Remove label from all notes
-        set((state) => ({
-          labels: state.labels.filter((l) => l.id !== id),
-          notes: state.notes.map((note) => ({
-            ...note,
-            labels: note.labels.filter((l) => normalizeLabel(l) !== normalizedLabelName),
-          })),
-        }));
-      },
+          // Sync unpin to cloud
+          if (unpinnedNote) {
+            syncToCloud(unpinnedNote);
+          }
+        },
 
-      renameLabel: (id, newName) => {
-        const oldLabel = get().labels.find((l) => l.id === id);
-        if (!oldLabel) return;
+        clearUnpinnedNotes: () => {
+          set((state) => {
+            const pinned = selectPinnedNotes(state);
+            return rebuildNoteState(pinned, getReadySearchIndex(state), keepPendingBodies(state, pinned));
+          });
+        },
+
+        upsertNotes: (notes) => {
+          if (notes.length === 0) return;
+          set((state) =>
+            commitNoteChanges(
+              state,
+              notes.map((note) => {
+                const prev = state.notesById[note.id];
+                return { prev, next: prev ? { ...prev, ...note } : note };
+              })
+            )
+          );
+        },
 
-        // Normalize the new name to canonical form
-        const normalizedNewName = normalizeLabel(newName);
-        const oldNormalizedName = normalizeLabel(oldLabel.name);
+        replaceNotes: (notes) => {
+          set((state) => rebuildNoteState(notes, getReadySearchIndex(state), keepPendingBodies(state, notes)));
+        },
 
-        set((state) => ({
-          labels: state.labels.map((l) =>
-            l.id === id ? { ...l, name: normalizedNewName } : l
-          ),
-          notes: state.notes.map((note) => ({
-            ...note,
-            labels: note.labels.map((l) =>
-              normalizeLabel(l) === oldNormalizedName ? normalizedNewName : l
-            ),
-          })),
-        }));
-      },
+        loadNoteBodies: async (ids) => {
+          const pending = (ids ?? Object.keys(get().pendingBodyIds)).filter(
+            (id) => get().pendingBodyIds[id]
+          );
 
-      // Note-Label actions (with auto-apply design)
-      addLabelToNote: (noteId, labelName) => {
-        const note = get().notes.find((n) => n.id === noteId);
-        if (!note) return;
+          for (let i = 0; i < pending.length; i += NOTE_BODY_BATCH_SIZE) {
+            const batch = pending.slice(i, i + NOTE_BODY_BATCH_SIZE);
+            const bodies = await noteStorage.readBodies(batch);
+            const loaded: Note[] = [];
+            const missing: string[] = [];
+
+            set((state) => {
+              const pendingBodyIds = { ...state.pendingBodyIds };
+              const changes: NoteChange[] = [];
+
+              for (const id of batch) {
+                const prev = state.notesById[id];
+                // Edited or removed while the body was being read
+                if (!pendingBodyIds[id] || !prev) continue;
+
+                // A missing or mismatched body leaves the note pending, so the
+                // preview is never saved or uploaded as its content
+                const body = bodies[id];
+                if (body === undefined || getNoteContentPreview(body) !== prev.content) {
+                  missing.push(id);
+                  continue;
+                }
+                delete pendingBodyIds[id];
+                const next = { ...prev, content: body };
+                changes.push({ prev, next });
+                loaded.push(next);
+              }
 
-        // Normalize to canonical form (handles singular/plural variants)
-        const normalizedName = normalizeLabel(labelName);
+              // Body loads aren't edits - bypass commitNoteChanges and index
+              // the notes whose search update was deferred
+              const indexes = applyNoteChanges(state, changes);
+              const { notesById } = state;
+              const deferred: NoteChange[] = [];
+              for (const id of batch) {
+                if (!pendingBodyIds[id] && deferredSearchIds.delete(id) && notesById[id]) {
+                  deferred.push({ next: notesById[id] });
+                }
+              }
+              if (state.searchIndexReady) updateSearchIndex(state.searchIndex, deferred);
 
-        // Skip if label already exists on note
-        if (note.labels.some((l) => normalizeLabel(l) === normalizedName)) {
-          return;
-        }
+              return { ...indexes, pendingBodyIds };
+            });
 
-        // Check if label has a preset (using normalized name)
-        const preset = getPresetForLabel(normalizedName);
-        const presetDesignId = preset ? `label-preset-${preset.id}` : undefined;
+            // Storage already holds these bodies - don't write them back
+            noteStorage.markClean(loaded);
+            if (missing.length > 0) {
+              console.warn('[NoteStore] Note bodies missing or out of date, keeping previews:', missing);
+            }
+          }
+        },
+
+        loadSearchIndex: () => {
+          if (!searchIndexLoad) {
+            searchIndexLoad = noteStorage.readSearchIndex().then((stored) => {
+              set((state) => {
+                const searchIndex = isSearchIndexCompatible(stored) ? stored : createEmptySearchIndex();
+                // Catch up with notes changed since the index was written,
+                // including edits made while it was loading
+                reconcileNoteSearch(searchIndex, selectAllNotes(state), state.pendingBodyIds);
+                return { searchIndex, searchIndexReady: true };
+              });
+            });
+          }
+          return searchIndexLoad;
+        },
+
+        // Label actions
+        addLabel: (name) => {
+          // Validate and sanitize the label name
+          const { isValid, sanitized } = validateLabelName(name);
+          if (!isValid || !sanitized) {
+            // Try to find existing label with the raw name (normalized)
+            const normalizedRaw = normalizeLabel(name);
+            const existing = get().labels.find(
+              (l) => l.name === normalizedRaw
+            );
+            if (existing) return existing;
+            // If validation failed and no existing label, return a fallback label
+            // This prevents undefined errors when sanitized is null/undefined
+            const fallbackName = normalizedRaw || 'untitled';
+            const fallbackLabel: Label = {
+              id: generateUUID(),
+              name: fallbackName,
+              createdAt: Date.now(),
+            };
+            set((state) => ({ labels: [...state.labels, fallbackLabel] }));
+            return fallbackLabel;
+          }
 
-        // Ensure the label exists in the labels collection and update lastUsedAt
-        const existingLabel = get().labels.find(
-          (l) => l.name === normalizedName
-        );
-        const now = Date.now();
+          // Normalize to canonical form (handles singular/plural)
+          const normalizedName = normalizeLabel(sanitized);
+          const existing = get().labels.find(
+            (l) => l.name === normalizedName
+          );
+          if (existing) return existing;
 
-        if (!existingLabel) {
           const newLabel: Label = {
             id: generateUUID(),
             name: normalizedName,
-            presetId: preset?.id,
-            createdAt: now,
-            lastUsedAt: now,
+            createdAt: Date.now(),
           };
           set((state) => ({ labels: [...state.labels, newLabel] }));
-        } else {
-          // Update lastUsedAt for existing label
+
+          // Track label creation
+          Analytics.labelCreated(normalizedName);
+
+          return newLabel;
+        },
+
+        deleteLabel: (id) => {
+          const label = get().labels.find((l) => l.id === id);
+          if (!label) return;
+
+          const normalizedLabelName = normalizeLabel(label.name);
+
+          // Remove label from the notes that carry it (via the label index)
+          set((state) => ({ labels: state.labels.filter((l) => l.id !== id) }));
+          patchNotes(get().labelIndex[normalizedLabelName] ?? [], (note) => ({
+            ...note,
+            labels: note.labels.filter((l) => normalizeLabel(l) !== normalizedLabelName),
+          }));
+        },
+
+        renameLabel: (id, newName) => {
+          const oldLabel = get().labels.find((l) => l.id === id);
+          if (!oldLabel) return;
+
+          // Normalize the new name to canonical form
+          const normalizedNewName = normalizeLabel(newName);
+          const oldNormalizedName = normalizeLabel(oldLabel.name);
+
           set((state) => ({
             labels: state.labels.map((l) =>
-              l.name === normalizedName
-                ? { ...l, lastUsedAt: now }
-                : l
+              l.id === id ? { ...l, name: normalizedNewName } : l
             ),
           }));
-        }
+          patchNotes(get().labelIndex[oldNormalizedName] ?? [], (note) => ({
+            ...note,
+            labels: note.labels.map((l) =>
+              normalizeLabel(l) === oldNormalizedName ? normalizedNewName : l
+            ),
+          }));
+        },
+
+        // Note-Label actions (with auto-apply design)
+        addLabelToNote: (noteId, labelName) => {
+          const note = get().notesById[noteId];
+          if (!note) return;
 
-        set((state) => ({
-          notes: state.notes.map((n) => {
-            if (n.id !== noteId) return n;
+          // Normalize to canonical form (handles singular/plural variants)
+          const normalizedName = normalizeLabel(labelName);
+
+          // Skip if label already exists on note
+          if (get().labelIndex[normalizedName]?.includes(noteId)) {
+            return;
+          }
+
+          // Check if label has a preset (using normalized name)
+          const preset = getPresetForLabel(normalizedName);
+          const presetDesignId = preset ? `label-preset-${preset.id}` : undefined;
+
+          // Ensure the label exists in the labels collection and update lastUsedAt
+          const existingLabel = get().labels.find(
+            (l) => l.name === normalizedName
+          );
+          const now = Date.now();
+
+          if (!existingLabel) {
+            const newLabel: Label = {
+              id: generateUUID(),
+              name: normalizedName,
+              presetId: preset?.id,
+              createdAt: now,
+              lastUsedAt: now,
+            };
+            set((state) => ({ labels: [...state.labels, newLabel] }));
+          } else {
+            // Update lastUsedAt for existing label
+            set((state) => ({
+              labels: state.labels.map((l) =>
+                l.name === normalizedName
+                  ? { ...l, lastUsedAt: now }
+                  : l
+              ),
+            }));
+          }
 
+          const updatedNote = patchNote(noteId, (n) => {
             const newLabels = [...n.labels, normalizedName];
 
             // Auto-apply design logic:
@@ -583,32 +840,26 @@ export const useNoteStore = create<NoteState>()(
               labels: newLabels,
               updatedAt: Date.now(),
             };
-          }),
-        }));
-
-        // Track label added to note
-        Analytics.labelAddedToNote(normalizedName, noteId);
-
-        // Sync to cloud
-        const updatedNote = get().notes.find((n) => n.id === noteId);
-        if (updatedNote) {
-          syncToCloud(updatedNote);
-          // Emit MODE Framework trigger event
-          emitLabelAdded(updatedNote, normalizedName);
-          // Auto-assign board mode if not already set
-          autoAssignBoardMode(normalizedName);
-        }
-      },
+          });
 
-      removeLabelFromNote: (noteId, labelName) => {
-        const normalizedName = normalizeLabel(labelName);
-        const note = get().notes.find((n) => n.id === noteId);
-        if (!note) return;
+          // Track label added to note
+          Analytics.labelAddedToNote(normalizedName, noteId);
 
-        set((state) => ({
-          notes: state.notes.map((n) => {
-            if (n.id !== noteId) return n;
+          // Sync to cloud
+          if (updatedNote) {
+            syncToCloud(updatedNote);
+            // Emit MODE Framework trigger event
+            emitLabelAdded(updatedNote, normalizedName);
+            // Auto-assign board mode if not already set
+            autoAssignBoardMode(normalizedName);
+          }
+        },
+
+        removeLabelFromNote: (noteId, labelName) => {
+          const normalizedName = normalizeLabel(labelName);
+          if (!get().notesById[noteId]) return;
 
+          const updatedNote = patchNote(noteId, (n) => {
             const newLabels = n.labels.filter(
               (l) => normalizeLabel(l) !== normalizedName
             );
@@ -642,135 +893,175 @@ export const useNoteStore = create<NoteState>()(
               activeDesignLabelId: newActiveDesignLabelId,
               updatedAt: Date.now(),
             };
-          }),
-        }));
-
-        // Track label removed from note
-        Analytics.labelRemoved(normalizedName, noteId);
+          });
 
-        // Sync to cloud
-        const updatedNote = get().notes.find((n) => n.id === noteId);
-        if (updatedNote) {
-          syncToCloud(updatedNote);
-        }
-      },
+          // Track label removed from note
+          Analytics.labelRemoved(normalizedName, noteId);
 
-      setActiveDesignLabel: (noteId, labelName) => {
-        const preset = labelName ? getPresetForLabel(labelName) : undefined;
-        const newDesignId = preset ? `label-preset-${preset.id}` : undefined;
-
-        set((state) => ({
-          notes: state.notes.map((n) =>
-            n.id === noteId
-              ? {
-                  ...n,
-                  designId: newDesignId,
-                  activeDesignLabelId: labelName,
-                  updatedAt: Date.now(),
-                }
-              : n
-          ),
-        }));
-
-        // Sync to cloud
-        const updatedNote = get().notes.find((n) => n.id === noteId);
-        if (updatedNote) {
-          syncToCloud(updatedNote);
-        }
-      },
+          // Sync to cloud
+          if (updatedNote) {
+            syncToCloud(updatedNote);
+          }
+        },
 
-      assignUncategorizedLabel: (noteId) => {
-        const note = get().notes.find((n) => n.id === noteId);
-        if (!note) return;
+        setActiveDesignLabel: (noteId, labelName) => {
+          const preset = labelName ? getPresetForLabel(labelName) : undefined;
+          const newDesignId = preset ? `label-preset-${preset.id}` : undefined;
 
-        // Don't add if already has labels
-        if (note.labels.length > 0) return;
+          const updatedNote = patchNote(noteId, (n) => ({
+            ...n,
+            designId: newDesignId,
+            activeDesignLabelId: labelName,
+            updatedAt: Date.now(),
+          }));
 
-        const uncategorizedLabel = 'uncategorized';
-        const preset = getPresetForLabel(uncategorizedLabel);
-        const presetDesignId = preset ? `label-preset-${preset.id}` : undefined;
+          // Sync to cloud
+          if (updatedNote) {
+            syncToCloud(updatedNote);
+          }
+        },
 
-        // Ensure the uncategorized label exists in the labels collection
-        const existingLabel = get().labels.find(
-          (l) => l.name.toLowerCase() === uncategorizedLabel
-        );
-        const now = Date.now();
+        assignUncategorizedLabel: (noteId) => {
+          const note = get().notesById[noteId];
+          if (!note) return;
 
-        if (!existingLabel) {
-          const newLabel: Label = {
-            id: generateUUID(),
-            name: uncategorizedLabel,
-            presetId: preset?.id,
-            isSystemLabel: true,
-            createdAt: now,
-            lastUsedAt: now,
-          };
-          set((state) => ({ labels: [...state.labels, newLabel] }));
-        }
+          // Don't add if already has labels
+          if (note.labels.length > 0) return;
 
-        set((state) => ({
-          notes: state.notes.map((n) => {
-            if (n.id !== noteId) return n;
+          const uncategorizedLabel = 'uncategorized';
+          const preset = getPresetForLabel(uncategorizedLabel);
+          const presetDesignId = preset ? `label-preset-${preset.id}` : undefined;
 
-            return {
-              ...n,
-              labels: [uncategorizedLabel],
-              designId: presetDesignId,
-              activeDesignLabelId: uncategorizedLabel,
-              updatedAt: Date.now(),
+          // Ensure the uncategorized label exists in the labels collection
+          const existingLabel = get().labels.find(
+            (l) => l.name.toLowerCase() === uncategorizedLabel
+          );
+          const now = Date.now();
+
+          if (!existingLabel) {
+            const newLabel: Label = {
+              id: generateUUID(),
+              name: uncategorizedLabel,
+              presetId: preset?.id,
+              isSystemLabel: true,
+              createdAt: now,
+              lastUsedAt: now,
             };
-          }),
-        }));
+            set((state) => ({ labels: [...state.labels, newLabel] }));
+          }
 
-        // Sync to cloud
-        const updatedNote = get().notes.find((n) => n.id === noteId);
-        if (updatedNote) {
-          syncToCloud(updatedNote);
-        }
-      },
+          const updatedNote = patchNote(noteId, (n) => ({
+            ...n,
+            labels: [uncategorizedLabel],
+            designId: presetDesignId,
+            activeDesignLabelId: uncategorizedLabel,
+            updatedAt: Date.now(),
+          }));
 
-      // Queries
-      getNoteById: (id) => get().notes.find((note) => note.id === id),
+          // Sync to cloud
+          if (updatedNote) {
+            syncToCloud(updatedNote);
+          }
+        },
 
-      getActiveNotes: () =>
-        get().notes.filter((note) => !note.isArchived && !note.isDeleted),
+        // Queries
+        getNoteById: (id) => get().notesById[id],
 
-      getArchivedNotes: () =>
-        get().notes.filter((note) => note.isArchived && !note.isDeleted),
+        getAllNotes: () => selectAllNotes(get()),
 
-      getDeletedNotes: () => get().notes.filter((note) => note.isDeleted),
+        getNoteIdsByStatus: (status) => get().statusIndex[status],
 
-      getNotesByLabel: (labelName) => {
-        const normalized = normalizeLabel(labelName);
-        return get().notes.filter(
-          (note) =>
-            !note.isArchived &&
-            !note.isDeleted &&
-            note.labels.some((l) => normalizeLabel(l) === normalized)
-        );
-      },
+        getActiveNotes: () => selectActiveNotes(get()),
+
+        getArchivedNotes: () => selectArchivedNotes(get()),
+
+        getDeletedNotes: () => selectDeletedNotes(get()),
+
+        getNotesByLabel: (labelName) => selectNotesByLabel(labelName)(get()),
 
-      searchNotes: (query) => {
-        const q = query.toLowerCase().trim();
-        if (!q) return get().getActiveNotes();
+        searchNotes: (query, options = {}) => {
+          const state = get();
+          const { tokens, labels } = parseSearchQuery(query);
+          const labelFilters = [...labels, ...(options.labels ?? [])].map(normalizeLabel);
+          if (tokens.length === 0 && labelFilters.length === 0) return state.getActiveNotes();
 
-        return get().notes.filter(
-          (note) =>
+          const isVisible = (note: Note | undefined): note is Note =>
+            !!note &&
             !note.isArchived &&
             !note.isDeleted &&
-            (note.title.toLowerCase().includes(q) ||
-              note.content.toLowerCase().includes(q))
-        );
-      },
-    }),
+            labelFilters.every((label) => state.labelIndex[label]?.includes(note.id));
+
+          // Label-only query: notes in the first label's bucket, in display order
+          if (tokens.length === 0) {
+            return (state.labelIndex[labelFilters[0]] ?? [])
+              .map((id) => state.notesById[id])
+              .filter(isVisible);
+          }
+
+          // The index loads after hydration; screens re-run the search once
+          // searchIndexReady flips
+          if (!state.searchIndexReady) return [];
+
+          // Rank by relevance, newest first on ties
+          return searchIndex(state.searchIndex, tokens)
+            .filter((match) => isVisible(state.notesById[match.id]))
+            .sort((a, b) => b.score - a.score || state.noteSeq[a.id] - state.noteSeq[b.id])
+            .map((match) => state.notesById[match.id]);
+        },
+      };
+    },
     {
       name: 'toonnotes-notes',
-      storage: createJSONStorage(() => debouncedStorage),
-      partialize: (state) => ({
-        notes: state.notes,
+      // One record per note, written only when the note changes
+      storage: noteStorage,
+      version: 1,
+      partialize: (state): PersistedNoteState => ({
+        notesById: state.notesById,
+        noteIds: state.noteIds,
+        // Persisted so cold start doesn't re-tokenize every note. Left out
+        // until loaded, so the empty placeholder never replaces the stored one.
+        searchIndex: state.searchIndexReady ? state.searchIndex : undefined,
+        // Not stored itself - tells storage which bodies it still holds
+        pendingBodyIds: state.pendingBodyIds,
+        // Other indexes are cheap to derive and rebuilt on hydration.
         // Don't persist recentlyModifiedIds - it's a Map that doesn't serialize
         // and it's only needed for temporary local modification tracking
       }),
+      // v0 persisted a flat `notes` array
+      migrate: (persistedState, version) => {
+        if (version === 0) {
+          const legacy = persistedState as { notes?: Note[] } | undefined;
+          const { notesById, noteIds } = buildNoteIndexes(legacy?.notes ?? []);
+          return { notesById, noteIds } as PersistedNoteState as NoteState;
+        }
+        return persistedState as NoteState;
+      },
+      merge: (persistedState, currentState) => {
+        const persisted = persistedState as Partial<PersistedNoteState> | undefined;
+        if (!persisted?.notesById || !persisted.noteIds) {
+          return currentState;
+        }
+        const byId = persisted.notesById;
+        const notes = persisted.noteIds.map((id) => byId[id]).filter(Boolean);
+        // The search index isn't part of hydration - see loadSearchIndex
+        return {
+          ...currentState,
+          ...rebuildNoteState(notes, getReadySearchIndex(currentState), persisted.pendingBodyIds ?? {}),
+        };
+      },
+      onRehydrateStorage: () => (state) => {
+        if (!state) return;
+        // Rewrite data still held in the old single-key blob
+        if (noteStorage.hasLegacyData()) {
+          useNoteStore.setState({});
+        }
+        // List renders from previews; full bodies and the search index load
+        // in the background
+        state.loadNoteBodies().catch((error) => {
+          console.error('[NoteStore] Failed to load note bodies:', error);
+        });
+        state.loadSearchIndex();
+      },
     }
   )
 );
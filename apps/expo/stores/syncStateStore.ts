@@ -0,0 +1,132 @@
+/**
+ * Sync State Store
+ *
+ * Zustand store for the device-side bookkeeping of incremental (delta) sync.
+ * Keeps a per-table cursor so syncService only fetches rows changed since the
+ * last successful pull and only uploads local records edited since the last
+ * successful push. Also exposes stats from the most recent sync run.
+ *
+ * Only cursors are persisted - stats are diagnostic and reset on app launch.
+ */
+
+import { create } from 'zustand';
+import { persist, createJSONStorage } from 'zustand/middleware';
+import { debouncedStorage } from './debouncedStorage';
+
+export type SyncTable = 'notes' | 'designs' | 'boards' | 'labels';
+
+export type SyncMode = 'delta' | 'full';
+
+/**
+ * Server version of a row this device wrote: its sync_seq, and the id of the
+ * transaction that wrote it (pulls are bounded by transaction ids)
+ */
+export interface SyncEcho {
+  seq: number;
+  xid: number;
+}
+
+export interface SyncCursor {
+  // Owner of the cursor - cursors never carry over between accounts
+  userId: string | null;
+  // Server transaction horizon pulled up to: every change committed by a
+  // transaction below it has been pulled (null = never pulled)
+  pulledXid: number | null;
+  // Device time when the last fully uploaded sync started (0 = never pushed).
+  // Only compared with local edit times, which come from the same clock.
+  pushedAt: number;
+  // Rows this device wrote (id -> version returned by the upsert), skipped
+  // when they come back in a pull
+  echoes: Record<string, SyncEcho>;
+  // Records known to be in the cloud at a version stamped after pushedAt
+  // (id -> local timestamp), e.g. downloads; not uploaded again unless edited
+  synced: Record<string, number>;
+}
+
+export interface SyncStats {
+  table: SyncTable;
+  mode: SyncMode;
+  startedAt: number;
+  durationMs: number;
+  pages: number;
+  rowsFetched: number;
+  bytesFetched: number;
+  chunks: number;
+  rowsUploaded: number;
+  bytesUploaded: number;
+  retries: number;
+}
+
+export const EMPTY_SYNC_CURSOR: SyncCursor = {
+  userId: null,
+  pulledXid: null,
+  pushedAt: 0,
+  echoes: {},
+  synced: {},
+};
+
+interface SyncStateState {
+  cursors: Partial<Record<SyncTable, SyncCursor>>;
+  lastStats: Partial<Record<SyncTable, SyncStats>>;
+
+  // Actions
+  setCursor: (table: SyncTable, cursor: SyncCursor) => void;
+  recordStats: (stats: SyncStats) => void;
+  resetCursors: () => void;
+
+  // Queries
+  getCursor: (table: SyncTable, userId: string) => SyncCursor;
+}
+
+export const useSyncStateStore = create<SyncStateState>()(
+  persist(
+    (set, get) => ({
+      cursors: {},
+      lastStats: {},
+
+      setCursor: (table, cursor) => {
+        set((state) => ({
+          cursors: { ...state.cursors, [table]: cursor },
+        }));
+      },
+
+      recordStats: (stats) => {
+        set((state) => ({
+          lastStats: { ...state.lastStats, [stats.table]: stats },
+        }));
+      },
+
+      resetCursors: () => {
+        set({ cursors: {}, lastStats: {} });
+      },
+
+      /**
+       * Get the cursor for a table, falling back to an empty cursor (full sync)
+       * when none exists or it belongs to a different account
+       */
+      getCursor: (table, userId) => {
+        const cursor = get().cursors[table];
+        if (!cursor || cursor.userId !== userId) {
+          return { ...EMPTY_SYNC_CURSOR, userId };
+        }
+        return cursor;
+      },
+    }),
+    {
+      name: 'toonnotes-sync-state',
+      storage: createJSONStorage(() => debouncedStorage),
+      version: 2,
+      partialize: (state) => ({
+        cursors: state.cursors,
+      }),
+      // v0 cursors were updated_at timestamps and v1 cursors sync_seq values,
+      // which could skip rows committed out of order - start over with a full sync
+      migrate: (persistedState, version) => {
+        if (version < 2) {
+          return { cursors: {} } as Partial<SyncStateState> as SyncStateState;
+        }
+        return persistedState as SyncStateState;
+      },
+    }
+  )
+);
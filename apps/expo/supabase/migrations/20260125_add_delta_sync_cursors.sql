@@ -0,0 +1,33 @@
+-- Migration: Support incremental (delta) sync
+-- ============================================
+-- Designs and labels get updated_at (and the shared trigger) here, like notes
+-- and boards, for last-write-wins conflict resolution during sync.
+--
+-- Soft deletes (notes.is_deleted / deleted_at) bump updated_at, so tombstones
+-- win over older edits. Delta fetches themselves are keyed on the server-side
+-- cursor added in 20260126_add_sync_seq.sql and 20260127_add_sync_horizon.sql.
+
+ALTER TABLE public.designs
+ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
+
+ALTER TABLE public.labels
+ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
+
+DROP TRIGGER IF EXISTS update_designs_updated_at ON public.designs;
+CREATE TRIGGER update_designs_updated_at
+  BEFORE UPDATE ON public.designs
+  FOR EACH ROW EXECUTE FUNCTION public.update_updated_at();
+
+DROP TRIGGER IF EXISTS update_labels_updated_at ON public.labels;
+CREATE TRIGGER update_labels_updated_at
+  BEFORE UPDATE ON public.labels
+  FOR EACH ROW EXECUTE FUNCTION public.update_updated_at();
+
+-- Delta fetches filter by user and range-scan on updated_at
+CREATE INDEX IF NOT EXISTS idx_notes_user_updated_at ON public.notes(user_id, updated_at);
+CREATE INDEX IF NOT EXISTS idx_designs_user_updated_at ON public.designs(user_id, updated_at);
+CREATE INDEX IF NOT EXISTS idx_boards_user_updated_at ON public.boards(user_id, updated_at);
+CREATE INDEX IF NOT EXISTS idx_labels_user_updated_at ON public.labels(user_id, updated_at);
+
+COMMENT ON COLUMN public.designs.updated_at IS 'Last modification time; used for last-write-wins conflict resolution';
+COMMENT ON COLUMN public.labels.updated_at IS 'Last modification time; used for last-write-wins conflict resolution';
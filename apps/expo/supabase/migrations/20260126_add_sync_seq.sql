@@ -0,0 +1,67 @@
+-- Migration: Server-assigned delta sync cursor
+-- ============================================
+-- updated_at can't be used as a pull cursor: inserts keep the timestamp the
+-- client sent, so a note created offline (or on a device whose clock is
+-- behind) lands below other devices' cursors and is never pulled.
+--
+-- sync_seq is taken from one global sequence on every INSERT and UPDATE, so
+-- each write gets a unique, increasing value regardless of client clocks.
+-- The app pages through changes with keyset pagination on sync_seq and
+-- recognises its own writes (returned by the upsert) by (id, sync_seq).
+--
+-- updated_at is left alone - it is still the client edit time used for
+-- last-write-wins conflict resolution.
+
+CREATE SEQUENCE IF NOT EXISTS public.sync_seq;
+
+CREATE OR REPLACE FUNCTION public.assign_sync_seq()
+RETURNS TRIGGER AS $$
+BEGIN
+  NEW.sync_seq = nextval('public.sync_seq');
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- The volatile default numbers existing rows without firing update triggers
+ALTER TABLE public.notes
+ADD COLUMN IF NOT EXISTS sync_seq BIGINT NOT NULL DEFAULT nextval('public.sync_seq');
+
+ALTER TABLE public.designs
+ADD COLUMN IF NOT EXISTS sync_seq BIGINT NOT NULL DEFAULT nextval('public.sync_seq');
+
+ALTER TABLE public.boards
+ADD COLUMN IF NOT EXISTS sync_seq BIGINT NOT NULL DEFAULT nextval('public.sync_seq');
+
+ALTER TABLE public.labels
+ADD COLUMN IF NOT EXISTS sync_seq BIGINT NOT NULL DEFAULT nextval('public.sync_seq');
+
+DROP TRIGGER IF EXISTS assign_notes_sync_seq ON public.notes;
+CREATE TRIGGER assign_notes_sync_seq
+  BEFORE INSERT OR UPDATE ON public.notes
+  FOR EACH ROW EXECUTE FUNCTION public.assign_sync_seq();
+
+DROP TRIGGER IF EXISTS assign_designs_sync_seq ON public.designs;
+CREATE TRIGGER assign_designs_sync_seq
+  BEFORE INSERT OR UPDATE ON public.designs
+  FOR EACH ROW EXECUTE FUNCTION public.assign_sync_seq();
+
+DROP TRIGGER IF EXISTS assign_boards_sync_seq ON public.boards;
+CREATE TRIGGER assign_boards_sync_seq
+  BEFORE INSERT OR UPDATE ON public.boards
+  FOR EACH ROW EXECUTE FUNCTION public.assign_sync_seq();
+
+DROP TRIGGER IF EXISTS assign_labels_sync_seq ON public.labels;
+CREATE TRIGGER assign_labels_sync_seq
+  BEFORE INSERT OR UPDATE ON public.labels
+  FOR EACH ROW EXECUTE FUNCTION public.assign_sync_seq();
+
+-- Delta fetches filter by user and range-scan on sync_seq
+CREATE INDEX IF NOT EXISTS idx_notes_user_sync_seq ON public.notes(user_id, sync_seq);
+CREATE INDEX IF NOT EXISTS idx_designs_user_sync_seq ON public.designs(user_id, sync_seq);
+CREATE INDEX IF NOT EXISTS idx_boards_user_sync_seq ON public.boards(user_id, sync_seq);
+CREATE INDEX IF NOT EXISTS idx_labels_user_sync_seq ON public.labels(user_id, sync_seq);
+
+COMMENT ON COLUMN public.notes.sync_seq IS 'Server-assigned change sequence; used as the delta sync cursor';
+COMMENT ON COLUMN public.designs.sync_seq IS 'Server-assigned change sequence; used as the delta sync cursor';
+COMMENT ON COLUMN public.boards.sync_seq IS 'Server-assigned change sequence; used as the delta sync cursor';
+COMMENT ON COLUMN public.labels.sync_seq IS 'Server-assigned change sequence; used as the delta sync cursor';
@@ -0,0 +1,62 @@
+-- Migration: Commit-safe delta sync horizon
+-- ============================================
+-- sync_seq is taken when a row is written, not when its transaction commits,
+-- so a row with a lower sync_seq can become visible after a higher one has
+-- already been pulled - a sync_seq cursor would skip it for good.
+--
+-- Every write now also records the id of the transaction that made it
+-- (sync_xid). sync_horizon() returns the oldest transaction still running:
+-- every transaction below it has committed or aborted, so the app pulls rows
+-- with sync_xid in [last horizon, current horizon) and moves its cursor to the
+-- current horizon. Rows committed by newer transactions wait for the next pull.
+-- sync_seq stays as the keyset for paging and for recognising own writes.
+--
+-- Requires Postgres 13+ (pg_current_xact_id / pg_current_snapshot).
+
+-- Existing rows were committed long ago, so they sit below any horizon
+ALTER TABLE public.notes ADD COLUMN IF NOT EXISTS sync_xid BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE public.designs ADD COLUMN IF NOT EXISTS sync_xid BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE public.boards ADD COLUMN IF NOT EXISTS sync_xid BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE public.labels ADD COLUMN IF NOT EXISTS sync_xid BIGINT NOT NULL DEFAULT 0;
+
+-- The existing assign_*_sync_seq triggers pick up the new body
+CREATE OR REPLACE FUNCTION public.assign_sync_seq()
+RETURNS TRIGGER AS $$
+BEGIN
+  NEW.sync_seq = nextval('public.sync_seq');
+  NEW.sync_xid = pg_current_xact_id()::text::bigint;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION public.sync_horizon()
+RETURNS BIGINT
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.sync_horizon() TO authenticated;
+
+-- Delta fetches filter by user and range-scan on sync_xid
+CREATE INDEX IF NOT EXISTS idx_notes_user_sync_xid ON public.notes(user_id, sync_xid);
+CREATE INDEX IF NOT EXISTS idx_designs_user_sync_xid ON public.designs(user_id, sync_xid);
+CREATE INDEX IF NOT EXISTS idx_boards_user_sync_xid ON public.boards(user_id, sync_xid);
+CREATE INDEX IF NOT EXISTS idx_labels_user_sync_xid ON public.labels(user_id, sync_xid);
+
+-- Nothing range-scans on updated_at any more
+DROP INDEX IF EXISTS public.idx_notes_user_updated_at;
+DROP INDEX IF EXISTS public.idx_designs_user_updated_at;
+DROP INDEX IF EXISTS public.idx_boards_user_updated_at;
+DROP INDEX IF EXISTS public.idx_labels_user_updated_at;
+
+COMMENT ON COLUMN public.notes.sync_seq IS 'Server-assigned change sequence; pages delta sync pulls and identifies own writes';
+COMMENT ON COLUMN public.designs.sync_seq IS 'Server-assigned change sequence; pages delta sync pulls and identifies own writes';
+COMMENT ON COLUMN public.boards.sync_seq IS 'Server-assigned change sequence; pages delta sync pulls and identifies own writes';
+COMMENT ON COLUMN public.labels.sync_seq IS 'Server-assigned change sequence; pages delta sync pulls and identifies own writes';
+
+COMMENT ON COLUMN public.notes.sync_xid IS 'Transaction that last wrote the row; bounds delta sync pulls (see sync_horizon)';
+COMMENT ON COLUMN public.designs.sync_xid IS 'Transaction that last wrote the row; bounds delta sync pulls (see sync_horizon)';
+COMMENT ON COLUMN public.boards.sync_xid IS 'Transaction that last wrote the row; bounds delta sync pulls (see sync_horizon)';
+COMMENT ON COLUMN public.labels.sync_xid IS 'Transaction that last wrote the row; bounds delta sync pulls (see sync_horizon)';
@@ -71,6 +71,7 @@ CREATE TABLE IF NOT EXISTS public.labels (
   last_used_at TIMESTAMPTZ,
 
   created_at TIMESTAMPTZ DEFAULT NOW(),
+  updated_at TIMESTAMPTZ DEFAULT NOW(),
 
   UNIQUE(user_id, name)
 );
@@ -96,7 +97,8 @@ CREATE TABLE IF NOT EXISTS public.designs (
   label_preset_id TEXT,
   is_label_preset BOOLEAN DEFAULT FALSE,
 
-  created_at TIMESTAMPTZ DEFAULT NOW()
+  created_at TIMESTAMPTZ DEFAULT NOW(),
+  updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
 -- ============================================
@@ -142,6 +144,28 @@ CREATE INDEX IF NOT EXISTS idx_designs_user_id ON public.designs(user_id);
 CREATE INDEX IF NOT EXISTS idx_boards_user_id ON public.boards(user_id);
 CREATE INDEX IF NOT EXISTS idx_purchases_user_id ON public.purchases(user_id);
 
+-- Delta sync: a server-assigned change sequence (paging) and the writing
+-- transaction id (pull horizon), set on every insert and update
+-- (see migrations/20260126_add_sync_seq.sql and 20260127_add_sync_horizon.sql)
+CREATE SEQUENCE IF NOT EXISTS public.sync_seq;
+ALTER TABLE public.notes ADD COLUMN IF NOT EXISTS sync_seq BIGINT NOT NULL DEFAULT nextval('public.sync_seq');
+ALTER TABLE public.designs ADD COLUMN IF NOT EXISTS sync_seq BIGINT NOT NULL DEFAULT nextval('public.sync_seq');
+ALTER TABLE public.boards ADD COLUMN IF NOT EXISTS sync_seq BIGINT NOT NULL DEFAULT nextval('public.sync_seq');
+ALTER TABLE public.labels ADD COLUMN IF NOT EXISTS sync_seq BIGINT NOT NULL DEFAULT nextval('public.sync_seq');
+ALTER TABLE public.notes ADD COLUMN IF NOT EXISTS sync_xid BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE public.designs ADD COLUMN IF NOT EXISTS sync_xid BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE public.boards ADD COLUMN IF NOT EXISTS sync_xid BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE public.labels ADD COLUMN IF NOT EXISTS sync_xid BIGINT NOT NULL DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS idx_notes_user_sync_seq ON public.notes(user_id, sync_seq);
+CREATE INDEX IF NOT EXISTS idx_designs_user_sync_seq ON public.designs(user_id, sync_seq);
+CREATE INDEX IF NOT EXISTS idx_boards_user_sync_seq ON public.boards(user_id, sync_seq);
+CREATE INDEX IF NOT EXISTS idx_labels_user_sync_seq ON public.labels(user_id, sync_seq);
+CREATE INDEX IF NOT EXISTS idx_notes_user_sync_xid ON public.notes(user_id, sync_xid);
+CREATE INDEX IF NOT EXISTS idx_designs_user_sync_xid ON public.designs(user_id, sync_xid);
+CREATE INDEX IF NOT EXISTS idx_boards_user_sync_xid ON public.boards(user_id, sync_xid);
+CREATE INDEX IF NOT EXISTS idx_labels_user_sync_xid ON public.labels(user_id, sync_xid);
+
 -- ============================================
 -- ROW LEVEL SECURITY (RLS)
 -- ============================================
@@ -245,6 +269,57 @@ CREATE TRIGGER update_boards_updated_at
   BEFORE UPDATE ON public.boards
   FOR EACH ROW EXECUTE FUNCTION public.update_updated_at();
 
+DROP TRIGGER IF EXISTS update_designs_updated_at ON public.designs;
+CREATE TRIGGER update_designs_updated_at
+  BEFORE UPDATE ON public.designs
+  FOR EACH ROW EXECUTE FUNCTION public.update_updated_at();
+
+DROP TRIGGER IF EXISTS update_labels_updated_at ON public.labels;
+CREATE TRIGGER update_labels_updated_at
+  BEFORE UPDATE ON public.labels
+  FOR EACH ROW EXECUTE FUNCTION public.update_updated_at();
+
+-- Stamp the delta sync sequence and writing transaction on every write
+CREATE OR REPLACE FUNCTION public.assign_sync_seq()
+RETURNS TRIGGER AS $$
+BEGIN
+  NEW.sync_seq = nextval('public.sync_seq');
+  NEW.sync_xid = pg_current_xact_id()::text::bigint;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Oldest running transaction: rows written below it are committed and final
+CREATE OR REPLACE FUNCTION public.sync_horizon()
+RETURNS BIGINT
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.sync_horizon() TO authenticated;
+
+DROP TRIGGER IF EXISTS assign_notes_sync_seq ON public.notes;
+CREATE TRIGGER assign_notes_sync_seq
+  BEFORE INSERT OR UPDATE ON public.notes
+  FOR EACH ROW EXECUTE FUNCTION public.assign_sync_seq();
+
+DROP TRIGGER IF EXISTS assign_designs_sync_seq ON public.designs;
+CREATE TRIGGER assign_designs_sync_seq
+  BEFORE INSERT OR UPDATE ON public.designs
+  FOR EACH ROW EXECUTE FUNCTION public.assign_sync_seq();
+
+DROP TRIGGER IF EXISTS assign_boards_sync_seq ON public.boards;
+CREATE TRIGGER assign_boards_sync_seq
+  BEFORE INSERT OR UPDATE ON public.boards
+  FOR EACH ROW EXECUTE FUNCTION public.assign_sync_seq();
+
+DROP TRIGGER IF EXISTS assign_labels_sync_seq ON public.labels;
+CREATE TRIGGER assign_labels_sync_seq
+  BEFORE INSERT OR UPDATE ON public.labels
+  FOR EACH ROW EXECUTE FUNCTION public.assign_sync_seq();
+
 -- ============================================
 -- ENABLE REALTIME
 -- ============================================
@@ -60,6 +60,39 @@ const warn = (message: string, ...args: unknown[]) => {
   console.warn(message, ...args);
 };
 
+// ============================================
+// Request Deduplication
+// ============================================
+
+// Successful analyses are reused briefly (retries, re-opened notes)
+const ANALYSIS_CACHE_TTL_MS = 5 * 60 * 1000;
+const ANALYSIS_CACHE_MAX_ENTRIES = 50;
+
+const analysisCache = new Map<string, { result: LabelAnalysisResponse; expiresAt: number }>();
+const pendingAnalyses = new Map<string, Promise<LabelAnalysisResponse>>();
+
+/**
+ * Key for an analysis request: djb2 hash of the normalized inputs plus their length
+ */
+function getAnalysisKey(request: LabelAnalysisRequest): string {
+  const labels = Array.from(new Set(request.existingLabels ?? [])).sort();
+  const str = [request.noteTitle?.trim() ?? '', request.noteContent?.trim() ?? '', ...labels].join('\u0000');
+  let hash = 5381;
+  for (let i = 0; i < str.length; i++) {
+    hash = (hash * 33) ^ str.charCodeAt(i);
+  }
+  return `${(hash >>> 0).toString(36)}:${str.length}`;
+}
+
+function cacheAnalysis(key: string, result: LabelAnalysisResponse): void {
+  analysisCache.delete(key);
+  analysisCache.set(key, { result, expiresAt: Date.now() + ANALYSIS_CACHE_TTL_MS });
+  while (analysisCache.size > ANALYSIS_CACHE_MAX_ENTRIES) {
+    const oldest = analysisCache.keys().next().value as string;
+    analysisCache.delete(oldest);
+  }
+}
+
 // ============================================
 // Core Analysis Function
 // ============================================
@@ -67,13 +100,16 @@ const warn = (message: string, ...args: unknown[]) => {
 /**
  * Analyze note content and return label suggestions
  *
+ * Identical requests share one in-flight call, and successful results are
+ * reused for a few minutes.
+ *
  * @param request - Note title, content, and existing custom labels
  * @returns Categorized label suggestions with confidence scores
  */
 export async function analyzeNoteContent(
   request: LabelAnalysisRequest
 ): Promise<LabelAnalysisResponse> {
-  const { noteTitle, noteContent, existingLabels = [] } = request;
+  const { noteTitle, noteContent } = request;
 
   // Skip analysis for empty notes
   if (!noteTitle?.trim() && !noteContent?.trim()) {
@@ -87,6 +123,44 @@ export async function analyzeNoteContent(
     };
   }
 
+  const key = getAnalysisKey(request);
+
+  const cached = analysisCache.get(key);
+  if (cached && cached.expiresAt > Date.now()) {
+    log('[label-ai] Using cached analysis');
+    return cached.result;
+  }
+
+  const pending = pendingAnalyses.get(key);
+  if (pending) {
+    log('[label-ai] Joining in-flight analysis');
+    return pending;
+  }
+
+  const analysis = requestAnalysis(request)
+    .then((result) => {
+      // Errors aren't cached so the next call retries
+      if (!result.error) {
+        cacheAnalysis(key, result);
+      }
+      return result;
+    })
+    .finally(() => {
+      pendingAnalyses.delete(key);
+    });
+
+  pendingAnalyses.set(key, analysis);
+  return analysis;
+}
+
+/**
+ * Call the analysis API with retries
+ */
+async function requestAnalysis(
+  request: LabelAnalysisRequest
+): Promise<LabelAnalysisResponse> {
+  const { noteTitle, noteContent, existingLabels = [] } = request;
+
   let lastError: Error | null = null;
   let lastStatusCode: number | null = null;
   let lastErrorMessage: string = 'Unknown error';
@@ -6,13 +6,13 @@
 
 import type { VercelRequest, VercelResponse } from '@vercel/node';
 import {
-  runReport,
-  batchRunReports,
   getMetadata,
   parseReportToRecords,
   createDateRange,
   type ReportRequest,
 } from './api/data';
+import { queryReport, queryReports } from './api/reportCache';
+import { exportReportAsCSV } from './tools/export';
 import {
   getActiveUsers,
   getRecentEvents,
@@ -303,7 +303,7 @@ async function handleToolCall(name: string, args: Record<string, unknown>): Prom
           dateRanges: [{ startDate: startDate || '7daysAgo', endDate: endDate || 'today' }],
           limit: limit || 100,
         };
-        const response = await runReport(request);
+        const response = await queryReport(request);
         const records = parseReportToRecords(response);
         return {
           content: [{ type: 'text', text: JSON.stringify({ rowCount: response.rowCount, data: records }, null, 2) }],
@@ -313,7 +313,7 @@ async function handleToolCall(name: string, args: Record<string, unknown>): Prom
       case 'ga4_get_active_users': {
         const { period = '7d' } = args as { period?: string };
         const dateRange = createDateRange(period as 'today' | '7d' | '30d' | '90d' | 'year');
-        const response = await runReport({
+        const response = await queryReport({
           dimensions: [{ name: 'deviceCategory' }],
           metrics: [{ name: 'activeUsers' }, { name: 'newUsers' }],
           dateRanges: [dateRange],
@@ -334,7 +334,7 @@ async function handleToolCall(name: string, args: Record<string, unknown>): Prom
       case 'ga4_get_top_events': {
         const { period = '7d', limit = 20 } = args as { period?: string; limit?: number };
         const dateRange = createDateRange(period as 'today' | '7d' | '30d' | '90d' | 'year');
-        const response = await runReport({
+        const response = await queryReport({
           dimensions: [{ name: 'eventName' }],
           metrics: [{ name: 'eventCount' }, { name: 'totalUsers' }],
           dateRanges: [dateRange],
@@ -350,7 +350,7 @@ async function handleToolCall(name: string, args: Record<string, unknown>): Prom
       case 'ga4_get_user_metrics': {
         const { period = '7d' } = args as { period?: string };
         const dateRange = createDateRange(period as 'today' | '7d' | '30d' | '90d' | 'year');
-        const { reports } = await batchRunReports([
+        const reports = await queryReports([
           {
             metrics: [
               { name: 'activeUsers' },
@@ -383,7 +383,7 @@ async function handleToolCall(name: string, args: Record<string, unknown>): Prom
           limit?: number;
         };
         const dateRange = createDateRange(period as 'today' | '7d' | '30d' | '90d' | 'year');
-        const response = await runReport({
+        const response = await queryReport({
           dimensions: [{ name: dimension }],
           metrics: [{ name: 'screenPageViews' }, { name: 'activeUsers' }, { name: 'averageSessionDuration' }],
           dateRanges: [dateRange],
@@ -637,7 +637,7 @@ async function handleToolCall(name: string, args: Record<string, unknown>): Prom
           dateRanges: [{ startDate: r.startDate || '7daysAgo', endDate: r.endDate || 'today' }],
           limit: r.limit || 100,
         }));
-        const { reports: responses } = await batchRunReports(requests);
+        const responses = await queryReports(requests);
         const results = reports.map((config, i) => ({
           name: config.name,
           rowCount: responses[i].rowCount,
@@ -656,26 +656,14 @@ async function handleToolCall(name: string, args: Record<string, unknown>): Prom
           endDate?: string;
           limit?: number;
         };
-        const response = await runReport({
+        const { csv, rowCount } = await exportReportAsCSV({
           dimensions: dimensions.map((name) => ({ name })),
           metrics: metrics.map((name) => ({ name })),
           dateRanges: [{ startDate: startDate || '7daysAgo', endDate: endDate || 'today' }],
           limit: limit || 1000,
         });
-        const headers = [
-          ...response.dimensionHeaders.map((h) => h.name),
-          ...response.metricHeaders.map((h) => h.name),
-        ];
-        const rows = (response.rows || []).map((row) => {
-          const values = [
-            ...row.dimensionValues.map((v) => escapeCSV(v.value)),
-            ...row.metricValues.map((v) => v.value),
-          ];
-          return values.join(',');
-        });
-        const csv = [headers.join(','), ...rows].join('\n');
         return {
-          content: [{ type: 'text', text: `CSV Export (${response.rowCount} rows):\n\n${csv}` }],
+          content: [{ type: 'text', text: `CSV Export (${rowCount} rows):\n\n${csv}` }],
         };
       }
 
@@ -683,7 +671,7 @@ async function handleToolCall(name: string, args: Record<string, unknown>): Prom
         const { period = '30d' } = args as { period?: string };
         const dateRange = createDateRange(period as 'today' | '7d' | '30d' | '90d' | 'year');
         // GA4 batch limit is 5 requests, so we combine some reports
-        const { reports } = await batchRunReports([
+        const reports = await queryReports([
           {
             metrics: [
               { name: 'activeUsers' },
@@ -773,7 +761,7 @@ async function handleToolCall(name: string, args: Record<string, unknown>): Prom
             limit: 100,
           },
         ];
-        const { reports } = await batchRunReports(requests);
+        const reports = await queryReports(requests);
         const currentData = parseReportToRecords(reports[0]);
         const previousData = parseReportToRecords(reports[1]);
         const calculateTotals = (data: Array<Record<string, string | number>>) => {
@@ -817,13 +805,6 @@ async function handleToolCall(name: string, args: Record<string, unknown>): Prom
   }
 }
 
-function escapeCSV(value: string): string {
-  if (value.includes(',') || value.includes('"') || value.includes('\n')) {
-    return `"${value.replace(/"/g, '""')}"`;
-  }
-  return value;
-}
-
 // Set CORS headers
 function setCorsHeaders(res: VercelResponse) {
   res.setHeader('Access-Control-Allow-Origin', '*');
@@ -831,6 +812,95 @@ function setCorsHeaders(res: VercelResponse) {
   res.setHeader('Access-Control-Allow-Headers', 'Content-Type, Authorization');
 }
 
+interface JsonRpcMessage {
+  jsonrpc?: string;
+  method?: string;
+  params?: Record<string, unknown>;
+  id?: unknown;
+}
+
+function isNotification(message: JsonRpcMessage): boolean {
+  return message?.jsonrpc === '2.0' && message.id === undefined;
+}
+
+// Handle a single JSON-RPC message
+async function handleMessage(body: JsonRpcMessage): Promise<{ status: number; body: Record<string, unknown> }> {
+  // Basic validation
+  if (!body?.jsonrpc || body.jsonrpc !== '2.0') {
+    return {
+      status: 400,
+      body: {
+        jsonrpc: '2.0',
+        error: { code: -32600, message: 'Invalid Request: Not a valid JSON-RPC 2.0 request' },
+        id: body?.id || null,
+      },
+    };
+  }
+
+  // Handle initialize
+  if (body.method === 'initialize') {
+    return {
+      status: 200,
+      body: {
+        jsonrpc: '2.0',
+        result: {
+          protocolVersion: '2024-11-05',
+          capabilities: { tools: {} },
+          serverInfo: { name: 'toonnotes-analytics', version: '1.0.0' },
+        },
+        id: body.id,
+      },
+    };
+  }
+
+  // Handle tools/list
+  if (body.method === 'tools/list') {
+    return {
+      status: 200,
+      body: {
+        jsonrpc: '2.0',
+        result: { tools: TOOLS },
+        id: body.id,
+      },
+    };
+  }
+
+  // Handle tools/call
+  if (body.method === 'tools/call') {
+    const params = body.params as { name: string; arguments?: Record<string, unknown> } | undefined;
+    if (!params?.name) {
+      return {
+        status: 400,
+        body: {
+          jsonrpc: '2.0',
+          error: { code: -32602, message: 'Invalid params: missing tool name' },
+          id: body.id,
+        },
+      };
+    }
+
+    const result = await handleToolCall(params.name, params.arguments || {});
+    return {
+      status: 200,
+      body: {
+        jsonrpc: '2.0',
+        result,
+        id: body.id,
+      },
+    };
+  }
+
+  // Method not found
+  return {
+    status: 404,
+    body: {
+      jsonrpc: '2.0',
+      error: { code: -32601, message: `Method not found: ${body.method}` },
+      id: body.id,
+    },
+  };
+}
+
 // Main handler
 export default async function handler(req: VercelRequest, res: VercelResponse) {
   setCorsHeaders(res);
@@ -854,64 +924,31 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
   // Handle POST (MCP requests)
   if (req.method === 'POST') {
     try {
-      const body = req.body as { jsonrpc?: string; method?: string; params?: Record<string, unknown>; id?: unknown };
-
-      // Basic validation
-      if (!body.jsonrpc || body.jsonrpc !== '2.0') {
-        return res.status(400).json({
-          jsonrpc: '2.0',
-          error: { code: -32600, message: 'Invalid Request: Not a valid JSON-RPC 2.0 request' },
-          id: body.id || null,
-        });
-      }
-
-      // Handle initialize
-      if (body.method === 'initialize') {
-        return res.json({
-          jsonrpc: '2.0',
-          result: {
-            protocolVersion: '2024-11-05',
-            capabilities: { tools: {} },
-            serverInfo: { name: 'toonnotes-analytics', version: '1.0.0' },
-          },
-          id: body.id,
-        });
-      }
-
-      // Handle tools/list
-      if (body.method === 'tools/list') {
-        return res.json({
-          jsonrpc: '2.0',
-          result: { tools: TOOLS },
-          id: body.id,
-        });
-      }
-
-      // Handle tools/call
-      if (body.method === 'tools/call') {
-        const params = body.params as { name: string; arguments?: Record<string, unknown> } | undefined;
-        if (!params?.name) {
+      // JSON-RPC batch: calls run concurrently, so their reports are merged
+      // into shared Data API batches and cache entries
+      if (Array.isArray(req.body)) {
+        if (req.body.length === 0) {
           return res.status(400).json({
             jsonrpc: '2.0',
-            error: { code: -32602, message: 'Invalid params: missing tool name' },
-            id: body.id,
+            error: { code: -32600, message: 'Invalid Request: Empty batch' },
+            id: null,
           });
         }
-
-        const result = await handleToolCall(params.name, params.arguments || {});
-        return res.json({
-          jsonrpc: '2.0',
-          result,
-          id: body.id,
-        });
+        const messages = req.body as JsonRpcMessage[];
+        const responses = await Promise.all(messages.map((message) => handleMessage(message)));
+
+        // Notifications (valid requests without an id) get no response
+        const replies = responses
+          .filter((_, i) => !isNotification(messages[i]))
+          .map((response) => response.body);
+        if (replies.length === 0) {
+          return res.status(202).end();
+        }
+        return res.json(replies);
       }
 
-      // Method not found
-      return res.status(404).json({
-        jsonrpc: '2.0',
-        error: { code: -32601, message: `Method not found: ${body.method}` },
-        id: body.id,
-      });
+      const { status, body } = await handleMessage(req.body as JsonRpcMessage);
+      return res.status(status).json(body);
     } catch (error) {
       return res.status(400).json({
         jsonrpc: '2.0',
@@ -110,6 +110,11 @@ export interface MetadataResponse {
 // API Functions
 // ============================================
 
+// Dimensions and metrics only change when custom definitions are added
+const METADATA_TTL_MS = 60 * 60 * 1000;
+
+const metadataCache = new Map<string, { value: Promise<MetadataResponse>; expiresAt: number }>();
+
 /**
  * Run a report query
  */
@@ -148,13 +153,23 @@ export async function batchRunReports(
 }
 
 /**
- * Get available dimensions and metrics metadata
+ * Get available dimensions and metrics metadata (memoized per property for an hour)
  */
 export async function getMetadata(): Promise<MetadataResponse> {
   const propertyPath = getPropertyPath();
+  const cached = metadataCache.get(propertyPath);
+  if (cached && cached.expiresAt > Date.now()) {
+    return cached.value;
+  }
+
   const url = `${DATA_API_BASE}/${propertyPath}/metadata`;
+  const value = makeAuthenticatedRequest<MetadataResponse>(url);
+
+  // Cache the pending request so concurrent callers share it; drop it on failure
+  metadataCache.set(propertyPath, { value, expiresAt: Date.now() + METADATA_TTL_MS });
+  value.catch(() => metadataCache.delete(propertyPath));
 
-  return makeAuthenticatedRequest<MetadataResponse>(url);
+  return value;
 }
 
 /**
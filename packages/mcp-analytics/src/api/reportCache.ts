@@ -0,0 +1,385 @@
+/**
+ * GA4 Report Cache
+ *
+ * Sits in front of the Data API client to keep dashboards within quota:
+ * - Caches reports keyed on the normalized request, with date-aware TTLs
+ *   (ranges that ended days ago are immutable and cached much longer).
+ *   Days are counted in the property's time zone, as GA4 does.
+ * - Shares in-flight requests between identical concurrent queries
+ * - Merges reports requested together into batchRunReports calls
+ * - Pages through large reports for exports instead of one huge response
+ */
+
+import { getPropertyPath } from '../auth/google';
+import {
+  runReport,
+  batchRunReports,
+  type DateRange,
+  type ReportRequest,
+  type ReportResponse,
+  type ReportRow,
+} from './data';
+
+// ============================================
+// Configuration
+// ============================================
+
+const DEFAULT_DATE_RANGE: DateRange = { startDate: '7daysAgo', endDate: 'today' };
+
+// Ranges touching today or yesterday are still collecting events
+const RECENT_TTL_MS = 5 * 60 * 1000;
+
+// GA4 may reprocess the last few days, so recently closed ranges still change
+const SETTLING_TTL_MS = 60 * 60 * 1000;
+const SETTLING_DAYS = 3;
+
+// Anything older is final
+const IMMUTABLE_TTL_MS = 24 * 60 * 60 * 1000;
+
+const MAX_CACHE_ENTRIES = 200;
+
+// Reports requested within this window are merged into one batch call
+const BATCH_WINDOW_MS = 10;
+
+// GA4 batchRunReports accepts at most 5 requests
+const MAX_BATCH_SIZE = 5;
+
+// Rows per page when paging through a report (GA4 allows up to 250,000)
+const DEFAULT_PAGE_SIZE = 10000;
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+const RELATIVE_DATE_PATTERN = /^(today|yesterday|\d+daysAgo)$/;
+
+// ============================================
+// Cache
+// ============================================
+
+interface CacheEntry {
+  value: Promise<ReportResponse>;
+  expiresAt: number;
+}
+
+// Map keeps insertion order, so re-inserting on read gives LRU eviction
+const cache = new Map<string, CacheEntry>();
+
+// GA4 resolves "today" and "NdaysAgo" in the property's time zone. It's
+// read from report metadata, so it is unknown until the first report returns.
+let propertyTimeZone: string | null = null;
+
+const stats = {
+  hits: 0,
+  misses: 0,
+  apiCalls: 0,
+  batchedReports: 0,
+};
+
+/**
+ * JSON with sorted keys, so equivalent requests produce the same string
+ */
+function stableStringify(value: unknown): string {
+  if (Array.isArray(value)) {
+    return `[${value.map(stableStringify).join(',')}]`;
+  }
+  if (value && typeof value === 'object') {
+    const entries = Object.entries(value as Record<string, unknown>)
+      .filter(([, v]) => v !== undefined)
+      .sort(([a], [b]) => a.localeCompare(b))
+      .map(([k, v]) => `${JSON.stringify(k)}:${stableStringify(v)}`);
+    return `{${entries.join(',')}}`;
+  }
+  return JSON.stringify(value);
+}
+
+/**
+ * Fill in the defaults the API would apply, so implicit and explicit
+ * requests share a cache entry
+ */
+export function normalizeReportRequest(request: ReportRequest): ReportRequest {
+  return {
+    ...request,
+    dateRanges: request.dateRanges?.length ? request.dateRanges : [DEFAULT_DATE_RANGE],
+    offset: request.offset || undefined,
+  };
+}
+
+function utcDay(now: number): number {
+  return Math.floor(now / DAY_MS);
+}
+
+/**
+ * Today's day number in the property's time zone (UTC until it's known)
+ */
+function propertyDay(now: number): number {
+  if (!propertyTimeZone) return utcDay(now);
+
+  try {
+    const parts = new Intl.DateTimeFormat('en-US', {
+      timeZone: propertyTimeZone,
+      year: 'numeric',
+      month: 'numeric',
+      day: 'numeric',
+    }).formatToParts(now);
+    const part = (type: string) => Number(parts.find((p) => p.type === type)?.value);
+    return utcDay(Date.UTC(part('year'), part('month') - 1, part('day')));
+  } catch {
+    // Time zone not supported by this runtime
+    return utcDay(now);
+  }
+}
+
+/**
+ * Remember the property time zone from a report's metadata
+ */
+function noteTimeZone(response: ReportResponse | undefined): void {
+  const timeZone = response?.metadata?.timeZone;
+  if (timeZone) propertyTimeZone = timeZone;
+}
+
+function isRelativeRequest(request: ReportRequest): boolean {
+  return request.dateRanges!.some(
+    (range) => RELATIVE_DATE_PATTERN.test(range.startDate) || RELATIVE_DATE_PATTERN.test(range.endDate)
+  );
+}
+
+/**
+ * Day number (days since epoch) for an API date, or null if unparseable.
+ * Calendar dates map to the same day number in any time zone.
+ */
+function resolveDay(date: string, now: number): number | null {
+  const today = propertyDay(now);
+  if (date === 'today') return today;
+  if (date === 'yesterday') return today - 1;
+
+  const daysAgo = date.match(/^(\d+)daysAgo$/);
+  if (daysAgo) return today - Number(daysAgo[1]);
+
+  const time = Date.parse(`${date}T00:00:00Z`);
+  return Number.isNaN(time) ? null : utcDay(time);
+}
+
+/**
+ * How long a report stays valid, based on how recent its date ranges are
+ */
+export function getReportTtl(request: ReportRequest, now = Date.now()): number {
+  const normalized = normalizeReportRequest(request);
+  let latestEnd = -Infinity;
+
+  for (const range of normalized.dateRanges!) {
+    const end = resolveDay(range.endDate, now);
+    if (end === null) return RECENT_TTL_MS;
+    latestEnd = Math.max(latestEnd, end);
+  }
+
+  const age = propertyDay(now) - latestEnd;
+  if (age <= 1) return RECENT_TTL_MS;
+  if (age <= SETTLING_DAYS) return SETTLING_TTL_MS;
+
+  // Without the time zone the property's day may roll over before the UTC
+  // day in the key does, so relative ranges can't be trusted for long
+  if (!propertyTimeZone && isRelativeRequest(normalized)) return SETTLING_TTL_MS;
+  return IMMUTABLE_TTL_MS;
+}
+
+/**
+ * Cache key for a normalized request. Relative dates ("7daysAgo") cover a
+ * different range each property-local day, so that day is part of their key.
+ */
+function getCacheKey(request: ReportRequest, now: number): string {
+  return stableStringify({
+    property: getPropertyPath(),
+    day: isRelativeRequest(request) ? propertyDay(now) : undefined,
+    request,
+  });
+}
+
+function getCached(key: string): Promise<ReportResponse> | undefined {
+  const entry = cache.get(key);
+  if (!entry) return undefined;
+
+  cache.delete(key);
+  if (entry.expiresAt <= Date.now()) return undefined;
+
+  cache.set(key, entry);
+  return entry.value;
+}
+
+function setCached(key: string, value: Promise<ReportResponse>, ttl: number): void {
+  cache.delete(key);
+  cache.set(key, { value, expiresAt: Date.now() + ttl });
+
+  while (cache.size > MAX_CACHE_ENTRIES) {
+    const oldest = cache.keys().next().value as string;
+    cache.delete(oldest);
+  }
+
+  // Failed requests aren't cached
+  value.catch(() => {
+    if (cache.get(key)?.value === value) cache.delete(key);
+  });
+}
+
+// ============================================
+// Batching
+// ============================================
+
+interface QueuedReport {
+  request: ReportRequest;
+  resolve: (response: ReportResponse) => void;
+  reject: (error: unknown) => void;
+}
+
+let queue: QueuedReport[] = [];
+let flushTimer: ReturnType<typeof setTimeout> | null = null;
+
+/**
+ * Whether an error came from the request itself rather than auth or quota
+ */
+function isInvalidRequestError(error: unknown): boolean {
+  return error instanceof Error && /\(400\)/.test(error.message);
+}
+
+async function runQueued(item: QueuedReport): Promise<void> {
+  stats.apiCalls++;
+  try {
+    const response = await runReport(item.request);
+    noteTimeZone(response);
+    item.resolve(response);
+  } catch (error) {
+    item.reject(error);
+  }
+}
+
+async function runBatch(batch: QueuedReport[]): Promise<void> {
+  if (batch.length === 1) {
+    await runQueued(batch[0]);
+    return;
+  }
+
+  stats.apiCalls++;
+  try {
+    const { reports } = await batchRunReports(batch.map((item) => item.request));
+    noteTimeZone(reports[0]);
+    stats.batchedReports += batch.length;
+    batch.forEach((item, i) => item.resolve(reports[i]));
+  } catch (error) {
+    if (!isInvalidRequestError(error)) {
+      batch.forEach((item) => item.reject(error));
+      return;
+    }
+    // One invalid request fails the whole batch - run them separately so
+    // the others still succeed
+    await Promise.all(batch.map(runQueued));
+  }
+}
+
+function flushQueue(): void {
+  if (flushTimer) {
+    clearTimeout(flushTimer);
+    flushTimer = null;
+  }
+
+  const pending = queue;
+  queue = [];
+  for (let i = 0; i < pending.length; i += MAX_BATCH_SIZE) {
+    void runBatch(pending.slice(i, i + MAX_BATCH_SIZE));
+  }
+}
+
+function enqueueReport(request: ReportRequest): Promise<ReportResponse> {
+  return new Promise((resolve, reject) => {
+    queue.push({ request, resolve, reject });
+
+    if (queue.length >= MAX_BATCH_SIZE) {
+      flushQueue();
+    } else if (!flushTimer) {
+      flushTimer = setTimeout(flushQueue, BATCH_WINDOW_MS);
+    }
+  });
+}
+
+// ============================================
+// Public API
+// ============================================
+
+/**
+ * Run a report through the cache. Reports requested at the same time are
+ * merged into batchRunReports calls.
+ */
+export function queryReport(request: ReportRequest): Promise<ReportResponse> {
+  const now = Date.now();
+  const normalized = normalizeReportRequest(request);
+  const key = getCacheKey(normalized, now);
+
+  const cached = getCached(key);
+  if (cached) {
+    stats.hits++;
+    return cached;
+  }
+
+  stats.misses++;
+  const response = enqueueReport(normalized);
+  setCached(key, response, getReportTtl(normalized, now));
+  return response;
+}
+
+/**
+ * Run several reports through the cache, in order. Only uncached reports
+ * reach the API, batched up to the GA4 limit per call.
+ */
+export function queryReports(requests: ReportRequest[]): Promise<ReportResponse[]> {
+  return Promise.all(requests.map(queryReport));
+}
+
+/**
+ * Page through a report with limit/offset, yielding rows a page at a time.
+ * Pages bypass the cache, so large exports don't evict dashboard queries.
+ *
+ * @param request - Report to run (its limit caps the total number of rows)
+ * @param pageSize - Rows fetched per API call
+ */
+export async function* streamReportRows(
+  request: ReportRequest,
+  pageSize = DEFAULT_PAGE_SIZE
+): AsyncGenerator<{ rows: ReportRow[]; response: ReportResponse }> {
+  const maxRows = request.limit ?? Infinity;
+  let offset = request.offset ?? 0;
+  let fetched = 0;
+
+  while (fetched < maxRows) {
+    stats.apiCalls++;
+    const response = await runReport({
+      ...request,
+      limit: Math.min(pageSize, maxRows - fetched),
+      offset,
+    });
+    noteTimeZone(response);
+
+    // The first page is yielded even when empty so callers still get headers
+    const rows = response.rows || [];
+    yield { rows, response };
+    if (rows.length === 0) return;
+
+    fetched += rows.length;
+    offset += rows.length;
+    if (offset >= (response.rowCount || 0)) return;
+  }
+}
+
+/**
+ * Cache and batching counters (for diagnostics)
+ */
+export function getReportCacheStats(): typeof stats & { entries: number } {
+  return { ...stats, entries: cache.size };
+}
+
+/**
+ * Clear cached reports, counters and the remembered time zone
+ */
+export function clearReportCache(): void {
+  cache.clear();
+  propertyTimeZone = null;
+  stats.hits = 0;
+  stats.misses = 0;
+  stats.apiCalls = 0;
+  stats.batchedReports = 0;
+}
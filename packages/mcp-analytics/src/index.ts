@@ -9,6 +9,7 @@ export * from './auth/google';
 
 // API Clients
 export * from './api/data';
+export * from './api/reportCache';
 export * from './api/realtime';
 export * from './api/admin';
 
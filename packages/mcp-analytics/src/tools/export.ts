@@ -10,12 +10,11 @@
 import { z } from 'zod';
 import type { McpServer } from '@modelcontextprotocol/sdk/server/mcp.js';
 import {
-  batchRunReports,
-  runReport,
   parseReportToRecords,
   createDateRange,
   type ReportRequest,
 } from '../api/data';
+import { queryReports, streamReportRows } from '../api/reportCache';
 
 // ============================================
 // Schema Definitions
@@ -64,7 +63,7 @@ export function registerExportTools(server: McpServer) {
           limit: r.limit || 100,
         }));
 
-        const { reports: responses } = await batchRunReports(requests);
+        const responses = await queryReports(requests);
 
         const results = reports.map((config, i) => ({
           name: config.name,
@@ -132,7 +131,7 @@ export function registerExportTools(server: McpServer) {
       limit?: number;
     }) => {
       try {
-        const response = await runReport({
+        const { csv, rowCount } = await exportReportAsCSV({
           dimensions: dimensions.map((name) => ({ name })),
           metrics: metrics.map((name) => ({ name })),
           dateRanges: [
@@ -144,27 +143,11 @@ export function registerExportTools(server: McpServer) {
           limit: limit || 1000,
         });
 
-        // Build CSV
-        const headers = [
-          ...response.dimensionHeaders.map((h) => h.name),
-          ...response.metricHeaders.map((h) => h.name),
-        ];
-
-        const rows = (response.rows || []).map((row) => {
-          const values = [
-            ...row.dimensionValues.map((v) => escapeCSV(v.value)),
-            ...row.metricValues.map((v) => v.value),
-          ];
-          return values.join(',');
-        });
-
-        const csv = [headers.join(','), ...rows].join('\n');
-
         return {
           content: [
             {
               type: 'text' as const,
-              text: `CSV Export (${response.rowCount} rows):\n\n${csv}`,
+              text: `CSV Export (${rowCount} rows):\n\n${csv}`,
             },
           ],
         };
@@ -199,7 +182,7 @@ export function registerExportTools(server: McpServer) {
         const dateRange = createDateRange(period);
 
         // Run multiple reports for comprehensive summary
-        const { reports } = await batchRunReports([
+        const reports = await queryReports([
           // Overall metrics
           {
             metrics: [
@@ -355,7 +338,7 @@ export function registerExportTools(server: McpServer) {
           },
         ];
 
-        const { reports } = await batchRunReports(requests);
+        const reports = await queryReports(requests);
 
         const currentData = parseReportToRecords(reports[0]);
         const previousData = parseReportToRecords(reports[1]);
@@ -439,3 +422,37 @@ function escapeCSV(value: string): string {
   }
   return value;
 }
+
+/**
+ * Page through a report and build the CSV as rows arrive, so only one page
+ * of API response is held at a time
+ */
+export async function exportReportAsCSV(
+  request: ReportRequest
+): Promise<{ csv: string; rowCount: number }> {
+  const lines: string[] = [];
+  let rowCount = 0;
+
+  for await (const { rows, response } of streamReportRows(request)) {
+    if (lines.length === 0) {
+      lines.push(
+        [
+          ...response.dimensionHeaders.map((h) => h.name),
+          ...response.metricHeaders.map((h) => h.name),
+        ].join(',')
+      );
+    }
+
+    for (const row of rows) {
+      lines.push(
+        [
+          ...row.dimensionValues.map((v) => escapeCSV(v.value)),
+          ...row.metricValues.map((v) => v.value),
+        ].join(',')
+      );
+    }
+    rowCount += rows.length;
+  }
+
+  return { csv: lines.join('\n'), rowCount };
+}
@@ -12,13 +12,12 @@
 import { z } from 'zod';
 import type { McpServer } from '@modelcontextprotocol/sdk/server/mcp.js';
 import {
-  runReport,
-  batchRunReports,
   getMetadata,
   parseReportToRecords,
   createDateRange,
   type ReportRequest,
 } from '../api/data';
+import { queryReport, queryReports } from '../api/reportCache';
 
 // ============================================
 // Tool Registration
@@ -68,7 +67,7 @@ export function registerQueryTools(server: McpServer) {
           limit: limit || 100,
         };
 
-        const response = await runReport(request);
+        const response = await queryReport(request);
         const records = parseReportToRecords(response);
 
         return {
@@ -113,7 +112,7 @@ export function registerQueryTools(server: McpServer) {
       try {
         const dateRange = createDateRange(period);
 
-        const response = await runReport({
+        const response = await queryReport({
           dimensions: [{ name: 'deviceCategory' }],
           metrics: [{ name: 'activeUsers' }, { name: 'newUsers' }],
           dateRanges: [dateRange],
@@ -174,7 +173,7 @@ export function registerQueryTools(server: McpServer) {
       try {
         const dateRange = createDateRange(period);
 
-        const response = await runReport({
+        const response = await queryReport({
           dimensions: [{ name: 'eventName' }],
           metrics: [{ name: 'eventCount' }, { name: 'totalUsers' }],
           dateRanges: [dateRange],
@@ -228,7 +227,7 @@ export function registerQueryTools(server: McpServer) {
         const dateRange = createDateRange(period);
 
         // Batch multiple reports for efficiency
-        const { reports } = await batchRunReports([
+        const reports = await queryReports([
           // Overall metrics
           {
             metrics: [
@@ -305,7 +304,7 @@ export function registerQueryTools(server: McpServer) {
       try {
         const dateRange = createDateRange(period);
 
-        const response = await runReport({
+        const response = await queryReport({
           dimensions: [{ name: dimension }],
           metrics: [
             { name: 'screenPageViews' },